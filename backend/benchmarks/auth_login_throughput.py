@@ -0,0 +1,131 @@
+"""
+Throughput de login y latencia del event loop con bcrypt dentro y fuera del loop.
+
+Corre `AuthService.login` completo (verificación, JWT, sesión) con el usuario,
+los roles y Redis reemplazados por dobles en memoria que simulan `--io-ms` de
+latencia. Compara:
+
+- inline: bcrypt en el event loop, como antes de `PasswordHasher` (cada
+  verificación frena todo el proceso).
+- executor: `PasswordHasher` con `--workers` threads.
+
+Mientras tanto un ticker cada 10 ms mide cuánto se atrasa el loop: es la
+demora que sufre cualquier otro request del mismo worker durante la ráfaga.
+
+Uso:
+	python -m benchmarks.auth_login_throughput [--logins 64] [--concurrency 16]
+		[--rounds 12] [--workers 1 2 4] [--io-ms 2]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import shared.models  # noqa: F401
+from core.helpers.password import PasswordHasher
+from modules.auth.application.service.auth import AuthService
+from modules.user.domain.entity.user import User
+
+TICK_SECONDS = 0.01
+
+
+class InlinePasswordHasher(PasswordHasher):
+	"""bcrypt en el propio event loop (el comportamiento anterior)."""
+
+	async def _run(self, func, *args):
+		return func(*args)
+
+
+def build_service(hasher: PasswordHasher, user: User, io_seconds: float) -> AuthService:
+	async def get_user(**kwargs):
+		await asyncio.sleep(io_seconds)
+		return user
+
+	async def create_session(session):
+		await asyncio.sleep(io_seconds)
+
+	user_service = MagicMock()
+	user_service.get_user_by_email_or_nickname = get_user
+	auth_repository = MagicMock()
+	auth_repository.create_user_session = create_session
+	return AuthService(
+		auth_repository,
+		lambda: user_service,
+		lambda: MagicMock(),
+		lambda: MagicMock(),
+		lambda: MagicMock(),
+		hasher,
+	)
+
+
+async def run_logins(
+	hasher: PasswordHasher, logins: int, concurrency: int, io_seconds: float
+) -> tuple[float, float, float]:
+	"""Devuelve (logins/s, atraso p99 del loop en ms, atraso máximo en ms)."""
+	user = User(
+		email="bench@example.com",
+		password=await asyncio.to_thread(hasher.hash_sync, "secreto"),
+		requires_password_reset=False,
+	)
+	service = build_service(hasher, user, io_seconds)
+	semaphore = asyncio.Semaphore(concurrency)
+	lags = []
+
+	async def ticker():
+		while True:
+			expected = time.perf_counter() + TICK_SECONDS
+			await asyncio.sleep(TICK_SECONDS)
+			lags.append(max(time.perf_counter() - expected, 0))
+
+	async def login():
+		async with semaphore:
+			await service.login(user.email, "secreto")
+
+	ticker_task = asyncio.create_task(ticker())
+	await asyncio.sleep(TICK_SECONDS * 2)
+	start = time.perf_counter()
+	await asyncio.gather(*[login() for _ in range(logins)])
+	elapsed = time.perf_counter() - start
+	ticker_task.cancel()
+
+	lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+	p99 = lags_ms[0]
+	if len(lags_ms) > 1:
+		p99 = statistics.quantiles(lags_ms, n=100, method="inclusive")[98]
+	return logins / elapsed, p99, lags_ms[-1]
+
+
+async def main(args: argparse.Namespace) -> None:
+	print(
+		f"logins={args.logins} concurrencia={args.concurrency} rounds={args.rounds} "
+		f"io={args.io_ms}ms"
+	)
+	hashers = [("inline", InlinePasswordHasher(args.rounds, max_workers=1))]
+	hashers += [
+		(f"executor x{workers}", PasswordHasher(args.rounds, max_workers=workers))
+		for workers in args.workers
+	]
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		for name, hasher in hashers:
+			rate, p99, worst = await run_logins(
+				hasher, args.logins, args.concurrency, args.io_ms / 1000
+			)
+			hasher.close()
+			print(
+				f"{name:>12}: {rate:6.1f} logins/s  atraso del loop p99 {p99:7.1f} ms  "
+				f"máx {worst:7.1f} ms"
+			)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--logins", type=int, default=64)
+	parser.add_argument("--concurrency", type=int, default=16)
+	parser.add_argument("--rounds", type=int, default=12)
+	parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+	parser.add_argument("--io-ms", type=float, default=2)
+	asyncio.run(main(parser.parse_args()))
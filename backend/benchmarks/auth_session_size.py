@@ -0,0 +1,141 @@
+"""
+Tamaño de la sesión en Redis y costo de leer los permisos en cada request.
+
+Compara el esquema anterior (`LoginResponseDTO` entero como JSON en un string)
+con el actual de `RedisAuthRepository` (hash con la metadata + set con los
+permisos). La sesión tiene los permisos de todo el registro (un admin) y
+`--modules` módulos, con JWT reales.
+
+Mide:
+
+- bytes guardados por sesión (claves, campos y valores; sin el overhead
+  interno de Redis por clave, ~50-70 bytes),
+- bytes que viajan desde Redis en cada request autenticado,
+- tiempo en Python de obtener los permisos a partir de la respuesta
+  (`AuthBackend`) y de armar la sesión completa (refresh).
+
+Uso:
+	python -m benchmarks.auth_session_size [--modules 12] [--repeat 20000]
+"""
+
+import argparse
+import timeit
+import uuid
+
+import shared.models  # noqa: F401
+import modules.provider.permissions  # noqa: F401
+import modules.rbac.permissions  # noqa: F401
+import modules.taxes.permissions  # noqa: F401
+import modules.user.permissions  # noqa: F401
+from core.fastapi.dependencies.permission import PERMISSIONS_REGISTRY
+from core.helpers.token import TokenHelper
+from fastapi.encoders import jsonable_encoder
+from modules.auth.adapter.output.persistence.redis import (
+	RedisAuthRepository,
+	_modules_adapter,
+)
+from modules.module.application.dto import ModuleViewDTO
+from modules.user.application.dto import LoginResponseDTO
+from modules.user.application.dto.user import UserLoginResponseDTO
+
+
+class RecordingPipeline:
+	"""Anota los comandos que encola el repositorio en vez de mandarlos."""
+
+	def __init__(self):
+		self.commands = []
+
+	def __getattr__(self, name):
+		def command(*args, **kwargs):
+			self.commands.append((name, args, kwargs))
+			return self
+
+		return command
+
+
+def build_session(modules: int) -> LoginResponseDTO:
+	user = UserLoginResponseDTO(
+		id=uuid.uuid4(),
+		nickname="mlopez",
+		email="mlopez@example.com",
+		name="María",
+		lastname="López",
+		job_position="Administración",
+		fk_role=1,
+		is_admin=True,
+		is_owner=False,
+	)
+	claims = jsonable_encoder(user)
+	return LoginResponseDTO(
+		user=user,
+		permissions=list(PERMISSIONS_REGISTRY),
+		modules=[
+			ModuleViewDTO(
+				name=f"Módulo {i}",
+				token=f"module_{i}",
+				description=f"Gestión del módulo {i} del portal de proveedores",
+			)
+			for i in range(modules)
+		],
+		token=TokenHelper.encode(claims, 900),
+		refresh_token=TokenHelper.encode({**claims, "sub": "refresh"}, 604800),
+	)
+
+
+def compact_layout(session: LoginResponseDTO) -> tuple[dict, set]:
+	pipe = RecordingPipeline()
+	RedisAuthRepository(None, None)._queue_session(pipe, session, 1000)  # type: ignore
+	fields, permissions = {}, set()
+	for name, args, kwargs in pipe.commands:
+		if name == "hset":
+			fields = kwargs["mapping"]
+		elif name == "sadd":
+			permissions = set(args[1:])
+	return fields, permissions
+
+
+def main(args: argparse.Namespace) -> None:
+	session = build_session(args.modules)
+	session_key = f"session:{session.user.id}"
+	permissions_key = f"{session_key}:permissions"
+
+	legacy = session.model_dump_json()
+	fields, permissions = compact_layout(session)
+
+	legacy_bytes = len(session_key) + len(legacy.encode())
+	compact_bytes = (
+		len(session_key)
+		+ sum(len(k) + len(str(v).encode()) for k, v in fields.items())
+		+ len(permissions_key)
+		+ sum(len(p.encode()) for p in permissions)
+	)
+	read_legacy = len(legacy.encode())
+	read_compact = sum(len(p.encode()) for p in permissions)
+
+	members = list(permissions)
+	timings = {
+		"permisos, antes": lambda: LoginResponseDTO.model_validate_json(legacy).permissions,
+		"permisos, ahora": lambda: list(set(members)),
+		"sesión, antes": lambda: LoginResponseDTO.model_validate_json(legacy),
+		"sesión, ahora": lambda: LoginResponseDTO(
+			user=UserLoginResponseDTO.model_validate_json(fields["user"]),
+			permissions=sorted(permissions),
+			modules=_modules_adapter.validate_json(fields["modules"]),
+			token=fields["token"],
+			refresh_token=fields["refresh_token"],
+		),
+	}
+
+	print(f"permisos={len(permissions)} módulos={args.modules}")
+	print(f"guardado por sesión: antes {legacy_bytes} B, ahora {compact_bytes} B")
+	print(f"leído por request:   antes {read_legacy} B, ahora {read_compact} B")
+	for name, func in timings.items():
+		seconds = min(timeit.repeat(func, number=args.repeat, repeat=3)) / args.repeat
+		print(f"{name:>16}: {seconds * 1e6:7.2f} µs")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--modules", type=int, default=12)
+	parser.add_argument("--repeat", type=int, default=20000)
+	main(parser.parse_args())
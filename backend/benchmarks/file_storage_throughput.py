@@ -0,0 +1,175 @@
+"""
+Throughput de subida y descarga de file_storage contra el S3 de reemplazo.
+
+Compara los dos adapters de S3 con el mismo stand-in (benchmarks.s3_standin):
+
+- boto3: `S3FileStorage`, cliente síncrono en el thread pool por defecto y un
+  único PutObject con el archivo completo en memoria.
+- aioboto3: `AsyncS3FileStorage`, cliente async con pool y multipart con
+  partes en paralelo.
+- local: `LocalFileStorage` en un directorio temporal, sin red: el techo del
+  resto de la API.
+
+Para cada nivel de concurrencia se suben `--files` archivos de `--size-mb` MiB
+(a lo sumo N a la vez), se descargan por bloques con `stream_file` y se
+informa MiB/s de cada fase.
+
+Uso:
+	python -m benchmarks.file_storage_throughput [--client boto3 aioboto3 local]
+		[--concurrency 1 4] [--files 8] [--size-mb 32] [--latency-ms 20]
+		[--bandwidth-mb 40] [--part-mb 8] [--part-concurrency 4]
+"""
+
+import argparse
+import asyncio
+import io
+import tempfile
+import time
+from dataclasses import dataclass
+
+from aiobotocore.config import AioConfig
+from botocore.config import Config
+
+from benchmarks.s3_standin import S3StandIn
+from modules.file_storage.adapter.output.async_s3_file_storage import AsyncS3FileStorage
+from modules.file_storage.adapter.output.local_file_storage import LocalFileStorage
+from modules.file_storage.adapter.output.s3_file_storage import S3FileStorage
+from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+
+MIB = 1024 * 1024
+CLIENTS = ("boto3", "aioboto3", "local")
+# Contra AWS (https + checksum) botocore no firma el cuerpo de las subidas. El
+# stand-in es http y lo firmaría con SHA-256, un costo que en producción no está
+HTTPS_LIKE_S3_CONFIG = {"addressing_style": "path", "payload_signing_enabled": False}
+
+
+@dataclass
+class ThroughputResult:
+	client: str
+	concurrency: int
+	upload_seconds: float
+	download_seconds: float
+	total_bytes: int
+
+	@property
+	def upload_mib_s(self) -> float:
+		return self.total_bytes / MIB / self.upload_seconds
+
+	@property
+	def download_mib_s(self) -> float:
+		return self.total_bytes / MIB / self.download_seconds
+
+
+def build_storage(
+	client: str,
+	endpoint_url: str,
+	part_size: int = 8 * MIB,
+	part_concurrency: int = 4,
+	local_dir: str | None = None,
+) -> FileStorageRepository:
+	if client == "local":
+		return LocalFileStorage(local_dir)
+
+	if client == "boto3":
+		storage = S3FileStorage("bench", "us-east-1", "key", "secret", endpoint_url=endpoint_url)
+		storage._s3 = storage._session.client(
+			"s3",
+			endpoint_url=endpoint_url,
+			config=Config(signature_version="s3v4", s3=HTTPS_LIKE_S3_CONFIG),
+		)
+		return storage
+
+	storage = AsyncS3FileStorage(
+		"bench",
+		"us-east-1",
+		"key",
+		"secret",
+		endpoint_url=endpoint_url,
+		part_size=part_size,
+		upload_concurrency=part_concurrency,
+	)
+	storage._config = storage._config.merge(AioConfig(s3=HTTPS_LIKE_S3_CONFIG))
+	return storage
+
+
+async def run_throughput(
+	client: str,
+	s3: S3StandIn,
+	concurrency: int,
+	files: int,
+	size: int,
+	part_size: int = 8 * MIB,
+	part_concurrency: int = 4,
+) -> ThroughputResult:
+	local_dir = tempfile.TemporaryDirectory(prefix="bench-files-")
+	storage = build_storage(client, s3.url, part_size, part_concurrency, local_dir.name)
+	content = bytes(range(256)) * (size // 256)
+	semaphore = asyncio.Semaphore(concurrency)
+
+	async def upload(i: int) -> None:
+		async with semaphore:
+			await storage.upload_file(io.BytesIO(content), f"{client}/{concurrency}/{i}.bin")
+
+	async def download(i: int) -> None:
+		async with semaphore:
+			received = 0
+			async for chunk in storage.stream_file(f"{client}/{concurrency}/{i}.bin"):
+				received += len(chunk)
+			assert received == len(content)
+
+	try:
+		start = time.perf_counter()
+		await asyncio.gather(*[upload(i) for i in range(files)])
+		upload_seconds = time.perf_counter() - start
+
+		start = time.perf_counter()
+		await asyncio.gather(*[download(i) for i in range(files)])
+		download_seconds = time.perf_counter() - start
+	finally:
+		await storage.close()
+		local_dir.cleanup()
+
+	return ThroughputResult(
+		client, concurrency, upload_seconds, download_seconds, files * len(content)
+	)
+
+
+async def main(args: argparse.Namespace) -> None:
+	print(
+		f"archivos={args.files} x {args.size_mb} MiB latencia={args.latency_ms}ms "
+		f"ancho de banda={args.bandwidth_mb} MiB/s por conexión "
+		f"parte={args.part_mb} MiB x {args.part_concurrency}"
+	)
+	async with S3StandIn(
+		latency=args.latency_ms / 1000, bandwidth=args.bandwidth_mb * MIB
+	) as s3:
+		for client in args.client:
+			for concurrency in args.concurrency:
+				result = await run_throughput(
+					client,
+					s3,
+					concurrency,
+					args.files,
+					int(args.size_mb * MIB),
+					part_size=int(args.part_mb * MIB),
+					part_concurrency=args.part_concurrency,
+				)
+				print(
+					f"{client:>8} concurrencia {concurrency:>3}: "
+					f"subida {result.upload_mib_s:7.1f} MiB/s  "
+					f"descarga {result.download_mib_s:7.1f} MiB/s"
+				)
+				s3.objects.clear()
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--client", choices=CLIENTS, nargs="+", default=list(CLIENTS))
+	parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+	parser.add_argument("--files", type=int, default=8)
+	parser.add_argument("--size-mb", type=float, default=32)
+	parser.add_argument("--latency-ms", type=float, default=20)
+	parser.add_argument("--bandwidth-mb", type=float, default=40)
+	parser.add_argument("--part-mb", type=float, default=8)
+	parser.add_argument("--part-concurrency", type=int, default=4)
+	asyncio.run(main(parser.parse_args()))
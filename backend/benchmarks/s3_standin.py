@@ -0,0 +1,233 @@
+"""
+S3 de reemplazo para benchmarks y pruebas de los adapters de file_storage.
+
+`S3StandIn` levanta un servidor HTTP local (aiohttp) con el subconjunto de la
+API de S3 (path-style) que usan `S3FileStorage` y `AsyncS3FileStorage`:
+
+- PutObject, GetObject (con `Range`), HeadObject.
+- CreateMultipartUpload, UploadPart, CompleteMultipartUpload,
+  AbortMultipartUpload.
+
+Los objetos quedan en memoria. No valida firmas. Para que el paralelismo se
+note igual que contra S3, cada request paga `latency` y transfiere a lo sumo
+`bandwidth` bytes/s (por conexión, como S3):
+
+	async with S3StandIn(latency=0.02, bandwidth=20 * 1024 * 1024) as s3:
+		storage = AsyncS3FileStorage("bucket", "us-east-1", "k", "s", endpoint_url=s3.url)
+"""
+
+import asyncio
+import hashlib
+import re
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+from xml.etree import ElementTree
+
+from aiohttp import web
+
+XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+# Bloque en el que se simula el ancho de banda de las descargas
+TRANSFER_CHUNK = 256 * 1024
+
+
+def _xml(root: str, **children: str) -> web.Response:
+	items = "".join(f"<{name}>{value}</{name}>" for name, value in children.items())
+	return web.Response(
+		body=f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="{XMLNS}">{items}</{root}>',
+		content_type="application/xml",
+	)
+
+
+def _error(status: int, code: str) -> web.Response:
+	response = _xml("Error", Code=code, Message=code)
+	response.set_status(status)
+	return response
+
+
+def _etag(content: bytes) -> str:
+	return f'"{hashlib.md5(content).hexdigest()}"'
+
+
+def _decode_aws_chunked(body: bytes) -> bytes:
+	"""Cuerpo `aws-chunked`: `<hex>;chunk-signature=...\\r\\n<datos>\\r\\n` + trailers."""
+	content, position = bytearray(), 0
+	while True:
+		header_end = body.index(b"\r\n", position)
+		size = int(body[position:header_end].split(b";", 1)[0], 16)
+		if size == 0:
+			return bytes(content)
+		start = header_end + 2
+		content += body[start : start + size]
+		position = start + size + 2
+
+
+@dataclass
+class S3StandIn:
+	latency: float = 0.0
+	# Bytes por segundo de cada request (None = sin límite)
+	bandwidth: float | None = None
+	host: str = "127.0.0.1"
+	objects: Dict[Tuple[str, str], bytes] = field(default_factory=dict)
+	uploads: Dict[str, Dict[int, bytes]] = field(default_factory=dict)
+	calls: Counter = field(default_factory=Counter)
+	# Máximo de requests simultáneos por operación
+	peak_concurrency: Counter = field(default_factory=Counter)
+	received_bytes: int = 0
+
+	def __post_init__(self):
+		self._runner: web.AppRunner | None = None
+		self._active: Counter = Counter()
+		self.url = ""
+
+	async def __aenter__(self) -> "S3StandIn":
+		app = web.Application(client_max_size=1024**3)
+		app.router.add_route("*", "/{bucket}/{key:.+}", self.handle)
+		self._runner = web.AppRunner(app, access_log=None)
+		await self._runner.setup()
+		site = web.TCPSite(self._runner, self.host, 0)
+		await site.start()
+		port = site._server.sockets[0].getsockname()[1]
+		self.url = f"http://{self.host}:{port}"
+		return self
+
+	async def __aexit__(self, *exc_info) -> None:
+		await self._runner.cleanup()
+
+	async def _transfer(self, size: int) -> None:
+		delay = self.latency
+		if self.bandwidth:
+			delay += size / self.bandwidth
+		if delay:
+			await asyncio.sleep(delay)
+
+	async def _body(self, request: web.Request) -> bytes:
+		body = await request.read()
+		if "aws-chunked" in request.headers.get("Content-Encoding", ""):
+			body = _decode_aws_chunked(body)
+		self.received_bytes += len(body)
+		await self._transfer(len(body))
+		return body
+
+	async def handle(self, request: web.Request) -> web.StreamResponse:
+		operation = f"{request.method} {'part' if 'partNumber' in request.query else 'object'}"
+		self._active[operation] += 1
+		self.peak_concurrency[operation] = max(
+			self.peak_concurrency[operation], self._active[operation]
+		)
+		try:
+			return await self._dispatch(request)
+		finally:
+			self._active[operation] -= 1
+
+	async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+		key = (request.match_info["bucket"], request.match_info["key"])
+		query = request.query
+		method = request.method
+
+		if method == "POST" and "uploads" in query:
+			return await self._create_multipart(key)
+		if method == "PUT" and "uploadId" in query:
+			return await self._upload_part(request)
+		if method == "POST" and "uploadId" in query:
+			return await self._complete_multipart(request, key)
+		if method == "DELETE" and "uploadId" in query:
+			self.calls["abort_multipart_upload"] += 1
+			self.uploads.pop(query["uploadId"], None)
+			return web.Response(status=204)
+		if method == "PUT":
+			self.calls["put_object"] += 1
+			content = await self._body(request)
+			self.objects[key] = content
+			return web.Response(headers={"ETag": _etag(content)})
+		if method in ("GET", "HEAD"):
+			return await self._get_object(request, key)
+		return _error(405, "MethodNotAllowed")
+
+	async def _create_multipart(self, key: Tuple[str, str]) -> web.Response:
+		self.calls["create_multipart_upload"] += 1
+		await self._transfer(0)
+		upload_id = uuid.uuid4().hex
+		self.uploads[upload_id] = {}
+		return _xml(
+			"InitiateMultipartUploadResult", Bucket=key[0], Key=key[1], UploadId=upload_id
+		)
+
+	async def _upload_part(self, request: web.Request) -> web.Response:
+		self.calls["upload_part"] += 1
+		parts = self.uploads.get(request.query["uploadId"])
+		if parts is None:
+			return _error(404, "NoSuchUpload")
+		content = await self._body(request)
+		parts[int(request.query["partNumber"])] = content
+		return web.Response(headers={"ETag": _etag(content)})
+
+	async def _complete_multipart(
+		self, request: web.Request, key: Tuple[str, str]
+	) -> web.Response:
+		self.calls["complete_multipart_upload"] += 1
+		parts = self.uploads.pop(request.query["uploadId"], None)
+		if parts is None:
+			return _error(404, "NoSuchUpload")
+		document = ElementTree.fromstring(await request.read())
+		numbers = [
+			int(element.text)
+			for element in document.iter()
+			if element.tag.rsplit("}", 1)[-1] == "PartNumber"
+		]
+		if numbers != sorted(parts) or numbers != list(range(1, len(numbers) + 1)):
+			return _error(400, "InvalidPart")
+		content = b"".join(parts[number] for number in numbers)
+		self.objects[key] = content
+		await self._transfer(0)
+		return _xml(
+			"CompleteMultipartUploadResult",
+			Location=f"{self.url}/{key[0]}/{key[1]}",
+			Bucket=key[0],
+			Key=key[1],
+			ETag=f'"{hashlib.md5(content).hexdigest()}-{len(numbers)}"',
+		)
+
+	async def _get_object(
+		self, request: web.Request, key: Tuple[str, str]
+	) -> web.StreamResponse:
+		head = request.method == "HEAD"
+		self.calls["head_object" if head else "get_object"] += 1
+		content = self.objects.get(key)
+		if content is None:
+			if head:
+				return web.Response(status=404)
+			return _error(404, "NoSuchKey")
+
+		start, end, status = 0, len(content) - 1, 200
+		match = re.fullmatch(r"bytes=(\d*)-(\d*)", request.headers.get("Range", ""))
+		if match and (match[1] or match[2]):
+			if match[1]:
+				start = int(match[1])
+				end = min(int(match[2]), end) if match[2] else end
+			else:
+				start = max(len(content) - int(match[2]), 0)
+			status = 206
+
+		headers = {
+			"ETag": _etag(content),
+			"Content-Length": str(end - start + 1),
+			"Accept-Ranges": "bytes",
+		}
+		if status == 206:
+			headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+		if head:
+			await self._transfer(0)
+			return web.Response(status=status, headers=headers)
+
+		response = web.StreamResponse(status=status, headers=headers)
+		await self._transfer(0)
+		await response.prepare(request)
+		for offset in range(start, end + 1, TRANSFER_CHUNK):
+			chunk = content[offset : min(offset + TRANSFER_CHUNK, end + 1)]
+			if self.bandwidth:
+				await asyncio.sleep(len(chunk) / self.bandwidth)
+			await response.write(chunk)
+		await response.write_eof()
+		return response
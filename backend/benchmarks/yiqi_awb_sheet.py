@@ -0,0 +1,98 @@
+"""
+Benchmark de la planilla de guías aéreas que se sube a ImportExcel de Yiqi.
+
+Compara el armado anterior (lista de tuplas -> pandas.DataFrame -> to_excel)
+con el writer en streaming de core.helpers.spreadsheet (XLSX write-only y
+CSV). Mide tiempo y pico de memoria (tracemalloc) con guías sintéticas.
+
+Uso:
+	python -m benchmarks.yiqi_awb_sheet [--rows 1000 10000 50000]
+"""
+
+import argparse
+import asyncio
+import io
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+from core.helpers.spreadsheet import write_csv, write_xlsx
+from modules.yiqi_erp.domain.vo.air_waybill_sheet import (
+	AIR_WAYBILL_SHEET_KEYS,
+	AIR_WAYBILL_SHEET_TITLES,
+	AirWaybillSheet,
+)
+
+try:
+	import pandas as pd
+except ImportError:  # pandas ya no es necesario en el worker
+	pd = None
+
+
+async def air_waybills(count: int) -> AsyncIterator[SimpleNamespace]:
+	for i in range(count):
+		yield SimpleNamespace(
+			awb_code=f"{i % 1000:03d}-{i:08d}",
+			origin="Argentina",
+			destination="Estados Unidos",
+			kg=round(10 + i % 500 * 0.37, 2),
+		)
+
+
+async def pandas_sheet(count: int) -> bytes:
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+	rows = [AIR_WAYBILL_SHEET_KEYS]
+	async for air_waybill in air_waybills(count):
+		rows.append(sheet.row(air_waybill))
+	df = pd.DataFrame(rows, columns=list(AIR_WAYBILL_SHEET_TITLES))
+	buffer = io.BytesIO()
+	df.to_excel(buffer, index=False, engine="openpyxl")
+	return buffer.getvalue()
+
+
+async def streaming_xlsx(count: int) -> bytes:
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+	return await write_xlsx(sheet.rows(air_waybills(count)))
+
+
+async def streaming_csv(count: int) -> bytes:
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+	return await write_csv(sheet.rows(air_waybills(count)))
+
+
+async def measure(build, count: int) -> tuple[float, float, int]:
+	# tracemalloc frena mucho la ejecución: tiempo y memoria en pasadas separadas
+	start = time.perf_counter()
+	content = await build(count)
+	elapsed = time.perf_counter() - start
+
+	tracemalloc.start()
+	await build(count)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return elapsed, peak / 1024 / 1024, len(content)
+
+
+async def main(sizes: list[int]) -> None:
+	builders = [("xlsx stream", streaming_xlsx), ("csv stream", streaming_csv)]
+	if pd is not None:
+		builders.insert(0, ("pandas", pandas_sheet))
+	else:
+		print("pandas no está instalado, se omite la comparación")
+
+	for count in sizes:
+		print(f"{count} guías")
+		for name, build in builders:
+			elapsed, peak_mb, size = await measure(build, count)
+			print(
+				f"{name:>12}: {elapsed * 1000:8.1f} ms  pico {peak_mb:7.1f} MiB"
+				f"  archivo {size / 1024:8.1f} KiB"
+			)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+	args = parser.parse_args()
+	asyncio.run(main(args.rows))
@@ -0,0 +1,215 @@
+"""
+Carga de la emisión de facturas contra el Yiqi de reemplazo (benchmarks.yiqi_standin).
+
+A diferencia de `yiqi_invoice_emission`, la parte de Yiqi no es un stub:
+las tasks usan el `YiqiService` real con `YiqiApiRepository` y
+`YiqiHttpClient` (pool, semáforo por schema, reintentos, circuit breaker),
+y sólo el transporte HTTP se reemplaza. Base de datos y S3 siguen siendo
+stubs con latencia fija.
+
+Para cada nivel de concurrencia se emiten `--invoices` facturas con a lo sumo
+N tasks en vuelo y se informa throughput, latencias, errores y llamadas a
+Yiqi por endpoint.
+
+Uso:
+	python -m benchmarks.yiqi_emission_load [--concurrency 1 4 16] [--invoices 40]
+		[--task improved|original] [--yiqi-ms 200] [--error-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import statistics
+import time
+import warnings
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest.mock import patch
+
+from benchmarks.yiqi_invoice_emission import StubServices
+from benchmarks.yiqi_standin import STANDIN_URL, YiqiStandIn
+from modules.yiqi_erp.adapter.input.tasks import yiqi_erp, yiqi_erp_improved
+from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+from modules.yiqi_erp.application.service.yiqi import YiqiService
+
+TASKS = {
+	"improved": (
+		yiqi_erp_improved,
+		yiqi_erp_improved.create_invoice_from_purchase_invoice_improved_tasks,
+	),
+	"original": (yiqi_erp, yiqi_erp.create_invoice_from_purchase_invoice_tasks),
+}
+
+
+class LoadStubServices(StubServices):
+	"""Stubs de base de datos y S3; `yiqi_service` es el servicio real."""
+
+	def __init__(self, yiqi_service: YiqiService, db: float, s3: float, awbs: int):
+		super().__init__(db, s3, yiqi=0)
+		self.yiqi_service = yiqi_service
+		self.awbs = awbs
+
+	def get_service(self, name: str):
+		if name == "yiqi_service":
+			return self.yiqi_service
+		return self
+
+	async def get_one_by_id(self, purchase_invoice_id):
+		await asyncio.sleep(self.db)
+		# Cada task modifica su factura (fk_yiqi_invoice): una copia por id
+		return SimpleNamespace(
+			**{
+				**vars(self.invoice),
+				"id": purchase_invoice_id,
+				"number": f"0001-{purchase_invoice_id:08d}",
+			}
+		)
+
+	async def stream_file(self, file_id):
+		metadata = await self.get_metadata(file_id)
+
+		async def stream():
+			await asyncio.sleep(self.s3)
+			for _ in range(4):
+				yield b"%" * (metadata.size // 4)
+
+		return SimpleNamespace(stream=stream(), metadata=metadata)
+
+	# air_waybill_service (task original)
+	async def iter_air_waybills_by_purchase_invoice_id(self, purchase_invoice_id):
+		await asyncio.sleep(self.db)
+		for i in range(self.awbs):
+			yield SimpleNamespace(
+				awb_code=f"{purchase_invoice_id:05d}{i:06d}",
+				origin="Argentina",
+				destination="Uruguay",
+				kg=1.5,
+			)
+
+	async def link_yiqi_air_waybills(self, purchase_invoice_id, yiqi_ids_by_code):
+		await asyncio.sleep(self.db)
+		return list(yiqi_ids_by_code)
+
+
+@dataclass
+class LoadResult:
+	concurrency: int
+	elapsed: float
+	latencies: List[float]
+	failures: Counter
+	calls: Dict[str, int]
+
+	@property
+	def throughput(self) -> float:
+		return len(self.latencies) / self.elapsed
+
+	def percentile(self, q: float) -> float:
+		ordered = sorted(self.latencies)
+		return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+async def run_load(
+	task_name: str,
+	standin: YiqiStandIn,
+	concurrency: int,
+	invoices: int,
+	db: float = 0.005,
+	s3: float = 0.08,
+	awbs: int = 20,
+	max_concurrency_per_schema: int = 8,
+	first_id: int = 1,
+) -> LoadResult:
+	module, task = TASKS[task_name]
+	client = YiqiHttpClient(
+		base_url=STANDIN_URL,
+		api_key="standin",
+		retry_backoff=0.05,
+		max_concurrency_per_schema=max_concurrency_per_schema,
+		transport=standin.transport(),
+	)
+	services = LoadStubServices(YiqiService(YiqiApiRepository(client)), db, s3, awbs)
+	calls_before = Counter(standin.calls)
+	semaphore = asyncio.Semaphore(concurrency)
+	latencies: List[float] = []
+	failures: Counter = Counter()
+
+	async def emit(purchase_invoice_id: int) -> None:
+		async with semaphore:
+			start = time.perf_counter()
+			try:
+				await task(purchase_invoice_id, 316)
+			except Exception as e:
+				failures[type(e).__name__] += 1
+			latencies.append(time.perf_counter() - start)
+
+	try:
+		# La task original hace print() de las respuestas de Yiqi
+		with patch.object(module, "service_locator", services), redirect_stdout(
+			io.StringIO()
+		):
+			start = time.perf_counter()
+			await asyncio.gather(*[emit(first_id + i) for i in range(invoices)])
+			elapsed = time.perf_counter() - start
+	finally:
+		await client.close()
+
+	calls = dict(Counter(standin.calls) - calls_before)
+	return LoadResult(concurrency, elapsed, latencies, failures, calls)
+
+
+async def main(args: argparse.Namespace) -> None:
+	standin = YiqiStandIn(
+		default_latency=args.yiqi_ms / 1000,
+		jitter=args.jitter,
+		error_rates={
+			endpoint: args.error_rate for endpoint in ("save", "savefile", "getentityupdates2")
+		},
+	)
+	print(
+		f"task={args.task} facturas={args.invoices} yiqi={args.yiqi_ms}ms "
+		f"db={args.db_ms}ms s3={args.s3_ms}ms errores={args.error_rate:.0%}"
+	)
+	first_id = 1
+	for concurrency in args.concurrency:
+		result = await run_load(
+			args.task,
+			standin,
+			concurrency,
+			args.invoices,
+			db=args.db_ms / 1000,
+			s3=args.s3_ms / 1000,
+			awbs=args.awbs,
+			max_concurrency_per_schema=args.max_per_schema,
+			first_id=first_id,
+		)
+		first_id += args.invoices
+		failed = sum(result.failures.values())
+		print(
+			f"concurrencia {concurrency:>3}: {result.throughput:6.2f} facturas/s"
+			f"  mediana {statistics.median(result.latencies) * 1000:7.1f} ms"
+			f"  p95 {result.percentile(0.95) * 1000:7.1f} ms"
+			f"  fallidas {failed}/{args.invoices} {dict(result.failures) or ''}"
+		)
+		print(f"{'':>17}llamadas a Yiqi: {dict(sorted(result.calls.items()))}")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--task", choices=sorted(TASKS), default="improved")
+	parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+	parser.add_argument("--invoices", type=int, default=40)
+	parser.add_argument("--yiqi-ms", type=float, default=200)
+	parser.add_argument("--jitter", type=float, default=0.2)
+	parser.add_argument("--db-ms", type=float, default=5)
+	parser.add_argument("--s3-ms", type=float, default=80)
+	parser.add_argument("--error-rate", type=float, default=0.0)
+	parser.add_argument("--awbs", type=int, default=20, help="Guías por factura (task original)")
+	parser.add_argument("--max-per-schema", type=int, default=8)
+	logging.basicConfig(level=logging.ERROR)
+	warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+	asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,158 @@
+"""
+Benchmark de la emisión de facturas en Yiqi (create_invoice_from_purchase_invoice_improved_tasks).
+
+Compara el pipeline actual (pasos independientes en paralelo) con el orden
+secuencial anterior, usando servicios stub con latencias fijas de base de
+datos, S3 y Yiqi. No necesita Postgres, S3 ni Yiqi.
+
+Uso:
+	python -m benchmarks.yiqi_invoice_emission [--runs 20] [--yiqi-ms 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from modules.yiqi_erp.adapter.input.tasks import yiqi_erp_improved
+
+
+class StubServices:
+	def __init__(self, db: float, s3: float, yiqi: float):
+		self.db, self.s3, self.yiqi = db, s3, yiqi
+		self.invoice = SimpleNamespace(
+			id=1,
+			number="0001-00000001",
+			concept="Transporte aereo",
+			issue_date=date(2025, 1, 10),
+			receipt_date=date(2025, 1, 11),
+			service_month=date(2025, 1, 1),
+			unit_price=1500.5,
+			currency="USD",
+			air_waybill=None,
+			kilograms=120.0,
+			items=3,
+			fk_provider=1,
+			fk_service=2,
+			fk_receipt_file=uuid.uuid4(),
+			fk_detail_file=uuid.uuid4(),
+			fk_yiqi_invoice=None,
+		)
+
+	def get_service(self, name: str):
+		return self
+
+	# purchase_invoice_service
+	async def get_one_by_id(self, _):
+		await asyncio.sleep(self.db)
+		return self.invoice
+
+	async def save(self, entity):
+		await asyncio.sleep(self.db)
+		return entity
+
+	# provider_service / draft_invoice_servicetype_service
+	async def get_provider_by_id(self, _):
+		await asyncio.sleep(self.db)
+		return SimpleNamespace(id=1, id_yiqi_provider=10, name="Proveedor")
+
+	async def get_services_by_id(self, _):
+		await asyncio.sleep(self.db)
+		return SimpleNamespace(id=2, id_yiqi_service=20, name="Servicio")
+
+	# file_storage_service
+	async def get_metadata(self, file_id):
+		await asyncio.sleep(self.db)
+		return SimpleNamespace(id=file_id, size=1024, download_filename="factura.pdf")
+
+	async def download_file(self, file_id):
+		metadata = await self.get_metadata(file_id)
+		await asyncio.sleep(self.s3)
+		return SimpleNamespace(file=b"%" * 1024, metadata=metadata)
+
+	async def stream_file(self, file_id):
+		metadata = await self.get_metadata(file_id)
+
+		async def stream():
+			await asyncio.sleep(self.s3)
+			yield b"%" * metadata.size
+
+		return SimpleNamespace(stream=stream(), metadata=metadata)
+
+	# yiqi_service
+	async def get_currency_by_code(self, code, schema_id):
+		await asyncio.sleep(self.yiqi)
+		return {"id": 2, "MONE_NOMBRE": code}
+
+	async def upload_file(self, command, schema_id):
+		await asyncio.sleep(self.yiqi)
+		return {"ok": True}
+
+	async def upload_file_stream(self, filename, stream, size, schema_id):
+		async for _ in stream:
+			pass
+		await asyncio.sleep(self.yiqi)
+		return True
+
+	async def create_invoice(self, command, schema_id):
+		await asyncio.sleep(self.yiqi)
+		return {"newId": 99}
+
+
+async def sequential_pipeline(services: StubServices, schema_id: int) -> dict:
+	"""Orden de awaits de la versión anterior de la task (uno tras otro)."""
+	invoice = await services.get_one_by_id(1)
+	await services.get_provider_by_id(invoice.fk_provider)
+	await services.get_services_by_id(invoice.fk_service)
+	await services.get_currency_by_code(invoice.currency, schema_id)
+	for file_id in (invoice.fk_receipt_file, invoice.fk_detail_file):
+		await services.get_metadata(file_id)
+		await services.download_file(file_id)
+		await services.upload_file(None, schema_id)
+	response = await services.create_invoice(None, schema_id)
+	await services.save(invoice)
+	return response
+
+
+async def measure(pipeline, runs: int) -> list[float]:
+	samples = []
+	for _ in range(runs):
+		start = time.perf_counter()
+		await pipeline()
+		samples.append(time.perf_counter() - start)
+	return samples
+
+
+async def main(runs: int, db_ms: float, s3_ms: float, yiqi_ms: float) -> None:
+	services = StubServices(db_ms / 1000, s3_ms / 1000, yiqi_ms / 1000)
+
+	with patch.object(yiqi_erp_improved, "service_locator", services):
+		sequential = await measure(lambda: sequential_pipeline(services, 316), runs)
+		concurrent = await measure(
+			lambda: yiqi_erp_improved.create_invoice_from_purchase_invoice_improved_tasks(
+				1, 316
+			),
+			runs,
+		)
+
+	print(f"latencias stub: db={db_ms}ms s3={s3_ms}ms yiqi={yiqi_ms}ms, {runs} corridas")
+	for name, samples in (("secuencial", sequential), ("concurrente", concurrent)):
+		print(
+			f"{name:>12}: mediana {statistics.median(samples) * 1000:7.1f} ms"
+			f"  p95 {sorted(samples)[int(len(samples) * 0.95) - 1] * 1000:7.1f} ms"
+		)
+	print(f"     mejora: x{statistics.median(sequential) / statistics.median(concurrent):.2f}")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--runs", type=int, default=20)
+	parser.add_argument("--db-ms", type=float, default=5)
+	parser.add_argument("--s3-ms", type=float, default=80)
+	parser.add_argument("--yiqi-ms", type=float, default=200)
+	args = parser.parse_args()
+	asyncio.run(main(args.runs, args.db_ms, args.s3_ms, args.yiqi_ms))
@@ -0,0 +1,316 @@
+"""
+Yiqi de reemplazo para benchmarks de carga y pruebas de regresión.
+
+`YiqiStandIn` implementa, sobre `httpx.MockTransport`, los endpoints que usa
+`YiqiApiRepository`:
+
+- GetEntityUpdates2: reproduce las filas grabadas en `fixtures/yiqi/<ENTIDAD>.json`
+  aplicando los filtros de igualdad de `additionalFilters`.
+- api/public/CLIENTE y CONTACTO: la fila con ese `id`.
+- Save / SaveInstancePOST2: devuelven `{"ok": true, "newId": n}`.
+- SaveFile: consume el multipart completo (también el streaming).
+- uploadExcel / ImportExcel / GetProgress: la planilla subida se lee de verdad
+  (CSV o XLSX) y sus filas pasan a GUIAS_AEREAS, así la conciliación de guías
+  de la task de emisión encuentra lo que envió. El progreso avanza según
+  `progress_steps`.
+- GenerateExcelTemplate y la descarga de la plantilla.
+
+La latencia y los errores se configuran por endpoint (último segmento del
+path en minúsculas, igual que `DEFAULT_ENDPOINT_TIMEOUTS` del cliente):
+
+	standin = YiqiStandIn(
+		latency={"save": 0.3}, default_latency=0.05, error_rates={"savefile": 0.1}
+	)
+	client = YiqiHttpClient(base_url=STANDIN_URL, api_key="x", transport=standin.transport())
+
+Los fixtures se graban contra Yiqi real con:
+
+	python -m benchmarks.yiqi_standin record [--provider 123]
+"""
+
+import argparse
+import ast
+import asyncio
+import csv
+import io
+import itertools
+import json
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "yiqi"
+STANDIN_URL = "https://yiqi.standin"
+TEMPLATE_PATH = "/files/air_waybills_template.xlsx"
+
+
+def endpoint_of(url: httpx.URL) -> str:
+	return url.path.rstrip("/").rsplit("/", 1)[-1].lower()
+
+
+def load_fixtures(directory: Path = FIXTURES_DIR) -> Dict[str, List[dict]]:
+	return {
+		path.stem: json.loads(path.read_text(encoding="utf-8"))
+		for path in sorted(directory.glob("*.json"))
+	}
+
+
+def _matches(row: dict, filters: Iterable[dict]) -> bool:
+	# Sólo igualdad (operator 1), que es lo que usa el repositorio
+	return all(
+		str(row.get(item["columnName"])) == str(item["operating"])
+		for item in filters
+		if item.get("operator") == 1
+	)
+
+
+def _sheet_rows(filename: str, content: bytes) -> List[Tuple[Any, ...]]:
+	if filename.lower().endswith(".csv"):
+		return [tuple(row) for row in csv.reader(io.StringIO(content.decode("utf-8-sig")))]
+
+	from openpyxl import load_workbook
+
+	workbook = load_workbook(io.BytesIO(content), read_only=True)
+	try:
+		return [tuple(row) for row in workbook.active.iter_rows(values_only=True)]
+	finally:
+		workbook.close()
+
+
+@dataclass
+class YiqiStandIn:
+	fixtures: Dict[str, List[dict]] = field(default_factory=load_fixtures)
+	# Segundos de espera por endpoint; `jitter` es la fracción aleatoria (+/-)
+	latency: Dict[str, float] = field(default_factory=dict)
+	default_latency: float = 0.0
+	jitter: float = 0.0
+	# Probabilidad de responder `error_status` por endpoint
+	error_rates: Dict[str, float] = field(default_factory=dict)
+	error_status: int = 503
+	progress_steps: Tuple[str, ...] = ("50|OK", "100|OK")
+	seed: int | None = 0
+
+	def __post_init__(self):
+		self.fixtures = {name: list(rows) for name, rows in self.fixtures.items()}
+		self.calls: Counter = Counter()
+		self.errors: Counter = Counter()
+		self.uploaded_bytes = 0
+		self._random = random.Random(self.seed)
+		next_id = max(
+			(row.get("id") or 0 for rows in self.fixtures.values() for row in rows),
+			default=0,
+		)
+		self._ids = itertools.count(next_id + 1)
+		self._uploads: Dict[str, Tuple[str, bytes]] = {}
+		self._progress: Dict[str, List[str]] = {}
+
+	def transport(self) -> httpx.MockTransport:
+		return httpx.MockTransport(self.handle)
+
+	async def handle(self, request: httpx.Request) -> httpx.Response:
+		endpoint = endpoint_of(request.url)
+		self.calls[endpoint] += 1
+
+		delay = self.latency.get(endpoint, self.default_latency)
+		if delay:
+			await asyncio.sleep(delay * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+		# El cuerpo se consume siempre, como lo haría el servidor real
+		body = await request.aread()
+		if self._random.random() < self.error_rates.get(endpoint, 0.0):
+			self.errors[endpoint] += 1
+			return httpx.Response(self.error_status, text="stand-in injected error")
+
+		handler = getattr(self, f"_handle_{endpoint}", None)
+		if handler is None:
+			if request.url.path == TEMPLATE_PATH:
+				return await self._template()
+			return httpx.Response(404, text=f"stand-in: {request.url.path} not implemented")
+		return handler(request, body)
+
+	def _schema(self, request: httpx.Request) -> str:
+		return request.url.params.get("schemaId", "")
+
+	def _handle_getentityupdates2(self, request: httpx.Request, body: bytes):
+		params = request.url.params
+		filters = ast.literal_eval(params.get("additionalFilters") or "[]")
+		rows = [
+			row
+			for row in self.fixtures.get(params["entityName"], [])
+			if _matches(row, filters)
+		]
+		return httpx.Response(200, json=rows)
+
+	def _public(self, entity_name: str, request: httpx.Request):
+		id_instance = request.url.params.get("id")
+		for row in self.fixtures.get(entity_name, []):
+			if str(row.get("id")) == id_instance:
+				return httpx.Response(200, json=row)
+		return httpx.Response(404, text=f"{entity_name} {id_instance} not found")
+
+	def _handle_cliente(self, request: httpx.Request, body: bytes):
+		return self._public("CLIENTE", request)
+
+	def _handle_contacto(self, request: httpx.Request, body: bytes):
+		return self._public("CONTACTO", request)
+
+	def _handle_save(self, request: httpx.Request, body: bytes):
+		payload = json.loads(body)
+		form = {key: values[-1] for key, values in parse_qs(payload["form"]).items()}
+		new_id = next(self._ids)
+		self.fixtures.setdefault("FACTURA_COMPRA", []).append({"id": new_id, **form})
+		return httpx.Response(200, json={"ok": True, "newId": new_id})
+
+	def _handle_saveinstancepost2(self, request: httpx.Request, body: bytes):
+		payload = json.loads(body)
+		new_id = next(self._ids)
+		row = {"id": new_id, **json.loads(payload["json"])}
+		self.fixtures.setdefault(payload["entityName"], []).append(row)
+		return httpx.Response(200, json={"ok": True, "newId": new_id})
+
+	def _handle_savefile(self, request: httpx.Request, body: bytes):
+		self.uploaded_bytes += len(body)
+		return httpx.Response(200, json={"ok": True})
+
+	def _handle_uploadexcel(self, request: httpx.Request, body: bytes):
+		self.uploaded_bytes += len(body)
+		filename, content = _multipart_file(request.headers["content-type"], body)
+		file_path = f"/uploads/{uuid.uuid4().hex}_{filename}"
+		self._uploads[file_path] = (filename, content)
+		return httpx.Response(200, text=file_path)
+
+	def _handle_importexcel(self, request: httpx.Request, body: bytes):
+		upload = self._uploads.pop(request.url.params.get("filePath", ""), None)
+		if upload is None:
+			self._progress[self._schema(request)] = ["0|ERROR|file not found"]
+			return httpx.Response(200, text='"OK"')
+
+		rows = _sheet_rows(*upload)
+		# Fila 1: títulos, fila 2: claves técnicas, luego los datos
+		keys = rows[1] if len(rows) > 1 else ()
+		air_waybills = self.fixtures.setdefault("GUIAS_AEREAS", [])
+		for values in rows[2:]:
+			air_waybills.append({"id": next(self._ids), **dict(zip(keys, values))})
+		self._progress[self._schema(request)] = list(self.progress_steps)
+		return httpx.Response(200, text='"OK"')
+
+	def _handle_getprogress(self, request: httpx.Request, body: bytes):
+		steps = self._progress.get(self._schema(request)) or ["0|OK"]
+		step = steps.pop(0) if len(steps) > 1 else steps[0]
+		return httpx.Response(200, text=f'"{step}"')
+
+	def _handle_generateexceltemplate(self, request: httpx.Request, body: bytes):
+		return httpx.Response(200, text=f'"{TEMPLATE_PATH}"')
+
+	async def _template(self) -> httpx.Response:
+		from core.helpers.spreadsheet import write_xlsx
+		from modules.yiqi_erp.domain.vo.air_waybill_sheet import (
+			AIR_WAYBILL_SHEET_KEYS,
+			AIR_WAYBILL_SHEET_TITLES,
+		)
+
+		content = await write_xlsx([AIR_WAYBILL_SHEET_TITLES, AIR_WAYBILL_SHEET_KEYS])
+		return httpx.Response(200, content=content)
+
+
+def _multipart_file(content_type: str, body: bytes) -> Tuple[str, bytes]:
+	"""Primer archivo de un cuerpo multipart/form-data."""
+	from email.parser import BytesParser
+	from email.policy import HTTP
+
+	header = f"Content-Type: {content_type}\r\n\r\n".encode()
+	parsed = BytesParser(policy=HTTP).parsebytes(header + body)
+	for part in parsed.iter_parts():
+		if part.get_filename():
+			return part.get_filename(), part.get_payload(decode=True)
+	raise ValueError("multipart body without file")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+	"""
+	Transporte que reenvía a Yiqi real y guarda las respuestas de
+	GetEntityUpdates2 como fixtures (una lista por entidad, sin repetir ids).
+	"""
+
+	def __init__(
+		self,
+		directory: Path = FIXTURES_DIR,
+		transport: httpx.AsyncBaseTransport | None = None,
+	):
+		self.directory = directory
+		self.transport = transport or httpx.AsyncHTTPTransport()
+
+	async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+		response = await self.transport.handle_async_request(request)
+		if endpoint_of(request.url) != "getentityupdates2":
+			return response
+
+		content = await response.aread()
+		await response.aclose()
+		if response.status_code == 200:
+			self._save(request.url.params["entityName"], json.loads(content))
+		headers = [
+			(name, value)
+			for name, value in response.headers.items()
+			if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+		]
+		return httpx.Response(response.status_code, headers=headers, content=content)
+
+	def _save(self, entity_name: str, rows: List[dict]) -> None:
+		path = self.directory / f"{entity_name}.json"
+		recorded = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+		by_id = {row.get("id"): row for row in recorded}
+		by_id.update({row.get("id"): row for row in rows})
+		self.directory.mkdir(parents=True, exist_ok=True)
+		path.write_text(
+			json.dumps(list(by_id.values()), ensure_ascii=False, indent="\t", default=str),
+			encoding="utf-8",
+		)
+
+	async def aclose(self) -> None:
+		await self.transport.aclose()
+
+
+async def record(id_schema: int, id_provider: int | None) -> None:
+	from core.config.settings import env
+	from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+	from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+
+	client = YiqiHttpClient(
+		base_url=env.YIQI_BASE_URL,
+		api_key=env.YIQI_API_TOKEN,
+		api_timeout=env.YIQI_HTTP_TIMEOUT_SECONDS,
+		transport=RecordingTransport(),
+	)
+	repository = YiqiApiRepository(client)
+	try:
+		await repository.get_currency_list(id_schema)
+		await repository.get_country_list(id_schema)
+		await repository.get_services_list(id_schema)
+		await repository.get_providers_list(id_schema)
+		if id_provider is not None:
+			await repository.get_invoices_list_of_provider(id_provider, id_schema)
+	finally:
+		await client.close()
+	print(f"fixtures grabados en {FIXTURES_DIR}")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	subparsers = parser.add_subparsers(dest="command", required=True)
+	record_parser = subparsers.add_parser("record", help="Graba fixtures contra Yiqi real")
+	record_parser.add_argument("--schema", type=int, default=None)
+	record_parser.add_argument(
+		"--provider", type=int, default=None, help="Graba también sus FACTURA_COMPRA"
+	)
+	args = parser.parse_args()
+
+	from core.config.settings import env
+
+	asyncio.run(record(args.schema or env.YIQI_SCHEMA, args.provider))
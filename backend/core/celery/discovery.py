@@ -4,13 +4,37 @@ Sistema simplificado de auto-registro de tareas de celery usando service_locator
 Este módulo descubre automáticamente todas las tasks registradas en el service_locator
 y las registra en una única instancia de Celery.
 
-Soporta tasks asíncronas usando asyncio.
+Soporta tasks asíncronas ejecutándolas en el event loop persistente de cada
+proceso worker (core.celery.runtime).
 """
 
-import asyncio
 import inspect
 from celery import Celery
 from core.celery import celery_app
+from core.celery import telemetry  # noqa: F401 - conecta las señales de telemetría
+from core.celery.idempotency import DEFAULT_RESULT_TTL, make_idempotent
+from core.celery.routing import (
+	DEFAULT_PRIORITY,
+	TaskRoute,
+	apply_routing,
+	clear_routes,
+	register_task_route,
+)
+from core.celery.runtime import WorkerRuntime, worker_runtime
+
+
+def make_sync_wrapper(async_func, runtime: WorkerRuntime | None = None):
+	"""
+	Envuelve una task async para Celery: se ejecuta en el event loop
+	persistente del proceso worker, compartido entre tasks.
+	"""
+
+	def sync_wrapper(*args, **kwargs):
+		return (runtime or worker_runtime).run(async_func(*args, **kwargs))
+
+	sync_wrapper.__name__ = async_func.__name__
+	sync_wrapper.__doc__ = async_func.__doc__
+	return sync_wrapper
 
 
 def register_celery_tasks() -> int:
@@ -37,11 +61,28 @@ def register_celery_tasks() -> int:
 				"retry_backoff_max": 600,
 				"retry_jitter": True,
 				...
-			}
+			},
+			# Opcional: deduplicación por clave de idempotencia
+			"idempotency_key": lambda invoice_id, *a, **kw: f"invoice:{invoice_id}",
+			"idempotency_ttl": 3600,  # segundos que se reutiliza el resultado
+			# Opcional: ruteo (por defecto cola = nombre del módulo)
+			"queue": "yiqi_erp",
+			"priority": 3,  # 0-10, mayor = más prioritario
+			"rate_limit": "30/m",  # límite por worker
+			# Opcional: ejecución periódica con celery beat
+			"schedule": 900,  # segundos, timedelta o celery.schedules.crontab
 		},
 		...
 	}
 
+	Con `idempotency_key`, los envíos duplicados con la misma clave colapsan en
+	una sola ejecución en curso (lock en Redis) y los resultados exitosos se
+	reutilizan durante `idempotency_ttl` (ver core.celery.idempotency).
+
+	`queue` y `priority` alimentan la tabla de ruteo generada (ver
+	core.celery.routing); `rate_limit` se aplica como opción de la task.
+	Las tasks con `schedule` se agregan a `beat_schedule` (hexa celery-beat).
+
 	Returns:
 		int: Número de tasks registradas
 	"""
@@ -57,6 +98,8 @@ def register_celery_tasks() -> int:
 	print(f"\n📦 Discovered {len(task_services)} task services from service_locator")
 
 	# Registrar cada función como task de Celery
+	clear_routes()
+	beat_schedule = {}
 	registered_count = 0
 	for service_name, task_dict in task_services.items():
 		# Extraer nombre del módulo: "invoicing_tasks" -> "invoicing"
@@ -68,6 +111,8 @@ def register_celery_tasks() -> int:
 
 		for task_name, task_data in task_dict.items():
 			# Determinar si es formato simple o con configuración
+			idempotency_key = None
+			route_options = {}
 			if callable(task_data):
 				# Formato simple: solo la función
 				task_func = task_data
@@ -76,6 +121,8 @@ def register_celery_tasks() -> int:
 				# Formato con configuración
 				task_func = task_data["task"]
 				task_config = task_data.get("config", {})
+				idempotency_key = task_data.get("idempotency_key")
+				route_options = task_data
 			else:
 				print(f"  ⚠️  Skipping {module_name}.{task_name}: invalid format")
 				continue
@@ -86,72 +133,56 @@ def register_celery_tasks() -> int:
 
 			# Si la función es async, envolverla en un wrapper síncrono
 			if inspect.iscoroutinefunction(task_func):
-				original_func = task_func
-
-				def make_sync_wrapper(async_func):
-					def sync_wrapper(*args, **kwargs):
-						# Verificar si ya hay un event loop corriendo
-						try:
-							asyncio.get_running_loop()
-							# Si llegamos aquí, hay un loop corriendo, lo cual no debería pasar en Celery
-							raise RuntimeError(
-								"Cannot run async task, event loop already running"
-							)
-						except RuntimeError:
-							# No hay loop corriendo, esto es lo esperado en Celery worker
-							pass
-
-						# Intentar obtener el loop actual
-						try:
-							loop = asyncio.get_event_loop()
-							# Si el loop está cerrado o viene del fork, crear uno nuevo
-							if loop.is_closed():
-								loop = asyncio.new_event_loop()
-								asyncio.set_event_loop(loop)
-						except RuntimeError:
-							# No existe loop, crear uno nuevo
-							loop = asyncio.new_event_loop()
-							asyncio.set_event_loop(loop)
-
-						# Ejecutar la función async
-						try:
-							return loop.run_until_complete(async_func(*args, **kwargs))
-						finally:
-							# Limpiar tareas pendientes pero NO cerrar el loop
-							# Esto permite reusar el loop en la siguiente tarea del mismo worker
-							try:
-								pending = asyncio.all_tasks(loop)
-								if pending:
-									for task in pending:
-										task.cancel()
-									# Ejecutar un tick del loop para procesar cancelaciones
-									if pending:
-										loop.run_until_complete(asyncio.sleep(0))
-							except Exception:
-								pass
-
-					sync_wrapper.__name__ = async_func.__name__
-					sync_wrapper.__doc__ = async_func.__doc__
-					return sync_wrapper
-
-				task_func = make_sync_wrapper(original_func)
+				task_func = make_sync_wrapper(task_func)
 				is_async = True
 			else:
 				is_async = False
 
+			if idempotency_key:
+				task_func = make_idempotent(
+					task_func,
+					idempotency_key,
+					result_ttl=task_data.get("idempotency_ttl", DEFAULT_RESULT_TTL),
+				)
+
 			# Registrar con nombre descriptivo y configuración
 			full_task_name = f"{module_name}.{task_name}"
-			celery_app.task(name=full_task_name, **task_config)(task_func)
+			route = TaskRoute(
+				task_name=full_task_name,
+				queue=route_options.get("queue", module_name),
+				priority=route_options.get("priority", DEFAULT_PRIORITY),
+				rate_limit=route_options.get("rate_limit"),
+			)
+			register_task_route(route)
+			task_options = dict(task_config)
+			if route.rate_limit:
+				task_options["rate_limit"] = route.rate_limit
+			celery_app.task(name=full_task_name, **task_options)(task_func)
 			registered_count += 1
 
+			if route_options.get("schedule"):
+				beat_schedule[full_task_name] = {
+					"task": full_task_name,
+					"schedule": route_options["schedule"],
+					"options": {"queue": route.queue, "priority": route.priority},
+				}
+
 			# Mostrar configuración si existe
 			async_marker = " [async]" if is_async else ""
+			if idempotency_key:
+				async_marker += " [idempotent]"
+			if full_task_name in beat_schedule:
+				async_marker += " [scheduled]"
+			async_marker += f" -> {route.queue}:{route.priority}"
 			if task_config:
 				config_info = ", ".join([f"{k}={v}" for k, v in task_config.items()])
 				print(f"  ✓ Registered: {full_task_name}{async_marker} ({config_info})")
 			else:
 				print(f"  ✓ Registered: {full_task_name}{async_marker}")
 
+	apply_routing(celery_app)
+	celery_app.conf.beat_schedule = beat_schedule
+
 	print(f"\n✅ Total {registered_count} tasks registered in Celery worker\n")
 	return registered_count
 
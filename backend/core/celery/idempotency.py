@@ -0,0 +1,91 @@
+"""
+Deduplicación de tasks de Celery mediante claves de idempotencia.
+
+Una task registrada con `idempotency_key` calcula una clave a partir de sus
+argumentos antes de ejecutarse:
+
+- Si ya existe un resultado memorizado para esa clave (dentro del TTL), se
+  devuelve sin volver a ejecutar la task.
+- Si otra ejecución con la misma clave está en curso (lock en Redis), el
+  envío duplicado se descarta y devuelve un marcador `duplicate`.
+- Si no, se toma el lock, se ejecuta la task y el resultado se memoriza.
+
+Ante errores de la task el lock se libera y no se memoriza nada, de modo que
+los reintentos de Celery vuelven a ejecutarla normalmente. Si Redis no está
+disponible la task se ejecuta igualmente (fail-open).
+"""
+
+import functools
+import json
+import logging
+from typing import Any, Callable
+
+import redis
+from redis.exceptions import RedisError
+
+from core.db.redis_db import get_sync_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "celery:idempotency"
+DEFAULT_RESULT_TTL = 3600
+DEFAULT_LOCK_TTL = 900
+
+
+def make_idempotent(
+	task_func: Callable[..., Any],
+	key_func: Callable[..., str],
+	result_ttl: int = DEFAULT_RESULT_TTL,
+	lock_ttl: int = DEFAULT_LOCK_TTL,
+	client_factory: Callable[[], redis.Redis] = get_sync_redis_client,
+) -> Callable[..., Any]:
+	"""
+	Envuelve una task síncrona para que las ejecuciones con la misma clave
+	colapsen en una sola.
+
+	Args:
+		task_func: Función de la task (ya síncrona)
+		key_func: Recibe los mismos argumentos que la task y devuelve la clave
+		result_ttl: Segundos durante los que se reutiliza un resultado exitoso
+		lock_ttl: Segundos máximos que se mantiene el lock de una ejecución
+		client_factory: Proveedor del cliente Redis (inyectable en tests)
+	"""
+
+	@functools.wraps(task_func)
+	def idempotent_wrapper(*args, **kwargs):
+		key = f"{KEY_PREFIX}:{key_func(*args, **kwargs)}"
+
+		try:
+			client = client_factory()
+			memo = client.get(f"{key}:result")
+			if memo is not None:
+				logger.info(f"Idempotent task hit, reusing result for {key}")
+				return json.loads(memo)
+
+			lock = client.lock(f"{key}:lock", timeout=lock_ttl, blocking=False)
+			acquired = lock.acquire()
+		except RedisError:
+			logger.warning(f"Redis unavailable, running {key} without deduplication")
+			return task_func(*args, **kwargs)
+
+		if not acquired:
+			logger.info(f"Duplicate submission skipped, {key} already in flight")
+			return {"status": "duplicate", "idempotency_key": key}
+
+		try:
+			result = task_func(*args, **kwargs)
+			try:
+				client.set(
+					f"{key}:result", json.dumps(result, default=str), ex=result_ttl
+				)
+			except RedisError:
+				logger.warning(f"Could not memoize result for {key}")
+			return result
+		finally:
+			try:
+				lock.release()
+			except Exception:
+				# El lock pudo expirar si la task superó lock_ttl
+				pass
+
+	return idempotent_wrapper
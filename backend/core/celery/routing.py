@@ -0,0 +1,74 @@
+"""
+Tabla de ruteo de tasks de Celery generada desde el registro de tasks.
+
+Cada task registrada por `register_celery_tasks` declara (o hereda) una cola y
+una prioridad. Con esa información se construye:
+
+- `task_routes`: usado por `send_task`/`delay` en la API y en los workers
+  para publicar cada task en la cola de su módulo.
+- `task_queues`: las colas que consume un worker sin `--queues` (todas).
+
+Por defecto cada módulo tiene su propia cola (el nombre del módulo), de modo
+que una ráfaga de emisiones a Yiqi no retrasa las notificaciones. Las colas de
+módulo se declaran con `x-max-priority` para soportar prioridades en RabbitMQ;
+la cola por defecto `celery` se mantiene sin argumentos porque ya existe en
+el broker.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+from celery import Celery
+from kombu import Queue
+
+DEFAULT_QUEUE = "celery"
+MAX_PRIORITY = 10
+DEFAULT_PRIORITY = 5
+
+
+@dataclass(frozen=True)
+class TaskRoute:
+	task_name: str
+	queue: str
+	priority: int = DEFAULT_PRIORITY
+	rate_limit: str | None = None
+
+
+_routes: Dict[str, TaskRoute] = {}
+
+
+def register_task_route(route: TaskRoute) -> None:
+	if not 0 <= route.priority <= MAX_PRIORITY:
+		raise ValueError(
+			f"Priority for {route.task_name} must be between 0 and {MAX_PRIORITY}"
+		)
+	_routes[route.task_name] = route
+
+
+def get_routing_table() -> Dict[str, TaskRoute]:
+	return dict(_routes)
+
+
+def get_queue_names() -> List[str]:
+	"""Colas conocidas por el registro, más la cola por defecto."""
+	return sorted({route.queue for route in _routes.values()} | {DEFAULT_QUEUE})
+
+
+def clear_routes() -> None:
+	_routes.clear()
+
+
+def apply_routing(app: Celery) -> None:
+	"""Configura `task_routes` y `task_queues` de la app desde el registro."""
+	app.conf.task_routes = {
+		name: {"queue": route.queue, "priority": route.priority}
+		for name, route in _routes.items()
+	}
+	app.conf.task_queues = [
+		Queue(name)
+		if name == DEFAULT_QUEUE
+		else Queue(name, routing_key=name, queue_arguments={"x-max-priority": MAX_PRIORITY})
+		for name in get_queue_names()
+	]
+	app.conf.task_default_queue = DEFAULT_QUEUE
+	app.conf.task_default_priority = DEFAULT_PRIORITY
@@ -0,0 +1,182 @@
+"""
+Runtime asíncrono persistente para los procesos worker de Celery.
+
+Cada proceso worker mantiene un único event loop de larga duración que corre
+en un hilo dedicado. Las tasks async se envían a ese loop, de modo que los
+recursos ligados al loop (pool del engine de SQLAlchemy, clientes httpx,
+conexiones de Redis) se reutilizan entre tasks en lugar de recrearse o
+cancelarse en cada ejecución.
+
+Ciclo de vida:
+- worker_process_init: se descartan las conexiones heredadas del fork y se
+  arranca el loop del proceso hijo.
+- worker_process_shutdown / worker_shutdown: se ejecutan los hooks de cierre
+  (engines, Redis, clientes HTTP) dentro del loop y luego se detiene.
+
+Con pools sin fork (solo, threads) el loop se arranca de forma perezosa con
+la primera task. Con `--pool threads` varias tasks async comparten el mismo
+loop y se ejecutan concurrentemente, acotadas por
+`env.CELERY_ASYNC_MAX_CONCURRENCY` (0 = sin límite).
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List
+
+from celery.signals import (
+	worker_process_init,
+	worker_process_shutdown,
+	worker_shutdown,
+)
+
+from core.config.settings import env
+
+logger = logging.getLogger(__name__)
+
+ShutdownHook = Callable[[], Awaitable[Any]]
+
+
+class WorkerRuntime:
+	"""Event loop de larga duración por proceso worker."""
+
+	def __init__(self, max_concurrency: int = 0, shutdown_timeout: float = 30.0):
+		self.max_concurrency = max_concurrency
+		self.shutdown_timeout = shutdown_timeout
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._thread: threading.Thread | None = None
+		self._semaphore: asyncio.Semaphore | None = None
+		self._lock = threading.Lock()
+		self._shutdown_hooks: List[ShutdownHook] = []
+
+	@property
+	def is_running(self) -> bool:
+		return self._loop is not None and self._loop.is_running()
+
+	@property
+	def loop(self) -> asyncio.AbstractEventLoop:
+		"""Devuelve el loop del proceso, arrancándolo si todavía no existe."""
+		self.start()
+		assert self._loop is not None
+		return self._loop
+
+	def add_shutdown_hook(self, hook: ShutdownHook) -> None:
+		"""Registra una corrutina a ejecutar dentro del loop al cerrar el worker."""
+		if hook not in self._shutdown_hooks:
+			self._shutdown_hooks.append(hook)
+
+	def start(self) -> None:
+		with self._lock:
+			if self.is_running:
+				return
+
+			loop = asyncio.new_event_loop()
+			started = threading.Event()
+
+			def _run():
+				asyncio.set_event_loop(loop)
+				loop.call_soon(started.set)
+				loop.run_forever()
+
+			self._thread = threading.Thread(
+				target=_run, name="celery-async-runtime", daemon=True
+			)
+			self._thread.start()
+			started.wait()
+			self._loop = loop
+			if self.max_concurrency > 0:
+				self._semaphore = asyncio.Semaphore(self.max_concurrency)
+			logger.info("Async runtime started for worker process")
+
+	def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+		"""
+		Ejecuta la corrutina en el loop del proceso y bloquea hasta su resultado.
+
+		Es seguro llamarlo desde varios hilos a la vez (pool threads).
+		"""
+		future = asyncio.run_coroutine_threadsafe(self._guard(coro), self.loop)
+		return future.result()
+
+	async def _guard(self, coro: Coroutine[Any, Any, Any]) -> Any:
+		if self._semaphore is None:
+			return await coro
+		async with self._semaphore:
+			return await coro
+
+	def reset_after_fork(self) -> None:
+		"""Olvida el loop heredado del proceso padre (no es válido tras el fork)."""
+		self._loop = None
+		self._thread = None
+		self._semaphore = None
+		self._lock = threading.Lock()
+
+	def stop(self) -> None:
+		"""Ejecuta los hooks de cierre y detiene el loop. Es idempotente."""
+		with self._lock:
+			loop = self._loop
+			if loop is None or not loop.is_running():
+				return
+
+			future = asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), loop)
+			try:
+				future.result(timeout=self.shutdown_timeout)
+			except Exception:
+				logger.exception("Error while disposing worker async resources")
+
+			loop.call_soon_threadsafe(loop.stop)
+			if self._thread is not None:
+				self._thread.join(timeout=self.shutdown_timeout)
+			loop.close()
+			self._loop = None
+			self._thread = None
+			self._semaphore = None
+			logger.info("Async runtime stopped for worker process")
+
+	async def _run_shutdown_hooks(self) -> None:
+		for hook in reversed(self._shutdown_hooks):
+			try:
+				await hook()
+			except Exception:
+				logger.exception(f"Shutdown hook failed: {hook!r}")
+
+
+async def _dispose_db_engines() -> None:
+	from core.db.session import engines
+
+	for engine in engines.values():
+		await engine.dispose()
+
+
+async def _close_redis_clients() -> None:
+	from core.db.redis_db import RedisClient
+
+	await RedisClient.session.aclose()
+	await RedisClient.permission.aclose()
+	await RedisClient.cache.aclose()
+
+
+worker_runtime = WorkerRuntime(max_concurrency=env.CELERY_ASYNC_MAX_CONCURRENCY)
+worker_runtime.add_shutdown_hook(_close_redis_clients)
+worker_runtime.add_shutdown_hook(_dispose_db_engines)
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+	from core.db.session import engines
+
+	# Las conexiones del pool creadas en el padre no se pueden compartir tras el fork
+	for engine in engines.values():
+		engine.sync_engine.dispose(close=False)
+
+	worker_runtime.reset_after_fork()
+	worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs):
+	worker_runtime.stop()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs):
+	worker_runtime.stop()
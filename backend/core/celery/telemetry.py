@@ -0,0 +1,242 @@
+"""
+Telemetría de tasks de Celery conectada a las señales de Celery.
+
+Por task (nombre completo) se registra:
+- Latencia de cola: desde que se publica (o desde su ETA/countdown) hasta que
+  un worker la empieza.
+- Duración de la ejecución.
+- Tamaño del resultado que se guarda en el result backend.
+- Contadores de ejecuciones, éxitos, reintentos y fallos.
+
+Las métricas se agregan en Redis como histogramas de buckets fijos para que
+la API y todos los workers compartan los mismos datos. Se exponen en
+`/system/metrics` (formato Prometheus) y se resumen con `hexa tasks-stats`.
+
+La telemetría nunca hace fallar una task: los errores de Redis se ignoran.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from celery.signals import (
+	before_task_publish,
+	task_failure,
+	task_postrun,
+	task_prerun,
+	task_retry,
+)
+from redis.exceptions import RedisError
+
+from core.db.redis_db import get_sync_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "celery:metrics"
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+# Buckets (límite superior) de cada histograma
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS: Dict[str, Tuple[float, ...]] = {
+	"queue_latency_seconds": SECONDS_BUCKETS,
+	"run_duration_seconds": SECONDS_BUCKETS,
+	"result_size_bytes": BYTES_BUCKETS,
+}
+COUNTERS = ("started", "succeeded", "failed", "retried")
+
+_started_at: Dict[str, float] = {}
+
+
+def _histogram_key(metric: str, task_name: str) -> str:
+	return f"{KEY_PREFIX}:{metric}:{task_name}"
+
+
+def _counters_key(task_name: str) -> str:
+	return f"{KEY_PREFIX}:counters:{task_name}"
+
+
+def _bucket_for(value: float, buckets: Tuple[float, ...]) -> str:
+	for bound in buckets:
+		if value <= bound:
+			return str(bound)
+	return "+Inf"
+
+
+def _record(
+	task_name: str,
+	counters: List[str] | None = None,
+	observations: Dict[str, float] | None = None,
+) -> None:
+	try:
+		pipe = get_sync_redis_client().pipeline(transaction=False)
+		pipe.sadd(f"{KEY_PREFIX}:tasks", task_name)
+		for counter in counters or []:
+			pipe.hincrby(_counters_key(task_name), counter, 1)
+		for metric, value in (observations or {}).items():
+			key = _histogram_key(metric, task_name)
+			pipe.hincrby(key, _bucket_for(value, HISTOGRAMS[metric]), 1)
+			pipe.hincrby(key, "count", 1)
+			pipe.hincrbyfloat(key, "sum", value)
+		pipe.execute()
+	except RedisError:
+		logger.debug(f"Could not record telemetry for {task_name}")
+
+
+def _timestamp(value: Any) -> float | None:
+	if value is None:
+		return None
+	if isinstance(value, (int, float)):
+		return float(value)
+	if isinstance(value, datetime):
+		return value.timestamp()
+	try:
+		return datetime.fromisoformat(str(value)).timestamp()
+	except ValueError:
+		return None
+
+
+# ============================================================================
+# SIGNAL HANDLERS
+# ============================================================================
+
+
+@before_task_publish.connect
+def _on_before_publish(headers=None, **kwargs):
+	if headers is not None:
+		headers[ENQUEUED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def _on_prerun(task_id=None, task=None, **kwargs):
+	now = time.time()
+	_started_at[task_id] = now
+
+	observations = {}
+	enqueued_at = _timestamp(getattr(task.request, ENQUEUED_AT_HEADER, None))
+	if enqueued_at is not None:
+		# Con countdown/eta la espera empieza cuando la task queda disponible
+		ready_at = max(enqueued_at, _timestamp(task.request.eta) or 0)
+		observations["queue_latency_seconds"] = max(now - ready_at, 0.0)
+
+	_record(task.name, ["started"], observations)
+
+
+@task_postrun.connect
+def _on_postrun(task_id=None, task=None, retval=None, state=None, **kwargs):
+	started_at = _started_at.pop(task_id, None)
+	observations = {}
+	if started_at is not None:
+		observations["run_duration_seconds"] = time.time() - started_at
+
+	counters = []
+	if state == "SUCCESS":
+		counters.append("succeeded")
+		try:
+			payload = json.dumps(retval, default=str).encode()
+			observations["result_size_bytes"] = len(payload)
+		except (TypeError, ValueError):
+			pass
+
+	_record(task.name, counters, observations)
+
+
+@task_retry.connect
+def _on_retry(sender=None, **kwargs):
+	_record(sender.name, ["retried"])
+
+
+@task_failure.connect
+def _on_failure(sender=None, **kwargs):
+	_record(sender.name, ["failed"])
+
+
+# ============================================================================
+# LECTURA / EXPORT
+# ============================================================================
+
+
+def _read_histogram(raw: Dict[str, str], buckets: Tuple[float, ...]) -> Dict[str, Any]:
+	"""Convierte el hash de Redis en buckets acumulados (estilo Prometheus)."""
+	cumulative = []
+	total = 0
+	for bound in [str(b) for b in buckets] + ["+Inf"]:
+		total += int(raw.get(bound, 0))
+		cumulative.append((bound, total))
+	return {
+		"buckets": cumulative,
+		"count": int(raw.get("count", 0)),
+		"sum": float(raw.get("sum", 0.0)),
+	}
+
+
+def quantile(histogram: Dict[str, Any], q: float) -> float | None:
+	"""Estima un percentil como el límite superior del bucket que lo contiene."""
+	count = histogram["count"]
+	if not count:
+		return None
+	target = q * count
+	for bound, cumulative in histogram["buckets"]:
+		if cumulative >= target:
+			return float("inf") if bound == "+Inf" else float(bound)
+	return None
+
+
+def collect_task_stats() -> Dict[str, Dict[str, Any]]:
+	"""
+	Lee las métricas agregadas de todas las tasks desde Redis.
+
+	Sin Redis devuelve {}: el resto de `/system/metrics` se sigue exponiendo.
+	"""
+	client = get_sync_redis_client()
+	stats: Dict[str, Dict[str, Any]] = {}
+	try:
+		for task_name in sorted(client.smembers(f"{KEY_PREFIX}:tasks")):
+			raw_counters = client.hgetall(_counters_key(task_name))
+			entry: Dict[str, Any] = {
+				"counters": {name: int(raw_counters.get(name, 0)) for name in COUNTERS}
+			}
+			for metric, buckets in HISTOGRAMS.items():
+				raw = client.hgetall(_histogram_key(metric, task_name))
+				entry[metric] = _read_histogram(raw, buckets)
+			stats[task_name] = entry
+	except RedisError as e:
+		logger.warning(f"Could not read task telemetry from Redis: {e}")
+		return {}
+	return stats
+
+
+def reset_task_stats() -> None:
+	client = get_sync_redis_client()
+	keys = list(client.scan_iter(f"{KEY_PREFIX}:*"))
+	if keys:
+		client.delete(*keys)
+
+
+def render_prometheus(stats: Dict[str, Dict[str, Any]]) -> str:
+	"""Serializa las métricas en formato de exposición de Prometheus."""
+	lines: List[str] = []
+
+	lines.append("# TYPE celery_task_events_total counter")
+	for task_name, entry in stats.items():
+		for event, value in entry["counters"].items():
+			lines.append(
+				f'celery_task_events_total{{task="{task_name}",event="{event}"}} {value}'
+			)
+
+	for metric in HISTOGRAMS:
+		name = f"celery_task_{metric}"
+		lines.append(f"# TYPE {name} histogram")
+		for task_name, entry in stats.items():
+			histogram = entry[metric]
+			for bound, cumulative in histogram["buckets"]:
+				lines.append(
+					f'{name}_bucket{{task="{task_name}",le="{bound}"}} {cumulative}'
+				)
+			lines.append(f'{name}_sum{{task="{task_name}"}} {histogram["sum"]}')
+			lines.append(f'{name}_count{{task="{task_name}"}} {histogram["count"]}')
+
+	return "\n".join(lines) + "\n"
@@ -1,8 +1,9 @@
-from .session import session, session_factory
+from .session import session, session_factory, session_scope
 from .transactional import Transactional
 
 __all__ = [
 	"session",
 	"Transactional",
 	"session_factory",
+	"session_scope",
 ]
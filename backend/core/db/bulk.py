@@ -0,0 +1,116 @@
+"""
+Upsert masivo para PostgreSQL.
+
+`bulk_upsert` escribe muchas filas con `INSERT ... ON CONFLICT DO UPDATE` en
+lotes (executemany con RETURNING), en lugar de un SELECT + add por fila.
+
+- Sólo se actualizan las filas cuyo contenido cambió (`IS DISTINCT FROM`), de
+  modo que las filas idénticas no generan escrituras ni versiones nuevas.
+- `xmax = 0` en el RETURNING distingue filas insertadas de actualizadas; las
+  que no vuelven en el RETURNING quedaron sin cambios.
+- Las filas repetidas por clave dentro de la entrada se deduplican (gana la
+  última): Postgres no permite afectar dos veces la misma fila en un INSERT.
+
+Requiere una restricción única sobre `index_elements`.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Type
+
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass
+class UpsertResult:
+	created: int = 0
+	updated: int = 0
+	unchanged: int = 0
+
+	@property
+	def total(self) -> int:
+		return self.created + self.updated + self.unchanged
+
+	def __add__(self, other: "UpsertResult") -> "UpsertResult":
+		return UpsertResult(
+			self.created + other.created,
+			self.updated + other.updated,
+			self.unchanged + other.unchanged,
+		)
+
+
+def _dedupe(
+	rows: Iterable[Dict[str, Any]], index_elements: Sequence[str]
+) -> List[Dict[str, Any]]:
+	unique: Dict[tuple, Dict[str, Any]] = {}
+	for row in rows:
+		unique[tuple(row[key] for key in index_elements)] = row
+	return list(unique.values())
+
+
+async def bulk_upsert(
+	session: AsyncSession,
+	model: Type[SQLModel],
+	rows: Iterable[Dict[str, Any]],
+	index_elements: Sequence[str],
+	update_columns: Sequence[str] | None = None,
+	chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> UpsertResult:
+	"""
+	Inserta o actualiza `rows` en la tabla de `model`.
+
+	Args:
+		session: Sesión donde se ejecuta (no hace commit)
+		model: Entidad SQLModel destino
+		rows: Diccionarios columna -> valor, todos con las mismas claves
+		index_elements: Columnas de la restricción única usada como conflicto
+		update_columns: Columnas a actualizar si la fila existe. Por defecto
+			todas las de `rows` salvo las de `index_elements`
+		chunk_size: Filas por lote
+
+	Returns:
+		UpsertResult con filas creadas, actualizadas y sin cambios
+	"""
+	rows = _dedupe(rows, index_elements)
+	result = UpsertResult()
+	if not rows:
+		return result
+
+	table = model.__table__
+	if update_columns is None:
+		update_columns = [key for key in rows[0] if key not in index_elements]
+
+	stmt = insert(table)
+	if update_columns:
+		set_ = {column: stmt.excluded[column] for column in update_columns}
+		if "updated_at" in table.c:
+			# onupdate no se aplica en ON CONFLICT DO UPDATE
+			set_["updated_at"] = func.now()
+
+		stmt = stmt.on_conflict_do_update(
+			index_elements=list(index_elements),
+			set_=set_,
+			where=or_(
+				*[
+					table.c[column].is_distinct_from(stmt.excluded[column])
+					for column in update_columns
+				]
+			),
+		)
+	else:
+		stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+	stmt = stmt.returning(literal_column("xmax = 0").label("inserted"))
+
+	for start in range(0, len(rows), chunk_size):
+		chunk = rows[start : start + chunk_size]
+		returned = (await session.execute(stmt, chunk)).scalars().all()
+		created = sum(1 for inserted in returned if inserted)
+		result.created += created
+		result.updated += len(returned) - created
+		result.unchanged += len(chunk) - len(returned)
+
+	return result
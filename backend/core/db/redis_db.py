@@ -1,3 +1,4 @@
+import redis as sync_redis
 import redis.asyncio as redis
 from core.config.settings import env
 
@@ -13,3 +14,23 @@ class RedisClient:
 	permission = redis.Redis.from_url(
 		f"{env.REDIS_URL}?password={env.REDIS_PASSWORD}", decode_responses=True
 	)
+	cache = redis.Redis.from_url(
+		f"{env.REDIS_URL}?password={env.REDIS_PASSWORD}", decode_responses=True
+	)
+
+
+_sync_client: sync_redis.Redis | None = None
+
+
+def get_sync_redis_client() -> sync_redis.Redis:
+	"""
+	Cliente Redis síncrono compartido por proceso.
+
+	Para código que corre fuera del event loop (wrappers y señales de Celery).
+	"""
+	global _sync_client
+	if _sync_client is None:
+		_sync_client = sync_redis.Redis.from_url(
+			f"{env.REDIS_URL}?password={env.REDIS_PASSWORD}", decode_responses=True
+		)
+	return _sync_client
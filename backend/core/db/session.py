@@ -1,3 +1,4 @@
+import uuid
 from contextlib import asynccontextmanager
 from contextvars import ContextVar, Token
 from enum import Enum
@@ -88,3 +89,19 @@ async def session_factory() -> AsyncGenerator[AsyncSession, None]:
 		yield _session
 	finally:
 		await _session.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[None, None]:
+	"""
+	Usa una sesión propia del scoped `session` dentro del bloque.
+
+	Una AsyncSession no admite operaciones concurrentes: cada rama que se
+	ejecuta en paralelo (asyncio.gather) debe abrir su propio scope.
+	"""
+	context = set_session_context(str(uuid.uuid4()))
+	try:
+		yield
+	finally:
+		await session.remove()
+		reset_session_context(context)
@@ -0,0 +1,179 @@
+"""
+Control de tormentas de notificaciones de errores no manejados.
+
+Sin control, cada 500 publica una task en RabbitMQ y un POST a Slack, justo
+cuando el sistema está más cargado. `ErrorNotifier` decide si un error se
+notifica:
+
+- Fingerprint por tipo de excepción y ubicación (último frame del traceback).
+- Conteo por fingerprint en una ventana deslizante, en memoria y en Redis
+  (compartido entre procesos de la API).
+- Un solo digest por fingerprint por intervalo, con la cantidad de
+  ocurrencias de la ventana.
+- Tope duro de notificaciones publicadas por minuto.
+
+Si Redis no está disponible o no responde en `redis_timeout` segundos se usa
+sólo el estado en memoria del proceso: el 500 no espera a Redis. Si falla
+cuando el digest ya pudo quedar tomado en Redis, no se notifica: otro proceso
+puede estar enviándolo.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import traceback
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Tuple
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "errors"
+
+
+@dataclass
+class ErrorDigest:
+	fingerprint: str
+	exception_type: str
+	location: str
+	count: int
+	should_notify: bool
+
+
+@dataclass
+class ErrorNotifier:
+	window_seconds: int = 300
+	interval_seconds: int = 300
+	max_per_minute: int = 10
+	redis_client: Any | None = None
+	redis_timeout: float = 0.25
+
+	_occurrences: Dict[str, Deque[float]] = field(default_factory=dict, init=False)
+	_last_sent: Dict[str, float] = field(default_factory=dict, init=False)
+	_minute: Tuple[int, int] = field(default=(0, 0), init=False)
+
+	@staticmethod
+	def fingerprint(exc: BaseException) -> Tuple[str, str, str]:
+		"""Devuelve (fingerprint, tipo, ubicación) de la excepción."""
+		exception_type = f"{type(exc).__module__}.{type(exc).__qualname__}"
+		frames = traceback.extract_tb(exc.__traceback__)
+		if frames:
+			frame = frames[-1]
+			location = f"{frame.filename}:{frame.lineno} in {frame.name}"
+		else:
+			location = "unknown"
+		digest = hashlib.sha1(f"{exception_type}|{location}".encode()).hexdigest()
+		return digest[:16], exception_type, location
+
+	async def register(self, exc: BaseException) -> ErrorDigest:
+		"""Registra la ocurrencia y decide si corresponde enviar el digest."""
+		fingerprint, exception_type, location = self.fingerprint(exc)
+		now = time.time()
+		count = self._count_local(fingerprint, now)
+
+		started = time.monotonic()
+		try:
+			if self.redis_client is None:
+				raise RedisError("Redis client not configured")
+			count = await asyncio.wait_for(
+				self._count_redis(fingerprint, now), self.redis_timeout
+			)
+		except (RedisError, asyncio.TimeoutError):
+			# Redis no llegó a tomar el digest: decide el estado en memoria
+			should_notify = self._claim_digest_local(fingerprint, now)
+			if should_notify and not self._within_cap_local(now):
+				self._release_digest_local(fingerprint)
+				should_notify = False
+		else:
+			remaining = self.redis_timeout - (time.monotonic() - started)
+			try:
+				should_notify = await asyncio.wait_for(
+					self._notify_redis(fingerprint, now), max(remaining, 0)
+				)
+			except (RedisError, asyncio.TimeoutError):
+				# El digest pudo quedar tomado en Redis aunque no haya respuesta:
+				# notificar además desde acá duplicaría el aviso de otro proceso
+				should_notify = False
+
+		if not should_notify:
+			logger.info(f"Error notification suppressed for {fingerprint} ({count})")
+
+		return ErrorDigest(fingerprint, exception_type, location, count, should_notify)
+
+	# ------------------------------------------------------------------
+	# Estado en memoria del proceso
+	# ------------------------------------------------------------------
+
+	def _count_local(self, fingerprint: str, now: float) -> int:
+		occurrences = self._occurrences.setdefault(fingerprint, deque())
+		occurrences.append(now)
+		while occurrences and occurrences[0] <= now - self.window_seconds:
+			occurrences.popleft()
+		return len(occurrences)
+
+	def _claim_digest_local(self, fingerprint: str, now: float) -> bool:
+		last_sent = self._last_sent.get(fingerprint)
+		if last_sent is not None and now - last_sent < self.interval_seconds:
+			return False
+		self._last_sent[fingerprint] = now
+		return True
+
+	def _release_digest_local(self, fingerprint: str) -> None:
+		self._last_sent.pop(fingerprint, None)
+
+	def _within_cap_local(self, now: float) -> bool:
+		minute, published = self._minute
+		current = int(now // 60)
+		if minute != current:
+			minute, published = current, 0
+		if published >= self.max_per_minute:
+			return False
+		self._minute = (minute, published + 1)
+		return True
+
+	# ------------------------------------------------------------------
+	# Estado compartido en Redis
+	# ------------------------------------------------------------------
+
+	async def _notify_redis(self, fingerprint: str, now: float) -> bool:
+		should_notify = await self._claim_digest_redis(fingerprint)
+		if should_notify and not await self._within_cap_redis(now):
+			# Con el tope alcanzado no se envía nada: se libera el digest para
+			# que el próximo error del mismo fingerprint pueda notificarse
+			await self._release_digest_redis(fingerprint)
+			should_notify = False
+		return should_notify
+
+	async def _count_redis(self, fingerprint: str, now: float) -> int:
+		key = f"{KEY_PREFIX}:window:{fingerprint}"
+		pipe = self.redis_client.pipeline(transaction=False)
+		pipe.zadd(key, {uuid.uuid4().hex: now})
+		pipe.zremrangebyscore(key, "-inf", now - self.window_seconds)
+		pipe.zcard(key)
+		pipe.expire(key, self.window_seconds)
+		_, _, count, _ = await pipe.execute()
+		return int(count)
+
+	async def _claim_digest_redis(self, fingerprint: str) -> bool:
+		claimed = await self.redis_client.set(
+			f"{KEY_PREFIX}:digest:{fingerprint}",
+			1,
+			nx=True,
+			ex=self.interval_seconds,
+		)
+		return bool(claimed)
+
+	async def _release_digest_redis(self, fingerprint: str) -> None:
+		await self.redis_client.delete(f"{KEY_PREFIX}:digest:{fingerprint}")
+
+	async def _within_cap_redis(self, now: float) -> bool:
+		key = f"{KEY_PREFIX}:published:{int(now // 60)}"
+		pipe = self.redis_client.pipeline(transaction=False)
+		pipe.incr(key)
+		pipe.expire(key, 120)
+		published, _ = await pipe.execute()
+		return int(published) <= self.max_per_minute
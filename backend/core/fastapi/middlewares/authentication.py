@@ -80,10 +80,10 @@ class AuthBackend(AuthenticationBackend):
 				algorithms=[env.JWT_ALGORITHM],
 			)
 			user_uuid = payload["id"]
-			session = await self.user_service.get_user_session(user_uuid)
+			permissions = await self.user_service.get_user_permissions(user_uuid)
 			user = CurrentUser(**payload)
-			if session:
-				user.permissions = session.permissions
+			if permissions is not None:
+				user.permissions = permissions
 			scopes = user.permissions
 
 		except jwt.ExpiredSignatureError:
@@ -1,18 +1,22 @@
+import asyncio
 import json
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.routing import APIRoute
 from rich import print
 
 from core.audit.listeners import setup_audit_listeners
 from core.audit.middleware import AuditMiddleware
 from core.config.settings import env
+from core.db.redis_db import RedisClient
 from core.exceptions.base import CustomException
+from core.fastapi.error_notifier import ErrorNotifier
 from core.fastapi.dependencies.logging import Logging
 from core.fastapi.dependencies.permission import system_permission
 from core.fastapi.middlewares import (
@@ -23,6 +27,8 @@ from core.fastapi.middlewares import (
 from shared.interfaces.module_registry import ModuleRegistry
 from shared.interfaces.service_locator import service_locator
 
+logger = logging.getLogger(__name__)
+
 
 def custom_generate_unique_id(route: APIRoute):
 	return f"{route.tags[0]}-{route.name}"
@@ -42,6 +48,16 @@ def generate_openapi_for_frontend(app_: FastAPI):
 		return openapi_content
 
 
+def init_metrics(app_: FastAPI):
+	@app_.get("/system/metrics", tags=["System"], response_class=PlainTextResponse)
+	def get_metrics():
+		"""Métricas de tasks de Celery y circuit breakers en formato Prometheus"""
+		from core.celery.telemetry import collect_task_stats, render_prometheus
+		from core.helpers import circuit_breaker
+
+		return render_prometheus(collect_task_stats()) + circuit_breaker.render_prometheus()
+
+
 def init_routes_pack(app_: FastAPI):
 	for route in ModuleRegistry().get_routes():
 		app_.include_router(route)
@@ -109,6 +125,15 @@ def make_middleware() -> list[Middleware]:
 	return middleware
 
 
+error_notifier = ErrorNotifier(
+	window_seconds=env.ERROR_NOTIFY_WINDOW_SECONDS,
+	interval_seconds=env.ERROR_NOTIFY_INTERVAL_SECONDS,
+	max_per_minute=env.ERROR_NOTIFY_MAX_PER_MINUTE,
+	redis_client=RedisClient.cache,
+	redis_timeout=env.ERROR_NOTIFY_REDIS_TIMEOUT_SECONDS,
+)
+
+
 def init_listeners(app_: FastAPI) -> None:
 	# Exception handler
 	@app_.exception_handler(CustomException)
@@ -121,18 +146,29 @@ def init_listeners(app_: FastAPI) -> None:
 	# General Exception handler
 	@app_.exception_handler(Exception)
 	async def general_exception_handler(request: Request, exc: Exception):
-		task_service = service_locator.get_service("celery_app")
-
-		notificacion = {
-			"sender": "slack",
-			"notification": {"body": f"Este es un error | {exc}"},
-		}
+		# Un digest por fingerprint por intervalo y tope de publicaciones por minuto
+		digest = await error_notifier.register(exc)
+		if digest.should_notify:
+			task_service = service_locator.get_service("celery_app")
+
+			window_minutes = error_notifier.window_seconds // 60
+			notificacion = {
+				"sender": "slack",
+				"notification": {
+					"body": (
+						f"Este es un error | {exc}\n"
+						f"{digest.exception_type} en {digest.location}\n"
+						f"Ocurrencias en los últimos {window_minutes} min: {digest.count} "
+						f"(fingerprint {digest.fingerprint})"
+					)
+				},
+			}
 
-		task_service.send_task(
-			"notification.send_notification_tasks",
-			args=[notificacion],
-			# countdown=30,
-		)
+			task_service.send_task(
+				"notification.send_notification_tasks",
+				args=[notificacion],
+				# countdown=30,
+			)
 
 		return JSONResponse(
 			status_code=500,
@@ -154,14 +190,59 @@ def export_openapi(app_: FastAPI):
 		json.dump(schema, f, indent=2)
 
 
+async def _run_warmup(name: str, warmup) -> None:
+	try:
+		await warmup()
+		logger.info(f"Warm-up {name} completed")
+	except Exception:
+		logger.exception(f"Warm-up {name} failed")
+
+
+def start_warmups() -> list[asyncio.Task]:
+	"""
+	Lanza en segundo plano los warm-ups registrados por los módulos.
+
+	Un módulo registra en service_locator una corrutina sin argumentos con
+	nombre terminado en "_warmup" (ej: "yiqi_erp_warmup"). No bloquean el
+	arranque y sus errores sólo se registran.
+	"""
+	return [
+		asyncio.create_task(_run_warmup(name, warmup))
+		for name, warmup in service_locator._services.items()
+		if name.endswith("_warmup") and callable(warmup)
+	]
+
+
+async def run_shutdowns() -> None:
+	"""
+	Ejecuta los cierres registrados por los módulos al apagar la API.
+
+	Igual que los warm-ups: una corrutina sin argumentos registrada en
+	service_locator con nombre terminado en "_shutdown". Sus errores sólo se
+	registran para no impedir el cierre de los demás módulos.
+	"""
+	for name, shutdown in service_locator._services.items():
+		if not (name.endswith("_shutdown") and callable(shutdown)):
+			continue
+		try:
+			await shutdown()
+		except Exception:
+			logger.exception(f"Shutdown {name} failed")
+
+
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
 	# 🚀 Startup
 	# Los módulos ya fueron descubiertos en create_app()
 	# await sync_permissions_to_db()
 	# await sync_modules_to_db()
+	warmups = start_warmups()
 	yield  # 👉 La app corre a partir de aquí
 
+	for task in warmups:
+		task.cancel()
+	await run_shutdowns()
+
 	# 🔚 Shutdown (opcional)
 	print("🧹 Limpieza al cerrar FastAPI")
 
@@ -237,6 +318,7 @@ def create_app() -> FastAPI:
 	init_listeners(app_=app_)
 	export_openapi(app_=app_)
 	generate_openapi_for_frontend(app_=app_)
+	init_metrics(app_=app_)
 	app_.include_router(system_permission)
 	# app_.include_router(system_modules)
 	return app_
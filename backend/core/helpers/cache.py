@@ -0,0 +1,146 @@
+"""
+Cache en dos niveles (memoria del proceso + Redis) con stale-while-revalidate.
+
+Pensado para datos de referencia que cambian poco y vienen de un servicio
+externo lento o no siempre disponible:
+
+- fresco (edad < ttl): se devuelve sin más.
+- stale (edad < ttl + stale_ttl): se devuelve igual y se refresca en segundo
+  plano (una sola vez por clave y proceso).
+- vencido o ausente: se carga desde el origen, compartiendo la misma carga
+  entre llamadas concurrentes.
+- modo degradado: si el origen falla se devuelve el último valor conocido
+  (Redis lo conserva hasta `max_age`) o, si no hay, el `fallback`.
+
+Los errores de Redis nunca se propagan: el nivel se saltea.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class StaleWhileRevalidateCache:
+	namespace: str
+	ttl: float = 3600
+	stale_ttl: float = 86400
+	max_age: float = 30 * 86400
+	redis_client: Any | None = None
+
+	_local: Dict[str, Tuple[Any, float]] = field(default_factory=dict, init=False)
+	_inflight: Dict[str, asyncio.Task] = field(default_factory=dict, init=False)
+
+	def _key(self, key: str) -> str:
+		return f"{self.namespace}:{key}"
+
+	async def get(
+		self, key: str, loader: Loader, fallback: Loader | None = None
+	) -> Any:
+		"""
+		Devuelve el valor de `key`, cargándolo con `loader` si hace falta.
+
+		`fallback` se usa sólo cuando el origen falla y no hay copia previa.
+		"""
+		entry = await self._read(key)
+		if entry is not None:
+			value, fetched_at = entry
+			age = time.time() - fetched_at
+			if age < self.ttl:
+				return value
+			if age < self.ttl + self.stale_ttl:
+				self._revalidate(key, loader)
+				return value
+
+		try:
+			return await self._load(key, loader)
+		except Exception as e:
+			if entry is not None:
+				logger.warning(f"Serving stale {self._key(key)}, origin failed: {e}")
+				return entry[0]
+			if fallback is not None:
+				logger.warning(f"Serving fallback for {self._key(key)}, origin failed: {e}")
+				value = await fallback()
+				if value is not None:
+					return value
+			raise
+
+	async def refresh(self, key: str, loader: Loader) -> Any:
+		"""Carga el valor desde el origen ignorando lo cacheado (warm-up)."""
+		return await self._load(key, loader)
+
+	async def invalidate(self, key: str) -> None:
+		self._local.pop(key, None)
+		if self.redis_client is None:
+			return
+		try:
+			await self.redis_client.delete(self._key(key))
+		except RedisError:
+			logger.debug(f"Could not invalidate {self._key(key)} in Redis")
+
+	# ------------------------------------------------------------------
+
+	def _revalidate(self, key: str, loader: Loader) -> None:
+		if key in self._inflight:
+			return
+
+		def _log_failure(task: asyncio.Task) -> None:
+			# Se consume el error para que no quede como excepción no recuperada
+			if not task.cancelled() and task.exception() is not None:
+				logger.warning(
+					f"Revalidation of {self._key(key)} failed: {task.exception()}"
+				)
+
+		asyncio.create_task(self._load(key, loader)).add_done_callback(_log_failure)
+
+	async def _load(self, key: str, loader: Loader) -> Any:
+		task = self._inflight.get(key)
+		if task is None:
+			task = asyncio.create_task(self._fetch_and_store(key, loader))
+			self._inflight[key] = task
+			task.add_done_callback(lambda _: self._inflight.pop(key, None))
+		return await asyncio.shield(task)
+
+	async def _fetch_and_store(self, key: str, loader: Loader) -> Any:
+		value = await loader()
+		fetched_at = time.time()
+		self._local[key] = (value, fetched_at)
+		if self.redis_client is not None:
+			try:
+				await self.redis_client.set(
+					self._key(key),
+					json.dumps({"value": value, "fetched_at": fetched_at}, default=str),
+					ex=int(self.max_age),
+				)
+			except RedisError:
+				logger.debug(f"Could not store {self._key(key)} in Redis")
+		return value
+
+	async def _read(self, key: str) -> Tuple[Any, float] | None:
+		entry = self._local.get(key)
+		if entry is not None and time.time() - entry[1] < self.ttl:
+			return entry
+		if self.redis_client is None:
+			return entry
+		try:
+			raw = await self.redis_client.get(self._key(key))
+		except RedisError:
+			return entry
+		if raw is None:
+			return entry
+		data = json.loads(raw)
+		shared = (data["value"], data["fetched_at"])
+		# Otro proceso pudo haberlo refrescado: se prefiere la copia más nueva
+		if entry is None or shared[1] > entry[1]:
+			self._local[key] = shared
+			return shared
+		return entry
@@ -0,0 +1,123 @@
+"""
+Circuit breaker para dependencias externas (ERP, APIs de terceros).
+
+Cuando el servicio remoto se degrada, seguir llamándolo sólo acumula
+corrutinas esperando timeouts (y las sesiones de base de datos que tienen
+abiertas). El breaker corta esas llamadas:
+
+- closed: las llamadas pasan; se cuentan los fallos consecutivos.
+- open: tras `failure_threshold` fallos seguidos se rechaza todo de inmediato
+  con `CircuitOpenError` durante `recovery_timeout` segundos.
+- half_open: pasado ese tiempo se deja pasar una llamada de prueba; si anda
+  se cierra, si falla se vuelve a abrir. Quien llama a `before_call` tiene
+  que terminar siempre con `record_success`, `record_failure` o
+  `release_probe` (también si la llamada se cancela).
+
+El estado es por proceso. Cada breaker se registra por nombre para exponer
+su estado en `/system/metrics`.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Valor numérico del gauge de Prometheus
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+	def __init__(self, name: str, retry_after: float):
+		super().__init__(f"Circuit {name} is open, retry in {retry_after:.0f}s")
+		self.name = name
+		self.retry_after = retry_after
+
+
+@dataclass
+class CircuitBreaker:
+	name: str
+	failure_threshold: int = 5
+	recovery_timeout: float = 30.0
+
+	state: str = field(default=CLOSED, init=False)
+	failures: int = field(default=0, init=False)
+	opened_at: float = field(default=0.0, init=False)
+	transitions: Dict[str, int] = field(default_factory=dict, init=False)
+	_probing: bool = field(default=False, init=False)
+
+	def __post_init__(self):
+		_registry[self.name] = self
+
+	def before_call(self) -> None:
+		"""
+		Decide si la llamada puede salir. Lanza CircuitOpenError si no.
+
+		En half_open sólo se permite una llamada de prueba a la vez.
+		"""
+		if self.state == OPEN:
+			elapsed = time.monotonic() - self.opened_at
+			if elapsed < self.recovery_timeout:
+				raise CircuitOpenError(self.name, self.recovery_timeout - elapsed)
+			self._transition(HALF_OPEN)
+
+		if self.state == HALF_OPEN:
+			if self._probing:
+				raise CircuitOpenError(self.name, self.recovery_timeout)
+			self._probing = True
+
+	def record_success(self) -> None:
+		self.failures = 0
+		self._probing = False
+		if self.state != CLOSED:
+			self._transition(CLOSED)
+
+	def record_failure(self) -> None:
+		self.failures += 1
+		self._probing = False
+		if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+			self.opened_at = time.monotonic()
+			if self.state != OPEN:
+				self._transition(OPEN)
+
+	def release_probe(self) -> None:
+		"""
+		Libera la llamada de prueba sin contar éxito ni fallo: la llamada se
+		canceló o falló antes de saber nada del servicio remoto.
+		"""
+		self._probing = False
+
+	def _transition(self, state: str) -> None:
+		logger.warning(f"Circuit {self.name}: {self.state} -> {state}")
+		self.state = state
+		self.transitions[state] = self.transitions.get(state, 0) + 1
+
+
+def get_circuit_breakers() -> Dict[str, CircuitBreaker]:
+	return dict(_registry)
+
+
+def render_prometheus() -> str:
+	"""Serializa el estado de los breakers del proceso en formato Prometheus."""
+	lines: List[str] = [
+		"# HELP circuit_breaker_state 0=closed, 1=half_open, 2=open",
+		"# TYPE circuit_breaker_state gauge",
+	]
+	for name, breaker in sorted(_registry.items()):
+		lines.append(
+			f'circuit_breaker_state{{name="{name}"}} {STATE_VALUES[breaker.state]}'
+		)
+	lines.append("# TYPE circuit_breaker_transitions_total counter")
+	for name, breaker in sorted(_registry.items()):
+		for state, count in sorted(breaker.transitions.items()):
+			lines.append(
+				f'circuit_breaker_transitions_total{{name="{name}",state="{state}"}} {count}'
+			)
+	return "\n".join(lines) + "\n"
@@ -0,0 +1,63 @@
+"""
+Utilidades para ejecutar I/O independiente en paralelo.
+
+- `gather_bounded`: como `asyncio.gather`, pero con un máximo de corrutinas
+  en vuelo, para no saturar la dependencia remota ni el pool de conexiones.
+- `StepTimings`: mide la duración de cada paso de un pipeline, incluso de los
+  que corren en paralelo, para registrar dónde se va el tiempo.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Dict, List
+
+
+async def gather_bounded(*aws: Awaitable[Any], limit: int = 4) -> List[Any]:
+	"""
+	Ejecuta `aws` concurrentemente con a lo sumo `limit` a la vez.
+
+	Devuelve los resultados en el mismo orden. Si una falla, se cancelan las
+	que siguen pendientes y se propaga la excepción.
+	"""
+	semaphore = asyncio.Semaphore(limit)
+
+	async def _bounded(aw: Awaitable[Any]) -> Any:
+		async with semaphore:
+			return await aw
+
+	tasks = [asyncio.ensure_future(_bounded(aw)) for aw in aws]
+	try:
+		return await asyncio.gather(*tasks)
+	except BaseException:
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+		raise
+
+
+@dataclass
+class StepTimings:
+	"""Duración (segundos) de cada paso y total desde la creación."""
+
+	steps: Dict[str, float] = field(default_factory=dict)
+	started_at: float = field(default_factory=time.perf_counter)
+
+	@asynccontextmanager
+	async def step(self, name: str) -> AsyncIterator[None]:
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.steps[name] = round(time.perf_counter() - start, 4)
+
+	async def run(self, name: str, aw: Awaitable[Any]) -> Any:
+		async with self.step(name):
+			return await aw
+
+	def as_dict(self) -> Dict[str, float]:
+		return {
+			**self.steps,
+			"total": round(time.perf_counter() - self.started_at, 4),
+		}
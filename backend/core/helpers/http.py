@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Tuple
+from urllib.parse import quote
+
+
+def content_disposition(filename: str, disposition: str = "attachment") -> str:
+	"""Content-Disposition con el nombre original, también si no es ASCII (RFC 6266)."""
+	fallback = filename.encode("ascii", "replace").decode().replace('"', "")
+	return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def http_date(value: datetime) -> str:
+	"""Fecha en formato HTTP (`Last-Modified`). Las fechas sin zona se toman como locales."""
+	return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def parse_http_date(value: str | None) -> datetime | None:
+	if not value:
+		return None
+	try:
+		parsed = parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		return None
+	# "-0000" se interpreta sin zona: en HTTP siempre es UTC
+	return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+	"""`If-None-Match`: comparación débil (ignora `W/`), acepta listas y `*`."""
+	if not header:
+		return False
+	if header.strip() == "*":
+		return True
+	opaque = etag.removeprefix("W/")
+	return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def etag_matches_strong(header: str | None, etag: str) -> bool:
+	"""
+	`If-Range`: comparación fuerte de un único ETag (RFC 9110 §13.1.5).
+
+	Un ETag débil, `*` o una lista nunca coinciden: se responde el archivo
+	completo en lugar de un tramo de una versión que pudo cambiar.
+	"""
+	if not header:
+		return False
+	tag = header.strip()
+	if tag.startswith("W/") or etag.startswith("W/") or tag == "*" or "," in tag:
+		return False
+	return tag == etag
+
+
+class RangeNotSatisfiable(Exception):
+	pass
+
+
+def parse_byte_range(header: str | None, size: int) -> Tuple[int, int] | None:
+	"""
+	Rango `bytes=` de un único tramo como (inicio, fin) inclusivos.
+
+	Devuelve None si no hay header, si es inválido o si pide varios tramos
+	(se responde el archivo completo, como permite RFC 9110). Levanta
+	RangeNotSatisfiable si el tramo queda fuera del archivo.
+	"""
+	if not header or not header.startswith("bytes="):
+		return None
+	spec = header[len("bytes=") :].strip()
+	if "," in spec or "-" not in spec:
+		return None
+
+	first, last = (part.strip() for part in spec.split("-", 1))
+	try:
+		if not first:
+			# Sufijo: los últimos N bytes
+			length = int(last)
+			if length <= 0 or size == 0:
+				raise RangeNotSatisfiable
+			return max(size - length, 0), size - 1
+		start = int(first)
+		end = int(last) if last else size - 1
+	except ValueError:
+		return None
+	if last and start > end:
+		return None
+	if start >= size:
+		raise RangeNotSatisfiable
+	return start, min(end, size - 1)
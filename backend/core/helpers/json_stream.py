@@ -0,0 +1,103 @@
+"""
+Lectura incremental de un array JSON (`[{...}, {...}, ...]`) que llega por
+partes, por ejemplo el cuerpo de una respuesta httpx (`aiter_bytes()`).
+
+Cada elemento se entrega apenas se completa, así que el consumidor puede ir
+procesándolos sin tener el payload entero ni la lista decodificada en memoria.
+Sólo se retiene el fragmento del elemento que todavía no terminó de llegar.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class JSONStreamError(ValueError):
+	pass
+
+
+def _skip(buffer: str, pos: int, chars: str) -> int:
+	while pos < len(buffer) and buffer[pos] in chars:
+		pos += 1
+	return pos
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+	"""Devuelve uno a uno los elementos del array JSON que llega en `chunks`."""
+	text = codecs.getincrementaldecoder("utf-8-sig")()
+	buffer = ""
+	pos = 0
+	started = finished = False
+	expect_value = True
+	after_comma = False
+
+	async def fill() -> bool:
+		nonlocal buffer, pos
+		async for chunk in iterator:
+			data = text.decode(chunk)
+			if data:
+				buffer = buffer[pos:] + data
+				pos = 0
+				return True
+		buffer = buffer[pos:] + text.decode(b"", final=True)
+		pos = 0
+		return False
+
+	iterator = chunks.__aiter__()
+	more = True
+	while True:
+		pos = _skip(buffer, pos, _WHITESPACE)
+		if pos >= len(buffer):
+			if not more:
+				break
+			more = await fill()
+			continue
+
+		if finished:
+			raise JSONStreamError(f"Unexpected data after array: {buffer[pos:pos + 20]!r}")
+
+		if not started:
+			if buffer[pos] != "[":
+				raise JSONStreamError(f"Expected a JSON array, got {buffer[pos:pos + 20]!r}")
+			started = True
+			pos += 1
+			continue
+
+		if buffer[pos] == "]":
+			if expect_value and after_comma:
+				raise JSONStreamError("Trailing comma before ']'")
+			finished = True
+			pos += 1
+			continue
+
+		if not expect_value:
+			if buffer[pos] != ",":
+				raise JSONStreamError(f"Expected ',' or ']', got {buffer[pos:pos + 20]!r}")
+			expect_value = after_comma = True
+			pos += 1
+			continue
+
+		try:
+			value, end = _decoder.raw_decode(buffer, pos)
+		except json.JSONDecodeError:
+			if not more:
+				raise
+			more = await fill()
+			continue
+
+		# Un número cortado ("6." + "75") decodifica igual: sólo se acepta el
+		# valor si ya llegó el separador que lo cierra
+		after = _skip(buffer, end, _WHITESPACE)
+		if more and (after >= len(buffer) or buffer[after] not in ",]"):
+			more = await fill()
+			continue
+
+		pos = end
+		expect_value = False
+		yield value
+
+	if not started or not finished:
+		raise JSONStreamError("Incomplete JSON array")
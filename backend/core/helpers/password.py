@@ -1,20 +1,89 @@
-from passlib.context import CryptContext
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import bcrypt
 from faker import Faker
 
 faker = Faker()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt sólo usa los primeros 72 bytes; passlib los truncaba sin avisar y
+# bcrypt >= 5 levanta error: se trunca igual para validar los hashes existentes
+BCRYPT_MAX_PASSWORD_BYTES = 72
+DEFAULT_BCRYPT_ROUNDS = 12
 
 
-class PasswordHelper:
-	@staticmethod
-	def verify_password(plain_password: str, hashed_password: str):
-		return pwd_context.verify(plain_password, hashed_password)
+class PasswordHasher:
+	"""
+	Hash y verificación de contraseñas con bcrypt fuera del event loop.
+
+	Cada hash cuesta ~100-300 ms de CPU (según `rounds`). bcrypt libera el GIL,
+	así que corre en un executor propio de `max_workers` threads: una ráfaga
+	de logins hace cola ahí sin frenar al resto de los requests ni ocupar el
+	executor por defecto (S3, archivos).
+
+	`rounds` es el costo de los hashes nuevos. Los hashes guardados con otro
+	costo siguen validando y `needs_rehash` indica que conviene regenerarlos.
+	"""
+
+	def __init__(self, rounds: int = DEFAULT_BCRYPT_ROUNDS, max_workers: int = 4):
+		self.rounds = rounds
+		self._executor = ThreadPoolExecutor(
+			max_workers=max_workers, thread_name_prefix="bcrypt"
+		)
 
 	@staticmethod
-	def get_password_hash(password: str):
-		return pwd_context.hash(password)
+	def _encode(password: str) -> bytes:
+		return password.encode()[:BCRYPT_MAX_PASSWORD_BYTES]
+
+	def hash_sync(self, password: str) -> str:
+		return bcrypt.hashpw(self._encode(password), bcrypt.gensalt(self.rounds)).decode()
+
+	def verify_sync(self, password: str, hashed_password: str | None) -> bool:
+		if not hashed_password:
+			return False
+		try:
+			return bcrypt.checkpw(self._encode(password), hashed_password.encode())
+		except ValueError:
+			# No es un hash bcrypt
+			return False
 
+	async def _run(self, func, *args):
+		return await asyncio.get_running_loop().run_in_executor(
+			self._executor, partial(func, *args)
+		)
+
+	async def hash(self, password: str) -> str:
+		return await self._run(self.hash_sync, password)
+
+	async def verify(self, password: str, hashed_password: str | None) -> bool:
+		return await self._run(self.verify_sync, password, hashed_password)
+
+	def needs_rehash(self, hashed_password: str) -> bool:
+		"""True si el hash se generó con otro costo (`$2b$<rounds>$...`)."""
+		try:
+			return int(hashed_password.split("$")[2]) != self.rounds
+		except (IndexError, ValueError):
+			return True
+
+	async def verify_and_update(
+		self, password: str, hashed_password: str | None
+	) -> tuple[bool, str | None]:
+		"""
+		Verifica y, si la contraseña es correcta pero el hash tiene otro costo,
+		devuelve también el hash nuevo para guardarlo (None si no hace falta).
+		"""
+		if not await self.verify(password, hashed_password):
+			return False, None
+		if hashed_password and self.needs_rehash(hashed_password):
+			return True, await self.hash(password)
+		return True, None
+
+	def close(self) -> None:
+		self._executor.shutdown(wait=False)
+
+
+class PasswordHelper:
 	@staticmethod
 	def generate_password():
 		password = faker.password(
@@ -0,0 +1,53 @@
+"""
+Polling asíncrono con backoff exponencial y deadline.
+
+Reemplaza los `while True: time.sleep(...)` dentro de corrutinas: la espera
+entre consultas no bloquea el event loop, crece exponencialmente (con
+jitter) hasta `max_delay` y el conjunto está acotado por `deadline`.
+Cancelar la tarea que llama interrumpe la espera en curso.
+"""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def poll_with_backoff(
+	probe: Callable[[], Awaitable[T]],
+	is_done: Callable[[T], bool],
+	*,
+	initial_delay: float = 0.5,
+	max_delay: float = 10.0,
+	factor: float = 2.0,
+	jitter: float = 0.1,
+	deadline: float = 600.0,
+	on_result: Callable[[T], Awaitable[None]] | None = None,
+) -> T:
+	"""
+	Ejecuta `probe` hasta que `is_done(resultado)` sea verdadero.
+
+	Args:
+		probe: Corrutina que consulta el estado
+		is_done: Decide si el resultado es final
+		initial_delay: Espera tras la primera consulta (segundos)
+		max_delay: Espera máxima entre consultas
+		factor: Multiplicador de la espera en cada vuelta
+		jitter: Variación aleatoria relativa de cada espera
+		deadline: Tiempo total máximo (segundos)
+		on_result: Callback con cada resultado intermedio (progreso)
+
+	Raises:
+		TimeoutError: si se supera `deadline`
+	"""
+	delay = initial_delay
+	async with asyncio.timeout(deadline):
+		while True:
+			result = await probe()
+			if on_result is not None:
+				await on_result(result)
+			if is_done(result):
+				return result
+			await asyncio.sleep(delay * (1 + random.uniform(-jitter, jitter)))
+			delay = min(delay * factor, max_delay)
@@ -0,0 +1,64 @@
+"""
+Escritura de planillas (XLSX / CSV) fila por fila.
+
+Para archivos de importación generados desde consultas: las filas se toman
+de un iterable (sync o async) y se escriben a medida que llegan, sin armar
+un DataFrame ni la lista completa en memoria.
+
+- XLSX: workbook de openpyxl en modo write-only (las filas se vuelcan al XML
+  de la hoja a medida que se agregan; no hay modelo de celdas en memoria).
+- CSV: UTF-8 con BOM para que Excel lo abra con los acentos correctos.
+"""
+
+import csv
+import io
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Literal, Sequence
+
+from openpyxl import Workbook
+
+Row = Sequence[Any]
+Rows = Iterable[Row] | AsyncIterable[Row]
+SpreadsheetFormat = Literal["xlsx", "csv"]
+
+CONTENT_TYPES = {
+	"xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+	"csv": "text/csv",
+}
+
+
+async def _iterate(rows: Rows) -> AsyncIterator[Row]:
+	if isinstance(rows, AsyncIterable):
+		async for row in rows:
+			yield row
+	else:
+		for row in rows:
+			yield row
+
+
+async def write_xlsx(rows: Rows, sheet_title: str = "Sheet1") -> bytes:
+	workbook = Workbook(write_only=True)
+	sheet = workbook.create_sheet(sheet_title)
+	async for row in _iterate(rows):
+		sheet.append(list(row))
+
+	buffer = io.BytesIO()
+	workbook.save(buffer)
+	return buffer.getvalue()
+
+
+async def write_csv(rows: Rows, delimiter: str = ",") -> bytes:
+	buffer = io.BytesIO()
+	text = io.TextIOWrapper(buffer, encoding="utf-8-sig", newline="")
+	writer = csv.writer(text, delimiter=delimiter, lineterminator="\r\n")
+	async for row in _iterate(rows):
+		writer.writerow(["" if value is None else value for value in row])
+	text.flush()
+	content = buffer.getvalue()
+	text.close()
+	return content
+
+
+async def write_spreadsheet(rows: Rows, format: SpreadsheetFormat = "xlsx") -> bytes:
+	if format == "csv":
+		return await write_csv(rows)
+	return await write_xlsx(rows)
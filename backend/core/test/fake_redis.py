@@ -0,0 +1,200 @@
+"""
+Redis en memoria para los tests de core.
+
+Implementa sólo los comandos que usa el código (strings, hashes, sets,
+sorted sets, contadores, locks y pipelines). Las claves expiran según
+`time.time()` (se puede adelantar con monkeypatch) y `ttls` guarda el último
+TTL en segundos de cada clave. `FakeRedis(fail=True)` simula un Redis caído
+levantando `ConnectionError` en cada comando.
+"""
+
+import fnmatch
+import time
+
+from redis.exceptions import ConnectionError
+
+
+class FakeLock:
+	def __init__(self, redis: "FakeRedis", name: str, timeout: float | None):
+		self.redis = redis
+		self.name = name
+		self.timeout = timeout
+
+	def acquire(self) -> bool:
+		return bool(self.redis.set(self.name, "locked", nx=True, ex=self.timeout))
+
+	def release(self) -> None:
+		self.redis.delete(self.name)
+
+
+class FakePipeline:
+	def __init__(self, redis: "FakeRedis"):
+		self.redis = redis
+		self.commands = []
+
+	def __getattr__(self, name):
+		command = getattr(self.redis, name)
+
+		def queue(*args, **kwargs):
+			self.commands.append((command, args, kwargs))
+			return self
+
+		return queue
+
+	def execute(self):
+		commands, self.commands = self.commands, []
+		return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedis:
+	def __init__(self, fail: bool = False):
+		self.fail = fail
+		self.data = {}
+		self.ttls = {}
+		self.expires_at = {}
+
+	def _check(self):
+		if self.fail:
+			raise ConnectionError("Redis no disponible")
+		now = time.time()
+		for key, expires_at in list(self.expires_at.items()):
+			if expires_at <= now:
+				self.data.pop(key, None)
+				self.ttls.pop(key, None)
+				del self.expires_at[key]
+
+	def _set_ttl(self, key, seconds):
+		self.ttls[key] = seconds
+		if seconds:
+			self.expires_at[key] = time.time() + seconds
+		else:
+			self.expires_at.pop(key, None)
+
+	def pipeline(self, transaction: bool = True) -> FakePipeline:
+		self._check()
+		return FakePipeline(self)
+
+	def lock(self, name, timeout=None, blocking=True):
+		self._check()
+		return FakeLock(self, name, timeout)
+
+	def get(self, key):
+		self._check()
+		return self.data.get(key)
+
+	def set(self, key, value, nx=False, ex=None):
+		self._check()
+		if nx and key in self.data:
+			return None
+		self.data[key] = str(value)
+		self._set_ttl(key, ex)
+		return True
+
+	def delete(self, *keys):
+		self._check()
+		deleted = 0
+		for key in keys:
+			if self.data.pop(key, None) is not None:
+				deleted += 1
+			self.ttls.pop(key, None)
+			self.expires_at.pop(key, None)
+		return deleted
+
+	def expire(self, key, seconds):
+		self._check()
+		if key not in self.data:
+			return False
+		self._set_ttl(key, seconds)
+		return True
+
+	def incr(self, key):
+		self._check()
+		value = int(self.data.get(key, 0)) + 1
+		self.data[key] = str(value)
+		return value
+
+	def sadd(self, key, *members):
+		self._check()
+		current = self.data.setdefault(key, set())
+		added = len(set(members) - current)
+		current.update(members)
+		return added
+
+	def smembers(self, key):
+		self._check()
+		return set(self.data.get(key, set()))
+
+	def hincrby(self, key, field, amount=1):
+		self._check()
+		fields = self.data.setdefault(key, {})
+		fields[field] = str(int(fields.get(field, 0)) + amount)
+		return int(fields[field])
+
+	def hincrbyfloat(self, key, field, amount=1.0):
+		self._check()
+		fields = self.data.setdefault(key, {})
+		fields[field] = repr(float(fields.get(field, 0)) + amount)
+		return float(fields[field])
+
+	def hgetall(self, key):
+		self._check()
+		return dict(self.data.get(key, {}))
+
+	def zadd(self, key, mapping):
+		self._check()
+		members = self.data.setdefault(key, {})
+		added = len(set(mapping) - set(members))
+		members.update(mapping)
+		return added
+
+	def zremrangebyscore(self, key, min_score, max_score):
+		self._check()
+		members = self.data.get(key, {})
+		low = float(min_score)
+		removed = [m for m, score in members.items() if low <= score <= float(max_score)]
+		for member in removed:
+			del members[member]
+		return len(removed)
+
+	def zcard(self, key):
+		self._check()
+		return len(self.data.get(key, {}))
+
+	def scan_iter(self, match="*"):
+		self._check()
+		return iter([key for key in list(self.data) if fnmatch.fnmatch(key, match)])
+
+
+class FakeAsyncPipeline:
+	def __init__(self, pipeline: FakePipeline):
+		self.pipeline = pipeline
+
+	def __getattr__(self, name):
+		queue = getattr(self.pipeline, name)
+
+		def command(*args, **kwargs):
+			queue(*args, **kwargs)
+			return self
+
+		return command
+
+	async def execute(self):
+		return self.pipeline.execute()
+
+
+class FakeAsyncRedis:
+	"""La misma API que `FakeRedis`, con comandos awaitables (redis.asyncio)."""
+
+	def __init__(self, redis: FakeRedis | None = None):
+		self.sync = redis or FakeRedis()
+
+	def pipeline(self, transaction: bool = True) -> FakeAsyncPipeline:
+		return FakeAsyncPipeline(self.sync.pipeline(transaction))
+
+	def __getattr__(self, name):
+		method = getattr(self.sync, name)
+
+		async def command(*args, **kwargs):
+			return method(*args, **kwargs)
+
+		return command
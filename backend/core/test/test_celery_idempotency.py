@@ -0,0 +1,81 @@
+import pytest
+
+from core.celery.idempotency import KEY_PREFIX, make_idempotent
+from core.test.fake_redis import FakeRedis
+
+
+class Task:
+	"""Task de prueba que cuenta sus ejecuciones."""
+
+	def __init__(self, result=None, error: Exception | None = None):
+		self.calls = []
+		self.result = result
+		self.error = error
+
+	def __call__(self, invoice_id, **kwargs):
+		self.calls.append(invoice_id)
+		if self.error:
+			raise self.error
+		return self.result
+
+
+def idempotent(task, redis, **kwargs):
+	return make_idempotent(
+		task,
+		key_func=lambda invoice_id, **kw: f"invoice:{invoice_id}",
+		client_factory=lambda: redis,
+		**kwargs,
+	)
+
+
+def test_result_is_memoised_and_reused():
+	redis = FakeRedis()
+	task = Task(result={"invoice": 7, "status": "emitted"})
+	wrapped = idempotent(task, redis, result_ttl=120)
+
+	assert wrapped(7) == {"invoice": 7, "status": "emitted"}
+	assert wrapped(7) == {"invoice": 7, "status": "emitted"}
+
+	assert task.calls == [7]
+	assert redis.ttls[f"{KEY_PREFIX}:invoice:7:result"] == 120
+	# El lock se libera al terminar
+	assert f"{KEY_PREFIX}:invoice:7:lock" not in redis.data
+
+
+def test_duplicate_is_skipped_while_the_lock_is_held():
+	redis = FakeRedis()
+	task = Task(result="ok")
+	wrapped = idempotent(task, redis, lock_ttl=60)
+	redis.set(f"{KEY_PREFIX}:invoice:7:lock", "locked", nx=True, ex=60)
+
+	assert wrapped(7) == {
+		"status": "duplicate",
+		"idempotency_key": f"{KEY_PREFIX}:invoice:7",
+	}
+	assert task.calls == []
+	# Otra clave no se ve afectada
+	assert wrapped(8) == "ok"
+
+
+def test_failure_releases_the_lock_and_memoises_nothing():
+	redis = FakeRedis()
+	task = Task(error=RuntimeError("yiqi caído"))
+	wrapped = idempotent(task, redis)
+
+	with pytest.raises(RuntimeError):
+		wrapped(7)
+
+	assert redis.data == {}
+	task.error = None
+	task.result = "ok"
+	assert wrapped(7) == "ok"
+	assert task.calls == [7, 7]
+
+
+def test_runs_without_deduplication_when_redis_is_down():
+	task = Task(result="ok")
+	wrapped = idempotent(task, FakeRedis(fail=True))
+
+	assert wrapped(7) == "ok"
+	assert wrapped(7) == "ok"
+	assert task.calls == [7, 7]
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.celery.discovery import make_sync_wrapper
+from core.celery.runtime import WorkerRuntime
+
+
+@pytest.fixture
+def runtime():
+	runtime = WorkerRuntime(max_concurrency=2, shutdown_timeout=5)
+	yield runtime
+	runtime.stop()
+
+
+def test_sync_wrapper_runs_tasks_on_one_persistent_loop(runtime):
+	async def current_loop(value):
+		"""Devuelve el loop en el que corre."""
+		await asyncio.sleep(0)
+		return value, asyncio.get_running_loop()
+
+	task = make_sync_wrapper(current_loop, runtime)
+
+	first_value, first_loop = task(1)
+	second_value, second_loop = task(value=2)
+
+	assert (first_value, second_value) == (1, 2)
+	assert first_loop is second_loop is runtime.loop
+	assert first_loop.is_running()
+	assert task.__name__ == "current_loop"
+	assert task.__doc__ == "Devuelve el loop en el que corre."
+
+
+def test_exceptions_reach_the_caller(runtime):
+	async def failing():
+		raise ValueError("boom")
+
+	with pytest.raises(ValueError, match="boom"):
+		make_sync_wrapper(failing, runtime)()
+
+
+def test_concurrency_is_bounded_by_the_semaphore(runtime):
+	running = 0
+	peak = 0
+
+	async def job():
+		nonlocal running, peak
+		running += 1
+		peak = max(peak, running)
+		await asyncio.sleep(0.02)
+		running -= 1
+
+	task = make_sync_wrapper(job, runtime)
+	threads = [threading.Thread(target=task) for _ in range(6)]
+	start = time.perf_counter()
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert peak == 2
+	assert time.perf_counter() - start >= 0.06
+
+
+def test_shutdown_hooks_run_inside_the_loop_in_reverse_order():
+	runtime = WorkerRuntime(shutdown_timeout=5)
+	calls = []
+
+	def hook(name):
+		async def close():
+			calls.append((name, asyncio.get_running_loop()))
+
+		return close
+
+	first, second = hook("first"), hook("second")
+	runtime.add_shutdown_hook(first)
+	runtime.add_shutdown_hook(second)
+	runtime.add_shutdown_hook(first)
+	loop = runtime.loop
+
+	runtime.stop()
+	runtime.stop()
+
+	assert calls == [("second", loop), ("first", loop)]
+	assert not runtime.is_running
+	assert loop.is_closed()
+
+
+def test_failing_hook_does_not_block_the_rest():
+	runtime = WorkerRuntime(shutdown_timeout=5)
+	closed = []
+
+	async def failing():
+		raise RuntimeError("redis caído")
+
+	async def dispose():
+		closed.append(True)
+
+	runtime.add_shutdown_hook(dispose)
+	runtime.add_shutdown_hook(failing)
+	runtime.start()
+	runtime.stop()
+
+	assert closed == [True]
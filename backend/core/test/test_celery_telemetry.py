@@ -0,0 +1,128 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from celery.signals import (
+	before_task_publish,
+	task_failure,
+	task_postrun,
+	task_prerun,
+	task_retry,
+)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.celery import telemetry
+from core.fastapi.server import init_metrics
+from core.test.fake_redis import FakeRedis
+
+TASK = "yiqi_erp.create_invoice"
+
+
+@pytest.fixture
+def redis(monkeypatch):
+	redis = FakeRedis()
+	monkeypatch.setattr(telemetry, "get_sync_redis_client", lambda: redis)
+	return redis
+
+
+class FakeTask:
+	name = TASK
+
+	def __init__(self, enqueued_at=None, eta=None):
+		self.request = SimpleNamespace(enqueued_at=enqueued_at, eta=eta)
+
+
+def run_task(task, task_id="t1", retval=None, state="SUCCESS"):
+	task_prerun.send(sender=task, task_id=task_id, task=task)
+	task_postrun.send(sender=task, task_id=task_id, task=task, retval=retval, state=state)
+
+
+def test_publish_stamps_the_enqueue_time():
+	headers = {}
+	before_task_publish.send(sender=TASK, headers=headers)
+
+	assert headers[telemetry.ENQUEUED_AT_HEADER] == pytest.approx(time.time(), abs=5)
+
+
+def test_signals_record_counters_and_buckets(redis):
+	run_task(FakeTask(enqueued_at=time.time() - 3), retval={"invoice": 7})
+	task = FakeTask()
+	task_retry.send(sender=task)
+	task_failure.send(sender=task)
+	run_task(task, task_id="t2", state="FAILURE")
+
+	assert redis.smembers(f"{telemetry.KEY_PREFIX}:tasks") == {TASK}
+	assert redis.hgetall(f"{telemetry.KEY_PREFIX}:counters:{TASK}") == {
+		"started": "2",
+		"succeeded": "1",
+		"retried": "1",
+		"failed": "1",
+	}
+	latency = redis.hgetall(f"{telemetry.KEY_PREFIX}:queue_latency_seconds:{TASK}")
+	assert latency["5"] == "1" and latency["count"] == "1"
+	assert 3 <= float(latency["sum"]) < 5
+	duration = redis.hgetall(f"{telemetry.KEY_PREFIX}:run_duration_seconds:{TASK}")
+	assert duration["0.05"] == "2" and duration["count"] == "2"
+	size = redis.hgetall(f"{telemetry.KEY_PREFIX}:result_size_bytes:{TASK}")
+	assert size == {"256": "1", "count": "1", "sum": repr(float(len('{"invoice": 7}')))}
+	assert telemetry._started_at == {}
+
+
+def test_eta_delays_the_start_of_the_queue_latency(redis):
+	now = time.time()
+	run_task(FakeTask(enqueued_at=now - 100, eta=now - 0.2))
+
+	latency = redis.hgetall(f"{telemetry.KEY_PREFIX}:queue_latency_seconds:{TASK}")
+	assert latency["0.25"] == "1"
+
+
+def test_redis_errors_never_fail_the_task(monkeypatch):
+	monkeypatch.setattr(telemetry, "get_sync_redis_client", lambda: FakeRedis(fail=True))
+
+	run_task(FakeTask(enqueued_at=time.time()))
+
+
+def test_metrics_endpoint_renders_prometheus_exposition(redis):
+	run_task(FakeTask(enqueued_at=time.time() - 3), retval="ok")
+	app = FastAPI()
+	init_metrics(app)
+
+	response = TestClient(app).get("/system/metrics")
+
+	assert response.status_code == 200
+	lines = response.text.splitlines()
+	assert f'celery_task_events_total{{task="{TASK}",event="started"}} 1' in lines
+	assert f'celery_task_events_total{{task="{TASK}",event="failed"}} 0' in lines
+	assert "# TYPE celery_task_queue_latency_seconds histogram" in lines
+	assert f'celery_task_queue_latency_seconds_bucket{{task="{TASK}",le="2.5"}} 0' in lines
+	assert f'celery_task_queue_latency_seconds_bucket{{task="{TASK}",le="5"}} 1' in lines
+	assert f'celery_task_queue_latency_seconds_bucket{{task="{TASK}",le="+Inf"}} 1' in lines
+	assert f'celery_task_queue_latency_seconds_count{{task="{TASK}"}} 1' in lines
+	assert f'celery_task_result_size_bytes_bucket{{task="{TASK}",le="256"}} 1' in lines
+	assert f'celery_task_result_size_bytes_sum{{task="{TASK}"}} 4.0' in lines
+
+
+def test_quantile_and_reset(redis):
+	for task_id in range(4):
+		run_task(FakeTask(enqueued_at=time.time() - 0.3 * task_id), task_id=task_id)
+	histogram = telemetry.collect_task_stats()[TASK]["queue_latency_seconds"]
+
+	assert histogram["count"] == 4
+	assert telemetry.quantile(histogram, 0.5) == 0.5
+	assert telemetry.quantile(histogram, 0.99) == 1.0
+
+	telemetry.reset_task_stats()
+	assert redis.data == {}
+	assert telemetry.collect_task_stats() == {}
+
+
+def test_metrics_endpoint_survives_redis_being_down(monkeypatch):
+	monkeypatch.setattr(telemetry, "get_sync_redis_client", lambda: FakeRedis(fail=True))
+	app = FastAPI()
+	init_metrics(app)
+
+	response = TestClient(app).get("/system/metrics")
+
+	assert response.status_code == 200
+	assert "# TYPE circuit_breaker_state gauge" in response.text.splitlines()
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+from core.fastapi import error_notifier as module
+from core.fastapi.error_notifier import ErrorNotifier
+from core.test.fake_redis import FakeAsyncRedis, FakeRedis
+
+
+class Clock:
+	def __init__(self, now: float = 1_000_020.0):
+		self.now = now
+
+	def __call__(self) -> float:
+		return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	clock = Clock()
+	monkeypatch.setattr(module.time, "time", clock)
+	return clock
+
+
+def error(exception_type: type[Exception]) -> Exception:
+	try:
+		raise exception_type("boom")
+	except Exception as e:
+		return e
+
+
+class HangingRedis(FakeAsyncRedis):
+	"""Redis que acepta la conexión pero nunca responde."""
+
+	def pipeline(self, transaction: bool = True):
+		pipe = super().pipeline(transaction)
+
+		async def execute(*args, **kwargs):
+			await asyncio.sleep(60)
+
+		pipe.execute = execute
+		return pipe
+
+
+def notifier(redis_client=None) -> ErrorNotifier:
+	return ErrorNotifier(
+		window_seconds=300,
+		interval_seconds=300,
+		max_per_minute=1,
+		redis_client=redis_client,
+	)
+
+
+@pytest.fixture(params=["redis", "local", "redis caído"])
+def storm(request):
+	redis_client = {
+		"redis": FakeAsyncRedis(),
+		"local": None,
+		"redis caído": FakeAsyncRedis(FakeRedis(fail=True)),
+	}[request.param]
+	return notifier(redis_client)
+
+
+async def test_one_digest_per_fingerprint_per_interval(storm, clock):
+	first = await storm.register(error(ValueError))
+	again = await storm.register(error(ValueError))
+
+	assert first.should_notify and first.count == 1
+	assert not again.should_notify and again.count == 2
+	assert first.fingerprint == again.fingerprint
+
+	clock.now += 301
+	later = await storm.register(error(ValueError))
+	assert later.should_notify and later.count == 1
+
+
+async def test_cap_does_not_consume_the_digest_slot(storm, clock):
+	assert (await storm.register(error(ValueError))).should_notify
+	capped = await storm.register(error(KeyError))
+	assert not capped.should_notify
+
+	# Minuto siguiente, dentro del intervalo: el KeyError se notifica
+	clock.now += 60
+	assert (await storm.register(error(KeyError))).should_notify
+
+
+async def test_state_is_shared_between_processes_through_redis(clock):
+	redis = FakeRedis()
+	api_1 = notifier(FakeAsyncRedis(redis))
+	api_2 = notifier(FakeAsyncRedis(redis))
+
+	first = await api_1.register(error(ValueError))
+	second = await api_2.register(error(ValueError))
+
+	assert first.should_notify
+	assert not second.should_notify and second.count == 2
+	assert redis.ttls[f"errors:digest:{first.fingerprint}"] == 300
+
+
+async def test_hung_redis_does_not_block_the_500(clock):
+	storm = notifier(HangingRedis())
+	storm.redis_timeout = 0.05
+
+	started = time.perf_counter()
+	digest = await storm.register(error(ValueError))
+
+	assert time.perf_counter() - started < 1
+	assert digest.should_notify and digest.count == 1
+
+
+class HangingClaimRedis(FakeAsyncRedis):
+	"""Redis que guarda el digest pero no responde a tiempo."""
+
+	async def set(self, *args, **kwargs):
+		await self.__getattr__("set")(*args, **kwargs)
+		await asyncio.sleep(60)
+
+
+async def test_timed_out_claim_is_not_notified_locally(clock):
+	redis = FakeRedis()
+	storm = notifier(HangingClaimRedis(redis))
+	storm.redis_timeout = 0.05
+
+	digest = await storm.register(error(ValueError))
+
+	# El digest quedó tomado en Redis: otro proceso es quien lo envía
+	assert not digest.should_notify
+	assert f"errors:digest:{digest.fingerprint}" in redis.ttls
@@ -7,7 +7,7 @@ import typer
 import uvicorn
 from typer import Option
 
-from shared.interfaces.service_protocols import YiqiServiceProtocol
+from shared.interfaces.service_protocols import YiqiSyncServiceProtocol
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from sqlalchemy import text
@@ -64,8 +64,24 @@ def verify_project_structure():
 
 
 @cmd.command("celery-apps")
-def run_celery():
-	"""Inicia el worker de Celery con todas las tasks descubiertas desde service_locator"""
+def run_celery(
+	queues: str = Option(
+		None,
+		help="Colas a consumir separadas por coma (ej: notification,auth). Por defecto todas",
+	),
+	concurrency: int = Option(None, help="Cantidad de procesos/hilos del worker"),
+	pool: str = Option(
+		None, help="Pool de ejecución: prefork, threads, solo, eventlet o gevent"
+	),
+):
+	"""
+	Inicia el worker de Celery con todas las tasks descubiertas desde service_locator.
+
+	Permite levantar pools separados por carga de trabajo:
+
+	  hexa celery-apps --queues notification --concurrency 2
+	  hexa celery-apps --queues yiqi_erp --pool threads --concurrency 8
+	"""
 	# IMPORTANTE: Limpiar registros antes de descubrir módulos
 	# Esto es necesario para cuando watchfiles reinicia el worker
 	from shared.interfaces.module_registry import ModuleRegistry
@@ -83,10 +99,130 @@ def run_celery():
 	print("✅ Modules registered\n")
 
 	# Ahora crear el worker (service_locator ya tiene las tasks registradas)
+	from core.celery.discovery import create_celery_worker
+	from core.celery.routing import get_queue_names
+
+	app = create_celery_worker()
+
+	argv = ["worker", "--loglevel=INFO"]
+	if queues:
+		selected = [q.strip() for q in queues.split(",") if q.strip()]
+		unknown = set(selected) - set(get_queue_names())
+		if unknown:
+			typer.echo(
+				f"Error: colas desconocidas {sorted(unknown)}. Disponibles: {get_queue_names()}",
+				err=True,
+			)
+			sys.exit(1)
+		argv += ["--queues", ",".join(selected)]
+		# Nombre de nodo único para poder correr varios pools en el mismo host
+		argv += ["--hostname", f"{'-'.join(selected)}@%h"]
+	if concurrency:
+		argv += ["--concurrency", str(concurrency)]
+	if pool:
+		argv += ["--pool", pool]
+
+	app.worker_main(argv)
+
+
+@cmd.command("celery-beat")
+def run_celery_beat():
+	"""
+	Inicia celery beat con las tasks periódicas declaradas con `schedule`.
+
+	Debe haber una sola instancia de beat por entorno; las tasks se publican
+	en la cola de su módulo y las ejecuta `hexa celery-apps`.
+	"""
+	from shared.interfaces.module_registry import ModuleRegistry
+	from shared.interfaces.service_locator import service_locator
+
+	ModuleRegistry().clear()
+	service_locator.clear()
+
+	from shared.interfaces.module_discovery import discover_modules
+
+	discover_modules("modules", "module.py")
+
 	from core.celery.discovery import create_celery_worker
 
 	app = create_celery_worker()
-	app.worker_main(["worker", "--loglevel=INFO"])
+	for name, entry in app.conf.beat_schedule.items():
+		typer.echo(f"⏱  {name}: {entry['schedule']}")
+	app.start(["beat", "--loglevel=INFO"])
+
+
+@cmd.command("celery-routes")
+def show_celery_routes():
+	"""Muestra la tabla de ruteo (cola, prioridad, rate limit) generada desde las tasks"""
+	from shared.interfaces.module_registry import ModuleRegistry
+	from shared.interfaces.service_locator import service_locator
+
+	ModuleRegistry().clear()
+	service_locator.clear()
+
+	from shared.interfaces.module_discovery import discover_modules
+
+	discover_modules("modules", "module.py")
+
+	from core.celery.discovery import register_celery_tasks
+	from core.celery.routing import get_routing_table
+
+	register_celery_tasks()
+
+	typer.echo(f"{'TASK':<60} {'QUEUE':<15} {'PRIORITY':<9} RATE LIMIT")
+	typer.echo("-" * 96)
+	for name, route in sorted(get_routing_table().items()):
+		typer.echo(
+			f"{name:<60} {route.queue:<15} {route.priority:<9} {route.rate_limit or '-'}"
+		)
+
+
+@cmd.command("tasks-stats")
+def tasks_stats(
+	reset: bool = Option(False, help="Borra las métricas acumuladas"),
+):
+	"""
+	Resume la telemetría de tasks de Celery: latencia de cola, duración,
+	reintentos, fallos y tamaño del resultado.
+	"""
+	from core.celery.telemetry import collect_task_stats, quantile, reset_task_stats
+
+	if reset:
+		reset_task_stats()
+		typer.echo("✅ Métricas de tasks borradas")
+		return
+
+	stats = collect_task_stats()
+	if not stats:
+		typer.echo("No hay métricas de tasks registradas todavía.")
+		return
+
+	def fmt(value: float | None, unit: str = "s") -> str:
+		if value is None:
+			return "-"
+		if value == float("inf"):
+			return "inf"
+		return f"{value:g}{unit}"
+
+	typer.echo(
+		f"{'TASK':<60} {'RUNS':>6} {'OK':>6} {'RETRY':>6} {'FAIL':>6} "
+		f"{'QUEUE p50/p95':>16} {'RUN p50/p95':>16} {'RESULT avg':>11}"
+	)
+	typer.echo("-" * 136)
+	for name, entry in stats.items():
+		counters = entry["counters"]
+		queue = entry["queue_latency_seconds"]
+		run = entry["run_duration_seconds"]
+		size = entry["result_size_bytes"]
+		avg_size = size["sum"] / size["count"] if size["count"] else None
+		typer.echo(
+			f"{name:<60} {counters['started']:>6} {counters['succeeded']:>6} "
+			f"{counters['retried']:>6} {counters['failed']:>6} "
+			f"{fmt(quantile(queue, 0.5)) + '/' + fmt(quantile(queue, 0.95)):>16} "
+			f"{fmt(quantile(run, 0.5)) + '/' + fmt(quantile(run, 0.95)):>16} "
+			f"{fmt(avg_size and round(avg_size), 'B'):>11}"
+		)
+	typer.echo("\nPercentiles estimados por el límite superior del bucket.")
 
 
 @cmd.command("test-celery")
@@ -193,7 +329,31 @@ def sync_with_yiqi_database(
 	currencies: bool = Option(True, help="Sincronizar divisas"),
 	services: bool = Option(True, help="Sincronizar servicios"),
 	providers: bool = Option(True, help="Sincronizar proveedores"),
+	purchase_invoices: bool = Option(True, help="Sincronizar facturas de compra"),
+	full: bool = Option(
+		False, help="Ignorar las marcas de agua y descargar el historial completo"
+	),
 ):
+	"""
+	Sincroniza la copia local de Yiqi (monedas, servicios, proveedores y
+	facturas de compra).
+
+	Por defecto es incremental: cada entidad pide sólo los cambios desde su
+	última sincronización confirmada (la misma que ejecuta celery beat). Las
+	listas chicas se descargan en paralelo; las facturas de compra se leen
+	como stream. Todo se escribe con upserts masivos.
+	"""
+	selected = {
+		"MONEDA": currencies,
+		"SERVICIOS": services,
+		"CLIENTE": providers,
+		"FACTURA_COMPRA": purchase_invoices,
+	}
+	entities = [name for name, enabled in selected.items() if enabled]
+	if not entities:
+		typer.echo("⚠️  No se seleccionó ninguna entidad para sincronizar")
+		return
+
 	async def run_sync():
 		typer.echo("\n🔄 Iniciando sincronización de yiqi con la base de datos...")
 		typer.echo("=" * 60)
@@ -218,177 +378,43 @@ def sync_with_yiqi_database(
 		get_modules_setup("modules")
 		typer.echo("✅ Configuraciones cargadas\n")
 
-		yiqi_service: YiqiServiceProtocol = service_locator.get_service("yiqi_service")
+		import uuid
 
-		# Sincronizar currencies
-		if currencies:
-			typer.echo("🔍 Obteniendo currencies de yiqi...")
-			from sqlmodel import select
-
-			from modules.finance.domain.entity.currency import Currency
-
-			currencies_data = await yiqi_service.get_currency_list(
-				id_schema=env.YIQI_SCHEMA
-			)
-
-			async with session_factory() as session:
-				try:
-					created = 0
-					updated = 0
-					for currency_item in currencies_data:
-						id_yiqi = currency_item.get("id")
-
-						code = currency_item.get("MONE_NOMBRE", "")
-						country = currency_item.get("PAIS_PAIS")
-
-						if not code:
-							continue
-
-						# Buscar si ya existe la moneda
-						stmt = select(Currency).where(Currency.code == code)
-						result = await session.execute(stmt)
-						existing_currency = result.scalars().first()
-
-						if existing_currency:
-							# Actualizar si existe
-							existing_currency.name = code
-							existing_currency.country = country
-							session.add(existing_currency)
-							updated += 1
-						else:
-							# Crear nueva si no existe
-							new_currency = Currency(
-								name=code,
-								code=code,
-								country=country,
-							)
-							session.add(new_currency)
-							created += 1
-
-					await session.commit()
-					typer.echo(f"✅ Se sincronizaron {len(currencies_data)} currencies (Nuevas: {created}, Actualizadas: {updated})")
-				except Exception as e:
-					await session.rollback()
-					typer.echo(f"❌ Error sincronizando currencies: {e}")
-					raise
-			typer.echo("")
-
-		# Sincronizar servicios
-		if services:
-			typer.echo("🔍 Obteniendo servicios de yiqi...")
-			from sqlmodel import select
-
-			from modules.provider.domain.entity.purchase_invoice_service import (
-				PurchaseInvoiceService,
-			)
+		from core.db.session import (
+			reset_session_context,
+			session,
+			set_session_context,
+		)
 
-			services_data = await yiqi_service.get_services_list(
-				id_schema=env.YIQI_SCHEMA
+		sync_service: YiqiSyncServiceProtocol = service_locator.get_service(
+			"yiqi_sync_service"
+		)
+		context = set_session_context(str(uuid.uuid4()))
+		try:
+			results = await sync_service.sync_all(
+				env.YIQI_SCHEMA, entities=entities, full=full
 			)
-
-			async with session_factory() as session:
-				try:
-					created = 0
-					updated = 0
-					for service_item in services_data:
-						id_yiqi = service_item.get("id")
-
-						name = service_item.get("SERV_SERVICIO", "")
-						group = service_item.get("SERV_MARCA_DE_GASTOS")
-						is_active = service_item.get("SERV_ACTIVO_PRO")
-
-						# Solo sincronizar servicios activos o sin estado definido (None)
-						# Filtrar solo los explícitamente inactivos ("N")
-						if is_active == "N" or not name:
-							continue
-
-						# Buscar si ya existe el servicio
-						stmt = select(PurchaseInvoiceService).where(
-							PurchaseInvoiceService.id_yiqi_service == id_yiqi
-						)
-						result = await session.execute(stmt)
-						existing_service = result.scalars().first()
-
-						if existing_service:
-							# Actualizar si existe
-							existing_service.name = name
-							existing_service.group = group
-							session.add(existing_service)
-							updated += 1
-						else:
-							# Crear nuevo si no existe
-							new_service = PurchaseInvoiceService(
-								name=name,
-								group=group,
-								id_yiqi_service=id_yiqi,
-							)
-							session.add(new_service)
-							created += 1
-
-					await session.commit()
-					typer.echo(f"✅ Se sincronizaron {len(services_data)} servicios (Nuevos: {created}, Actualizados: {updated})")
-				except Exception as e:
-					await session.rollback()
-					typer.echo(f"❌ Error sincronizando servicios: {e}")
-					raise
-			typer.echo("")
-
-		# Sincronizar proveedores
-		if providers:
-			typer.echo("🔍 Obteniendo proveedores de yiqi...")
-			from sqlmodel import select
-
-			from modules.provider.domain.entity.provider import Provider
-
-			providers_data = await yiqi_service.get_providers_list(
-				id_schema=env.YIQI_SCHEMA
+		finally:
+			await session.remove()
+			reset_session_context(context)
+
+		failed = False
+		for result in results:
+			since = result.since.strftime("%d/%m/%Y") if result.since else "inicio"
+			if result.error:
+				failed = True
+				typer.echo(f"❌ {result.entity_name}: {result.error}")
+				continue
+			typer.echo(
+				f"✅ {result.entity_name} desde {since}: {result.fetched} recibidos "
+				f"(Nuevos: {result.created}, Actualizados: {result.updated}, "
+				f"Sin cambios: {result.unchanged})"
 			)
 
-			async with session_factory() as session:
-				try:
-					created = 0
-					updated = 0
-					for provider_item in providers_data:
-						id_yiqi = provider_item.get("id")
-
-						name = provider_item.get("CLIE_NOMBRE", "")
-						currency = provider_item.get("CLIE_MONEDA")
-						is_active_provider = provider_item.get("CLIE_ACTIVO_P") == "S"
-
-						# Solo sincronizar proveedores activos
-						if not is_active_provider or not name:
-							continue
-
-						# Buscar si ya existe el proveedor
-						stmt = select(Provider).where(Provider.id_yiqi_provider == id_yiqi)
-						result = await session.execute(stmt)
-						existing_provider = result.scalars().first()
-
-						if existing_provider:
-							# Actualizar si existe
-							existing_provider.name = name
-							existing_provider.currency = currency
-							session.add(existing_provider)
-							updated += 1
-						else:
-							# Crear nuevo si no existe
-							new_provider = Provider(
-								name=name,
-								currency=currency,
-								id_yiqi_provider=id_yiqi,
-							)
-							session.add(new_provider)
-							created += 1
-
-					await session.commit()
-					typer.echo(f"✅ Se sincronizaron {len(providers_data)} proveedores (Nuevos: {created}, Actualizados: {updated})")
-				except Exception as e:
-					await session.rollback()
-					typer.echo(f"❌ Error sincronizando proveedores: {e}")
-					raise
-			typer.echo("")
-
 		typer.echo("=" * 60)
+		if failed:
+			typer.echo("⚠️  Sincronización completada con errores\n")
+			sys.exit(1)
 		typer.echo("✨ Sincronización completada exitosamente\n")
 
 	asyncio.run(run_sync())
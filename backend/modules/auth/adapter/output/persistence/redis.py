@@ -1,14 +1,39 @@
 import uuid
-from datetime import datetime, timedelta
+from datetime import timedelta
+from typing import List
 
-from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ResponseError, WatchError
 from modules.auth.domain.repository.auth import AuthRepository
 from modules.auth.domain.entity import RecoverPassword
+from modules.module.application.dto import ModuleViewDTO
 from modules.user.application.dto import LoginResponseDTO
+from modules.user.application.dto.user import UserLoginResponseDTO
+
+_modules_adapter = TypeAdapter(List[ModuleViewDTO])
+
+
+# Versión del esquema de la sesión en Redis (campo `v` del hash)
+SESSION_SCHEMA_VERSION = "2"
 
 
 class RedisAuthRepository(AuthRepository):
+	"""
+	Sesiones de usuario en Redis.
+
+	Cada sesión ocupa dos claves con el mismo TTL:
+
+	- `session:<uuid>`: hash con `v`, `user` y `modules` (JSON), `token` y
+	  `refresh_token`. Sólo se lee entero en el refresh.
+	- `session:<uuid>:permissions`: set con los tokens de permiso. Es lo único
+	  que `AuthBackend` lee en cada request.
+
+	Las sesiones creadas antes de este esquema (el `LoginResponseDTO` como
+	JSON en un string) se convierten al leerlas, conservando su TTL.
+	"""
+
 	session_prefix = "session"
 	permission_prefix = "permission"
 	days_of_expiration = 7
@@ -17,40 +42,138 @@ class RedisAuthRepository(AuthRepository):
 		self.session_repository = session_repository
 		self.permission_repository = permission_repository
 
-	async def create_user_session(self, login_response_dto: LoginResponseDTO):
-		expiration_time = datetime.now() + timedelta(days=self.days_of_expiration)
-		ttl_seconds = int((expiration_time - datetime.now()).total_seconds())
+	def _session_key(self, user_uuid) -> str:
+		return f"{self.session_prefix}:{user_uuid}"
+
+	def _permissions_key(self, user_uuid) -> str:
+		return f"{self.session_prefix}:{user_uuid}:permissions"
+
+	def _default_ttl_ms(self) -> int:
+		return int(timedelta(days=self.days_of_expiration).total_seconds() * 1000)
 
-		status = await self.session_repository.set(
-			f"{self.session_prefix}:{login_response_dto.user.id}",  # type: ignore
-			login_response_dto.model_dump_json(),
-			ex=ttl_seconds,
+	def _queue_session(
+		self, pipe: Pipeline, login_response_dto: LoginResponseDTO, ttl_ms: int
+	) -> None:
+		"""Encola la escritura completa de la sesión (reemplaza la anterior)."""
+		session_key = self._session_key(login_response_dto.user.id)
+		permissions_key = self._permissions_key(login_response_dto.user.id)
+		pipe.delete(session_key, permissions_key)
+		pipe.hset(
+			session_key,
+			mapping={
+				"v": SESSION_SCHEMA_VERSION,
+				"user": login_response_dto.user.model_dump_json(),
+				"modules": _modules_adapter.dump_json(login_response_dto.modules).decode(),
+				"token": login_response_dto.token,
+				"refresh_token": login_response_dto.refresh_token,
+			},
 		)
-		print(f" ++ [{status}] Session created for: {login_response_dto.user.id}")
+		if login_response_dto.permissions:
+			pipe.sadd(permissions_key, *login_response_dto.permissions)
+		pipe.pexpire(session_key, ttl_ms)
+		pipe.pexpire(permissions_key, ttl_ms)
+
+	async def _write_session(
+		self, login_response_dto: LoginResponseDTO, ttl_ms: int
+	) -> None:
+		pipe = self.session_repository.pipeline(transaction=True)
+		self._queue_session(pipe, login_response_dto, ttl_ms)
+		await pipe.execute()
+
+	async def create_user_session(self, login_response_dto: LoginResponseDTO):
+		await self._write_session(login_response_dto, self._default_ttl_ms())
+		print(f" ++ Session created for: {login_response_dto.user.id}")
 
 	async def get_user_session(self, user_uuid: str):
-		session = await self.session_repository.get(
-			f"{self.session_prefix}:{user_uuid}"
+		session = await self._read_session(user_uuid)
+		if isinstance(session, ResponseError):
+			# WRONGTYPE: sesión con el esquema anterior (o una clave ajena)
+			return await self._migrate_legacy_session(user_uuid)
+		return session
+
+	async def _read_session(
+		self, user_uuid: str
+	) -> LoginResponseDTO | ResponseError | None:
+		"""Lee el hash y los permisos; devuelve el ResponseError si la clave no es un hash."""
+		pipe = self.session_repository.pipeline(transaction=False)
+		pipe.hgetall(self._session_key(user_uuid))
+		pipe.smembers(self._permissions_key(user_uuid))
+		fields, permissions = await pipe.execute(raise_on_error=False)
+
+		if isinstance(fields, ResponseError):
+			return fields
+		if not fields:
+			return None
+		return LoginResponseDTO(
+			user=UserLoginResponseDTO.model_validate_json(fields["user"]),
+			permissions=sorted(permissions),
+			modules=_modules_adapter.validate_json(fields["modules"]),
+			token=fields["token"],
+			refresh_token=fields["refresh_token"],
 		)
-		if isinstance(session, str):
-			session = LoginResponseDTO.model_validate_json(jsonable_encoder(session))
-			return session
-		return None
 
 	async def revoque_user_session(self, login_response_dto: LoginResponseDTO):
-		status = await self.session_repository.set(
-			f"{self.session_prefix}:{login_response_dto.user.id}",  # type: ignore
-			login_response_dto.model_dump_json(),
-			keepttl=True,
+		ttl_ms = await self.session_repository.pttl(
+			self._session_key(login_response_dto.user.id)
 		)
-		print(f" ~~ [{status}] Session revoqued for: {login_response_dto.user.id}")
+		if ttl_ms < 0:
+			# La sesión expiró mientras tanto (o no tenía TTL): vuelve a durar lo de un login
+			ttl_ms = self._default_ttl_ms()
+		await self._write_session(login_response_dto, ttl_ms)
+		print(f" ~~ Session revoqued for: {login_response_dto.user.id}")
+
+	async def get_user_permissions(self, user_uuid: str) -> List[str] | None:
+		"""
+		Permisos de la sesión, sin leer el resto. None si no hay sesión.
+		"""
+		pipe = self.session_repository.pipeline(transaction=False)
+		pipe.type(self._session_key(user_uuid))
+		pipe.smembers(self._permissions_key(user_uuid))
+		key_type, permissions = await pipe.execute()
+
+		if key_type == "hash":
+			return list(permissions)
+		if key_type == "string":
+			session = await self._migrate_legacy_session(user_uuid)
+			return session.permissions if session else None
+		return None
+
+	async def _migrate_legacy_session(self, user_uuid: str) -> LoginResponseDTO | None:
+		"""
+		Reescribe una sesión guardada como JSON con el esquema actual.
 
-	async def get_user_permissions(self, user_uuid: str):
-		raise NotImplementedError
+		Usa WATCH: si un login o un refresh la reemplaza en el medio, gana esa
+		escritura y se devuelve la sesión vieja sólo para este request. Una
+		clave de otro tipo no es una sesión: se trata como sesión inexistente.
+		"""
+		session_key = self._session_key(user_uuid)
+		async with self.session_repository.pipeline(transaction=True) as pipe:
+			await pipe.watch(session_key)
+			key_type = await pipe.type(session_key)
+			if key_type != "string":
+				await pipe.reset()
+				if key_type == "hash":
+					# Otro request ya la migró
+					session = await self._read_session(user_uuid)
+					return session if isinstance(session, LoginResponseDTO) else None
+				if key_type != "none":
+					print(f" !! Unexpected {key_type} key for session: {user_uuid}")
+				return None
+			session = LoginResponseDTO.model_validate_json(await pipe.get(session_key))
+			ttl_ms = await pipe.pttl(session_key)
+			if ttl_ms < 0:
+				ttl_ms = self._default_ttl_ms()
+			pipe.multi()
+			self._queue_session(pipe, session, ttl_ms)
+			try:
+				await pipe.execute()
+			except WatchError:
+				pass
+		return session
 
 	async def delete_user_session(self, user_uuid: str):
 		status = await self.session_repository.delete(
-			f"{self.session_prefix}:{user_uuid}"
+			self._session_key(user_uuid), self._permissions_key(user_uuid)
 		)
 		print(f" -- [{status}] Session deleted for: {user_uuid}")
 
@@ -22,7 +22,7 @@ class AuthRepositoryAdapter(AuthRepository):
 		return await self.redis_repository.revoque_user_session(login_response_dto)
 
 	async def get_user_permissions(self, user_uuid: str):
-		raise NotImplementedError
+		return await self.redis_repository.get_user_permissions(user_uuid)
 
 	async def delete_user_session(self, user_uuid: str):
 		return await self.redis_repository.delete_user_session(user_uuid)
@@ -1,10 +1,12 @@
+import logging
 from dataclasses import dataclass
+from typing import List
 
 from fastapi.encoders import jsonable_encoder
 
 from core.config.settings import env
 from core.db.transactional import Transactional
-from core.helpers.password import PasswordHelper
+from core.helpers.password import PasswordHasher
 from core.helpers.token import TokenHelper
 from modules.auth.application.dto import AuthPasswordResetResponseDTO
 from modules.auth.application.exception import (
@@ -31,6 +33,8 @@ from shared.interfaces.service_protocols import (
 	UserServiceProtocol,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AuthService:
@@ -39,13 +43,16 @@ class AuthService:
 	role_service: RoleServiceProtocol
 	email_template_service: EmailTemplateServiceProtocol
 	notification_service: NotificationServiceProtocol
+	password_hasher: PasswordHasher
 
 	def __post_init__(self):
 		self.user_service = self.user_service()
 		self.role_service = self.role_service()
 		self.email_template_service = self.email_template_service()
 		self.notification_service = self.notification_service()
-		self.usecase = AuthUseCaseFactory(self.user_service, self.auth_repository)
+		self.usecase = AuthUseCaseFactory(
+			self.user_service, self.auth_repository, self.password_hasher
+		)
 
 	async def login(
 		self, email_or_nickname: str, password: str
@@ -62,9 +69,9 @@ class AuthService:
 		if user.requires_password_reset and password == user.initial_password:
 			return AuthPasswordResetResponseDTO.model_validate(user.model_dump())
 
-		is_password_valid = PasswordHelper.verify_password(
-			password, user.password or None
-		)  # type: ignore
+		is_password_valid, new_hash = await self.password_hasher.verify_and_update(
+			password, user.password
+		)
 
 		if not is_password_valid:
 			raise LoginUsernamePasswordException
@@ -72,6 +79,9 @@ class AuthService:
 		if not user.is_active:
 			raise UserInactiveException
 
+		if new_hash:
+			await self._update_password_hash(user, new_hash)
+
 		user_response = UserLoginResponseDTO.model_validate(user.model_dump())
 		user_dump = jsonable_encoder(user_response)
 		permissions = []
@@ -119,7 +129,7 @@ class AuthService:
 		if not new_password:
 			raise AuthPasswordResetError
 
-		hashed_password = PasswordHelper.get_password_hash(new_password)
+		hashed_password = await self.password_hasher.hash(new_password)
 
 		await self.user_service.set_user_password(user, hashed_password)
 		return True
@@ -210,12 +220,31 @@ class AuthService:
 
 		return True
 
+	async def _update_password_hash(self, user, new_hash: str) -> None:
+		"""
+		Guarda el hash regenerado con el costo actual (PASSWORD_BCRYPT_ROUNDS).
+		Si falla, el login sigue: se reintenta en el próximo.
+		"""
+		try:
+			await self._save_password_hash(user, new_hash)
+		except Exception as e:
+			logger.warning(f"No se pudo actualizar el hash de la contraseña: {e}")
+
+	@Transactional()
+	async def _save_password_hash(self, user, new_hash: str) -> None:
+		user.password = new_hash
+		await self.user_service.save_user(user)
+
 	### TODO ofrecer un servicio que sea get_user_session -> LoginResponseDTO | AuthPasswordResetResponseDTO
 
 	async def get_user_session(self, user_uuid: str):
 		session = await self.usecase.get_session_user(user_uuid)
 		return session
 
+	async def get_user_permissions(self, user_uuid: str) -> List[str] | None:
+		"""Permisos de la sesión activa (None si no hay sesión)."""
+		return await self.usecase.get_session_permissions(user_uuid)
+
 	def _prepare_template(self, template: bytes, data: dict) -> str:
 		template_decoded = template.decode()
 		for key, value in data.items():
@@ -2,7 +2,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-from core.helpers.password import PasswordHelper
+from core.helpers.password import PasswordHasher, PasswordHelper
 from modules.auth.domain.command import RegisterUserDTO
 from modules.auth.domain.entity import RecoverPassword
 from modules.auth.domain.exception import RegisteredUserException
@@ -36,10 +36,19 @@ class GetSessionUser(UseCase):
 		return session
 
 
+@dataclass
+class GetSessionPermissions(UseCase):
+	auth_repository: AuthRepository
+
+	async def __call__(self, user_uuid: str):
+		return await self.auth_repository.get_user_permissions(user_uuid)
+
+
 @dataclass
 class CreateRecoveryPasswordRequest(UseCase):
 	auth_repository: AuthRepository
 	user_service: UserServiceProtocol
+	password_hasher: PasswordHasher
 
 	async def __call__(
 		self, user_uuid: uuid.UUID, expiration_hours: int = 24
@@ -56,7 +65,7 @@ class CreateRecoveryPasswordRequest(UseCase):
 		"""
 		# Generar una nueva contraseña temporal
 		temporary_password = PasswordHelper.generate_password()
-		hashed_password = PasswordHelper.get_password_hash(temporary_password)
+		hashed_password = await self.password_hasher.hash(temporary_password)
 
 		# Crear la fecha de expiración (sin timezone para coincidir con la BD)
 		fecha_expiracion = datetime.now() + timedelta(hours=expiration_hours)
@@ -83,6 +92,7 @@ class CreateRecoveryPasswordRequest(UseCase):
 class CompleteRecoveryPassword(UseCase):
 	auth_repository: AuthRepository
 	user_service: UserServiceProtocol
+	password_hasher: PasswordHasher
 
 	async def __call__(
 		self, user_uuid: uuid.UUID, temporary_password: str, new_password: str
@@ -102,8 +112,6 @@ class CompleteRecoveryPassword(UseCase):
 		Raises:
 			ValueError: Si no hay solicitud activa o la contraseña no coincide
 		"""
-		from core.helpers.password import PasswordHelper
-
 		# Buscar la solicitud de recuperación activa
 		recovery_request = await self.auth_repository.get_active_recovery_request(
 			user_uuid
@@ -113,7 +121,7 @@ class CompleteRecoveryPassword(UseCase):
 			raise ValueError("No hay solicitud de recuperación activa o ya expiró")
 
 		# Validar la contraseña temporal contra el hash guardado
-		is_valid = PasswordHelper.verify_password(
+		is_valid = await self.password_hasher.verify(
 			temporary_password, recovery_request.new_password
 		)
 
@@ -126,7 +134,7 @@ class CompleteRecoveryPassword(UseCase):
 			raise ValueError("Usuario no encontrado")
 
 		# Establecer la nueva contraseña
-		hashed_password = PasswordHelper.get_password_hash(new_password)
+		hashed_password = await self.password_hasher.hash(new_password)
 		user.password = hashed_password
 		user.requires_password_reset = False
 		await self.user_service.save_user(user)
@@ -141,13 +149,15 @@ class CompleteRecoveryPassword(UseCase):
 class AuthUseCaseFactory:
 	user_service: UserServiceProtocol
 	auth_repository: AuthRepository
+	password_hasher: PasswordHasher
 
 	def __post_init__(self):
 		self.register_user = RegisterUser(self.user_service)
 		self.get_session_user = GetSessionUser(self.auth_repository)
+		self.get_session_permissions = GetSessionPermissions(self.auth_repository)
 		self.create_recovery_password_request = CreateRecoveryPasswordRequest(
-			self.auth_repository, self.user_service
+			self.auth_repository, self.user_service, self.password_hasher
 		)
 		self.complete_recovery_password = CompleteRecoveryPassword(
-			self.auth_repository, self.user_service
+			self.auth_repository, self.user_service, self.password_hasher
 		)
@@ -1,7 +1,9 @@
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
-from dependency_injector.providers import Factory, Object, Singleton
+from dependency_injector.providers import Configuration, Factory, Object, Singleton
 
+from core.config.settings import env
 from core.db.redis_db import RedisClient
+from core.helpers.password import PasswordHasher
 from modules.auth.adapter.output.persistence.redis import RedisAuthRepository
 from modules.auth.adapter.output.persistence.sqlalchemy import AuthSQLAlchemyRepository
 from modules.auth.adapter.output.persistence.repository_adapter import (
@@ -14,6 +16,7 @@ from shared.interfaces.service_locator import service_locator
 
 class AuthContainer(DeclarativeContainer):
 	wiring_config = WiringConfiguration(packages=["."], auto_wire=True)
+	config = Configuration(pydantic_settings=[env])
 
 	redis_session_repository = Object(RedisClient.session)
 	redis_permission_repository = Object(RedisClient.permission)
@@ -32,9 +35,16 @@ class AuthContainer(DeclarativeContainer):
 		sqlalchemy_repository=sqlalchemy_repository,
 	)
 
+	password_hasher = Singleton(
+		PasswordHasher,
+		rounds=config.PASSWORD_BCRYPT_ROUNDS,
+		max_workers=config.PASSWORD_HASH_MAX_WORKERS,
+	)
+
 	service = Factory(
 		AuthService,
 		auth_repository=repository_adapter,
+		password_hasher=password_hasher,
 		user_service=service_locator.get_dependency("user_service"),
 		role_service=service_locator.get_dependency("rbac.role_service"),
 		email_template_service=service_locator.get_dependency("email_template_service"),
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import uuid
+from typing import List
 
 from modules.user.application.dto import LoginResponseDTO
 from modules.auth.domain.entity import RecoverPassword
@@ -18,7 +19,7 @@ class AuthRepository(ABC):
 	) -> None: ...
 
 	@abstractmethod
-	async def get_user_permissions(self, user_uuid: str): ...
+	async def get_user_permissions(self, user_uuid: str) -> List[str] | None: ...
 
 	@abstractmethod
 	async def delete_user_session(self, user_uuid: str): ...
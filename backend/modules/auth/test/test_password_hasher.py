@@ -0,0 +1,98 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bcrypt
+import pytest
+
+import shared.models  # noqa: F401
+from core.helpers.password import PasswordHasher
+from modules.auth.application.exception import LoginUsernamePasswordException
+from modules.auth.application.service.auth import AuthService
+from modules.user.domain.entity.user import User
+
+
+@pytest.fixture
+def hasher():
+	hasher = PasswordHasher(rounds=4, max_workers=2)
+	yield hasher
+	hasher.close()
+
+
+async def test_hash_and_verify(hasher):
+	hashed = await hasher.hash("secreto")
+
+	assert hashed.startswith("$2b$04$")
+	assert await hasher.verify("secreto", hashed)
+	assert not await hasher.verify("otro", hashed)
+	assert not await hasher.verify("secreto", None)
+	assert not await hasher.verify("secreto", "texto plano")
+
+
+async def test_long_passwords_match_hashes_truncated_at_72_bytes(hasher):
+	password = "ñ" * 50  # 100 bytes
+	legacy_hash = bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt(4)).decode()
+
+	assert await hasher.verify(password, legacy_hash)
+
+
+async def test_hash_with_other_cost_is_updated(hasher):
+	old_hash = bcrypt.hashpw(b"secreto", bcrypt.gensalt(5)).decode()
+
+	valid, new_hash = await hasher.verify_and_update("secreto", old_hash)
+	assert valid and new_hash.startswith("$2b$04$")
+	assert await hasher.verify_and_update("secreto", new_hash) == (True, None)
+	assert await hasher.verify_and_update("otro", old_hash) == (False, None)
+
+
+async def test_event_loop_keeps_running_while_hashing():
+	hasher = PasswordHasher(rounds=10, max_workers=2)
+	ticks = []
+
+	async def ticker():
+		while True:
+			ticks.append(time.perf_counter())
+			await asyncio.sleep(0.005)
+
+	task = asyncio.create_task(ticker())
+	await asyncio.gather(*[hasher.hash("secreto") for _ in range(4)])
+	task.cancel()
+	hasher.close()
+
+	gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+	assert len(ticks) > 5
+	assert max(gaps) < 0.05
+
+
+def auth_service(user, hasher):
+	user_service = MagicMock()
+	user_service.get_user_by_email_or_nickname = AsyncMock(return_value=user)
+	user_service.save_user = AsyncMock()
+	auth_repository = MagicMock()
+	auth_repository.create_user_session = AsyncMock()
+	return AuthService(
+		auth_repository,
+		lambda: user_service,
+		lambda: MagicMock(),
+		lambda: MagicMock(),
+		lambda: MagicMock(),
+		hasher,
+	)
+
+
+async def test_login_rehashes_password_stored_with_old_cost(hasher):
+	old_hash = bcrypt.hashpw(b"secreto", bcrypt.gensalt(5)).decode()
+	user = User(email="a@b.c", password=old_hash, requires_password_reset=False)
+	service = auth_service(user, hasher)
+
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		response = await service.login("a@b.c", "secreto")
+
+	assert response.user.email == "a@b.c"
+	service.user_service.save_user.assert_awaited_once_with(user)
+	assert user.password.startswith("$2b$04$")
+
+	with pytest.raises(LoginUsernamePasswordException):
+		await service.login("a@b.c", "otro")
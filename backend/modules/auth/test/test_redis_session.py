@@ -0,0 +1,215 @@
+import uuid
+
+import pytest
+from redis.exceptions import ResponseError, WatchError
+
+from modules.auth.adapter.output.persistence.redis import RedisAuthRepository
+from modules.module.application.dto import ModuleViewDTO
+from modules.user.application.dto import LoginResponseDTO
+from modules.user.application.dto.user import UserLoginResponseDTO
+
+
+class InMemoryRedis:
+	"""Los comandos de Redis que usa la sesión, con TTL fijo (no expira)."""
+
+	def __init__(self):
+		self.data = {}
+		self.ttls = {}
+		self.versions = {}
+
+	def _touch(self, key):
+		self.versions[key] = self.versions.get(key, 0) + 1
+
+	def _typed(self, key, kind):
+		value = self.data.get(key)
+		if value is not None and not isinstance(value, kind):
+			raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+		return value
+
+	async def type(self, key):
+		value = self.data.get(key)
+		return {str: "string", dict: "hash", set: "set"}.get(type(value), "none")
+
+	async def set(self, key, value, ex=None):
+		self.data[key] = value
+		self.ttls[key] = ex * 1000 if ex else -1
+		self._touch(key)
+		return True
+
+	async def get(self, key):
+		return self._typed(key, str)
+
+	async def hset(self, key, mapping):
+		self._typed(key, dict)
+		self.data.setdefault(key, {}).update(mapping)
+		self.ttls.setdefault(key, -1)
+		self._touch(key)
+
+	async def hgetall(self, key):
+		return dict(self._typed(key, dict) or {})
+
+	async def sadd(self, key, *members):
+		self._typed(key, set)
+		self.data.setdefault(key, set()).update(members)
+		self.ttls.setdefault(key, -1)
+		self._touch(key)
+
+	async def smembers(self, key):
+		return set(self._typed(key, set) or set())
+
+	async def delete(self, *keys):
+		deleted = 0
+		for key in keys:
+			if self.data.pop(key, None) is not None:
+				deleted += 1
+				self.ttls.pop(key, None)
+				self._touch(key)
+		return deleted
+
+	async def pexpire(self, key, ttl_ms):
+		if key not in self.data:
+			return False
+		self.ttls[key] = ttl_ms
+		return True
+
+	async def pttl(self, key):
+		return self.ttls.get(key, -2)
+
+	def pipeline(self, transaction=True):
+		return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+	def __init__(self, redis: InMemoryRedis):
+		self.redis = redis
+		self.queue = []
+		self.watched = {}
+		self.immediate = False
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		await self.reset()
+
+	async def watch(self, *keys):
+		self.immediate = True
+		self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+
+	def multi(self):
+		self.immediate = False
+
+	async def reset(self):
+		self.queue, self.watched, self.immediate = [], {}, False
+
+	def __getattr__(self, name):
+		command = getattr(self.redis, name)
+		if self.immediate:
+			return command
+
+		def queue(*args, **kwargs):
+			self.queue.append((command, args, kwargs))
+			return self
+
+		return queue
+
+	async def execute(self, raise_on_error=True):
+		if any(self.redis.versions.get(key, 0) != v for key, v in self.watched.items()):
+			raise WatchError("watched key changed")
+		results = []
+		for command, args, kwargs in self.queue:
+			try:
+				results.append(await command(*args, **kwargs))
+			except ResponseError as e:
+				if raise_on_error:
+					raise
+				results.append(e)
+		await self.reset()
+		return results
+
+
+def login_response(permissions=("providers:read", "providers:write")) -> LoginResponseDTO:
+	return LoginResponseDTO(
+		user=UserLoginResponseDTO(
+			id=uuid.uuid4(), email="a@b.c", fk_role=3, is_admin=False, is_owner=False
+		),
+		permissions=list(permissions),
+		modules=[ModuleViewDTO(name="Proveedores", token="providers", description="")],
+		token="access.jwt",
+		refresh_token="refresh.jwt",
+	)
+
+
+@pytest.fixture
+def redis():
+	return InMemoryRedis()
+
+
+@pytest.fixture
+def repository(redis):
+	return RedisAuthRepository(redis, redis)
+
+
+async def test_session_is_a_hash_plus_a_permission_set(repository, redis):
+	session = login_response()
+	await repository.create_user_session(session)
+	user_id = session.user.id
+
+	assert await redis.type(f"session:{user_id}") == "hash"
+	assert await redis.smembers(f"session:{user_id}:permissions") == set(session.permissions)
+	assert await redis.pttl(f"session:{user_id}") == 7 * 24 * 3600 * 1000
+	assert await redis.pttl(f"session:{user_id}:permissions") == 7 * 24 * 3600 * 1000
+	assert await repository.get_user_session(str(user_id)) == session
+	assert sorted(await repository.get_user_permissions(str(user_id))) == session.permissions
+
+	await repository.delete_user_session(str(user_id))
+	assert redis.data == {}
+	assert await repository.get_user_session(str(user_id)) is None
+	assert await repository.get_user_permissions(str(user_id)) is None
+
+
+async def test_revoque_replaces_permissions_and_keeps_ttl(repository, redis):
+	session = login_response()
+	await repository.create_user_session(session)
+	redis.ttls[f"session:{session.user.id}"] = 60_000
+
+	refreshed = session.model_copy(
+		update={"permissions": ["providers:read"], "refresh_token": "otro.jwt"}
+	)
+	await repository.revoque_user_session(refreshed)
+
+	assert await repository.get_user_session(str(session.user.id)) == refreshed
+	assert await redis.pttl(f"session:{session.user.id}") == 60_000
+	assert await redis.pttl(f"session:{session.user.id}:permissions") == 60_000
+
+
+async def test_session_without_permissions_is_still_a_session(repository):
+	session = login_response(permissions=())
+	await repository.create_user_session(session)
+
+	assert await repository.get_user_permissions(str(session.user.id)) == []
+	assert (await repository.get_user_session(str(session.user.id))).permissions == []
+
+
+@pytest.mark.parametrize("read", ["get_user_permissions", "get_user_session"])
+async def test_legacy_json_session_is_migrated_on_read(repository, redis, read):
+	session = login_response()
+	await redis.set(f"session:{session.user.id}", session.model_dump_json(), ex=3600)
+
+	result = await getattr(repository, read)(str(session.user.id))
+
+	if read == "get_user_session":
+		assert result == session
+	else:
+		assert sorted(result) == session.permissions
+	assert await redis.type(f"session:{session.user.id}") == "hash"
+	assert await redis.pttl(f"session:{session.user.id}") == 3_600_000
+	assert await repository.get_user_session(str(session.user.id)) == session
+
+
+async def test_key_of_another_type_is_not_a_session(repository, redis):
+	user_id = uuid.uuid4()
+	redis.data[f"session:{user_id}"] = {"basura"}
+
+	assert await repository.get_user_session(str(user_id)) is None
+	assert await repository.get_user_permissions(str(user_id)) is None
@@ -0,0 +1,97 @@
+import mimetypes
+from typing import Mapping
+
+from fastapi import Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from core.helpers.http import (
+	RangeNotSatisfiable,
+	content_disposition,
+	etag_matches,
+	etag_matches_strong,
+	http_date,
+	parse_byte_range,
+	parse_http_date,
+)
+from modules.file_storage.application.dto import FileStreamDTO
+from modules.file_storage.domain.entity import FileMetadata
+
+# Siempre se revalida (así se vuelve a chequear el acceso) pero sin reenviar
+# el contenido si no cambió: un archivo por id es inmutable
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_for(metadata: FileMetadata) -> str:
+	# El hash del contenido; los archivos anteriores a la deduplicación no lo
+	# tienen, pero su clave tampoco se reescribe
+	return f'"{metadata.sha256 or metadata.id.hex}"'
+
+
+def build_download_response(
+	file_dto: FileStreamDTO, request_headers: Mapping[str, str], method: str = "GET"
+) -> Response:
+	"""
+	Respuesta de descarga con validadores y rangos:
+
+	- `ETag` (hash del contenido) y `Last-Modified`: `If-None-Match` /
+	  `If-Modified-Since` responden 304 sin tocar el storage.
+	- `Range` de un tramo: 206 con un GET con Range al storage. `If-Range`
+	  que no coincide y varios tramos devuelven el archivo completo.
+	- `Content-Length` cuando se conoce el tamaño.
+	- Si el storage tiene el archivo en disco (`local_path`) responde con
+	  `FileResponse`, que resuelve los rangos y usa sendfile si el servidor
+	  ASGI lo soporta.
+	"""
+	metadata = file_dto.metadata
+	etag = etag_for(metadata)
+	headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+	if metadata.date_created:
+		headers["Last-Modified"] = http_date(metadata.date_created)
+
+	if_none_match = request_headers.get("if-none-match")
+	if if_none_match is not None:
+		not_modified = etag_matches(if_none_match, etag)
+	else:
+		since = parse_http_date(request_headers.get("if-modified-since"))
+		not_modified = bool(
+			since and metadata.date_created and parse_http_date(headers["Last-Modified"]) <= since
+		)
+	if not_modified:
+		return Response(status_code=304, headers=headers)
+
+	filename = metadata.download_filename or metadata.filename
+	headers["Content-Disposition"] = content_disposition(filename)
+	media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+	if file_dto.local_path is not None:
+		# Conserva ETag y Last-Modified propios (no los del stat del archivo)
+		return FileResponse(file_dto.local_path, headers=headers, media_type=media_type)
+
+	size = metadata.size
+	status_code = 200
+	stream = file_dto.stream
+
+	if size is not None:
+		headers["Accept-Ranges"] = "bytes"
+		if_range = request_headers.get("if-range")
+		byte_range = None
+		if if_range is None or etag_matches_strong(if_range, etag):
+			try:
+				byte_range = parse_byte_range(request_headers.get("range"), size)
+			except RangeNotSatisfiable:
+				headers["Content-Range"] = f"bytes */{size}"
+				return Response(status_code=416, headers=headers)
+
+		if byte_range is not None and file_dto.read_range is not None:
+			start, end = byte_range
+			status_code = 206
+			headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+			headers["Content-Length"] = str(end - start + 1)
+			stream = file_dto.read_range(byte_range)
+		else:
+			headers["Content-Length"] = str(size)
+
+	if method == "HEAD":
+		return Response(status_code=status_code, headers=headers, media_type=media_type)
+	return StreamingResponse(
+		content=stream, status_code=status_code, headers=headers, media_type=media_type
+	)
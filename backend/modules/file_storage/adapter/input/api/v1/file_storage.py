@@ -1,12 +1,18 @@
-from io import BytesIO
 import uuid
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Request, UploadFile
 
 from modules.file_storage.container import FileStorageContainer
 
-# from modules.file_storage.adapter.input.api.v1.request import ProviderCreateRequest, ProviderUpdateRequest
+from modules.file_storage.adapter.input.api.v1.download import build_download_response
+from modules.file_storage.adapter.input.api.v1.request import (
+	UploadConfirmRequest,
+	UploadUrlCreateRequest,
+)
+from modules.file_storage.application.dto import (
+	PresignedDownloadDTO,
+	PresignedUploadDTO,
+)
 from modules.file_storage.application.service.file_storage import FileStorageService
 from modules.file_storage.domain.command import SaveFileCommand
 
@@ -27,21 +33,50 @@ async def upload_file(
 	return await service.save_file(command)
 
 
+@file_storage_router.post("/upload-url", response_model=PresignedUploadDTO)
+@inject
+async def create_upload_url(
+	request: UploadUrlCreateRequest,
+	service: FileStorageService = Depends(Provide[FileStorageContainer.service]),
+):
+	"""
+	Subida directa al storage: el cliente sube con `request` y después envía
+	`upload_token` a /upload/confirm. /upload queda como alternativa.
+	"""
+	return await service.create_upload_url(request)
+
+
+@file_storage_router.post("/upload/confirm")
+@inject
+async def confirm_upload(
+	request: UploadConfirmRequest,
+	service: FileStorageService = Depends(Provide[FileStorageContainer.service]),
+):
+	return await service.confirm_upload(request)
+
+
+@file_storage_router.get("/{uuid_file}/download-url", response_model=PresignedDownloadDTO)
+@inject
+async def get_download_url(
+	uuid_file: uuid.UUID,
+	service: FileStorageService = Depends(Provide[FileStorageContainer.service]),
+):
+	return await service.get_download_url(uuid_file)
+
+
 @file_storage_router.post("/{uuid_file}/download")
+@file_storage_router.get("/{uuid_file}/download", name="get_download")
+@file_storage_router.head("/{uuid_file}/download", include_in_schema=False)
 @inject
 async def download_file(
 	uuid_file: uuid.UUID,
+	request: Request,
 	service: FileStorageService = Depends(Provide[FileStorageContainer.service]),
 ):
-	file_dto = await service.download_file(uuid_file)
-	headers = {
-		"Content-Disposition": f'attachment; filename="{file_dto.metadata.download_filename}"'
-	}
-	return StreamingResponse(
-		content=BytesIO(file_dto.file),
-		headers=headers,
-		media_type="application/octet-stream",
-	)
+	# Alternativa a /download-url: se reenvía por bloques, sin cargarlo entero.
+	# GET admite Range y respuestas condicionales (ETag / 304)
+	file_dto = await service.stream_file(uuid_file)
+	return build_download_response(file_dto, request.headers, request.method)
 
 
 @file_storage_router.get("/{uuid_file}")
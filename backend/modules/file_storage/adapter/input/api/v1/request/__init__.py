@@ -1,7 +1,10 @@
-from modules.provider.domain.command import CreateProviderCommand, UpdateProviderCommand
+from modules.file_storage.domain.command import (
+	ConfirmUploadCommand,
+	CreateUploadUrlCommand,
+)
 
 
-class ProviderCreateRequest(CreateProviderCommand): ...
+class UploadUrlCreateRequest(CreateUploadUrlCommand): ...
 
 
-class ProviderUpdateRequest(UpdateProviderCommand): ...
+class UploadConfirmRequest(ConfirmUploadCommand): ...
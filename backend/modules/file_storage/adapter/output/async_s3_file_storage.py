@@ -0,0 +1,265 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, BinaryIO, Dict, Literal, Tuple
+
+import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
+
+from core.helpers.http import content_disposition
+from modules.file_storage.application.exceptions import (
+	FileStorageDownloadException,
+	FileStorageUploadException,
+)
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import PresignedRequest
+
+# S3 exige partes de al menos 5 MiB (salvo la última)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+class AsyncS3FileStorage(FileStorageRepository):
+	"""
+	Storage S3 con cliente async (aioboto3) compartido por el proceso.
+
+	- Un único cliente con pool de conexiones; se abre en el primer uso y se
+	  vuelve a abrir si cambia el event loop (el pool de aiohttp queda atado
+	  al loop en el que se creó).
+	- Los archivos de más de `part_size` se suben en multipart con hasta
+	  `upload_concurrency` partes en vuelo: en memoria hay como máximo
+	  `upload_concurrency + 1` partes, sin importar el tamaño del archivo.
+	- Las descargas se leen por bloques directo del socket.
+	"""
+
+	def __init__(
+		self,
+		bucket_name: str,
+		region: str,
+		access_key: str,
+		secret_key: str,
+		endpoint_url: str | None = None,
+		part_size: int = DEFAULT_PART_SIZE,
+		upload_concurrency: int = 4,
+		max_pool_connections: int = 20,
+	):
+		self.bucket_name = bucket_name
+		self.part_size = max(part_size, MIN_PART_SIZE)
+		self.upload_concurrency = max(upload_concurrency, 1)
+		self._region = region
+		self._endpoint_url = endpoint_url
+		self._session = aioboto3.Session(
+			aws_access_key_id=access_key,
+			aws_secret_access_key=secret_key,
+			region_name=region,
+		)
+		self._config = AioConfig(
+			signature_version="s3v4",
+			max_pool_connections=max_pool_connections,
+			# Los S3 compatibles (MinIO, stand-in) no resuelven el bucket por DNS
+			s3={"addressing_style": "path"} if endpoint_url else None,
+		)
+		self._client = None
+		self._client_loop: asyncio.AbstractEventLoop | None = None
+		self._client_lock: asyncio.Lock | None = None
+		self._exit_stack: AsyncExitStack | None = None
+
+	async def client(self) -> Any:
+		loop = asyncio.get_running_loop()
+		if self._client_loop is not loop:
+			# El cliente del loop anterior no se puede cerrar desde este
+			self._client = None
+			self._exit_stack = None
+			self._client_loop = loop
+			self._client_lock = asyncio.Lock()
+
+		if self._client is None:
+			async with self._client_lock:
+				if self._client is None:
+					stack = AsyncExitStack()
+					self._client = await stack.enter_async_context(
+						self._session.client(
+							"s3", endpoint_url=self._endpoint_url, config=self._config
+						)
+					)
+					self._exit_stack = stack
+		return self._client
+
+	async def close(self) -> None:
+		if self._exit_stack is not None:
+			stack, self._exit_stack, self._client = self._exit_stack, None, None
+			await stack.aclose()
+
+	def _url(self, filename: str) -> str:
+		if self._endpoint_url:
+			return f"{self._endpoint_url.rstrip('/')}/{self.bucket_name}/{filename}"
+		return f"https://{self.bucket_name}.s3.{self._region}.amazonaws.com/{filename}"
+
+	async def upload_file(self, file: BinaryIO, filename: str) -> str:
+		"""
+		Sube el archivo por partes. Si entra en una sola parte se usa un
+		único PutObject.
+
+		`file.read` es bloqueante, pero `UploadFile` guarda en memoria o en un
+		archivo temporal local: leer una parte es mucho más rápido que subirla.
+		"""
+		client = await self.client()
+		try:
+			body = file.read(self.part_size)
+			if len(body) < self.part_size:
+				await client.put_object(Bucket=self.bucket_name, Key=filename, Body=body)
+			else:
+				await self._upload_multipart(client, file, filename, body)
+		except ClientError as e:
+			raise FileStorageUploadException(message=e)
+
+		return self._url(filename)
+
+	async def _upload_multipart(
+		self, client: Any, file: BinaryIO, filename: str, first_part: bytes
+	) -> None:
+		upload = await client.create_multipart_upload(Bucket=self.bucket_name, Key=filename)
+		upload_id = upload["UploadId"]
+		etags: Dict[int, str] = {}
+		slots = asyncio.Semaphore(self.upload_concurrency)
+		tasks: list[asyncio.Task] = []
+
+		async def upload_part(part_number: int, body: bytes) -> None:
+			try:
+				response = await client.upload_part(
+					Bucket=self.bucket_name,
+					Key=filename,
+					UploadId=upload_id,
+					PartNumber=part_number,
+					Body=body,
+				)
+				etags[part_number] = response["ETag"]
+			finally:
+				slots.release()
+
+		try:
+			part_number, body = 1, first_part
+			while body:
+				# Se lee la parte siguiente recién cuando hay lugar para subirla
+				await slots.acquire()
+				failed = next((task for task in tasks if task.done() and task.exception()), None)
+				if failed:
+					slots.release()
+					raise failed.exception()
+				tasks.append(asyncio.create_task(upload_part(part_number, body)))
+				part_number += 1
+				body = file.read(self.part_size)
+
+			await asyncio.gather(*tasks)
+			await client.complete_multipart_upload(
+				Bucket=self.bucket_name,
+				Key=filename,
+				UploadId=upload_id,
+				MultipartUpload={
+					"Parts": [
+						{"PartNumber": number, "ETag": etags[number]} for number in sorted(etags)
+					]
+				},
+			)
+		except BaseException:
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+			try:
+				await client.abort_multipart_upload(
+					Bucket=self.bucket_name, Key=filename, UploadId=upload_id
+				)
+			except ClientError:
+				pass
+			raise
+
+	async def download_file(self, filename: str) -> bytes:
+		client = await self.client()
+		try:
+			response = await client.get_object(Bucket=self.bucket_name, Key=filename)
+			body = response["Body"]
+			async with body:
+				return await body.read()
+		except ClientError as e:
+			raise FileStorageDownloadException(message=e)
+
+	async def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		client = await self.client()
+		params = {"Bucket": self.bucket_name, "Key": filename}
+		if byte_range is not None:
+			params["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+		try:
+			response = await client.get_object(**params)
+		except ClientError as e:
+			raise FileStorageDownloadException(message=e)
+
+		# Cerrar el body libera la conexión aunque no se haya leído completo
+		body = response["Body"]
+		async with body:
+			async for chunk in body.iter_chunks(chunk_size):
+				yield chunk
+
+	async def generate_upload_url(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		client = await self.client()
+		if method == "PUT":
+			params = {"Bucket": self.bucket_name, "Key": filename}
+			headers = {}
+			if content_type:
+				params["ContentType"] = content_type
+				headers["Content-Type"] = content_type
+			url = await client.generate_presigned_url(
+				"put_object", Params=params, ExpiresIn=expires_in, HttpMethod="PUT"
+			)
+			return PresignedRequest(method="PUT", url=url, headers=headers)
+
+		fields = {}
+		conditions = []
+		if content_type:
+			fields["Content-Type"] = content_type
+			conditions.append({"Content-Type": content_type})
+		if max_size is not None:
+			conditions.append(["content-length-range", 0, max_size])
+		post = await client.generate_presigned_post(
+			Bucket=self.bucket_name,
+			Key=filename,
+			Fields=fields,
+			Conditions=conditions,
+			ExpiresIn=expires_in,
+		)
+		return PresignedRequest(method="POST", url=post["url"], fields=post["fields"])
+
+	async def generate_download_url(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		client = await self.client()
+		params = {"Bucket": self.bucket_name, "Key": filename}
+		if download_filename:
+			params["ResponseContentDisposition"] = content_disposition(download_filename)
+		return await client.generate_presigned_url(
+			"get_object", Params=params, ExpiresIn=expires_in
+		)
+
+	async def get_size(self, filename: str) -> int | None:
+		client = await self.client()
+		try:
+			response = await client.head_object(Bucket=self.bucket_name, Key=filename)
+		except ClientError as e:
+			if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+				return None
+			raise FileStorageDownloadException(message=e)
+		return response["ContentLength"]
@@ -0,0 +1,128 @@
+import asyncio
+from typing import AsyncIterator, BinaryIO, Literal, Tuple
+
+from modules.file_storage.adapter.output.disk_cache import DiskLRUCache
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import PresignedRequest
+
+
+class CachedFileStorage(FileStorageRepository):
+	"""
+	Cache en disco local delante de las lecturas de otro storage.
+
+	`download_file` y `stream_file` sirven desde disco los archivos ya
+	leídos. En un fallo, `stream_file` copia los bloques al cache mientras
+	los entrega; si el consumidor corta antes del final, la copia se descarta.
+	Los tramos (`byte_range`) se sirven del cache si está el archivo y si no
+	se piden al storage sin cachearlos.
+	Escrituras, URLs firmadas y consultas van directo al storage.
+	"""
+
+	def __init__(self, file_storage_repository: FileStorageRepository, cache: DiskLRUCache):
+		self.file_storage_repository = file_storage_repository
+		self.cache = cache
+
+	async def _open_cached(self, filename: str) -> BinaryIO | None:
+		path = await asyncio.to_thread(self.cache.get, filename)
+		if path is None:
+			return None
+		try:
+			return await asyncio.to_thread(open, path, "rb")
+		except FileNotFoundError:
+			# Lo desalojó otro proceso entre get y open
+			return None
+
+	async def download_file(self, filename: str) -> bytes:
+		cached = await self._open_cached(filename)
+		if cached is not None:
+			with cached:
+				return await asyncio.to_thread(cached.read)
+
+		content = await self.file_storage_repository.download_file(filename)
+		if self.cache.accepts(len(content)):
+			await asyncio.to_thread(self.cache.put, filename, content)
+		return content
+
+	async def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		cached = await self._open_cached(filename)
+		if cached is not None:
+			with cached:
+				remaining = None
+				if byte_range is not None:
+					await asyncio.to_thread(cached.seek, byte_range[0])
+					remaining = byte_range[1] - byte_range[0] + 1
+				while remaining is None or remaining > 0:
+					size = chunk_size if remaining is None else min(chunk_size, remaining)
+					chunk = await asyncio.to_thread(cached.read, size)
+					if not chunk:
+						break
+					if remaining is not None:
+						remaining -= len(chunk)
+					yield chunk
+			return
+
+		if byte_range is not None:
+			async for chunk in self.file_storage_repository.stream_file(
+				filename, chunk_size, byte_range
+			):
+				yield chunk
+			return
+
+		writer = None
+		if self.cache.enabled:
+			writer = await asyncio.to_thread(self.cache.open_writer, filename)
+		try:
+			async for chunk in self.file_storage_repository.stream_file(filename, chunk_size):
+				if writer is not None:
+					if self.cache.accepts(writer.size + len(chunk)):
+						await asyncio.to_thread(writer.write, chunk)
+					else:
+						await asyncio.to_thread(writer.discard)
+						writer = None
+				yield chunk
+		except BaseException:
+			if writer is not None:
+				await asyncio.to_thread(writer.discard)
+			raise
+		if writer is not None:
+			await asyncio.to_thread(writer.commit)
+
+	async def upload_file(self, file: BinaryIO, filename: str) -> str:
+		return await self.file_storage_repository.upload_file(file, filename)
+
+	async def generate_upload_url(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		return await self.file_storage_repository.generate_upload_url(
+			filename, expires_in, content_type, max_size, method
+		)
+
+	async def generate_download_url(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		return await self.file_storage_repository.generate_download_url(
+			filename, expires_in, download_filename
+		)
+
+	async def get_size(self, filename: str) -> int | None:
+		return await self.file_storage_repository.get_size(filename)
+
+	async def get_local_path(self, filename: str) -> str | None:
+		# Las entradas del cache se pueden desalojar mientras se envían: no se exponen
+		return await self.file_storage_repository.get_local_path(filename)
+
+	async def close(self) -> None:
+		return await self.file_storage_repository.close()
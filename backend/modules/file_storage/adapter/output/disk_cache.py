@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TEMP_PREFIX = ".tmp-"
+# Temporales de escrituras que no terminaron (proceso caído) se borran pasada esta edad
+STALE_TEMP_SECONDS = 3600
+# Al desalojar se baja hasta esta fracción del máximo, para no desalojar en cada escritura
+EVICT_TARGET_RATIO = 0.9
+
+
+class DiskLRUCache:
+	"""
+	Cache de archivos en disco local con tamaño máximo, compartido por los
+	procesos de la máquina (API y workers usan el mismo directorio).
+
+	- Cada clave es un archivo; las escrituras van a un temporal y se publican
+	  con `os.replace`, así otro proceso nunca lee un archivo a medias.
+	- Un acierto actualiza el mtime: al pasarse de `max_bytes` se borran los
+	  de mtime más viejo (LRU aproximado, sin índice compartido).
+	- Cada proceso lleva una estimación del tamaño y recorre el directorio
+	  sólo cuando la estimación supera el máximo.
+
+	Sólo sirve para contenido inmutable (las claves del storage no se
+	reescriben). Con `max_bytes=0` está deshabilitada.
+
+	Los métodos hacen I/O bloqueante: llamarlos con `asyncio.to_thread`.
+	"""
+
+	def __init__(self, directory: str, max_bytes: int, max_file_bytes: int | None = None):
+		self.directory = Path(directory)
+		self.max_bytes = max_bytes
+		self.max_file_bytes = max_file_bytes or max_bytes
+		self._size: int | None = None
+
+	@property
+	def enabled(self) -> bool:
+		return self.max_bytes > 0
+
+	def accepts(self, size: int) -> bool:
+		return self.enabled and size <= self.max_file_bytes
+
+	def path_for(self, key: str) -> Path:
+		digest = hashlib.sha256(key.encode()).hexdigest()
+		return self.directory / digest[:2] / digest
+
+	def get(self, key: str) -> Path | None:
+		if not self.enabled:
+			return None
+		path = self.path_for(key)
+		try:
+			os.utime(path)
+		except FileNotFoundError:
+			return None
+		return path
+
+	def open_writer(self, key: str) -> "CacheWriter":
+		path = self.path_for(key)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		handle, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+		return CacheWriter(self, path, Path(temp_path), os.fdopen(handle, "wb"))
+
+	def put(self, key: str, content: bytes) -> None:
+		if not self.accepts(len(content)):
+			return
+		writer = self.open_writer(key)
+		try:
+			writer.write(content)
+		except BaseException:
+			writer.discard()
+			raise
+		writer.commit()
+
+	def _added(self, size: int) -> None:
+		if self._size is None:
+			self._size = self._scan_size()
+		else:
+			self._size += size
+		if self._size > self.max_bytes:
+			self.evict()
+
+	def _entries(self) -> list[tuple[float, int, Path]]:
+		entries = []
+		now = time.time()
+		for path in self.directory.glob("*/*"):
+			try:
+				stat = path.stat()
+			except FileNotFoundError:
+				continue
+			if path.name.startswith(TEMP_PREFIX):
+				if now - stat.st_mtime > STALE_TEMP_SECONDS:
+					path.unlink(missing_ok=True)
+				continue
+			entries.append((stat.st_mtime, stat.st_size, path))
+		return entries
+
+	def _scan_size(self) -> int:
+		return sum(size for _, size, _ in self._entries())
+
+	def evict(self) -> None:
+		entries = sorted(self._entries())
+		total = sum(size for _, size, _ in entries)
+		target = self.max_bytes * EVICT_TARGET_RATIO
+		for _, size, path in entries:
+			if total <= target:
+				break
+			path.unlink(missing_ok=True)
+			total -= size
+		self._size = total
+		logger.debug(f"File cache evicted down to {total} bytes")
+
+
+class CacheWriter:
+	"""Escritura en curso de una entrada; `commit` la publica y `discard` la descarta."""
+
+	def __init__(self, cache: DiskLRUCache, path: Path, temp_path: Path, file):
+		self.cache = cache
+		self.path = path
+		self.temp_path = temp_path
+		self.file = file
+		self.size = 0
+
+	def write(self, chunk: bytes) -> None:
+		self.file.write(chunk)
+		self.size += len(chunk)
+
+	def commit(self) -> None:
+		self.file.close()
+		os.replace(self.temp_path, self.path)
+		self.cache._added(self.size)
+
+	def discard(self) -> None:
+		self.file.close()
+		self.temp_path.unlink(missing_ok=True)
@@ -1,3 +1,4 @@
+from typing import List, Sequence
 from uuid import UUID
 
 from modules.file_storage.domain.command import CreateFileMetadataCommand
@@ -12,6 +13,14 @@ class FileMetadataAdapter(FileMetadataRepository):
 	async def get_by_uuid(self, uuid: UUID) -> FileMetadata | None:
 		return await self.file_metadata_repository.get_by_uuid(uuid)
 
+	async def get_by_uuids(
+		self, uuids: list[UUID]
+	) -> List[FileMetadata] | Sequence[FileMetadata]:
+		return await self.file_metadata_repository.get_by_uuids(uuids)
+
+	async def get_by_sha256(self, sha256: str) -> FileMetadata | None:
+		return await self.file_metadata_repository.get_by_sha256(sha256)
+
 	def create(self, command: CreateFileMetadataCommand) -> FileMetadata:
 		return self.create(command)
 
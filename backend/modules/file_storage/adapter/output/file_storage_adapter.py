@@ -1,6 +1,10 @@
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO, Literal, Tuple
 
-from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import PresignedRequest
 
 
 class FileStorageAdapter(FileStorageRepository):
@@ -12,3 +16,39 @@ class FileStorageAdapter(FileStorageRepository):
 
 	async def download_file(self, filename: str) -> bytes:
 		return await self.file_storage_repository.download_file(filename)
+
+	def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		return self.file_storage_repository.stream_file(filename, chunk_size, byte_range)
+
+	async def generate_upload_url(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		return await self.file_storage_repository.generate_upload_url(
+			filename, expires_in, content_type, max_size, method
+		)
+
+	async def generate_download_url(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		return await self.file_storage_repository.generate_download_url(
+			filename, expires_in, download_filename
+		)
+
+	async def get_size(self, filename: str) -> int | None:
+		return await self.file_storage_repository.get_size(filename)
+
+	async def get_local_path(self, filename: str) -> str | None:
+		return await self.file_storage_repository.get_local_path(filename)
+
+	async def close(self) -> None:
+		return await self.file_storage_repository.close()
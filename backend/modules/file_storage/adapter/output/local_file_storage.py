@@ -0,0 +1,114 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Tuple
+
+from modules.file_storage.application.exceptions import (
+	FileStorageDownloadException,
+	FileStorageUploadException,
+)
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+
+TEMP_PREFIX = ".tmp-"
+# Bloque de copia al escribir (shutil usa 64 KiB; con archivos grandes conviene más)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class LocalFileStorage(FileStorageRepository):
+	"""
+	Storage en un directorio local, para desarrollo, QA, despliegues de un
+	solo nodo y benchmarks sin red.
+
+	- Cada clave es una ruta relativa a `directory`; las que salen del
+	  directorio (`..`, rutas absolutas) se rechazan.
+	- Las escrituras van a un temporal en el mismo directorio y se publican
+	  con `os.replace`: un lector nunca ve un archivo a medias y dos
+	  escrituras de la misma clave no se mezclan.
+	- `get_local_path` permite que la API responda con `FileResponse`, que
+	  usa sendfile si el servidor ASGI lo soporta, sin pasar los bytes por
+	  Python.
+
+	No firma URLs: `/upload-url` y `/download-url` responden 501.
+	"""
+
+	def __init__(self, directory: str):
+		self.directory = Path(directory).resolve()
+
+	def _path_for(self, filename: str) -> Path:
+		path = (self.directory / filename).resolve()
+		if not path.is_relative_to(self.directory) or path == self.directory:
+			raise ValueError(f"Invalid storage key: {filename}")
+		return path
+
+	def _write(self, file: BinaryIO, path: Path) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		handle, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+		try:
+			with os.fdopen(handle, "wb") as temp_file:
+				shutil.copyfileobj(file, temp_file, COPY_BUFFER_SIZE)
+				temp_file.flush()
+				os.fsync(temp_file.fileno())
+			os.replace(temp_path, path)
+		except BaseException:
+			Path(temp_path).unlink(missing_ok=True)
+			raise
+
+	async def upload_file(self, file: BinaryIO, filename: str) -> str:
+		try:
+			path = self._path_for(filename)
+			await asyncio.to_thread(self._write, file, path)
+		except (OSError, ValueError) as e:
+			raise FileStorageUploadException(message=str(e))
+		return path.as_uri()
+
+	async def download_file(self, filename: str) -> bytes:
+		try:
+			return await asyncio.to_thread(self._path_for(filename).read_bytes)
+		except (OSError, ValueError) as e:
+			raise FileStorageDownloadException(message=str(e))
+
+	async def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		try:
+			file = await asyncio.to_thread(open, self._path_for(filename), "rb")
+		except (OSError, ValueError) as e:
+			raise FileStorageDownloadException(message=str(e))
+
+		with file:
+			remaining = None
+			if byte_range is not None:
+				await asyncio.to_thread(file.seek, byte_range[0])
+				remaining = byte_range[1] - byte_range[0] + 1
+			while remaining is None or remaining > 0:
+				size = chunk_size if remaining is None else min(chunk_size, remaining)
+				chunk = await asyncio.to_thread(file.read, size)
+				if not chunk:
+					break
+				if remaining is not None:
+					remaining -= len(chunk)
+				yield chunk
+
+	async def get_size(self, filename: str) -> int | None:
+		try:
+			stat = await asyncio.to_thread(os.stat, self._path_for(filename))
+		except FileNotFoundError:
+			return None
+		except ValueError as e:
+			raise FileStorageDownloadException(message=str(e))
+		return stat.st_size
+
+	async def get_local_path(self, filename: str) -> str | None:
+		try:
+			path = self._path_for(filename)
+		except ValueError:
+			return None
+		return str(path) if await asyncio.to_thread(path.is_file) else None
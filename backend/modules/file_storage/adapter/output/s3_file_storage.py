@@ -1,12 +1,18 @@
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO, Literal, Tuple
 import asyncio
 import boto3
 from functools import partial
+from core.helpers.http import content_disposition
 from modules.file_storage.application.exceptions import (
 	FileStorageUploadException,
 	FileStorageDownloadException,
 )
-from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import PresignedRequest
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
@@ -17,6 +23,7 @@ class S3FileStorage(FileStorageRepository):
 		region: str,
 		access_key: str,
 		secret_key: str,
+		endpoint_url: str | None = None,
 	):
 		self.bucket_name = bucket_name
 		self._session = boto3.Session(
@@ -24,7 +31,15 @@ class S3FileStorage(FileStorageRepository):
 			aws_secret_access_key=secret_key,
 			region_name=region,
 		)
-		self._s3 = self._session.client("s3")
+		# Las URLs firmadas con SigV2 no sirven en las regiones nuevas
+		self._s3 = self._session.client(
+			"s3",
+			endpoint_url=endpoint_url,
+			config=Config(
+				signature_version="s3v4",
+				s3={"addressing_style": "path"} if endpoint_url else None,
+			),
+		)
 		self._region = region
 
 	async def upload_file(self, file: BinaryIO, filename: str) -> str:
@@ -76,3 +91,98 @@ class S3FileStorage(FileStorageRepository):
 			return file_content
 		except ClientError as e:
 			raise FileStorageDownloadException(message=e)
+
+	async def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		"""
+		Lee el objeto de S3 por bloques: en memoria queda como máximo un bloque,
+		sin importar el tamaño del archivo. `byte_range` se pide a S3 como GET
+		con Range.
+		"""
+		loop = asyncio.get_event_loop()
+		params = {"Bucket": self.bucket_name, "Key": filename}
+		if byte_range is not None:
+			params["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+		try:
+			response = await loop.run_in_executor(
+				None,
+				partial(self._s3.get_object, **params),
+			)
+		except ClientError as e:
+			raise FileStorageDownloadException(message=e)
+
+		body = response["Body"]
+		try:
+			while True:
+				chunk = await loop.run_in_executor(None, body.read, chunk_size)
+				if not chunk:
+					break
+				yield chunk
+		finally:
+			body.close()
+
+	async def generate_upload_url(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		"""
+		Firma la subida directa a S3. Firmar es un cálculo local (no hay
+		request a S3), por eso no pasa por el thread pool.
+		"""
+		if method == "PUT":
+			params = {"Bucket": self.bucket_name, "Key": filename}
+			headers = {}
+			if content_type:
+				params["ContentType"] = content_type
+				headers["Content-Type"] = content_type
+			url = self._s3.generate_presigned_url(
+				"put_object", Params=params, ExpiresIn=expires_in, HttpMethod="PUT"
+			)
+			return PresignedRequest(method="PUT", url=url, headers=headers)
+
+		fields = {}
+		conditions = []
+		if content_type:
+			fields["Content-Type"] = content_type
+			conditions.append({"Content-Type": content_type})
+		if max_size is not None:
+			conditions.append(["content-length-range", 0, max_size])
+		post = self._s3.generate_presigned_post(
+			Bucket=self.bucket_name,
+			Key=filename,
+			Fields=fields,
+			Conditions=conditions,
+			ExpiresIn=expires_in,
+		)
+		return PresignedRequest(method="POST", url=post["url"], fields=post["fields"])
+
+	async def generate_download_url(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		params = {"Bucket": self.bucket_name, "Key": filename}
+		if download_filename:
+			params["ResponseContentDisposition"] = content_disposition(download_filename)
+		return self._s3.generate_presigned_url(
+			"get_object", Params=params, ExpiresIn=expires_in
+		)
+
+	async def get_size(self, filename: str) -> int | None:
+		loop = asyncio.get_event_loop()
+		try:
+			response = await loop.run_in_executor(
+				None,
+				partial(self._s3.head_object, Bucket=self.bucket_name, Key=filename),
+			)
+		except ClientError as e:
+			if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+				return None
+			raise FileStorageDownloadException(message=e)
+		return response["ContentLength"]
@@ -1,4 +1,6 @@
+from typing import List, Sequence
 from uuid import UUID
+from sqlmodel import col, select
 from core.db import session, session_factory
 from modules.file_storage.domain.command import CreateFileMetadataCommand
 from modules.file_storage.domain.entity.file_metadata import FileMetadata
@@ -11,6 +13,24 @@ class FileMetadataSQLAlchemyRepository(FileMetadataRepository):
 			file_metadata = await session.get(FileMetadata, uuid)
 		return file_metadata
 
+	async def get_by_uuids(
+		self, uuids: list[UUID]
+	) -> List[FileMetadata] | Sequence[FileMetadata]:
+		if not uuids:
+			return []
+		stmt = select(FileMetadata).where(col(FileMetadata.id).in_(uuids))
+		async with session_factory() as session:
+			result = await session.execute(stmt)
+		return result.scalars().all()
+
+	async def get_by_sha256(self, sha256: str) -> FileMetadata | None:
+		async with session_factory() as session:
+			result = await session.execute(
+				select(FileMetadata).where(FileMetadata.sha256 == sha256).limit(1)
+			)
+			file_metadata = result.scalars().first()
+		return file_metadata
+
 	def create(self, command: CreateFileMetadataCommand) -> FileMetadata:
 		return FileMetadata.model_validate(command)
 
@@ -1,9 +1,40 @@
 from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Tuple
+import uuid
 
 from modules.file_storage.domain.entity import FileMetadata
+from modules.file_storage.domain.vo import PresignedRequest
 
 
 @dataclass
 class FileStorageDTO:
 	file: bytes
 	metadata: FileMetadata
+
+
+@dataclass
+class FileStreamDTO:
+	# Se lee recién al iterarlo: abrirlo sólo consulta la metadata
+	stream: AsyncIterator[bytes]
+	metadata: FileMetadata
+	# Abre sólo un tramo (inicio, fin inclusivos) del mismo archivo, en vez de `stream`
+	read_range: Callable[[Tuple[int, int]], AsyncIterator[bytes]] | None = None
+	# Ruta local si el storage la tiene (storage local): se envía con sendfile
+	local_path: str | None = None
+
+
+@dataclass
+class PresignedUploadDTO:
+	# Id que tendrá la metadata una vez confirmada la subida
+	id: uuid.UUID
+	request: PresignedRequest
+	# Se envía a /upload/confirm después de subir el archivo
+	upload_token: str
+	expires_in: int
+
+
+@dataclass
+class PresignedDownloadDTO:
+	url: str
+	expires_in: int
+	metadata: FileMetadata
@@ -11,3 +11,21 @@ class FileStorageDownloadException(CustomException):
 	code = 400
 	error_code = "FILE_STORAGE__DOWNLOAD_ERROR"
 	message = "Hubo un error al descargar el archivo"
+
+
+class FileStorageUploadNotFoundException(CustomException):
+	code = 404
+	error_code = "FILE_STORAGE__UPLOAD_NOT_FOUND"
+	message = "El archivo no fue subido al storage"
+
+
+class FileStorageUploadSizeMismatchException(CustomException):
+	code = 400
+	error_code = "FILE_STORAGE__UPLOAD_SIZE_MISMATCH"
+	message = "El tamaño del archivo subido no coincide con el declarado"
+
+
+class FileStorageUploadTooLargeException(CustomException):
+	code = 413
+	error_code = "FILE_STORAGE__UPLOAD_TOO_LARGE"
+	message = "El archivo supera el tamaño máximo permitido"
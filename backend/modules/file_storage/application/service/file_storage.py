@@ -1,24 +1,52 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, Iterable
 import pathlib
 import uuid
 
-from modules.file_storage.application.dto import FileStorageDTO
+from core.helpers.token import DecodeTokenException, TokenHelper
+from modules.file_storage.application.dto import (
+	FileStorageDTO,
+	FileStreamDTO,
+	PresignedDownloadDTO,
+	PresignedUploadDTO,
+)
+from modules.file_storage.application.exceptions import (
+	FileStorageUploadNotFoundException,
+	FileStorageUploadSizeMismatchException,
+	FileStorageUploadTooLargeException,
+)
 from modules.file_storage.domain.command import (
+	ConfirmUploadCommand,
 	CreateFileMetadataCommand,
+	CreateUploadUrlCommand,
 	SaveFileCommand,
 )
 from modules.file_storage.domain.entity import FileMetadata
 from modules.file_storage.domain.repository.file_metadata import FileMetadataRepository
-from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import ContentAddress
 from modules.file_storage.application.usecase.file_metadata import FileMetadataUseCaseFactory
 from modules.file_storage.application.usecase.file_storage import FileStorageUseCaseFactory
 
 
+# Tipo del token de /upload-url: evita que otro JWT de la app sirva para confirmar
+UPLOAD_TOKEN_TYPE = "file_upload"
+
+
 @dataclass
 class FileStorageService:
 	file_storage_repository: FileStorageRepository
 	file_metadata_repository: FileMetadataRepository
+	# Vigencia de las URLs firmadas de subida y descarga
+	presigned_url_expires: int = 900
+	# Ventana para confirmar una subida directa
+	upload_confirm_expires: int = 86400
+	max_upload_size: int = 50 * 1024 * 1024
 
 	def __post_init__(self):
 		self.storage_usecase = FileStorageUseCaseFactory(self.file_storage_repository)
@@ -26,26 +54,45 @@ class FileStorageService:
 			self.file_metadata_repository
 		)
 
-	async def save_file(self, command: SaveFileCommand) -> FileMetadata | None:
+	@staticmethod
+	def _new_file_path(
+		original_filename: str, path_target: str | None = None
+	) -> tuple[uuid.UUID, str, str]:
 		uuid_for_file = uuid.uuid4()
 		today = datetime.now()
-		file_extension = pathlib.Path(command.filename).suffix
+		file_extension = pathlib.Path(original_filename).suffix
 		filename = str(uuid_for_file) + file_extension
 		file_path = f"{today.year}/{today.month}/{today.day}/{filename}"
-		if command.path_target:
-			file_path = f"{today.year}{command.path_target}/{filename}"
+		if path_target:
+			file_path = f"{today.year}{path_target}/{filename}"
+		return uuid_for_file, filename, file_path
 
-		await self.storage_usecase.upload_file_to_storage(
-			file=command.file,
-			filename=file_path,
-		)
+	async def save_file(self, command: SaveFileCommand) -> FileMetadata | None:
+		"""
+		Guarda el archivo direccionado por contenido: si ya hay un blob con el
+		mismo SHA-256 no se vuelve a subir y la metadata nueva apunta a ese.
+		"""
+		uuid_for_file, filename, _ = self._new_file_path(command.filename)
+		# Leer y hashear bloquea (UploadFile puede estar en disco)
+		address, file = await asyncio.to_thread(ContentAddress.read, command.file)
+
+		blob = await self.metadata_usecase.get_file_metadata_by_sha256(address.sha256)
+		if blob is not None and blob.path_target:
+			file_path = blob.path_target
+		else:
+			file_path = address.key
+			await self.storage_usecase.upload_file_to_storage(
+				file=file,
+				filename=file_path,
+			)
 
 		file_metadata_command = CreateFileMetadataCommand(
 			id=uuid_for_file,
 			path_target=file_path,
 			filename=filename,
 			download_filename=command.filename,
-			size=command.size,
+			size=address.size,
+			sha256=address.sha256,
 		)
 
 		file_metadata = self.metadata_usecase.create_file_metadata(
@@ -63,5 +110,110 @@ class FileStorageService:
 		)
 		return FileStorageDTO(file, metadata)
 
+	async def stream_file(
+		self, file_metadata_uuid: uuid.UUID, chunk_size: int = DEFAULT_CHUNK_SIZE
+	) -> FileStreamDTO:
+		metadata = await self.metadata_usecase.get_file_metadata_by_uuid(
+			file_metadata_uuid
+		)
+		path = metadata.path_target or metadata.filename
+		stream = self.storage_usecase.stream_file_from_storage(path, chunk_size)
+
+		def read_range(byte_range: tuple[int, int]):
+			return self.storage_usecase.stream_file_from_storage(path, chunk_size, byte_range)
+
+		local_path = await self.storage_usecase.get_local_file_path(path)
+		return FileStreamDTO(stream, metadata, read_range, local_path)
+
 	async def get_metadata(self, file_metadata_uuid: uuid.UUID) -> FileMetadata:
 		return await self.metadata_usecase.get_file_metadata_by_uuid(file_metadata_uuid)
+
+	async def get_metadata_many(
+		self, file_metadata_uuids: Iterable[uuid.UUID | None]
+	) -> Dict[uuid.UUID, FileMetadata]:
+		"""
+		Metadata de varios archivos con una sola consulta. Los ids que no
+		existen no aparecen en el resultado (no levanta excepción).
+		"""
+		return await self.metadata_usecase.get_file_metadata_by_uuids(file_metadata_uuids)
+
+	async def create_upload_url(
+		self, command: CreateUploadUrlCommand
+	) -> PresignedUploadDTO:
+		"""
+		Primer paso de la subida directa: firma el request contra el storage
+		y un token con la ubicación elegida. El archivo no pasa por la API y
+		la metadata recién se crea en `confirm_upload`.
+		"""
+		if command.size is not None and command.size > self.max_upload_size:
+			raise FileStorageUploadTooLargeException
+		uuid_for_file, filename, file_path = self._new_file_path(
+			command.filename, command.path_target
+		)
+
+		request = await self.storage_usecase.generate_upload_url(
+			file_path,
+			self.presigned_url_expires,
+			command.content_type,
+			command.size if command.size is not None else self.max_upload_size,
+			command.method,
+		)
+		upload_token = TokenHelper.encode(
+			payload={
+				"type": UPLOAD_TOKEN_TYPE,
+				"id": str(uuid_for_file),
+				"path_target": file_path,
+				"filename": filename,
+				"download_filename": command.filename,
+				"size": command.size,
+			},
+			expire_period=self.upload_confirm_expires,
+		)
+		return PresignedUploadDTO(
+			uuid_for_file, request, upload_token, self.presigned_url_expires
+		)
+
+	async def confirm_upload(self, command: ConfirmUploadCommand) -> FileMetadata | None:
+		"""
+		Segundo paso: verifica que el archivo esté en el storage y registra su
+		metadata con el tamaño real. Confirmar dos veces devuelve la misma
+		metadata.
+		"""
+		payload = TokenHelper.decode(command.upload_token)
+		if payload.get("type") != UPLOAD_TOKEN_TYPE:
+			raise DecodeTokenException
+
+		file_metadata_uuid = uuid.UUID(payload["id"])
+		existing = await self.file_metadata_repository.get_by_uuid(file_metadata_uuid)
+		if existing:
+			return existing
+
+		size = await self.storage_usecase.get_stored_file_size(payload["path_target"])
+		if size is None:
+			raise FileStorageUploadNotFoundException
+		if payload["size"] is not None and size != payload["size"]:
+			raise FileStorageUploadSizeMismatchException
+		if size > self.max_upload_size:
+			raise FileStorageUploadTooLargeException
+
+		file_metadata = self.metadata_usecase.create_file_metadata(
+			CreateFileMetadataCommand(
+				id=file_metadata_uuid,
+				path_target=payload["path_target"],
+				filename=payload["filename"],
+				download_filename=payload["download_filename"],
+				size=size,
+			)
+		)
+		return await self.metadata_usecase.save_file_metadata(file_metadata)
+
+	async def get_download_url(self, file_metadata_uuid: uuid.UUID) -> PresignedDownloadDTO:
+		metadata = await self.metadata_usecase.get_file_metadata_by_uuid(
+			file_metadata_uuid
+		)
+		url = await self.storage_usecase.generate_download_url(
+			metadata.path_target or metadata.filename,
+			self.presigned_url_expires,
+			metadata.download_filename,
+		)
+		return PresignedDownloadDTO(url, self.presigned_url_expires, metadata)
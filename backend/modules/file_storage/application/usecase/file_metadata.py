@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Dict, Iterable
 import uuid
 
 from core.db import Transactional
@@ -19,6 +20,27 @@ class GetFileMetadataByUuidUseCase:
 		return file_metadata
 
 
+@dataclass
+class GetFileMetadataByUuidsUseCase:
+	file_metadata_repository: FileMetadataRepository
+
+	async def __call__(
+		self, uuids: Iterable[uuid.UUID | None]
+	) -> Dict[uuid.UUID, FileMetadata]:
+		# Sin repetidos ni vacíos: una sola consulta IN
+		unique_uuids = list(dict.fromkeys(file_uuid for file_uuid in uuids if file_uuid))
+		files_metadata = await self.file_metadata_repository.get_by_uuids(unique_uuids)
+		return {file_metadata.id: file_metadata for file_metadata in files_metadata}
+
+
+@dataclass
+class GetFileMetadataBySha256UseCase:
+	file_metadata_repository: FileMetadataRepository
+
+	async def __call__(self, sha256: str) -> FileMetadata | None:
+		return await self.file_metadata_repository.get_by_sha256(sha256)
+
+
 @dataclass
 class CreateFileMetadataUseCase:
 	file_metadata_repository: FileMetadataRepository
@@ -53,6 +75,12 @@ class FileMetadataUseCaseFactory:
 		self.get_file_metadata_by_uuid = GetFileMetadataByUuidUseCase(
 			self.file_metadata_repository
 		)
+		self.get_file_metadata_by_uuids = GetFileMetadataByUuidsUseCase(
+			self.file_metadata_repository
+		)
+		self.get_file_metadata_by_sha256 = GetFileMetadataBySha256UseCase(
+			self.file_metadata_repository
+		)
 		self.create_file_metadata = CreateFileMetadataUseCase(
 			self.file_metadata_repository
 		)
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO, Literal, Tuple
 
-from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+from modules.file_storage.domain.repository.file_storage import (
+	DEFAULT_CHUNK_SIZE,
+	FileStorageRepository,
+)
+from modules.file_storage.domain.vo import PresignedRequest
 
 
 @dataclass
@@ -20,6 +24,64 @@ class DownloadFileFromStorageUseCase:
 		return await self.file_storage_repository.download_file(filename)
 
 
+@dataclass
+class StreamFileFromStorageUseCase:
+	file_storage_repository: FileStorageRepository
+
+	def __call__(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		return self.file_storage_repository.stream_file(filename, chunk_size, byte_range)
+
+
+@dataclass
+class GenerateUploadUrlUseCase:
+	file_storage_repository: FileStorageRepository
+
+	async def __call__(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		return await self.file_storage_repository.generate_upload_url(
+			filename, expires_in, content_type, max_size, method
+		)
+
+
+@dataclass
+class GenerateDownloadUrlUseCase:
+	file_storage_repository: FileStorageRepository
+
+	async def __call__(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		return await self.file_storage_repository.generate_download_url(
+			filename, expires_in, download_filename
+		)
+
+
+@dataclass
+class GetStoredFileSizeUseCase:
+	file_storage_repository: FileStorageRepository
+
+	async def __call__(self, filename: str) -> int | None:
+		return await self.file_storage_repository.get_size(filename)
+
+
+@dataclass
+class GetLocalFilePathUseCase:
+	file_storage_repository: FileStorageRepository
+
+	async def __call__(self, filename: str) -> str | None:
+		return await self.file_storage_repository.get_local_path(filename)
+
+
 @dataclass
 class FileStorageUseCaseFactory:
 	file_storage_repository: FileStorageRepository
@@ -31,3 +93,12 @@ class FileStorageUseCaseFactory:
 		self.download_file_from_storage = DownloadFileFromStorageUseCase(
 			self.file_storage_repository
 		)
+		self.stream_file_from_storage = StreamFileFromStorageUseCase(
+			self.file_storage_repository
+		)
+		self.generate_upload_url = GenerateUploadUrlUseCase(self.file_storage_repository)
+		self.generate_download_url = GenerateDownloadUrlUseCase(
+			self.file_storage_repository
+		)
+		self.get_stored_file_size = GetStoredFileSizeUseCase(self.file_storage_repository)
+		self.get_local_file_path = GetLocalFilePathUseCase(self.file_storage_repository)
@@ -1,9 +1,13 @@
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
 
-from dependency_injector.providers import Singleton, Factory, Configuration
+from dependency_injector.providers import Singleton, Factory, Configuration, Selector
 
+from .adapter.output.async_s3_file_storage import AsyncS3FileStorage
+from .adapter.output.cached_file_storage import CachedFileStorage
+from .adapter.output.disk_cache import DiskLRUCache
 from .adapter.output.file_metadata_adapter import FileMetadataAdapter
 from .adapter.output.file_storage_adapter import FileStorageAdapter
+from .adapter.output.local_file_storage import LocalFileStorage
 from .adapter.output.s3_file_storage import S3FileStorage
 
 from core.config.settings import env
@@ -17,18 +21,55 @@ class FileStorageContainer(DeclarativeContainer):
 	wiring_config = WiringConfiguration(packages=["."], auto_wire=True)
 	config = Configuration(pydantic_settings=[env])
 
-	s3_storage_repo = Singleton(
-		S3FileStorage,
-		bucket_name=config.AWS_ACCESS_BUCKET_NAME,
-		region=config.AWS_ACCESS_REGION,
-		access_key=config.AWS_ACCESS_KEY,
-		secret_key=config.AWS_ACCESS_SECRET_KEY,
+	s3_storage_repo = Selector(
+		config.FILE_STORAGE_S3_CLIENT,
+		aioboto3=Singleton(
+			AsyncS3FileStorage,
+			bucket_name=config.AWS_ACCESS_BUCKET_NAME,
+			region=config.AWS_ACCESS_REGION,
+			access_key=config.AWS_ACCESS_KEY,
+			secret_key=config.AWS_ACCESS_SECRET_KEY,
+			endpoint_url=config.AWS_S3_ENDPOINT_URL,
+			part_size=config.FILE_STORAGE_S3_PART_SIZE_BYTES,
+			upload_concurrency=config.FILE_STORAGE_S3_UPLOAD_CONCURRENCY,
+			max_pool_connections=config.FILE_STORAGE_S3_MAX_POOL_CONNECTIONS,
+		),
+		boto3=Singleton(
+			S3FileStorage,
+			bucket_name=config.AWS_ACCESS_BUCKET_NAME,
+			region=config.AWS_ACCESS_REGION,
+			access_key=config.AWS_ACCESS_KEY,
+			secret_key=config.AWS_ACCESS_SECRET_KEY,
+			endpoint_url=config.AWS_S3_ENDPOINT_URL,
+		),
+	)
+
+	disk_cache = Singleton(
+		DiskLRUCache,
+		directory=config.FILE_STORAGE_CACHE_DIR,
+		max_bytes=config.FILE_STORAGE_CACHE_MAX_BYTES,
+		max_file_bytes=config.FILE_STORAGE_CACHE_MAX_FILE_BYTES,
+	)
+
+	cached_storage_repo = Singleton(
+		CachedFileStorage, file_storage_repository=s3_storage_repo, cache=disk_cache
+	)
+
+	local_storage_repo = Singleton(
+		LocalFileStorage, directory=config.FILE_STORAGE_LOCAL_DIR
+	)
+
+	# El storage local ya está en disco: no pasa por el cache
+	storage_repo = Selector(
+		config.FILE_STORAGE_BACKEND,
+		s3=cached_storage_repo,
+		local=local_storage_repo,
 	)
 
 	metadata_repo = Singleton(FileMetadataSQLAlchemyRepository)
 
 	file_storage_adapter = Factory(
-		FileStorageAdapter, file_storage_repository=s3_storage_repo
+		FileStorageAdapter, file_storage_repository=storage_repo
 	)
 
 	file_metadata_adapter = Factory(
@@ -39,4 +80,7 @@ class FileStorageContainer(DeclarativeContainer):
 		FileStorageService,
 		file_storage_repository=file_storage_adapter,
 		file_metadata_repository=file_metadata_adapter,
+		presigned_url_expires=config.FILE_STORAGE_PRESIGNED_URL_EXPIRES_SECONDS,
+		upload_confirm_expires=config.FILE_STORAGE_UPLOAD_CONFIRM_SECONDS,
+		max_upload_size=config.FILE_STORAGE_MAX_UPLOAD_BYTES,
 	)
@@ -1,30 +1,55 @@
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 import uuid
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+
+def check_path_target(value: str):
+	if not isinstance(value, str) or not value:
+		raise ValueError("Path must be a non-empty string")
+
+	if len(value) == 1 and value == "/":
+		return value
+
+	if not "/" == value[0]:
+		raise ValueError("First character must be '/'")
+
+	if "/" == value[-1]:
+		raise ValueError("Last character must not be '/'")
+
+	if ".." in value.split("/"):
+		raise ValueError("Path must not contain '..' segments")
+
+	return value
 
 
 class SaveFileCommand(BaseModel):
 	file: Any  # BinaryIO
-	path_target: Optional[str] = None
+	# Sin path_target: save_file guarda por contenido (blobs/sha256/...)
 	filename: str
 	download_filename: Optional[str] = None
 	size: Optional[int] = None
 
-	@field_validator("path_target", mode="before")
-	@classmethod
-	def check_first_slash_character(cls, value: str):
-		if len(value) == 1 and value == "/":
-			return value
+	model_config = {"arbitrary_types_allowed": True}
 
-		if not "/" == value[0]:
-			raise ValueError("First character must be '/'")
 
-		if "/" == value[-1]:
-			raise ValueError("Last character must not be '/'")
+class CreateUploadUrlCommand(BaseModel):
+	filename: str
+	size: Optional[int] = Field(default=None, ge=0)
+	content_type: Optional[str] = None
+	path_target: Optional[str] = None
+	# POST permite acotar el tamaño en la política firmada; PUT no
+	method: Literal["POST", "PUT"] = "POST"
 
-		return value
+	@field_validator("path_target", mode="before")
+	@classmethod
+	def check_first_slash_character(cls, value: str | None):
+		if value is None:
+			return None
+		return check_path_target(value)
 
-	model_config = {"arbitrary_types_allowed": True}
+
+class ConfirmUploadCommand(BaseModel):
+	upload_token: str
 
 
 class CreateFileMetadataCommand(BaseModel):
@@ -33,3 +58,4 @@ class CreateFileMetadataCommand(BaseModel):
 	filename: str
 	download_filename: Optional[str] = None
 	size: Optional[int] = None
+	sha256: Optional[str] = None
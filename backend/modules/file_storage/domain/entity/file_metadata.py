@@ -10,5 +10,7 @@ class FileMetadata(SQLModel, table=True):
 	filename: str = Field(default=None)
 	download_filename: Optional[str] = Field(default=None)
 	size: Optional[int] = Field(default=None)
+	# Hash del contenido: las filas con el mismo sha256 comparten el blob de path_target
+	sha256: Optional[str] = Field(default=None, index=True)
 
 	date_created: Optional[datetime] = Field(default_factory=datetime.now)
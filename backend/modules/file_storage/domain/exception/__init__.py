@@ -5,3 +5,9 @@ class FileMetadataNotFoundException(CustomException):
 	code = 404
 	error_code = "FILE_METADATA__NOT_FOUND_ERROR"
 	message = "File metadata not found"
+
+
+class PresignedUrlNotSupportedException(CustomException):
+	code = 501
+	error_code = "FILE_STORAGE__PRESIGNED_URL_NOT_SUPPORTED"
+	message = "El storage configurado no admite URLs firmadas, usar /upload y /download"
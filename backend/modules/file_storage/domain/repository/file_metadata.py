@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 import uuid
 
 from modules.file_storage.domain.command import CreateFileMetadataCommand
@@ -9,6 +10,14 @@ class FileMetadataRepository(ABC):
 	@abstractmethod
 	async def get_by_uuid(self, uuid: uuid.UUID) -> FileMetadata | None: ...
 
+	@abstractmethod
+	async def get_by_uuids(
+		self, uuids: list[uuid.UUID]
+	) -> List[FileMetadata] | Sequence[FileMetadata]: ...
+
+	@abstractmethod
+	async def get_by_sha256(self, sha256: str) -> FileMetadata | None: ...
+
 	@abstractmethod
 	def create(self, command: CreateFileMetadataCommand) -> FileMetadata: ...
 
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO, Literal, Tuple
+
+from modules.file_storage.domain.exception import PresignedUrlNotSupportedException
+from modules.file_storage.domain.vo import PresignedRequest
+
+# Tamaño de cada bloque al leer un archivo en streaming
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 class FileStorageRepository(ABC):
@@ -10,3 +16,57 @@ class FileStorageRepository(ABC):
 	@abstractmethod
 	async def download_file(self, filename: str) -> bytes:  # contenido crudo
 		...
+
+	async def stream_file(
+		self,
+		filename: str,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		byte_range: Tuple[int, int] | None = None,
+	) -> AsyncIterator[bytes]:
+		"""
+		Devuelve el contenido en bloques de a lo sumo `chunk_size` bytes.
+		Con `byte_range` (inicio, fin inclusivos) sólo ese tramo.
+
+		Esta implementación por defecto descarga el archivo completo; los
+		storages que puedan leer por partes deben sobrescribirla.
+		"""
+		content = await self.download_file(filename)
+		if byte_range is not None:
+			content = content[byte_range[0] : byte_range[1] + 1]
+		for start in range(0, len(content), chunk_size):
+			yield content[start : start + chunk_size]
+
+	async def generate_upload_url(
+		self,
+		filename: str,
+		expires_in: int,
+		content_type: str | None = None,
+		max_size: int | None = None,
+		method: Literal["POST", "PUT"] = "POST",
+	) -> PresignedRequest:
+		"""
+		Firma un request para que el cliente suba `filename` sin pasar por la API.
+
+		Sólo POST puede acotar el tamaño (`max_size`) en la política firmada.
+		"""
+		raise PresignedUrlNotSupportedException
+
+	async def generate_download_url(
+		self, filename: str, expires_in: int, download_filename: str | None = None
+	) -> str:
+		raise PresignedUrlNotSupportedException
+
+	async def get_size(self, filename: str) -> int | None:
+		"""Tamaño del archivo guardado, o None si no existe."""
+		raise PresignedUrlNotSupportedException
+
+	async def get_local_path(self, filename: str) -> str | None:
+		"""
+		Ruta en el disco local del archivo, si el storage la tiene. Permite
+		servirlo con sendfile en vez de leerlo por bloques.
+		"""
+		return None
+
+	async def close(self) -> None:
+		"""Libera conexiones abiertas (al apagar el worker)."""
+		return None
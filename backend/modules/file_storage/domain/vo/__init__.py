@@ -0,0 +1,4 @@
+from .content_address import BLOB_PREFIX, ContentAddress
+from .presigned_request import PresignedRequest
+
+__all__ = ["BLOB_PREFIX", "ContentAddress", "PresignedRequest"]
@@ -0,0 +1,51 @@
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Tuple
+
+# Bloque de lectura al calcular el hash
+HASH_CHUNK_SIZE = 1024 * 1024
+# Prefijo de los blobs direccionados por contenido
+BLOB_PREFIX = "blobs/sha256"
+# Los archivos que no se pueden rebobinar se copian a un temporal: en memoria
+# hasta este tamaño, después a disco
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ContentAddress:
+	"""
+	Identidad de un archivo por su contenido: dos subidas iguales comparten
+	el mismo blob en el storage.
+	"""
+
+	sha256: str
+	size: int
+
+	@property
+	def key(self) -> str:
+		return f"{BLOB_PREFIX}/{self.sha256[:2]}/{self.sha256}"
+
+	@classmethod
+	def read(
+		cls, file: BinaryIO, chunk_size: int = HASH_CHUNK_SIZE
+	) -> Tuple["ContentAddress", BinaryIO]:
+		"""
+		Calcula el SHA-256 leyendo por bloques y devuelve el archivo listo
+		para volver a leerlo desde el principio. Si `file` no se puede
+		rebobinar, se devuelve la copia hecha mientras se leía.
+		"""
+		seekable = getattr(file, "seekable", lambda: False)()
+		start = file.tell() if seekable else 0
+		spool = None if seekable else tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE)
+		digest = hashlib.sha256()
+		size = 0
+		while chunk := file.read(chunk_size):
+			digest.update(chunk)
+			size += len(chunk)
+			if spool is not None:
+				spool.write(chunk)
+
+		readable = file if spool is None else spool
+		readable.seek(start)
+		return cls(digest.hexdigest(), size), readable
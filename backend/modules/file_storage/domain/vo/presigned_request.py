@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import Dict, Literal
+
+
+@dataclass
+class PresignedRequest:
+	"""
+	Request firmado que el cliente hace directo contra el storage.
+
+	- POST: formulario multipart con `fields` seguido del campo `file`.
+	- PUT: el cuerpo es el archivo y deben enviarse los `headers` firmados.
+	"""
+
+	method: Literal["POST", "PUT"]
+	url: str
+	fields: Dict[str, str] = field(default_factory=dict)
+	headers: Dict[str, str] = field(default_factory=dict)
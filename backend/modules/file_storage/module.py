@@ -7,6 +7,7 @@ from typing import Dict
 
 from fastapi import APIRouter
 
+from core.celery.runtime import worker_runtime
 from modules.file_storage.container import FileStorageContainer
 
 
@@ -29,6 +30,14 @@ def setup_routes() -> APIRouter:
 # Configuración del módulo
 name = "file_storage"
 container = FileStorageContainer()
+
+
+async def close_storage():
+	"""Cierra el pool de conexiones al storage (S3) al apagar el worker"""
+	await container.storage_repo().close()
+
+
+worker_runtime.add_shutdown_hook(close_storage)
 service: Dict[str, object] = {
 	"file_storage_service": container.service,
 }
@@ -0,0 +1,80 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+
+from benchmarks.s3_standin import S3StandIn
+from modules.file_storage.adapter.output.async_s3_file_storage import (
+	MIN_PART_SIZE,
+	AsyncS3FileStorage,
+)
+from modules.file_storage.application.exceptions import FileStorageUploadException
+
+CONTENT = bytes(range(256)) * (MIN_PART_SIZE * 3 // 256 + 1000)
+
+
+@pytest.fixture
+async def s3():
+	async with S3StandIn(latency=0.01) as standin:
+		yield standin
+
+
+@pytest.fixture
+async def storage(s3):
+	storage = AsyncS3FileStorage(
+		"bucket",
+		"us-east-1",
+		"key",
+		"secret",
+		endpoint_url=s3.url,
+		part_size=MIN_PART_SIZE,
+		upload_concurrency=2,
+	)
+	yield storage
+	await storage.close()
+
+
+async def test_large_files_are_uploaded_in_bounded_parallel_parts(storage, s3):
+	url = await storage.upload_file(io.BytesIO(CONTENT), "2025/invoice.pdf")
+
+	assert url == f"{s3.url}/bucket/2025/invoice.pdf"
+	assert s3.objects[("bucket", "2025/invoice.pdf")] == CONTENT
+	assert s3.calls["upload_part"] == 4
+	assert s3.peak_concurrency["PUT part"] == 2
+
+
+async def test_small_files_use_a_single_put(storage, s3):
+	await storage.upload_file(io.BytesIO(b"%PDF"), "small.pdf")
+
+	assert s3.calls["put_object"] == 1
+	assert "create_multipart_upload" not in s3.calls
+
+
+async def test_failed_part_aborts_the_upload(storage, s3):
+	upload_part = s3._upload_part
+
+	async def failing_part(request):
+		if request.query["partNumber"] == "2":
+			await request.read()
+			return web.Response(status=400, body=b"<Error><Code>InvalidPart</Code></Error>")
+		return await upload_part(request)
+
+	with patch.object(s3, "_upload_part", failing_part):
+		with pytest.raises(FileStorageUploadException):
+			await storage.upload_file(io.BytesIO(CONTENT), "broken.pdf")
+
+	assert s3.calls["abort_multipart_upload"] == 1
+	assert not s3.uploads
+	assert ("bucket", "broken.pdf") not in s3.objects
+
+
+async def test_stream_reads_in_bounded_chunks(storage, s3):
+	s3.objects[("bucket", "a.pdf")] = CONTENT
+
+	chunks = [chunk async for chunk in storage.stream_file("a.pdf", chunk_size=64 * 1024)]
+
+	assert b"".join(chunks) == CONTENT
+	assert max(len(chunk) for chunk in chunks) <= 64 * 1024
+	assert await storage.get_size("a.pdf") == len(CONTENT)
+	assert await storage.get_size("missing.pdf") is None
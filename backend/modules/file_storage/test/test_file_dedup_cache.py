@@ -0,0 +1,126 @@
+import hashlib
+import io
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from modules.file_storage.adapter.output.cached_file_storage import CachedFileStorage
+from modules.file_storage.adapter.output.disk_cache import DiskLRUCache
+from modules.file_storage.application.service.file_storage import FileStorageService
+from modules.file_storage.domain.command import SaveFileCommand
+from modules.file_storage.domain.repository.file_storage import FileStorageRepository
+from modules.file_storage.test.test_file_presigned import InMemoryFileMetadataRepository
+
+PDF = b"%PDF-1.7 recibo" * 1000
+
+
+class InMemoryFileStorage(FileStorageRepository):
+	def __init__(self):
+		self.objects = {}
+		self.uploads = []
+		self.downloads = []
+
+	async def upload_file(self, file, filename):
+		self.uploads.append(filename)
+		self.objects[filename] = file.read()
+		return filename
+
+	async def download_file(self, filename):
+		self.downloads.append(filename)
+		return self.objects[filename]
+
+
+class OneShotReader(io.RawIOBase):
+	"""Archivo que no se puede rebobinar (ej: un stream de red)."""
+
+	def __init__(self, content: bytes):
+		self.content = io.BytesIO(content)
+
+	def readable(self):
+		return True
+
+	def read(self, size=-1):
+		return self.content.read(size)
+
+
+@pytest.fixture
+def service():
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		yield FileStorageService(InMemoryFileStorage(), InMemoryFileMetadataRepository())
+
+
+async def test_same_content_is_stored_once(service):
+	first = await service.save_file(SaveFileCommand(file=io.BytesIO(PDF), filename="recibo.pdf"))
+	second = await service.save_file(
+		SaveFileCommand(file=OneShotReader(PDF), filename="recibo (1).pdf")
+	)
+
+	sha256 = hashlib.sha256(PDF).hexdigest()
+	storage = service.file_storage_repository
+	assert storage.uploads == [f"blobs/sha256/{sha256[:2]}/{sha256}"]
+	assert storage.objects[storage.uploads[0]] == PDF
+	assert first.id != second.id
+	assert first.path_target == second.path_target == storage.uploads[0]
+	assert (first.sha256, first.size) == (sha256, len(PDF))
+	assert second.download_filename == "recibo (1).pdf"
+
+
+async def test_different_content_gets_its_own_blob(service):
+	await service.save_file(SaveFileCommand(file=io.BytesIO(PDF), filename="a.pdf"))
+	await service.save_file(SaveFileCommand(file=io.BytesIO(PDF + b"!"), filename="a.pdf"))
+
+	assert len(set(service.file_storage_repository.uploads)) == 2
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+	cache = DiskLRUCache(str(tmp_path), max_bytes=350)
+	for i, key in enumerate(["a", "b", "c"]):
+		cache.put(key, b"x" * 100)
+		os.utime(cache.path_for(key), (1000 + i, 1000 + i))
+	assert cache.get("a") is not None  # "a" pasa a ser el más reciente
+
+	cache.put("d", b"x" * 100)
+
+	assert [key for key in "abcd" if cache.path_for(key).exists()] == ["a", "c", "d"]
+
+
+async def test_cached_storage_reads_storage_once(tmp_path):
+	storage = InMemoryFileStorage()
+	storage.objects["k.pdf"] = PDF
+	cached = CachedFileStorage(storage, DiskLRUCache(str(tmp_path), max_bytes=10**6))
+
+	streamed = [chunk async for chunk in cached.stream_file("k.pdf", chunk_size=4096)]
+	downloaded = await cached.download_file("k.pdf")
+
+	assert b"".join(streamed) == downloaded == PDF
+	assert storage.downloads == ["k.pdf"]
+
+
+async def test_cached_storage_serves_ranges_from_disk(tmp_path):
+	storage = InMemoryFileStorage()
+	storage.objects["k.pdf"] = PDF
+	cached = CachedFileStorage(storage, DiskLRUCache(str(tmp_path), max_bytes=10**6))
+	await cached.download_file("k.pdf")
+
+	chunks = [chunk async for chunk in cached.stream_file("k.pdf", 1000, byte_range=(500, 2999))]
+
+	assert b"".join(chunks) == PDF[500:3000]
+	assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+	assert storage.downloads == ["k.pdf"]
+
+
+async def test_partial_stream_is_not_cached(tmp_path):
+	storage = InMemoryFileStorage()
+	storage.objects["k.pdf"] = PDF
+	cache = DiskLRUCache(str(tmp_path), max_bytes=10**6, max_file_bytes=len(PDF))
+	cached = CachedFileStorage(storage, cache)
+
+	stream = cached.stream_file("k.pdf", chunk_size=4096)
+	await stream.__anext__()
+	await stream.aclose()
+
+	assert cache.get("k.pdf") is None
+	assert not list(tmp_path.glob("*/.tmp-*"))
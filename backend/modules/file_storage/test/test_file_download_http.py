@@ -0,0 +1,141 @@
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.s3_standin import S3StandIn
+from core.helpers.http import RangeNotSatisfiable, parse_byte_range
+from modules.file_storage.adapter.input.api.v1.download import build_download_response
+from modules.file_storage.adapter.output.async_s3_file_storage import AsyncS3FileStorage
+from modules.file_storage.application.service.file_storage import FileStorageService
+from modules.file_storage.domain.entity import FileMetadata
+from modules.file_storage.test.test_file_presigned import InMemoryFileMetadataRepository
+
+CONTENT = bytes(range(256)) * 40
+METADATA = FileMetadata(
+	id=uuid.uuid4(),
+	path_target="blobs/sha256/ab/abc",
+	filename="x.pdf",
+	download_filename="Factura.pdf",
+	size=len(CONTENT),
+	sha256="abc",
+	date_created=datetime(2025, 4, 7, 12, 30, 15),
+)
+
+
+@pytest.fixture
+async def service():
+	async with S3StandIn() as s3:
+		s3.objects[("bucket", METADATA.path_target)] = CONTENT
+		storage = AsyncS3FileStorage("bucket", "us-east-1", "k", "s", endpoint_url=s3.url)
+		metadata_repository = InMemoryFileMetadataRepository()
+		await metadata_repository.save(METADATA)
+		yield FileStorageService(storage, metadata_repository)
+		await storage.close()
+
+
+async def download(service, **headers):
+	file_dto = await service.stream_file(METADATA.id)
+	response = build_download_response(
+		file_dto, {name.replace("_", "-"): value for name, value in headers.items()}
+	)
+	body = b""
+	if hasattr(response, "body_iterator"):
+		body = b"".join([chunk async for chunk in response.body_iterator])
+	return response, body
+
+
+async def test_full_download_has_length_and_validators(service):
+	response, body = await download(service)
+
+	assert response.status_code == 200
+	assert body == CONTENT
+	assert response.headers["content-length"] == str(len(CONTENT))
+	assert response.headers["etag"] == '"abc"'
+	assert response.headers["accept-ranges"] == "bytes"
+	assert response.headers["content-type"] == "application/pdf"
+	assert response.headers["last-modified"].endswith("GMT")
+
+
+async def test_range_is_fetched_as_ranged_get(service):
+	response, body = await download(service, range="bytes=100-199")
+
+	assert response.status_code == 206
+	assert body == CONTENT[100:200]
+	assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+	assert response.headers["content-length"] == "100"
+
+
+@pytest.mark.parametrize(
+	"headers",
+	[{"if_none_match": '"abc"'}, {"if_none_match": 'W/"other", W/"abc"'}, {"if_none_match": "*"}],
+)
+async def test_matching_etag_is_not_modified(service, headers):
+	service.storage_usecase.stream_file_from_storage = MagicMock()
+
+	response, body = await download(service, **headers)
+
+	assert response.status_code == 304
+	assert body == b""
+	assert response.headers["etag"] == '"abc"'
+	service.storage_usecase.stream_file_from_storage.return_value.__anext__.assert_not_called()
+
+
+async def test_if_modified_since_without_etag(service):
+	last_modified = (await download(service))[0].headers["last-modified"]
+
+	response, _ = await download(service, if_modified_since=last_modified)
+
+	assert response.status_code == 304
+
+
+async def test_stale_if_range_returns_whole_file(service):
+	response, body = await download(service, range="bytes=0-9", if_range='"old"')
+
+	assert response.status_code == 200
+	assert body == CONTENT
+
+
+@pytest.mark.parametrize("if_range", ['W/"abc"', "*", '"abc", "old"'])
+async def test_weak_or_wildcard_if_range_returns_whole_file(service, if_range):
+	response, body = await download(service, range="bytes=0-9", if_range=if_range)
+
+	assert response.status_code == 200
+	assert body == CONTENT
+
+
+async def test_matching_if_range_returns_range(service):
+	response, body = await download(service, range="bytes=0-9", if_range='"abc"')
+
+	assert response.status_code == 206
+	assert body == CONTENT[:10]
+
+
+async def test_range_past_the_end_is_not_satisfiable(service):
+	response, _ = await download(service, range=f"bytes={len(CONTENT)}-")
+
+	assert response.status_code == 416
+	assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+@pytest.mark.parametrize(
+	"header, expected",
+	[
+		("bytes=0-9", (0, 9)),
+		("bytes=5-", (5, 99)),
+		("bytes=-10", (90, 99)),
+		("bytes=90-500", (90, 99)),
+		("bytes=0-1,5-6", None),
+		("bytes=9-3", None),
+		("items=0-9", None),
+		(None, None),
+	],
+)
+def test_parse_byte_range(header, expected):
+	assert parse_byte_range(header, 100) == expected
+
+
+def test_parse_byte_range_outside_file():
+	with pytest.raises(RangeNotSatisfiable):
+		parse_byte_range("bytes=100-", 100)
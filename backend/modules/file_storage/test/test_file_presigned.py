@@ -0,0 +1,167 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from botocore.exceptions import ClientError
+from pydantic import ValidationError
+
+from core.helpers.token import DecodeTokenException, TokenHelper
+from modules.file_storage.adapter.output.s3_file_storage import S3FileStorage
+from modules.file_storage.application.exceptions import (
+	FileStorageUploadNotFoundException,
+	FileStorageUploadSizeMismatchException,
+	FileStorageUploadTooLargeException,
+)
+from modules.file_storage.application.service.file_storage import FileStorageService
+from modules.file_storage.domain.command import (
+	ConfirmUploadCommand,
+	CreateUploadUrlCommand,
+)
+from modules.file_storage.domain.repository.file_metadata import FileMetadataRepository
+
+
+class InMemoryFileMetadataRepository(FileMetadataRepository):
+	def __init__(self):
+		self.items = {}
+		self.batches = []
+
+	async def get_by_uuid(self, uuid):
+		return self.items.get(uuid)
+
+	async def get_by_uuids(self, uuids):
+		self.batches.append(list(uuids))
+		return [self.items[uuid] for uuid in uuids if uuid in self.items]
+
+	async def get_by_sha256(self, sha256):
+		return next((item for item in self.items.values() if item.sha256 == sha256), None)
+
+	def create(self, command):
+		raise NotImplementedError
+
+	async def save(self, file_metadata):
+		self.items[file_metadata.id] = file_metadata
+		return file_metadata
+
+	async def delete(self, file_metadata):
+		self.items.pop(file_metadata.id, None)
+
+
+@pytest.fixture
+def storage():
+	return S3FileStorage("bucket", "us-east-1", "key", "secret")
+
+
+@pytest.fixture
+def service(storage):
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		yield FileStorageService(storage, InMemoryFileMetadataRepository(), max_upload_size=1000)
+
+
+async def test_presigned_post_limits_size_and_content_type(service):
+	upload = await service.create_upload_url(
+		CreateUploadUrlCommand(
+			filename="factura.pdf", size=500, content_type="application/pdf", path_target="/invoices"
+		)
+	)
+
+	assert upload.request.method == "POST"
+	assert upload.request.fields["key"].endswith(f"/invoices/{upload.id}.pdf")
+	assert upload.request.fields["Content-Type"] == "application/pdf"
+	assert "policy" in upload.request.fields
+	payload = TokenHelper.decode(upload.upload_token)
+	assert payload["path_target"] == upload.request.fields["key"]
+	assert payload["download_filename"] == "factura.pdf"
+
+
+async def test_presigned_put_signs_content_type(service):
+	upload = await service.create_upload_url(
+		CreateUploadUrlCommand(filename="a.xlsx", content_type="text/csv", method="PUT")
+	)
+
+	query = parse_qs(urlparse(upload.request.url).query)
+	assert upload.request.method == "PUT"
+	assert upload.request.headers == {"Content-Type": "text/csv"}
+	assert "content-type" in query["X-Amz-SignedHeaders"][0]
+
+
+def test_upload_url_path_target_is_optional():
+	command = CreateUploadUrlCommand(filename="a.pdf", path_target=None)
+	assert command.path_target is None
+	command = CreateUploadUrlCommand(filename="a.pdf", path_target="/facturas")
+	assert command.path_target == "/facturas"
+
+
+@pytest.mark.parametrize(
+	"path_target", ["", "facturas", "/facturas/", "/../secreto", "/a/../b", "/a/..", 7]
+)
+def test_upload_url_rejects_invalid_path_target(path_target):
+	with pytest.raises(ValidationError):
+		CreateUploadUrlCommand(filename="a.pdf", path_target=path_target)
+
+
+async def test_declared_size_over_limit_is_rejected(service):
+	with pytest.raises(FileStorageUploadTooLargeException):
+		await service.create_upload_url(CreateUploadUrlCommand(filename="a.pdf", size=1001))
+
+
+async def test_confirm_records_metadata_with_stored_size_once(service, storage):
+	upload = await service.create_upload_url(CreateUploadUrlCommand(filename="a.pdf", size=500))
+	storage._s3 = MagicMock()
+	storage._s3.head_object.return_value = {"ContentLength": 500}
+	command = ConfirmUploadCommand(upload_token=upload.upload_token)
+
+	metadata = await service.confirm_upload(command)
+	again = await service.confirm_upload(command)
+
+	assert metadata.id == upload.id
+	assert metadata.size == 500
+	assert metadata.download_filename == "a.pdf"
+	assert again is metadata
+	storage._s3.head_object.assert_called_once()
+
+
+@pytest.mark.parametrize(
+	"head, error",
+	[
+		(
+			ClientError({"Error": {"Code": "404"}}, "HeadObject"),
+			FileStorageUploadNotFoundException,
+		),
+		({"ContentLength": 499}, FileStorageUploadSizeMismatchException),
+	],
+)
+async def test_confirm_rejects_missing_or_different_upload(service, storage, head, error):
+	upload = await service.create_upload_url(CreateUploadUrlCommand(filename="a.pdf", size=500))
+	storage._s3 = MagicMock()
+	if isinstance(head, Exception):
+		storage._s3.head_object.side_effect = head
+	else:
+		storage._s3.head_object.return_value = head
+
+	with pytest.raises(error):
+		await service.confirm_upload(ConfirmUploadCommand(upload_token=upload.upload_token))
+
+	assert not service.file_metadata_repository.items
+
+
+async def test_confirm_rejects_other_tokens(service):
+	token = TokenHelper.encode(payload={"user_id": 1, "id": str(uuid.uuid4())})
+
+	with pytest.raises(DecodeTokenException):
+		await service.confirm_upload(ConfirmUploadCommand(upload_token=token))
+
+
+async def test_download_url_keeps_original_filename(service):
+	metadata = await service.file_metadata_repository.save(
+		MagicMock(id=uuid.uuid4(), path_target="2025/1/2/x.pdf", download_filename="Factura Nº 1.pdf")
+	)
+
+	download = await service.get_download_url(metadata.id)
+
+	query = parse_qs(urlparse(download.url).query)
+	assert urlparse(download.url).path.endswith("/2025/1/2/x.pdf")
+	assert "filename*=UTF-8''Factura%20N%C2%BA%201.pdf" in query["response-content-disposition"][0]
+	assert download.expires_in == service.presigned_url_expires
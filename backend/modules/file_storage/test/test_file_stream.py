@@ -0,0 +1,31 @@
+from unittest.mock import MagicMock
+
+from modules.file_storage.adapter.output.s3_file_storage import S3FileStorage
+
+
+class FakeBody:
+	def __init__(self, data: bytes):
+		self.data = data
+		self.reads = []
+		self.closed = False
+
+	def read(self, amount: int) -> bytes:
+		self.reads.append(amount)
+		chunk, self.data = self.data[:amount], self.data[amount:]
+		return chunk
+
+	def close(self):
+		self.closed = True
+
+
+async def test_s3_stream_reads_in_bounded_chunks():
+	storage = S3FileStorage("bucket", "us-east-1", "key", "secret")
+	body = FakeBody(b"x" * 10_000)
+	storage._s3 = MagicMock()
+	storage._s3.get_object.return_value = {"Body": body}
+
+	chunks = [chunk async for chunk in storage.stream_file("a.pdf", chunk_size=4096)]
+
+	assert [len(chunk) for chunk in chunks] == [4096, 4096, 1808]
+	assert set(body.reads) == {4096}
+	assert body.closed
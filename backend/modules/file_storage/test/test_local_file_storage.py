@@ -0,0 +1,112 @@
+import io
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+from fastapi.testclient import TestClient
+
+from modules.file_storage.adapter.input.api.v1.download import build_download_response
+from modules.file_storage.adapter.output.local_file_storage import LocalFileStorage
+from modules.file_storage.application.exceptions import FileStorageUploadException
+from modules.file_storage.application.service.file_storage import FileStorageService
+from modules.file_storage.container import FileStorageContainer
+from modules.file_storage.domain.command import SaveFileCommand
+from modules.file_storage.test.test_file_presigned import InMemoryFileMetadataRepository
+
+PDF = b"%PDF-1.7 recibo" * 1000
+
+
+class FailingReader(io.RawIOBase):
+	"""Entrega algunos bytes y falla a mitad de la copia."""
+
+	def __init__(self):
+		self.calls = 0
+
+	def readable(self):
+		return True
+
+	def readinto(self, buffer):
+		self.calls += 1
+		if self.calls > 1:
+			raise OSError("conexión cortada")
+		buffer[:4] = b"%PDF"
+		return 4
+
+
+@pytest.fixture
+def storage(tmp_path):
+	return LocalFileStorage(str(tmp_path))
+
+
+async def test_roundtrip_and_ranges(storage, tmp_path):
+	await storage.upload_file(io.BytesIO(PDF), "blobs/sha256/ab/abc")
+
+	assert (tmp_path / "blobs/sha256/ab/abc").read_bytes() == PDF
+	assert await storage.download_file("blobs/sha256/ab/abc") == PDF
+	chunks = [chunk async for chunk in storage.stream_file("blobs/sha256/ab/abc", 4096)]
+	assert b"".join(chunks) == PDF
+	ranged = storage.stream_file("blobs/sha256/ab/abc", 4096, byte_range=(10, 5009))
+	assert b"".join([chunk async for chunk in ranged]) == PDF[10:5010]
+	assert await storage.get_size("blobs/sha256/ab/abc") == len(PDF)
+	assert await storage.get_size("missing") is None
+	assert not list(tmp_path.rglob(".tmp-*"))
+
+
+async def test_failed_write_leaves_nothing_behind(storage, tmp_path):
+	await storage.upload_file(io.BytesIO(PDF), "a.pdf")
+
+	with pytest.raises(FileStorageUploadException):
+		await storage.upload_file(FailingReader(), "a.pdf")
+
+	assert (tmp_path / "a.pdf").read_bytes() == PDF
+	assert not list(tmp_path.rglob(".tmp-*"))
+
+
+@pytest.mark.parametrize("key", ["../outside.pdf", "/etc/passwd", "a/../../b"])
+async def test_keys_cannot_escape_the_directory(storage, key):
+	with pytest.raises(FileStorageUploadException):
+		await storage.upload_file(io.BytesIO(PDF), key)
+	assert await storage.get_local_path(key) is None
+
+
+async def test_download_is_sent_from_disk(storage):
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		service = FileStorageService(storage, InMemoryFileMetadataRepository())
+		metadata = await service.save_file(
+			SaveFileCommand(file=io.BytesIO(PDF), filename="recibo.pdf")
+		)
+	file_dto = await service.stream_file(metadata.id)
+	assert file_dto.local_path == await storage.get_local_path(metadata.path_target)
+	assert isinstance(build_download_response(file_dto, {}), FileResponse)
+
+	app = FastAPI()
+
+	@app.get("/download")
+	async def download(request: Request):
+		file_dto = await service.stream_file(metadata.id)
+		return build_download_response(file_dto, request.headers, request.method)
+
+	client = TestClient(app)
+	full = client.get("/download")
+	ranged = client.get("/download", headers={"Range": "bytes=100-199"})
+	not_modified = client.get("/download", headers={"If-None-Match": full.headers["etag"]})
+
+	assert full.content == PDF
+	assert full.headers["etag"] == f'"{metadata.sha256}"'
+	assert full.headers["content-disposition"].startswith('attachment; filename="recibo.pdf"')
+	assert ranged.status_code == 206
+	assert ranged.content == PDF[100:200]
+	assert ranged.headers["content-range"] == f"bytes 100-199/{len(PDF)}"
+	assert not_modified.status_code == 304
+
+
+def test_backend_is_selected_by_config(tmp_path):
+	container = FileStorageContainer()
+	container.config.FILE_STORAGE_BACKEND.from_value("local")
+	container.config.FILE_STORAGE_LOCAL_DIR.from_value(str(tmp_path))
+
+	assert isinstance(container.storage_repo(), LocalFileStorage)
+	assert container.file_storage_adapter().file_storage_repository is container.storage_repo()
@@ -4,6 +4,7 @@ from sqlmodel import SQLModel, Field
 class Currency(SQLModel, table=True):
 	id: int | None = Field(default=None, primary_key=True)
 	name: str
-	code: str
+	code: str = Field(unique=True)
 	symbol: str | None = Field(default=None)
 	country: str | None = Field(default=None)
+	id_yiqi_currency: int | None = Field(default=None)
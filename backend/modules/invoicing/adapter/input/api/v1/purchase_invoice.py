@@ -11,7 +11,6 @@ from modules.invoicing.adapter.input.api.v1.request import (
 from modules.invoicing.adapter.input.api.v1.response import PaginatedResponse
 from modules.invoicing.container import InvoicingContainer
 from modules.invoicing.domain.entity.purchase_invoice import PurchaseInvoice
-from shared.interfaces.service_locator import service_locator
 
 # from modules.invoicing.adapter.input.api.v1.request import (
 # 	ProviderCreateRequest,
@@ -154,14 +153,12 @@ async def create_purchase_invoice(
 	),
 ):
 	invoice = await service.create(purchase_invoice)
-	invoice_saved = await service.save(invoice)
 
-	# Ejecutar task de Celery de forma asíncrona si se solicita
+	# Encola la emisión a Yiqi (task idempotente por purchase invoice) si se solicita
 	if emit_to_yiqi:
-		yiqi_tasks = service_locator.get_service("yiqi_erp_tasks")
-		yiqi_tasks["emit_invoice"].delay(invoice_saved.model_dump())
+		return await service.save_and_emit(invoice)
 
-	return invoice_saved
+	return await service.save(invoice)
 
 
 @purchase_invoice_router.post("/reemit/{id_purchase_invoice}")
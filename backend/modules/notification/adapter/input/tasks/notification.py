@@ -6,8 +6,8 @@ a través del service_locator y el discovery automático.
 """
 
 import uuid
-from core.db.session import reset_session_context, set_session_context
-from modules.notification.container import NotificationContainer
+from core.db.session import reset_session_context, session, set_session_context
+from shared.interfaces.service_locator import service_locator
 
 
 async def send_notification_tasks(notification_content: dict):
@@ -18,13 +18,14 @@ async def send_notification_tasks(notification_content: dict):
 	Será registrada automáticamente como: "notification.send_notification"
 	return "Esto es una notificacion"
 	"""
-	try:
-		notification_service = NotificationContainer().service()
+	session_uuid = uuid.uuid4()
+	context = set_session_context(str(session_uuid))
 
-		session_uuid = uuid.uuid4()
-		context = set_session_context(str(session_uuid))
+	try:
+		notification_service = service_locator.get_service("notification_service")
 
 		await notification_service.send_notification(notification_content)
 
 	finally:
+		await session.remove()
 		reset_session_context(context)
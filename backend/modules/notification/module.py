@@ -45,6 +45,8 @@ service: Dict[str, object] = {
 				"retry_backoff_max": 600,
 				"retry_jitter": True,
 			},
+			# Cola propia y prioridad alta: no debe esperar detrás de la emisión a Yiqi
+			"priority": 8,
 		}
 	},
 }
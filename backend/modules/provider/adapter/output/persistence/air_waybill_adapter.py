@@ -1,4 +1,4 @@
-from typing import Sequence
+from typing import AsyncIterator, List, Mapping, Sequence
 from modules.provider.domain.entity.air_waybill import AirWaybill
 from modules.provider.domain.repository.air_waybill import AirWaybillRepository
 
@@ -26,6 +26,13 @@ class AirWaybillRepositoryAdapter(AirWaybillRepository):
 			)
 		)
 
+	def iter_air_waybills_by_purchase_invoice_id(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[AirWaybill]:
+		return self.air_waybill_repository.iter_air_waybills_by_purchase_invoice_id(
+			id_purchase_invoice, batch_size
+		)
+
 	async def validate_duplicated_air_waybill(
 		self, air_waybill: AirWaybill
 	) -> list[AirWaybill] | Sequence[AirWaybill]:
@@ -36,6 +43,13 @@ class AirWaybillRepositoryAdapter(AirWaybillRepository):
 	async def save_air_waybill(self, air_waybill: AirWaybill) -> AirWaybill:
 		return await self.air_waybill_repository.save_air_waybill(air_waybill)
 
+	async def link_yiqi_air_waybills(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]:
+		return await self.air_waybill_repository.link_yiqi_air_waybills(
+			id_purchase_invoice, yiqi_ids_by_code
+		)
+
 	async def delete_air_waybill(self, air_waybill: AirWaybill):
 		return await self.air_waybill_repository.delete_air_waybill(air_waybill)
 
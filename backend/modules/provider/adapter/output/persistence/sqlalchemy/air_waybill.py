@@ -1,12 +1,16 @@
-from celery.bin.result import result
+from sqlalchemy import Integer, String, column, update, values
 from sqlmodel import select, delete
-from typing import Sequence
+from typing import AsyncIterator, List, Mapping, Sequence
 
 from core.db import session_factory, session as global_session
 from modules.provider.domain.entity.air_waybill import AirWaybill
 from modules.provider.domain.repository.air_waybill import AirWaybillRepository
 
 
+# Postgres admite hasta 32767 parámetros por sentencia (2 por guía)
+LINK_BATCH_SIZE = 5000
+
+
 class AirWaybillSQLAlchemyRepository(AirWaybillRepository):
 	async def get_air_waybill_by_id(self, id_air_waybill: int) -> AirWaybill | None:
 		stmt = select(AirWaybill).where(AirWaybill.id == int(id_air_waybill))
@@ -33,6 +37,20 @@ class AirWaybillSQLAlchemyRepository(AirWaybillRepository):
 		result = await global_session.execute(query)
 		return result.scalars().all()
 
+	async def iter_air_waybills_by_purchase_invoice_id(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[AirWaybill]:
+		# Cursor del lado del servidor: se traen `batch_size` filas por vez
+		query = (
+			select(AirWaybill)
+			.where(AirWaybill.fk_purchase_invoice == int(id_purchase_invoice))
+			.order_by(AirWaybill.id)
+			.execution_options(yield_per=batch_size)
+		)
+		result = await global_session.stream_scalars(query)
+		async for air_waybill in result:
+			yield air_waybill
+
 	async def validate_duplicated_air_waybill(
 		self, air_waybill: AirWaybill
 	) -> list[AirWaybill] | Sequence[AirWaybill]:
@@ -48,6 +66,37 @@ class AirWaybillSQLAlchemyRepository(AirWaybillRepository):
 		await global_session.flush()
 		return air_waybill
 
+	async def link_yiqi_air_waybills(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]:
+		"""
+		UPDATE airwaybill SET fk_yiqi_awb = v.fk_yiqi_awb
+		FROM (VALUES ...) AS v WHERE awb_code = v.awb_code, por lotes.
+		Devuelve los códigos actualizados.
+		"""
+		links = list(yiqi_ids_by_code.items())
+		linked: List[str] = []
+		for start in range(0, len(links), LINK_BATCH_SIZE):
+			yiqi_links = values(
+				column("awb_code", String),
+				column("fk_yiqi_awb", Integer),
+				name="yiqi_links",
+			).data(links[start : start + LINK_BATCH_SIZE])
+			query = (
+				update(AirWaybill)
+				.where(
+					AirWaybill.fk_purchase_invoice == int(id_purchase_invoice),
+					AirWaybill.awb_code == yiqi_links.c.awb_code,
+				)
+				.values(fk_yiqi_awb=yiqi_links.c.fk_yiqi_awb)
+				.returning(AirWaybill.awb_code)
+				.execution_options(synchronize_session=False)
+			)
+			result = await global_session.execute(query)
+			linked.extend(result.scalars().all())
+		await global_session.flush()
+		return linked
+
 	async def delete_air_waybill(self, air_waybill: AirWaybill):
 		await global_session.delete(air_waybill)
 		await global_session.flush()
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Sequence
+from typing import AsyncIterator, List, Mapping, Sequence
 
 from modules.provider.application.exception import (
 	AirWaybillHasBeenEmittedException,
@@ -52,6 +52,17 @@ class AirWaybillService:
 			raise AirWaybillNotFoundException
 		return air_waybills
 
+	def iter_air_waybills_by_purchase_invoice_id(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[AirWaybill]:
+		"""
+		Recorre las guías de la factura de a `batch_size` filas, sin cargarlas
+		todas en memoria. No valida que existan: el consumidor cuenta las filas.
+		"""
+		return self.air_waybill_usecase.iter_air_waybills_by_purchase_invoice_id(
+			id_purchase_invoice, batch_size
+		)
+
 	async def create_air_waybills(
 		self, command: list[CreateAirWaybillCommand]
 	) -> list[AirWaybill]:
@@ -80,6 +91,17 @@ class AirWaybillService:
 			raise AirWaybillNotFoundException
 		return await self.air_waybill_usecase.save_air_waybill(air_waybill)
 
+	async def link_yiqi_air_waybills(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]:
+		"""
+		Asigna fk_yiqi_awb a las guías de la factura según su código, en un
+		único UPDATE. Devuelve los códigos que quedaron vinculados.
+		"""
+		return await self.air_waybill_usecase.link_yiqi_air_waybills(
+			id_purchase_invoice, yiqi_ids_by_code
+		)
+
 	async def delete_air_waybill(self, id_air_waybill: int):
 		air_waybill = await self.air_waybill_usecase.get_air_waybill_by_id(
 			id_air_waybill
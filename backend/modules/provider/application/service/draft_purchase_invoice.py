@@ -1,6 +1,6 @@
 import uuid
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Any, Dict, Iterable, List, Sequence
 
 from core.db.transactional import Transactional
 from modules.provider.application.service.air_waybill import AirWaybillService
@@ -74,19 +74,32 @@ class DraftPurchaseInvoiceService:
 	async def get_draft_purchase_invoice_with_filemetadata(
 		self, draft_purchase_invoice: DraftPurchaseInvoice
 	) -> DraftPurchaseInvoiceDTO:
-		archivo_comprobante = await self._get_metadata_or_none(
-			draft_purchase_invoice.id_receipt_file
+		draft_invoices_dto = await self.get_draft_purchase_invoices_with_filemetadata(
+			[draft_purchase_invoice]
 		)
-		archivo_detalle = await self._get_metadata_or_none(
-			draft_purchase_invoice.id_details_file
+		return draft_invoices_dto[0]
+
+	async def get_draft_purchase_invoices_with_filemetadata(
+		self, draft_purchase_invoices: Sequence[DraftPurchaseInvoice]
+	) -> List[DraftPurchaseInvoiceDTO]:
+		"""Adjunta la metadata de los archivos con una sola consulta para todo el lote."""
+		files_metadata = await self._get_metadata_many(
+			file_id
+			for draft_purchase_invoice in draft_purchase_invoices
+			for file_id in (
+				draft_purchase_invoice.id_receipt_file,
+				draft_purchase_invoice.id_details_file,
+			)
 		)
 
-		draft_invoice_dto = DraftPurchaseInvoiceDTO(
-			**draft_purchase_invoice.model_dump(),
-			receipt_file=archivo_comprobante,
-			details_file=archivo_detalle,
-		)
-		return draft_invoice_dto
+		return [
+			DraftPurchaseInvoiceDTO(
+				**draft_purchase_invoice.model_dump(),
+				receipt_file=files_metadata.get(draft_purchase_invoice.id_receipt_file),
+				details_file=files_metadata.get(draft_purchase_invoice.id_details_file),
+			)
+			for draft_purchase_invoice in draft_purchase_invoices
+		]
 
 	async def create_draft_purchase_invoice(
 		self, command: CreateDraftPurchaseInvoiceCommand
@@ -170,19 +183,21 @@ class DraftPurchaseInvoiceService:
 			raise ProviderServiceLinkNotFoundException
 
 		# Validar archivos en storage (capa de aplicación)
-		if draft_invoice.id_receipt_file:
-			receipt_file_metadata = await self._get_metadata_or_none(
-				draft_invoice.id_receipt_file
-			)
-			if not receipt_file_metadata:
-				raise DraftPurchaseInvoiceReceiptFileInvalidException
+		check_detail_file = bool(
+			service_link.require_detail_file and draft_invoice.id_details_file
+		)
+		files_metadata = await self._get_metadata_many(
+			[
+				draft_invoice.id_receipt_file,
+				draft_invoice.id_details_file if check_detail_file else None,
+			]
+		)
+		receipt_file = draft_invoice.id_receipt_file
+		if receipt_file and receipt_file not in files_metadata:
+			raise DraftPurchaseInvoiceReceiptFileInvalidException
 
-		if service_link.require_detail_file and draft_invoice.id_details_file:
-			detail_file_metadata = await self._get_metadata_or_none(
-				draft_invoice.id_details_file
-			)
-			if not detail_file_metadata:
-				raise DraftPurchaseInvoiceDetailFileInvalidException
+		if check_detail_file and draft_invoice.id_details_file not in files_metadata:
+			raise DraftPurchaseInvoiceDetailFileInvalidException
 
 		# Validar campos obligatorios (capa de dominio)
 		await self.draft_purchase_invoice_usecase.validate_draft_purchase_invoice(
@@ -241,12 +256,14 @@ class DraftPurchaseInvoiceService:
 
 		return purchase_invoice_created
 
-	async def _get_metadata_or_none(self, file_id: uuid.UUID | None):
-		if not file_id:
-			return None
+	async def _get_metadata_many(
+		self, file_ids: Iterable[uuid.UUID | None]
+	) -> Dict[uuid.UUID, Any]:
+		file_ids = [file_id for file_id in file_ids if file_id]
+		if not file_ids:
+			return {}
 		try:
-			metadata = await self.file_storage_service().get_metadata(file_id)
-			return metadata
+			return await self.file_storage_service().get_metadata_many(file_ids)
 		except Exception as e:
 			print("Hubo un error al obtener la metadata:", e)
-			return None
+			return {}
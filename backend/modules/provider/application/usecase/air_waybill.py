@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Sequence
+from typing import AsyncIterator, List, Mapping, Sequence
 
 from core.db.transactional import Transactional
 from modules.invoicing.domain.repository.purchase_invoice import (
@@ -48,6 +48,18 @@ class GetAirWaybillsByPurchaseInvoiceIdUseCase:
 		)
 
 
+@dataclass
+class IterAirWaybillsByPurchaseInvoiceIdUseCase:
+	air_waybill_repository: AirWaybillRepository
+
+	def __call__(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[AirWaybill]:
+		return self.air_waybill_repository.iter_air_waybills_by_purchase_invoice_id(
+			id_purchase_invoice, batch_size
+		)
+
+
 @dataclass
 class CreateAirWaybillsUseCase:
 	air_waybill_repository: AirWaybillRepository
@@ -92,6 +104,21 @@ class UpdateAirWaybillUseCase:
 		return await self.air_waybill_repository.save_air_waybill(air_waybill)
 
 
+@dataclass
+class LinkYiqiAirWaybillsUseCase:
+	air_waybill_repository: AirWaybillRepository
+
+	@Transactional()
+	async def __call__(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]:
+		if not yiqi_ids_by_code:
+			return []
+		return await self.air_waybill_repository.link_yiqi_air_waybills(
+			id_purchase_invoice, yiqi_ids_by_code
+		)
+
+
 @dataclass
 class DeleteAirWaybillUseCase:
 	air_waybill_repository: AirWaybillRepository
@@ -141,12 +168,18 @@ class AirWaybillUseCaseFactory:
 		self.get_air_waybills_by_purchase_invoice_id = (
 			GetAirWaybillsByPurchaseInvoiceIdUseCase(self.air_waybill_repository)
 		)
+		self.iter_air_waybills_by_purchase_invoice_id = (
+			IterAirWaybillsByPurchaseInvoiceIdUseCase(self.air_waybill_repository)
+		)
 		self.create_air_waybills = CreateAirWaybillsUseCase(self.air_waybill_repository)
 		self.validate_duplicated_air_waybill = ValidateDuplicatedAirWaybillUseCase(
 			self.air_waybill_repository
 		)
 		self.save_air_waybill = SaveAirWaybillUseCase(self.air_waybill_repository)
 		self.update_air_waybill = UpdateAirWaybillUseCase(self.air_waybill_repository)
+		self.link_yiqi_air_waybills = LinkYiqiAirWaybillsUseCase(
+			self.air_waybill_repository
+		)
 		self.delete_air_waybill = DeleteAirWaybillUseCase(self.air_waybill_repository)
 		self.delete_all_air_waybills_by_draft_invoice = (
 			DeleteAllAirWaybillsByDraftInvoiceUseCase(self.air_waybill_repository)
@@ -29,7 +29,7 @@ class Provider(SQLModel, AuditMixin, TimestampMixin, table=True):
 	id: int | None = Field(None, primary_key=True)
 	name: str
 
-	id_yiqi_provider: int | None = Field(None)
+	id_yiqi_provider: int | None = Field(None, unique=True)
 
 	currency: str | None = Field(default=None)
 	allow_multi_invoice: bool | None = Field(default=False)
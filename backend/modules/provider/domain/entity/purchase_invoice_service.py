@@ -35,5 +35,5 @@ class PurchaseInvoiceService(SQLModel, AuditMixin, TimestampMixin, table=True):
 	)
 
 	id_yiqi_service: int | None = Field(
-		default=None, description="Id service from Yiqi"
+		default=None, unique=True, description="Id service from Yiqi"
 	)
@@ -1,4 +1,4 @@
-from typing import Sequence
+from typing import AsyncIterator, List, Mapping, Sequence
 from modules.provider.domain.entity.air_waybill import AirWaybill
 from abc import ABC, abstractmethod
 
@@ -17,6 +17,11 @@ class AirWaybillRepository(ABC):
 		self, id_purchase_invoice: int
 	) -> list[AirWaybill] | Sequence[AirWaybill]: ...
 
+	@abstractmethod
+	def iter_air_waybills_by_purchase_invoice_id(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[AirWaybill]: ...
+
 	@abstractmethod
 	async def validate_duplicated_air_waybill(
 		self, air_waybill: AirWaybill
@@ -25,6 +30,11 @@ class AirWaybillRepository(ABC):
 	@abstractmethod
 	async def save_air_waybill(self, air_waybill: AirWaybill) -> AirWaybill: ...
 
+	@abstractmethod
+	async def link_yiqi_air_waybills(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]: ...
+
 	@abstractmethod
 	async def delete_air_waybill(self, air_waybill: AirWaybill): ...
 
@@ -0,0 +1,48 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+import shared.models  # noqa: F401
+from modules.provider.adapter.output.persistence.sqlalchemy import (
+	air_waybill as air_waybill_module,
+)
+from modules.provider.adapter.output.persistence.sqlalchemy.air_waybill import (
+	AirWaybillSQLAlchemyRepository,
+)
+
+
+def fake_session(linked_codes):
+	result = MagicMock()
+	result.scalars.return_value.all.return_value = linked_codes
+	session = MagicMock()
+	session.execute = AsyncMock(return_value=result)
+	session.flush = AsyncMock()
+	return session
+
+
+async def test_link_is_a_single_update_from_values():
+	session = fake_session(["123-00000001", "123-00000002"])
+	links = {"123-00000001": 10, "123-00000002": 11}
+
+	with patch.object(air_waybill_module, "global_session", session):
+		linked = await AirWaybillSQLAlchemyRepository().link_yiqi_air_waybills(7, links)
+
+	assert linked == ["123-00000001", "123-00000002"]
+	session.execute.assert_awaited_once()
+	session.flush.assert_awaited_once()
+	sql = str(
+		session.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+	)
+	assert sql.startswith("UPDATE airwaybill SET fk_yiqi_awb=yiqi_links.fk_yiqi_awb")
+	assert "FROM (VALUES" in sql
+	assert "RETURNING airwaybill.awb_code" in sql
+
+
+async def test_link_splits_large_batches():
+	session = fake_session([])
+	links = {f"123-{i:08d}": i for i in range(air_waybill_module.LINK_BATCH_SIZE + 1)}
+
+	with patch.object(air_waybill_module, "global_session", session):
+		await AirWaybillSQLAlchemyRepository().link_yiqi_air_waybills(7, links)
+
+	assert session.execute.await_count == 2
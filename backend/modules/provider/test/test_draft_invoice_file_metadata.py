@@ -0,0 +1,97 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+import shared.models  # noqa: F401
+from modules.file_storage.adapter.output import (
+	sqlalchemy_file_metadata_storage as file_metadata_storage_module,
+)
+from modules.file_storage.adapter.output.sqlalchemy_file_metadata_storage import (
+	FileMetadataSQLAlchemyRepository,
+)
+from modules.file_storage.application.service.file_storage import FileStorageService
+from modules.file_storage.domain.entity import FileMetadata
+from modules.file_storage.domain.repository.file_metadata import FileMetadataRepository
+from modules.provider.application.service.draft_purchase_invoice import (
+	DraftPurchaseInvoiceService,
+)
+from modules.provider.domain.entity.draft_purchase_invoice import DraftPurchaseInvoice
+
+
+class InMemoryFileMetadataRepository(FileMetadataRepository):
+	"""Guarda las metadata en memoria y anota cada consulta por lote."""
+
+	def __init__(self):
+		self.items = {}
+		self.batches = []
+
+	async def get_by_uuid(self, uuid):
+		return self.items.get(uuid)
+
+	async def get_by_uuids(self, uuids):
+		self.batches.append(list(uuids))
+		return [self.items[uuid] for uuid in uuids if uuid in self.items]
+
+	async def get_by_sha256(self, sha256):
+		return None
+
+	def create(self, command):
+		raise NotImplementedError
+
+	async def save(self, file_metadata):
+		self.items[file_metadata.id] = file_metadata
+		return file_metadata
+
+	async def delete(self, file_metadata):
+		self.items.pop(file_metadata.id, None)
+
+
+def file_metadata(filename: str) -> FileMetadata:
+	return FileMetadata(id=uuid.uuid4(), filename=filename, download_filename=filename)
+
+
+async def test_draft_list_loads_all_file_metadata_in_one_batch():
+	metadata_repository = InMemoryFileMetadataRepository()
+	receipt, details = file_metadata("a.pdf"), file_metadata("b.pdf")
+	for item in (receipt, details):
+		await metadata_repository.save(item)
+	file_storage_service = FileStorageService(MagicMock(), metadata_repository)
+	service = DraftPurchaseInvoiceService(
+		MagicMock(), MagicMock(), MagicMock(), lambda: file_storage_service, None, MagicMock()
+	)
+	drafts = [
+		DraftPurchaseInvoice(id=1, id_receipt_file=receipt.id, id_details_file=details.id),
+		DraftPurchaseInvoice(id=2, id_receipt_file=receipt.id, id_details_file=uuid.uuid4()),
+		DraftPurchaseInvoice(id=3),
+	]
+
+	dtos = await service.get_draft_purchase_invoices_with_filemetadata(drafts)
+
+	assert len(metadata_repository.batches) == 1
+	assert len(metadata_repository.batches[0]) == 3
+	assert [(dto.receipt_file, dto.details_file) for dto in dtos] == [
+		(receipt, details),
+		(receipt, None),
+		(None, None),
+	]
+
+
+async def test_get_by_uuids_is_a_single_in_query():
+	result = MagicMock()
+	result.scalars.return_value.all.return_value = []
+	session = MagicMock()
+	session.execute = AsyncMock(return_value=result)
+	session_factory = MagicMock()
+	session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+	session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+	uuids = [uuid.uuid4(), uuid.uuid4()]
+
+	with patch.object(file_metadata_storage_module, "session_factory", session_factory):
+		repository = FileMetadataSQLAlchemyRepository()
+		assert await repository.get_by_uuids([]) == []
+		await repository.get_by_uuids(uuids)
+
+	session.execute.assert_awaited_once()
+	sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+	assert "WHERE filemetadata.id IN (" in sql
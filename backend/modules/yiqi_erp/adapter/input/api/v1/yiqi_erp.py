@@ -1,14 +1,21 @@
 from io import BytesIO
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from fastapi.responses import StreamingResponse
 
 from modules.yiqi_erp.adapter.input.api.v1.request import (
 	YiqiCreateAirWaybillRequest,
 	YiqiUploadFileRequest,
 )
+from modules.yiqi_erp.application.service.air_waybill_import import (
+	YiqiAirWaybillImportService,
+)
+from modules.yiqi_erp.application.service.purchase_invoice import (
+	YiqiPurchaseInvoiceService,
+)
 from modules.yiqi_erp.application.service.yiqi import YiqiService
 from modules.yiqi_erp.container import YiqiContainer
+from modules.yiqi_erp.domain.vo.purchase_invoice_page import YiqiPurchaseInvoicePage
 
 yiqi_erp_router = APIRouter()
 
@@ -79,6 +86,26 @@ async def get_provider_by_id(
 	return await service.get_provider_by_id(int(id_provider), id_schema)
 
 
+@yiqi_erp_router.get(
+	"/provider/{id_provider}/purchase_invoices", response_model=YiqiPurchaseInvoicePage
+)
+@inject
+async def get_provider_purchase_invoices(
+	id_provider: int,
+	status: str | None = Query(default=None, description="DESC_ESTADO"),
+	limit: int = Query(default=100, ge=1, le=500),
+	offset: int = Query(default=0, ge=0),
+	id_schema: int = Depends(Provide[YiqiContainer.config.YIQI_SCHEMA]),
+	service: YiqiPurchaseInvoiceService = Depends(
+		Provide[YiqiContainer.purchase_invoice_service]
+	),
+):
+	# Se sirve desde la copia local; `stale` avisa si la sincronización se atrasó
+	return await service.get_provider_invoices(
+		id_provider, id_schema, status, limit, offset
+	)
+
+
 @yiqi_erp_router.get("/air_waybills_template_file")
 @inject
 async def get_air_waybills_template_file(
@@ -118,10 +145,63 @@ async def create_air_waybill(
 @inject
 async def create_multiple_air_waybills(
 	upload_file: YiqiUploadFileRequest,
+	response: Response,
+	wait: bool = False,
 	id_schema: int = Depends(Provide[YiqiContainer.config.YIQI_SCHEMA]),
 	service: YiqiService = Depends(Provide[YiqiContainer.service]),
+	import_service: YiqiAirWaybillImportService = Depends(
+		Provide[YiqiContainer.air_waybill_import_service]
+	),
+):
+	# wait=true mantiene el comportamiento anterior (bloquea hasta que termina)
+	if wait:
+		return await service.create_multiple_air_waybills(upload_file, id_schema)
+	response.status_code = 202
+	return await import_service.start_import(upload_file, id_schema)
+
+
+@yiqi_erp_router.get("/air_waybills_import/{import_id}")
+@inject
+async def get_air_waybills_import_status(
+	import_id: str,
+	import_service: YiqiAirWaybillImportService = Depends(
+		Provide[YiqiContainer.air_waybill_import_service]
+	),
+):
+	return await import_service.get_status(import_id)
+
+
+@yiqi_erp_router.get("/air_waybills_import/{import_id}/events")
+@inject
+async def stream_air_waybills_import_status(
+	import_id: str,
+	import_service: YiqiAirWaybillImportService = Depends(
+		Provide[YiqiContainer.air_waybill_import_service]
+	),
+):
+	# Se valida antes de abrir el stream para poder responder 404
+	await import_service.get_status(import_id)
+
+	async def events():
+		async for status in import_service.stream_status(import_id):
+			yield f"event: {status.status}\ndata: {status.model_dump_json()}\n\n"
+
+	return StreamingResponse(
+		events(),
+		media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+	)
+
+
+@yiqi_erp_router.delete("/air_waybills_import/{import_id}")
+@inject
+async def cancel_air_waybills_import(
+	import_id: str,
+	import_service: YiqiAirWaybillImportService = Depends(
+		Provide[YiqiContainer.air_waybill_import_service]
+	),
 ):
-	return await service.create_multiple_air_waybills(upload_file, id_schema)
+	return await import_service.cancel(import_id)
 
 
 @yiqi_erp_router.post("/upload_file")
@@ -5,25 +5,49 @@ Estas funciones se registrarán automáticamente como tasks de Celery
 a través del service_locator y el discovery automático.
 
 NOTA: Las funciones async son soportadas automáticamente.
-El sistema las envuelve en un wrapper síncrono usando asyncio.run().
+El sistema las ejecuta en el event loop persistente del worker (core.celery.runtime).
 """
 
 from io import BytesIO
+import logging
 import uuid
-import pandas as pd
+from starlette.datastructures import Headers
 from shared.interfaces.service_locator import service_locator
 from shared.interfaces.service_protocols import (
 	FileStorageServiceProtocol,
 	ProviderServiceProtocol,
 	PurchaseInvoiceServiceProtocol,
 	PurchaseInvoiceServiceTypeServiceProtocol,
+	YiqiServiceProtocol,
+)
+from modules.yiqi_erp.application.service.invoice_integration import (
+	upload_stored_attachment,
 )
-from modules.yiqi_erp.container import YiqiContainer
 from modules.yiqi_erp.domain.command import CreateYiqiInvoiceCommand, UploadFileCommand
-from core.db.session import set_session_context, reset_session_context
+from modules.yiqi_erp.domain.vo.air_waybill_reconciliation import (
+	AirWaybillReconciliation,
+)
+from modules.yiqi_erp.domain.vo.air_waybill_sheet import AirWaybillSheet
+from core.helpers.spreadsheet import CONTENT_TYPES, write_spreadsheet
+from core.db.session import session, set_session_context, reset_session_context
 from core.config.settings import env
 from shared.interfaces.service_protocols.provider import AirWaybillServiceProtocol
 
+logger = logging.getLogger(__name__)
+
+
+def purchase_invoice_emission_key(
+	purchase_invoice_id: int, schema_id: int = env.YIQI_SCHEMA
+) -> str:
+	"""
+	Clave de idempotencia de la emisión de una purchase invoice a YiqiERP.
+
+	Es compartida por las tasks de emisión (original y mejorada), de modo que
+	los reenvíos (`reemit`, `emit_to_yiqi`) de la misma factura colapsan en
+	una sola ejecución.
+	"""
+	return f"yiqi_erp.emit_purchase_invoice:{schema_id}:{purchase_invoice_id}"
+
 
 async def create_invoice_from_purchase_invoice_tasks(
 	purchase_invoice_id: int, schema_id: int = env.YIQI_SCHEMA
@@ -43,11 +67,12 @@ async def create_invoice_from_purchase_invoice_tasks(
 	Returns:
 		Respuesta del servicio YiqiERP
 	"""
-	try:
-		yiqi_service = YiqiContainer().service()
+	session_uuid = uuid.uuid4()
+	context = set_session_context(str(session_uuid))
 
-		session_uuid = uuid.uuid4()
-		context = set_session_context(str(session_uuid))
+	try:
+		# Servicio del container del módulo: reutiliza el cliente HTTP entre tasks
+		yiqi_service: YiqiServiceProtocol = service_locator.get_service("yiqi_service")
 
 		provider_service: ProviderServiceProtocol = service_locator.get_service(
 			"provider_service"
@@ -92,33 +117,22 @@ async def create_invoice_from_purchase_invoice_tasks(
 		yiqi_comprobante = None
 		yiqi_detalle = None
 
+		# Los adjuntos pasan del storage a Yiqi por bloques, sin cargarlos en memoria
 		if purchase_invoice.fk_receipt_file:
-			comprobante_metadata = await file_storage_service.get_metadata(
-				purchase_invoice.fk_receipt_file
+			yiqi_comprobante = await upload_stored_attachment(
+				file_storage_service,
+				yiqi_service,
+				purchase_invoice.fk_receipt_file,
+				schema_id,
 			)
-			archivo_comprobante = await file_storage_service.download_file(
-				purchase_invoice.fk_receipt_file
-			)
-			yiqi_comprobante = UploadFileCommand(
-				BytesIO(archivo_comprobante.file),
-				size=comprobante_metadata.size,
-				filename=comprobante_metadata.download_filename,
-			)
-			await yiqi_service.upload_file(yiqi_comprobante, schema_id)
 
 		if purchase_invoice.fk_detail_file:
-			detalle_metadata = await file_storage_service.get_metadata(
-				purchase_invoice.fk_detail_file
-			)
-			archivo_detalle = await file_storage_service.download_file(
-				purchase_invoice.fk_detail_file
+			yiqi_detalle = await upload_stored_attachment(
+				file_storage_service,
+				yiqi_service,
+				purchase_invoice.fk_detail_file,
+				schema_id,
 			)
-			yiqi_detalle = UploadFileCommand(
-				BytesIO(archivo_detalle.file),
-				size=detalle_metadata.size,
-				filename=detalle_metadata.download_filename,
-			)
-			await yiqi_service.upload_file(yiqi_detalle, schema_id)
 
 		yiqi_invoice = CreateYiqiInvoiceCommand(
 			Provider=provider.id_yiqi_provider,
@@ -149,59 +163,35 @@ async def create_invoice_from_purchase_invoice_tasks(
 		await purchase_invoice_service.save(purchase_invoice)
 		print(yiqi_response)
 
-		air_waybills = (
-			await air_waybill_service.get_air_waybills_by_purchase_invoice_id(
-				purchase_invoice.id
-			)
+		# La planilla se arma directo desde el cursor, sin DataFrame ni lista
+		awb_format = env.YIQI_AWB_IMPORT_FORMAT
+		sheet = AirWaybillSheet(
+			id_yiqi_provider=provider.id_yiqi_provider,
+			id_yiqi_invoice=purchase_invoice.fk_yiqi_invoice,
 		)
-		columns = [
-			"🔑 Proveedor (Nombre)",
-			"🔑 Factura (Id factura)",
-			"🔑 Guía aérea",
-			"CN38",
-			"Origen (País)",
-			"Destino (País)",
-			"Kg",
-			"Bags",
-		]
-		rows = [
-			(
-				"CLIE_ID_CLIE",
-				"FACO_ID_FACO",
-				"GUAE_GUIA_AEREA",
-				"GUAE_CN38",
-				"PAIS_ID_PAI1",
-				"PAIS_ID_PAIS",
-				"GUAE_KG",
-				"GUAE_BAGS",
-			)
-		]
-		for item in air_waybills:
-			rows.append(
-				(
-					str(provider.id_yiqi_provider),
-					str(purchase_invoice.fk_yiqi_invoice),
-					item.awb_code,
-					"",
-					item.origin,
-					item.destination,
-					str(item.kg),
-					"",
+		yiqi_awb_bytes = await write_spreadsheet(
+			sheet.rows(
+				air_waybill_service.iter_air_waybills_by_purchase_invoice_id(
+					purchase_invoice.id
 				)
+			),
+			awb_format,
+		)
+		if not sheet.rows_written:
+			# La factura ya existe en Yiqi: fallar acá haría que el reintento la
+			# duplicara, así que sólo se omite la importación de guías
+			logger.warning(
+				f"Purchase invoice {purchase_invoice.id} has no air waybills, "
+				"skipping the Yiqi AWB import."
 			)
-		df = pd.DataFrame(rows, columns=columns)
-		print(df)
-		buffer = BytesIO()
-		df.to_excel(buffer, index=False, engine="openpyxl")
-		buffer.seek(0)
-		yiqi_awb_bytes = buffer.getvalue()
+			return yiqi_response
 
 		yiqi_awb_file = UploadFileCommand(
 			BytesIO(yiqi_awb_bytes),
 			size=len(yiqi_awb_bytes),
-			filename="air_waybills.xlsx",
+			filename=f"air_waybills.{awb_format}",
+			headers=Headers({"content-type": CONTENT_TYPES[awb_format]}),
 		)
-		buffer.close()
 
 		yiqi_awb_creation = await yiqi_service.create_multiple_air_waybills(
 			yiqi_awb_file, schema_id
@@ -220,13 +210,21 @@ async def create_invoice_from_purchase_invoice_tasks(
 			purchase_invoice.fk_yiqi_invoice, schema_id
 		)
 
-		for awb in yiqi_awbs:
-			for air_waybill in air_waybills:
-				if awb.get("GUAE_GUIA_AEREA") == air_waybill.awb_code:
-					air_waybill.fk_yiqi_awb = awb.get("id")
-					await air_waybill_service.save_air_waybill(air_waybill)
-					break
+		reconciliation = AirWaybillReconciliation.index(yiqi_awbs, sheet.awb_codes)
+		reconciliation.linked_codes = set(
+			await air_waybill_service.link_yiqi_air_waybills(
+				purchase_invoice.id, reconciliation.matches
+			)
+		)
+		if reconciliation.missing_in_yiqi or reconciliation.missing_locally:
+			logger.warning(
+				f"Purchase invoice {purchase_invoice.id}: "
+				f"{len(reconciliation.linked_codes)} AWBs linked, "
+				f"not found in Yiqi: {reconciliation.missing_in_yiqi}, "
+				f"not found locally: {reconciliation.missing_locally}"
+			)
 
 		return yiqi_response
 	finally:
+		await session.remove()
 		reset_session_context(context)
@@ -7,17 +7,26 @@ Mejoras sobre la versión original:
 3. Validación temprana de datos
 4. Logging estructurado
 5. Type hints más precisos
+6. Pasos independientes en paralelo (proveedor, servicio, moneda y adjuntos),
+   con la duración de cada paso registrada en el log
 """
 
 import logging
 import uuid
 from decimal import Decimal
 from io import BytesIO
-from typing import Any, Dict
+from typing import Any, Awaitable, Dict
+from uuid import UUID
 
 from core.config.settings import env
-from core.db.session import reset_session_context, set_session_context
-from modules.yiqi_erp.container import YiqiContainer
+from core.db.session import (
+	reset_session_context,
+	session,
+	session_scope,
+	set_session_context,
+)
+from core.helpers.concurrency import StepTimings, gather_bounded
+from modules.yiqi_erp.domain.command import UploadFileCommand as YiqiUploadFile
 from modules.yiqi_erp.domain.command.improved_commands import (
 	CreateYiqiInvoiceCommand,
 	UploadFileCommand,
@@ -28,6 +37,7 @@ from shared.interfaces.service_protocols import (
 	ProviderServiceProtocol,
 	PurchaseInvoiceServiceProtocol,
 	PurchaseInvoiceServiceTypeServiceProtocol,
+	YiqiServiceProtocol,
 )
 
 # Configure logger
@@ -43,6 +53,128 @@ class InvoiceCreationError(Exception):
 		super().__init__(self.message)
 
 
+# Máximo de operaciones de I/O en vuelo en cada etapa del pipeline
+FAN_OUT_LIMIT = 4
+
+
+async def _in_own_session(aw: Awaitable[Any]) -> Any:
+	# Las ramas paralelas no pueden compartir la AsyncSession de la task
+	async with session_scope():
+		return await aw
+
+
+async def _fetch_provider(
+	provider_service: ProviderServiceProtocol, provider_id: int
+) -> Any:
+	provider = await provider_service.get_provider_by_id(provider_id)
+
+	if not provider:
+		raise InvoiceCreationError(
+			f"Provider not found: {provider_id}",
+			{"provider_id": provider_id},
+		)
+
+	if not provider.id_yiqi_provider:
+		raise InvoiceCreationError(
+			f"Provider missing Yiqi ID: {provider.id}",
+			{
+				"provider_id": provider.id,
+				"provider_name": getattr(provider, "name", "N/A"),
+			},
+		)
+	return provider
+
+
+async def _fetch_service(
+	servicetype_service: PurchaseInvoiceServiceTypeServiceProtocol, service_id: int
+) -> Any:
+	service = await servicetype_service.get_services_by_id(service_id)
+
+	if not service:
+		raise InvoiceCreationError(
+			f"Service not found: {service_id}",
+			{"service_id": service_id},
+		)
+
+	if not service.id_yiqi_service:
+		raise InvoiceCreationError(
+			f"Service missing Yiqi ID: {service.id}",
+			{
+				"service_id": service.id,
+				"service_name": getattr(service, "name", "N/A"),
+			},
+		)
+	return service
+
+
+async def _fetch_currency(
+	yiqi_service: YiqiServiceProtocol, currency_code: str, schema_id: int
+) -> dict:
+	yiqi_currency = await yiqi_service.get_currency_by_code(currency_code, schema_id)
+
+	if not yiqi_currency or "id" not in yiqi_currency:
+		raise InvoiceCreationError(
+			f"Currency not found in Yiqi: {currency_code}",
+			{"currency_code": currency_code, "schema_id": schema_id},
+		)
+	return yiqi_currency
+
+
+async def _open_attachment(
+	file_storage_service: FileStorageServiceProtocol, file_id: UUID, label: str
+) -> Any:
+	"""
+	Abre el adjunto para streaming y valida tamaño y nombre.
+
+	Sólo consulta la metadata: S3 se lee recién al subirlo a Yiqi.
+	"""
+	try:
+		stored_file = await file_storage_service.stream_file(file_id)
+	except Exception as e:
+		raise InvoiceCreationError(
+			f"Failed to read/download {label} file from storage: {str(e)}",
+			{"file_id": str(file_id)},
+		)
+
+	metadata = stored_file.metadata
+	try:
+		UploadFileCommand(
+			file=BytesIO(), size=metadata.size, filename=metadata.download_filename
+		)
+	except ValueError as e:
+		raise InvoiceCreationError(
+			f"Invalid {label} file: {str(e)}",
+			{"file_id": str(file_id), "validation_error": str(e)},
+		)
+	return stored_file
+
+
+async def _upload_attachment(
+	yiqi_service: YiqiServiceProtocol, stored_file: Any, schema_id: int, label: str
+) -> YiqiUploadFile:
+	"""Sube el adjunto a Yiqi por bloques, directo desde S3."""
+	metadata = stored_file.metadata
+	try:
+		await yiqi_service.upload_file_stream(
+			metadata.download_filename, stored_file.stream, metadata.size, schema_id
+		)
+		logger.info(f"{label.capitalize()} file uploaded: {metadata.download_filename}")
+	except Exception as e:
+		raise InvoiceCreationError(
+			f"Failed to upload {label} file: {str(e)}",
+			{"file_id": str(metadata.id)},
+		)
+
+	# CreateYiqiInvoiceCommand sólo usa el nombre (y el tamaño para validar)
+	return YiqiUploadFile(
+		BytesIO(), size=metadata.size, filename=metadata.download_filename
+	)
+
+
+async def _nothing() -> None:
+	return None
+
+
 async def create_invoice_from_purchase_invoice_improved_tasks(
 	purchase_invoice_id: int, schema_id: int = env.YIQI_SCHEMA
 ) -> Dict[str, Any]:
@@ -80,10 +212,11 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 		f"schema_id={schema_id}"
 	)
 
-	# Initialize services
-	yiqi_service = YiqiContainer().service()
+	# Initialize services (module container: HTTP client shared across tasks)
+	yiqi_service: YiqiServiceProtocol = service_locator.get_service("yiqi_service")
 	session_uuid = uuid.uuid4()
 	context = set_session_context(str(session_uuid))
+	timings = StepTimings()
 
 	try:
 		# === Step 1: Get required services ===
@@ -105,8 +238,9 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 		# === Step 2: Fetch invoice and related data ===
 		logger.debug(f"Fetching purchase invoice {purchase_invoice_id}")
 
-		purchase_invoice = await purchase_invoice_service.get_one_by_id(
-			purchase_invoice_id
+		purchase_invoice = await timings.run(
+			"purchase_invoice",
+			purchase_invoice_service.get_one_by_id(purchase_invoice_id),
 		)
 
 		if not purchase_invoice:
@@ -133,139 +267,78 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 				{"purchase_invoice_id": purchase_invoice_id, "field": "fk_service"},
 			)
 
-		# === Step 4: Fetch related entities ===
-		logger.debug("Fetching provider and service data")
-
-		provider = await provider_service.get_provider_by_id(
-			purchase_invoice.fk_provider
-		)
-
-		if not provider:
-			raise InvoiceCreationError(
-				f"Provider not found: {purchase_invoice.fk_provider}",
-				{"provider_id": purchase_invoice.fk_provider},
+		# === Step 4: Fetch related entities and attachments concurrently ===
+		# Proveedor, servicio, moneda y la metadata de cada adjunto no dependen
+		# entre sí. Los adjuntos se suben a Yiqi recién cuando todo validó,
+		# para no dejar archivos huérfanos si falta algún dato
+		logger.debug("Fetching provider, service, currency and attachments")
+
+		(
+			provider,
+			service,
+			yiqi_currency,
+			receipt_file,
+			detail_file,
+		) = await gather_bounded(
+			timings.run(
+				"provider",
+				_in_own_session(
+					_fetch_provider(provider_service, purchase_invoice.fk_provider)
+				),
+			),
+			timings.run(
+				"service",
+				_in_own_session(
+					_fetch_service(servicetype_service, purchase_invoice.fk_service)
+				),
+			),
+			timings.run(
+				"currency",
+				_in_own_session(
+					_fetch_currency(yiqi_service, purchase_invoice.currency, schema_id)
+				),
+			),
+			timings.run(
+				"receipt_open",
+				_in_own_session(
+					_open_attachment(
+						file_storage_service, purchase_invoice.fk_receipt_file, "receipt"
+					)
+				),
 			)
-
-		if not provider.id_yiqi_provider:
-			raise InvoiceCreationError(
-				f"Provider missing Yiqi ID: {provider.id}",
-				{
-					"provider_id": provider.id,
-					"provider_name": getattr(provider, "name", "N/A"),
-				},
+			if purchase_invoice.fk_receipt_file
+			else _nothing(),
+			timings.run(
+				"detail_open",
+				_in_own_session(
+					_open_attachment(
+						file_storage_service, purchase_invoice.fk_detail_file, "detail"
+					)
+				),
 			)
-
-		service = await servicetype_service.get_services_by_id(
-			purchase_invoice.fk_service
+			if purchase_invoice.fk_detail_file
+			else _nothing(),
+			limit=FAN_OUT_LIMIT,
 		)
 
-		if not service:
-			raise InvoiceCreationError(
-				f"Service not found: {purchase_invoice.fk_service}",
-				{"service_id": purchase_invoice.fk_service},
+		# === Step 5: Stream attachments from S3 to Yiqi concurrently ===
+		yiqi_comprobante, yiqi_detalle = await gather_bounded(
+			timings.run(
+				"receipt_upload",
+				_upload_attachment(yiqi_service, receipt_file, schema_id, "receipt"),
 			)
-
-		if not service.id_yiqi_service:
-			raise InvoiceCreationError(
-				f"Service missing Yiqi ID: {service.id}",
-				{
-					"service_id": service.id,
-					"service_name": getattr(service, "name", "N/A"),
-				},
+			if receipt_file
+			else _nothing(),
+			timings.run(
+				"detail_upload",
+				_upload_attachment(yiqi_service, detail_file, schema_id, "detail"),
 			)
-
-		# === Step 5: Get currency ===
-		logger.debug(f"Fetching currency: {purchase_invoice.currency}")
-
-		yiqi_currency = await yiqi_service.get_currency_by_code(
-			purchase_invoice.currency, schema_id
+			if detail_file
+			else _nothing(),
+			limit=FAN_OUT_LIMIT,
 		)
 
-		if not yiqi_currency or "id" not in yiqi_currency:
-			raise InvoiceCreationError(
-				f"Currency not found in Yiqi: {purchase_invoice.currency}",
-				{"currency_code": purchase_invoice.currency, "schema_id": schema_id},
-			)
-
-		# === Step 6: Process file attachments ===
-		yiqi_comprobante = None
-		yiqi_detalle = None
-
-		if purchase_invoice.fk_receipt_file:
-			logger.debug(f"Processing receipt file: {purchase_invoice.fk_receipt_file}")
-
-			try:
-				comprobante_metadata = await file_storage_service.get_metadata(
-					purchase_invoice.fk_receipt_file
-				)
-				archivo_comprobante = await file_storage_service.download_file(
-					purchase_invoice.fk_receipt_file
-				)
-
-				# Create upload command with validation
-				yiqi_comprobante = UploadFileCommand(
-					file=BytesIO(archivo_comprobante.file),
-					size=comprobante_metadata.size,
-					filename=comprobante_metadata.download_filename,
-				)
-
-				await yiqi_service.upload_file(yiqi_comprobante, schema_id)
-				logger.info(
-					f"Receipt file uploaded: {comprobante_metadata.download_filename}"
-				)
-
-			except ValueError as e:
-				raise InvoiceCreationError(
-					f"Invalid receipt file: {str(e)}",
-					{
-						"file_id": str(purchase_invoice.fk_receipt_file),
-						"validation_error": str(e),
-					},
-				)
-			except Exception as e:
-				raise InvoiceCreationError(
-					f"Failed to upload receipt file: {str(e)}",
-					{"file_id": str(purchase_invoice.fk_receipt_file)},
-				)
-
-		if purchase_invoice.fk_detail_file:
-			logger.debug(f"Processing detail file: {purchase_invoice.fk_detail_file}")
-
-			try:
-				detalle_metadata = await file_storage_service.get_metadata(
-					purchase_invoice.fk_detail_file
-				)
-				archivo_detalle = await file_storage_service.download_file(
-					purchase_invoice.fk_detail_file
-				)
-
-				# Create upload command with validation
-				yiqi_detalle = UploadFileCommand(
-					file=BytesIO(archivo_detalle.file),
-					size=detalle_metadata.size,
-					filename=detalle_metadata.download_filename,
-				)
-
-				await yiqi_service.upload_file(yiqi_detalle, schema_id)
-				logger.info(
-					f"Detail file uploaded: {detalle_metadata.download_filename}"
-				)
-
-			except ValueError as e:
-				raise InvoiceCreationError(
-					f"Invalid detail file: {str(e)}",
-					{
-						"file_id": str(purchase_invoice.fk_detail_file),
-						"validation_error": str(e),
-					},
-				)
-			except Exception as e:
-				raise InvoiceCreationError(
-					f"Failed to upload detail file: {str(e)}",
-					{"file_id": str(purchase_invoice.fk_detail_file)},
-				)
-
-		# === Step 7: Create invoice command with full validation ===
+		# === Step 6: Create invoice command with full validation ===
 		logger.debug("Creating invoice command with validation")
 
 		try:
@@ -319,13 +392,15 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 				},
 			)
 
-		# === Step 8: Create invoice in Yiqi ===
+		# === Step 7: Create invoice in Yiqi ===
 		logger.info(
 			f"Creating invoice in Yiqi for invoice number: {purchase_invoice.number}"
 		)
 
 		try:
-			yiqi_response = await yiqi_service.create_invoice(yiqi_invoice, schema_id)
+			yiqi_response = await timings.run(
+				"create_invoice", yiqi_service.create_invoice(yiqi_invoice, schema_id)
+			)
 
 			if "newId" not in yiqi_response:
 				raise InvoiceCreationError(
@@ -346,14 +421,14 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 				},
 			)
 
-		# === Step 9: Update purchase invoice with Yiqi ID ===
+		# === Step 8: Update purchase invoice with Yiqi ID ===
 		logger.debug(
 			f"Updating purchase invoice with Yiqi ID: {yiqi_response['newId']}"
 		)
 
 		try:
 			purchase_invoice.fk_yiqi_invoice = yiqi_response.get("newId")
-			await purchase_invoice_service.save(purchase_invoice)
+			await timings.run("save", purchase_invoice_service.save(purchase_invoice))
 
 			logger.info(
 				f"Purchase invoice updated successfully. "
@@ -390,7 +465,13 @@ async def create_invoice_from_purchase_invoice_improved_tasks(
 		)
 
 	finally:
-		# Always reset session context
+		logger.info(
+			f"Invoice pipeline timings for purchase_invoice_id={purchase_invoice_id}: "
+			f"{timings.as_dict()}",
+			extra={"timings": timings.as_dict()},
+		)
+		# Always release the scoped session and reset its context
+		await session.remove()
 		reset_session_context(context)
 		logger.debug(f"Session context reset: {session_uuid}")
 
@@ -0,0 +1,67 @@
+"""
+Tasks de sincronización incremental con YiqiERP - Input Adapter.
+
+`sync_yiqi_entities_tasks` se programa con celery beat (ver module.py) y
+mantiene la copia local de monedas, servicios, proveedores y facturas de
+compra al día pidiendo sólo los cambios desde la última marca de agua de cada
+entidad.
+"""
+
+import uuid
+from dataclasses import asdict
+from typing import List
+
+from core.config.settings import env
+from core.db.session import reset_session_context, session, set_session_context
+from shared.interfaces.service_locator import service_locator
+from shared.interfaces.service_protocols import YiqiSyncServiceProtocol
+
+
+def yiqi_sync_key(
+	schema_id: int = env.YIQI_SCHEMA,
+	entities: List[str] | None = None,
+	full: bool = False,
+) -> str:
+	"""
+	Colapsa sincronizaciones repetidas con los mismos argumentos.
+
+	La clave incluye `full` y las entidades (ordenadas) para que una
+	sincronización completa o de otras entidades no reciba el resultado
+	memorizado de otra distinta.
+	"""
+	scope = ",".join(sorted(set(entities))) if entities else "all"
+	mode = "full" if full else "incremental"
+	return f"yiqi_erp.sync:{schema_id}:{mode}:{scope}"
+
+
+async def sync_yiqi_entities_tasks(
+	schema_id: int = env.YIQI_SCHEMA,
+	entities: List[str] | None = None,
+	full: bool = False,
+) -> List[dict]:
+	"""
+	Sincroniza las entidades de Yiqi con la base local.
+
+	Será registrada automáticamente como: "yiqi_erp.sync_yiqi_entities_tasks"
+
+	Args:
+		schema_id: ID del schema en YiqiERP
+		entities: Entidades a sincronizar (MONEDA, SERVICIOS, CLIENTE,
+			FACTURA_COMPRA). Por defecto todas
+		full: Ignora las marcas de agua y descarga el historial completo
+
+	Returns:
+		Resultado por entidad (desde, recibidos, creados, actualizados, error)
+	"""
+	session_uuid = uuid.uuid4()
+	context = set_session_context(str(session_uuid))
+
+	try:
+		sync_service: YiqiSyncServiceProtocol = service_locator.get_service(
+			"yiqi_sync_service"
+		)
+		results = await sync_service.sync_all(schema_id, entities, full)
+		return [asdict(result) for result in results]
+	finally:
+		await session.remove()
+		reset_session_context(context)
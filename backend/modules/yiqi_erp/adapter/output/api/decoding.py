@@ -0,0 +1,60 @@
+import logging
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, List, Type, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+from core.helpers.json_stream import iter_json_array
+from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
+
+logger = logging.getLogger(__name__)
+
+EntityT = TypeVar("EntityT", bound=YiqiEntity)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def entity_list_adapter(model: Type[EntityT]) -> TypeAdapter[List[EntityT]]:
+	# Construir el validador es caro: uno por modelo para todo el proceso
+	return TypeAdapter(List[model])
+
+
+def _validate_batch(model: Type[EntityT], rows: List[dict]) -> List[EntityT]:
+	try:
+		return entity_list_adapter(model).validate_python(rows)
+	except ValidationError:
+		pass
+
+	# Alguna fila no valida: se descartan sólo esas
+	entities = []
+	for row in rows:
+		try:
+			entities.append(model.model_validate(row))
+		except ValidationError as e:
+			logger.warning(
+				f"Skipping {model.__internal_name__} row {row.get('id')}: "
+				f"{e.error_count()} validation errors"
+			)
+	return entities
+
+
+async def iter_entities(
+	chunks: AsyncIterable[bytes],
+	model: Type[EntityT],
+	batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[EntityT]:
+	"""
+	Decodifica un array JSON de GetEntityUpdates2 a medida que llega y lo
+	valida contra `model` de a `batch_size` filas.
+	"""
+	batch: List[dict] = []
+	async for row in iter_json_array(chunks):
+		batch.append(row)
+		if len(batch) >= batch_size:
+			for entity in _validate_batch(model, batch):
+				yield entity
+			batch = []
+	if batch:
+		for entity in _validate_batch(model, batch):
+			yield entity
@@ -12,3 +12,9 @@ class RequestException(CustomException):
 		self.code = code
 		self.error_code = error_code
 		self.message = message
+
+
+class YiqiUnavailableException(CustomException):
+	code = 503
+	error_code = "YIQI__UNAVAILABLE"
+	message = "Yiqi no está respondiendo, se reintentará en unos segundos"
@@ -1,5 +1,10 @@
-from dataclasses import dataclass
-from typing import Any
+import asyncio
+import importlib.util
+import logging
+import random
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict
 
 import httpx
 from httpx._types import (
@@ -13,24 +18,197 @@ from httpx._types import (
 	TimeoutTypes,
 )
 
+from core.helpers.circuit_breaker import CircuitBreaker, CircuitOpenError
+from modules.yiqi_erp.adapter.output.api.exception import YiqiUnavailableException
+
+logger = logging.getLogger(__name__)
+
+# Errores de transporte transitorios: se reintentan y cuentan para el circuito.
+# El resto (UnsupportedProtocol, LocalProtocolError, ProxyError...) son errores
+# de configuración o locales y se propagan sin reintentar
+RETRY_TRANSPORT_ERRORS = (
+	httpx.TimeoutException,
+	httpx.NetworkError,
+	httpx.RemoteProtocolError,
+)
+
+# Timeout de lectura por endpoint (último segmento del path, en minúsculas).
+# Los que no figuran usan `api_timeout` (GetEntityUpdates2 con historial
+# completo puede tardar minutos)
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, float] = {
+	"getprogress": 15.0,
+	"cliente": 30.0,
+	"contacto": 30.0,
+	"save": 60.0,
+	"saveinstancepost2": 60.0,
+	"generateexceltemplate": 60.0,
+	"uploadexcel": 120.0,
+	"importexcel": 120.0,
+	"savefile": 120.0,
+}
+
+# Respuestas que vale la pena reintentar (sólo en requests idempotentes)
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
 
 @dataclass
 class YiqiHttpClient:
+	"""
+	Cliente HTTP de Yiqi compartido por todo el proceso.
+
+	- Pool de conexiones con límites y keep-alive configurables (HTTP/2
+	  opcional, requiere el paquete `h2`).
+	- Timeout de lectura por endpoint.
+	- Reintentos con backoff exponencial y jitter sólo en requests
+	  idempotentes (GET por defecto; nunca POST salvo que se indique).
+	- Semáforo por schema: acota las llamadas simultáneas a Yiqi por empresa.
+	- Circuit breaker: si Yiqi falla seguido se rechaza de inmediato con
+	  YiqiUnavailableException en vez de esperar timeouts.
+	"""
+
 	base_url: str
 	api_key: str
 	api_timeout: float = 30.0
+	connect_timeout: float = 5.0
+	max_connections: int = 20
+	max_keepalive_connections: int = 10
+	keepalive_expiry: float = 30.0
+	http2: bool = False
+	max_retries: int = 2
+	retry_backoff: float = 0.5
+	retry_max_backoff: float = 5.0
+	max_concurrency_per_schema: int = 8
+	failure_threshold: int = 5
+	recovery_timeout: float = 30.0
+	endpoint_timeouts: Dict[str, float] = field(
+		default_factory=lambda: dict(DEFAULT_ENDPOINT_TIMEOUTS)
+	)
+	# Permite reemplazar la red (tests, httpx.MockTransport)
+	transport: httpx.AsyncBaseTransport | None = None
 
 	def __post_init__(self):
+		if self.http2 and importlib.util.find_spec("h2") is None:
+			logger.warning("YIQI_HTTP2 enabled but 'h2' is not installed, using HTTP/1.1")
+			self.http2 = False
+
 		self._client = httpx.AsyncClient(
 			base_url=self.base_url,
 			headers={"Authorization": f"Bearer {self.api_key}"},
-			timeout=self.api_timeout,
+			timeout=httpx.Timeout(self.api_timeout, connect=self.connect_timeout),
+			limits=httpx.Limits(
+				max_connections=self.max_connections,
+				max_keepalive_connections=self.max_keepalive_connections,
+				keepalive_expiry=self.keepalive_expiry,
+			),
+			http2=self.http2,
+			transport=self.transport,
+		)
+		self.breaker = CircuitBreaker(
+			"yiqi",
+			failure_threshold=self.failure_threshold,
+			recovery_timeout=self.recovery_timeout,
 		)
+		self._semaphores: Dict[Any, asyncio.Semaphore] = {}
 
 	def _extract_content_type_header(self, response: httpx.Response) -> str:
 		content_type = response.headers.get("Content-Type", "application/json")
 		return content_type
 
+	def _timeout_for(self, path: str) -> TimeoutTypes:
+		endpoint = httpx.URL(path).path.rstrip("/").rsplit("/", 1)[-1].lower()
+		read_timeout = self.endpoint_timeouts.get(endpoint)
+		if read_timeout is None:
+			return self._client.timeout
+		return httpx.Timeout(read_timeout, connect=self.connect_timeout)
+
+	def _semaphore_for(
+		self, *payloads: Any, id_schema: int | None = None
+	) -> asyncio.Semaphore:
+		for payload in payloads:
+			if id_schema is None and isinstance(payload, dict):
+				id_schema = payload.get("schemaId", payload.get("SchemaId"))
+		semaphore = self._semaphores.get(id_schema)
+		if semaphore is None:
+			semaphore = asyncio.Semaphore(self.max_concurrency_per_schema)
+			self._semaphores[id_schema] = semaphore
+		return semaphore
+
+	def _retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+		delay = random.uniform(
+			0, min(self.retry_max_backoff, self.retry_backoff * 2 ** (attempt - 1))
+		)
+		retry_after = response.headers.get("Retry-After") if response else None
+		if retry_after and retry_after.isdigit():
+			delay = max(delay, min(float(retry_after), self.retry_max_backoff))
+		return delay
+
+	async def _request(
+		self,
+		method: str,
+		path: str,
+		*,
+		idempotent: bool,
+		timeout: TimeoutTypes | None,
+		stream: bool = False,
+		id_schema: int | None = None,
+		**kwargs,
+	) -> httpx.Response:
+		attempts = 1 + (self.max_retries if idempotent else 0)
+		timeout = timeout or self._timeout_for(path)
+		semaphore = self._semaphore_for(
+			kwargs.get("params"),
+			kwargs.get("data"),
+			kwargs.get("json"),
+			id_schema=id_schema,
+		)
+		if stream:
+			# Quien lee el cuerpo ya tiene el semáforo tomado (ver `stream`)
+			semaphore = nullcontext()
+		auth = kwargs.pop("auth", httpx.USE_CLIENT_DEFAULT)
+
+		response = None
+		for attempt in range(attempts):
+			if attempt:
+				await asyncio.sleep(self._retry_delay(attempt, response))
+			try:
+				self.breaker.before_call()
+			except CircuitOpenError as e:
+				raise YiqiUnavailableException from e
+
+			try:
+				async with semaphore:
+					request = self._client.build_request(
+						method, path, timeout=timeout, **kwargs
+					)
+					response = await self._client.send(
+						request, auth=auth, stream=stream
+					)
+			except RETRY_TRANSPORT_ERRORS as e:
+				self.breaker.record_failure()
+				if attempt == attempts - 1:
+					raise
+				logger.warning(f"Yiqi {method} {path} failed ({e!r}), retrying")
+				response = None
+				continue
+			except BaseException:
+				# Cancelación o error local (p. ej. el cuerpo multipart no coincide
+				# con su tamaño, o una base_url mal configurada): no dice nada de
+				# Yiqi, pero la llamada de prueba del half_open no puede quedar tomada
+				self.breaker.release_probe()
+				raise
+
+			if response.status_code >= 500:
+				self.breaker.record_failure()
+			else:
+				self.breaker.record_success()
+			if response.status_code in RETRY_STATUS_CODES and attempt < attempts - 1:
+				logger.warning(f"Yiqi {method} {path} -> {response.status_code}, retrying")
+				await response.aclose()
+				continue
+
+			setattr(response, "content_type", self._extract_content_type_header(response))
+			return response
+
 	async def get(
 		self,
 		path: str,
@@ -39,17 +217,47 @@ class YiqiHttpClient:
 		cookies: CookieTypes | None = None,
 		auth: AuthTypes | None = None,
 		timeout: TimeoutTypes | None = None,
+		idempotent: bool = True,
 	):
-		if not auth:
-			auth = self._client.auth
-		if not timeout:
-			timeout = self._client.timeout
-
-		response = await self._client.get(
-			path, params=params, headers=headers, cookies=cookies, timeout=timeout
+		return await self._request(
+			"GET",
+			path,
+			idempotent=idempotent,
+			timeout=timeout,
+			params=params,
+			headers=headers,
+			cookies=cookies,
+			auth=auth or httpx.USE_CLIENT_DEFAULT,
 		)
-		setattr(response, "content_type", self._extract_content_type_header(response))
-		return response
+
+	@asynccontextmanager
+	async def stream(
+		self,
+		path: str,
+		params: QueryParamTypes | None = None,
+		headers: HeaderTypes | None = None,
+		timeout: TimeoutTypes | None = None,
+	) -> AsyncIterator[httpx.Response]:
+		"""
+		GET cuyo cuerpo se lee por partes con `response.aiter_bytes()`.
+
+		Se reintenta sólo hasta recibir los headers; el semáforo del schema
+		queda tomado hasta terminar de leer el cuerpo.
+		"""
+		async with self._semaphore_for(params):
+			response = await self._request(
+				"GET",
+				path,
+				idempotent=True,
+				timeout=timeout,
+				stream=True,
+				params=params,
+				headers=headers,
+			)
+			try:
+				yield response
+			finally:
+				await response.aclose()
 
 	async def post(
 		self,
@@ -62,12 +270,19 @@ class YiqiHttpClient:
 		headers: HeaderTypes | None = None,
 		cookies: CookieTypes | None = None,
 		timeout: TimeoutTypes | None = None,
+		idempotent: bool = False,
+		id_schema: int | None = None,
 	):
-		if not timeout:
-			timeout = self._client.timeout
-
-		response = await self._client.post(
+		"""
+		`id_schema` elige el semáforo del schema cuando no viaja en
+		params/data/json (p. ej. un cuerpo multipart en streaming).
+		"""
+		return await self._request(
+			"POST",
 			path,
+			idempotent=idempotent,
+			timeout=timeout,
+			id_schema=id_schema,
 			content=content,
 			data=data,
 			files=files,
@@ -75,10 +290,7 @@ class YiqiHttpClient:
 			params=params,
 			headers=headers,
 			cookies=cookies,
-			timeout=timeout,
 		)
-		setattr(response, "content_type", self._extract_content_type_header(response))
-		return response
 
 	async def close(self):
 		await self._client.aclose()
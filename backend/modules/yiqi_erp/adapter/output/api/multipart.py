@@ -0,0 +1,66 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict
+
+
+def _quote(value: str) -> str:
+	# Igual que httpx: las comillas y saltos de línea no pueden ir en el header
+	return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+@dataclass
+class StreamingMultipartBody:
+	"""
+	Cuerpo multipart/form-data con un único archivo que se envía a medida que
+	se lee de `stream`, sin armar el cuerpo completo en memoria.
+
+	httpx sólo acepta archivos síncronos en `files=`; este cuerpo se pasa como
+	`content=` junto con `headers`. Si se conoce `size` se manda Content-Length
+	(si el stream no coincide se aborta el envío); si no, va chunked.
+	"""
+
+	fields: Dict[str, str]
+	file_field: str
+	filename: str
+	stream: AsyncIterator[bytes]
+	size: int | None = None
+	content_type: str = "application/octet-stream"
+	boundary: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+	def _head(self) -> bytes:
+		parts = [
+			f"--{self.boundary}\r\n"
+			f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+			f"{value}\r\n"
+			for name, value in self.fields.items()
+		]
+		parts.append(
+			f"--{self.boundary}\r\n"
+			f'Content-Disposition: form-data; name="{_quote(self.file_field)}"; '
+			f'filename="{_quote(self.filename)}"\r\n'
+			f"Content-Type: {self.content_type}\r\n\r\n"
+		)
+		return "".join(parts).encode()
+
+	def _tail(self) -> bytes:
+		return f"\r\n--{self.boundary}--\r\n".encode()
+
+	@property
+	def headers(self) -> Dict[str, str]:
+		headers = {"Content-Type": f"multipart/form-data; boundary={self.boundary}"}
+		if self.size is not None:
+			length = len(self._head()) + self.size + len(self._tail())
+			headers["Content-Length"] = str(length)
+		return headers
+
+	async def __aiter__(self) -> AsyncIterator[bytes]:
+		yield self._head()
+		sent = 0
+		async for chunk in self.stream:
+			sent += len(chunk)
+			yield chunk
+		if self.size is not None and sent != self.size:
+			raise ValueError(
+				f"{self.filename}: expected {self.size} bytes, stream had {sent}"
+			)
+		yield self._tail()
@@ -1,10 +1,17 @@
 import json
-import time
 import urllib.parse
 from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Type
 from fastapi import UploadFile
 
+from modules.yiqi_erp.adapter.output.api.decoding import (
+	DEFAULT_BATCH_SIZE,
+	EntityT,
+	iter_entities,
+)
 from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+from modules.yiqi_erp.adapter.output.api.multipart import StreamingMultipartBody
 from modules.yiqi_erp.domain.command import (
 	CreateYiqiAirWaybillCommand,
 	CreateYiqiInvoiceCommand,
@@ -12,11 +19,23 @@ from modules.yiqi_erp.domain.command import (
 	YiqiInvoice,
 	YiqiInvoiceAttach,
 )
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
 from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+from modules.yiqi_erp.domain.vo.import_status import YiqiImportProgress
 from modules.yiqi_erp.adapter.output.api.exception import RequestException
 from core.config.settings import env
 from starlette.datastructures import Headers
 
+# Fecha mínima de GetEntityUpdates2: devuelve el historial completo de la entidad
+FULL_HISTORY = "01011900"
+
+
+def format_last_update(last_update: datetime | None) -> str:
+	"""Formatea una marca de agua con el formato de fecha de Yiqi (ddmmYYYY)."""
+	if last_update is None:
+		return FULL_HISTORY
+	return last_update.strftime("%d%m%Y")
+
 
 @dataclass
 class YiqiApiRepository(YiqiRepository):
@@ -34,10 +53,11 @@ class YiqiApiRepository(YiqiRepository):
 		response = await self.client.get(url, params)
 		return response
 
-	async def get_services_list(self, id_schema: int = 316):
+	async def get_services_list(
+		self, id_schema: int = 316, last_update: datetime | None = None
+	):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "SERVICIOS"
-		last_update = "01011900"
 		aditional_filters = [
 			# {
 			# 	"columnName": "PORT_ACTIVO_EN_PORTAL",
@@ -57,7 +77,7 @@ class YiqiApiRepository(YiqiRepository):
 		params = {
 			"schemaId": id_schema,
 			"entityName": entity_name,
-			"lastUpdate": last_update,
+			"lastUpdate": format_last_update(last_update),
 			"additionalFilters": aditional_filters.__repr__(),
 			"attributes": ",".join(attributes),
 		}
@@ -67,16 +87,17 @@ class YiqiApiRepository(YiqiRepository):
 	async def get_services_list_by_provider_id(self, id_provider: int):
 		raise NotImplementedError
 
-	async def get_currency_list(self, id_schema: int = 316):
+	async def get_currency_list(
+		self, id_schema: int = 316, last_update: datetime | None = None
+	):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "MONEDA"
-		last_update = "01011900"
 		aditional_filters = []
 		attributes = ["MONE_NOMBRE", "PAIS_PAIS"]
 		params = {
 			"schemaId": id_schema,
 			"entityName": entity_name,
-			"lastUpdate": last_update,
+			"lastUpdate": format_last_update(last_update),
 			"additionalFilters": aditional_filters.__repr__(),
 			"attributes": ",".join(attributes),
 		}
@@ -86,7 +107,7 @@ class YiqiApiRepository(YiqiRepository):
 	async def get_currency_by_code(self, code: str, id_schema: int = 316):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "MONEDA"
-		last_update = "01011900"
+		last_update = FULL_HISTORY
 
 		aditional_filters = [
 			{
@@ -111,16 +132,17 @@ class YiqiApiRepository(YiqiRepository):
 		response = await self.client.get(url, params)
 		return response
 
-	async def get_country_list(self, id_schema: int = 316):
+	async def get_country_list(
+		self, id_schema: int = 316, last_update: datetime | None = None
+	):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "PAIS"
-		last_update = "01011900"
 		aditional_filters = []
 		attributes = ["PAIS_PAIS", "PAIS_CODIGO"]
 		params = {
 			"schemaId": id_schema,
 			"entityName": entity_name,
-			"lastUpdate": last_update,
+			"lastUpdate": format_last_update(last_update),
 			"additionalFilters": aditional_filters.__repr__(),
 			"attributes": ",".join(attributes),
 		}
@@ -132,7 +154,7 @@ class YiqiApiRepository(YiqiRepository):
 	) -> dict | None:
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "PAIS"
-		last_update = "01011900"
+		last_update = FULL_HISTORY
 
 		aditional_filters = [
 			{
@@ -167,12 +189,13 @@ class YiqiApiRepository(YiqiRepository):
 		# Y si hubo un error o no es 200 o is_success, que devuelva un error
 		raise RequestException(code=response.status_code, message=response.text)
 
-	async def get_invoices_list_of_provider(
-		self, id_provider: int, id_schema: int = 316
-	):
-		url = "/api/InstancesAPI/GetEntityUpdates2"
+	def _purchase_invoices_params(
+		self,
+		id_schema: int,
+		last_update: datetime | None,
+		id_provider: int | None = None,
+	) -> dict:
 		entity_name = "FACTURA_COMPRA"
-		last_update = "01011900"
 
 		"""Tipos de datos
 		1: format string
@@ -181,14 +204,17 @@ class YiqiApiRepository(YiqiRepository):
 		4: boolean (1 = true, 0 = false)
 		"""
 
-		aditional_filters = [
-			{
-				"columnName": "CLIE_ID_PROV",
-				"TipoDato": 2,
-				"operator": 1,
-				"operating": str(id_provider),
-			}
-		]
+		# Sin proveedor se piden las facturas de todos (sincronización local)
+		aditional_filters = []
+		if id_provider is not None:
+			aditional_filters.append(
+				{
+					"columnName": "CLIE_ID_PROV",
+					"TipoDato": 2,
+					"operator": 1,
+					"operating": str(id_provider),
+				}
+			)
 
 		# attributes = FacturaDeCompra.attibutes()
 
@@ -234,14 +260,60 @@ class YiqiApiRepository(YiqiRepository):
 		params = {
 			"schemaId": id_schema,
 			"entityName": entity_name,
-			"lastUpdate": last_update,
+			"lastUpdate": format_last_update(last_update),
 			"additionalFilters": aditional_filters.__repr__(),
 			"attributes": ",".join(attributes),
 		}
+		return params
 
+	async def get_invoices_list_of_provider(
+		self,
+		id_provider: int,
+		id_schema: int = 316,
+		last_update: datetime | None = None,
+	):
+		url = "/api/InstancesAPI/GetEntityUpdates2"
+		params = self._purchase_invoices_params(id_schema, last_update, id_provider)
 		response = await self.client.get(url, params)
 		return response
 
+	async def iter_invoices_of_provider(
+		self,
+		id_provider: int,
+		id_schema: int = 316,
+		last_update: datetime | None = None,
+		batch_size: int = DEFAULT_BATCH_SIZE,
+	) -> AsyncIterator[FacturaDeCompra]:
+		params = self._purchase_invoices_params(id_schema, last_update, id_provider)
+		async for invoice in self._iter_entity_updates(
+			FacturaDeCompra, params, batch_size
+		):
+			yield invoice
+
+	async def iter_purchase_invoices(
+		self,
+		id_schema: int = 316,
+		last_update: datetime | None = None,
+		batch_size: int = DEFAULT_BATCH_SIZE,
+	) -> AsyncIterator[FacturaDeCompra]:
+		params = self._purchase_invoices_params(id_schema, last_update)
+		async for invoice in self._iter_entity_updates(
+			FacturaDeCompra, params, batch_size
+		):
+			yield invoice
+
+	async def _iter_entity_updates(
+		self, model: Type[EntityT], params: dict, batch_size: int
+	) -> AsyncIterator[EntityT]:
+		"""GetEntityUpdates2 decodificado a medida que llega, sin response.json()."""
+		url = "/api/InstancesAPI/GetEntityUpdates2"
+		async with self.client.stream(url, params) as response:
+			if not response.is_success:
+				await response.aread()
+				raise RequestException(code=response.status_code, message=response.text)
+			async for entity in iter_entities(response.aiter_bytes(), model, batch_size):
+				yield entity
+
 	async def create_invoice(
 		self,
 		command: CreateYiqiInvoiceCommand,
@@ -252,10 +324,14 @@ class YiqiApiRepository(YiqiRepository):
 	) -> dict:
 		url = "/api/InstancesAPI/Save"
 
-		form = YiqiInvoice.model_validate(command).model_dump(
+		# from_attributes: acepta también el comando de improved_commands, que
+		# no hereda de YiqiInvoice
+		form = YiqiInvoice.model_validate(command, from_attributes=True).model_dump(
 			exclude={"Comprobante", "Detalle"}, by_alias=True
 		)
-		attachs = YiqiInvoiceAttach.model_validate(command).model_dump(
+		attachs = YiqiInvoiceAttach.model_validate(
+			command, from_attributes=True
+		).model_dump(
 			include={"Comprobante", "Detalle"},
 			by_alias=True,
 			exclude_none=True,
@@ -300,9 +376,9 @@ class YiqiApiRepository(YiqiRepository):
 			raise Exception("Error creating air waybill in YiqiERP", response.text)
 		return response.json()
 
-	async def create_multiple_air_waybills(
+	async def start_air_waybills_import(
 		self, file: UploadFile, id_schema: int = 316
-	) -> dict:
+	) -> None:
 		url = "/api/instancesApi/uploadExcel"
 		params = {"entityId": 1044}
 		data = {
@@ -325,7 +401,6 @@ class YiqiApiRepository(YiqiRepository):
 			)
 
 		file_path = upload_file.text
-		print(f"DEBUG: File path from uploadExcel: {file_path}")
 		url = "/api/instancesApi/ImportExcel"
 		import_file = await self.client.get(
 			url,
@@ -337,38 +412,34 @@ class YiqiApiRepository(YiqiRepository):
 				"filePath": file_path,  # Pass the file path from uploadExcel
 			},
 			headers=headers,
+			# Es un GET pero dispara la importación: no se reintenta
+			idempotent=False,
 		)
 		if import_file.is_error:
 			raise Exception(
 				"Error importing multiple air waybills in YiqiERP", import_file.text
 			)
 
-		while True:
-			time.sleep(1)
-			process = await self.client.get(
-				"/api/instancesApi/GetProgress",
-				params={
-					"schemaId": id_schema,
-					"entityId": 1044,
-					"processKey": "EXCIMP",
-				},
-				headers=headers,
+	async def get_air_waybills_import_progress(
+		self, id_schema: int = 316
+	) -> YiqiImportProgress:
+		process = await self.client.get(
+			"/api/instancesApi/GetProgress",
+			params={
+				"schemaId": id_schema,
+				"entityId": 1044,
+				"processKey": "EXCIMP",
+			},
+			headers={
+				"Referer": f"https://me.yiqi.com.ar/view/GUIAS_AEREAS?schemaId={id_schema}"
+			},
+		)
+		if process.is_error:
+			raise Exception(
+				"Error getting import progress of multiple air waybills in YiqiERP",
+				process.text,
 			)
-			if process.is_error:
-				raise Exception(
-					"Error getting import progress of multiple air waybills in YiqiERP",
-					process.text,
-				)
-			process = process.text
-			print(f"debug: ${process}")
-			if "100|OK" in process:
-				break
-			if "|ERROR|" in process:
-				raise Exception(
-					"Error during import of multiple air waybills in YiqiERP", process
-				)
-				break
-		return {"status": "ok"}
+		return YiqiImportProgress.parse(process.text)
 
 	async def get_air_waybills_template_file(self, id_schema: int = 316):
 		url = "/api/instancesApi/GenerateExcelTemplate"
@@ -416,7 +487,7 @@ class YiqiApiRepository(YiqiRepository):
 	):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "GUIAS_AEREAS"
-		last_update = "01011900"
+		last_update = FULL_HISTORY
 		aditional_filters = [
 			{
 				"columnName": "FACO_ID_FACO",
@@ -459,10 +530,31 @@ class YiqiApiRepository(YiqiRepository):
 		response = await self.client.post(url, data=data, files=files)
 		return response
 
-	async def get_providers_list(self, id_schema: int = 316):
+	async def upload_file_stream(
+		self,
+		filename: str,
+		stream: AsyncIterator[bytes],
+		size: int | None,
+		id_schema: int = 316,
+	):
+		url = "/api/InstancesAPI/SaveFile"
+		body = StreamingMultipartBody(
+			fields={"SchemaId": str(id_schema)},
+			file_field="FileName",
+			filename=filename,
+			stream=stream,
+			size=size,
+		)
+		response = await self.client.post(
+			url, content=body, headers=body.headers, id_schema=id_schema
+		)
+		return response
+
+	async def get_providers_list(
+		self, id_schema: int = 316, last_update: datetime | None = None
+	):
 		url = "/api/InstancesAPI/GetEntityUpdates2"
 		entity_name = "CLIENTE"
-		last_update = "01011900"
 		aditional_filters = [
 			{
 				"columnName": "CLIE_ACTIVO_P",
@@ -484,7 +576,7 @@ class YiqiApiRepository(YiqiRepository):
 		params = {
 			"schemaId": id_schema,
 			"entityName": entity_name,
-			"lastUpdate": last_update,
+			"lastUpdate": format_last_update(last_update),
 			"additionalFilters": aditional_filters.__repr__(),
 			"attributes": ",".join(attributes),
 		}
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from modules.yiqi_erp.domain.repository.import_status import (
+	YiqiImportStatusRepository,
+)
+from modules.yiqi_erp.domain.vo.import_status import YiqiImportStatus
+
+
+@dataclass
+class YiqiImportStatusRedisRepository(YiqiImportStatusRepository):
+	redis_client: Redis
+	prefix: str = "yiqi:import"
+	ttl_seconds: int = 86400
+
+	async def save(self, status: YiqiImportStatus) -> YiqiImportStatus:
+		await self.redis_client.set(
+			f"{self.prefix}:{status.import_id}",
+			status.model_dump_json(),
+			ex=self.ttl_seconds,
+		)
+		return status
+
+	async def get(self, import_id: str) -> YiqiImportStatus | None:
+		raw = await self.redis_client.get(f"{self.prefix}:{import_id}")
+		if raw is None:
+			return None
+		return YiqiImportStatus.model_validate_json(raw)
+
+	async def request_cancel(self, import_id: str) -> None:
+		await self.redis_client.set(
+			f"{self.prefix}:{import_id}:cancel", 1, ex=self.ttl_seconds
+		)
+
+	async def is_cancel_requested(self, import_id: str) -> bool:
+		return bool(await self.redis_client.exists(f"{self.prefix}:{import_id}:cancel"))
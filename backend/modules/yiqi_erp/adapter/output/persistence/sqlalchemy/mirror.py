@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+from core.db import session as global_session
+from core.db.bulk import bulk_upsert
+from modules.finance.domain.entity.currency import Currency
+from modules.provider.domain.entity.provider import Provider
+from modules.provider.domain.entity.purchase_invoice_service import (
+	PurchaseInvoiceService,
+)
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
+from modules.yiqi_erp.domain.entity.purchase_invoice_mirror import (
+	YiqiPurchaseInvoice,
+)
+from modules.yiqi_erp.domain.repository.mirror import YiqiMirrorRepository
+
+
+@dataclass
+class YiqiMirrorSQLAlchemyRepository(YiqiMirrorRepository):
+	async def upsert_currencies(self, rows: List[dict]) -> Dict[str, int]:
+		values = [
+			{
+				"code": item["MONE_NOMBRE"],
+				"name": item["MONE_NOMBRE"],
+				"country": item.get("PAIS_PAIS"),
+				"id_yiqi_currency": item.get("id"),
+			}
+			for item in rows
+			if item.get("MONE_NOMBRE")
+		]
+		result = await bulk_upsert(
+			global_session, Currency, values, index_elements=["code"]
+		)
+		return vars(result)
+
+	async def upsert_services(self, rows: List[dict]) -> Dict[str, int]:
+		values = [
+			{
+				"id_yiqi_service": item.get("id"),
+				"name": item["SERV_SERVICIO"],
+				"group": item.get("SERV_MARCA_DE_GASTOS"),
+			}
+			for item in rows
+			# Se filtran sólo los explícitamente inactivos ("N")
+			if item.get("SERV_SERVICIO") and item.get("SERV_ACTIVO_PRO") != "N"
+		]
+		result = await bulk_upsert(
+			global_session,
+			PurchaseInvoiceService,
+			values,
+			index_elements=["id_yiqi_service"],
+		)
+		return vars(result)
+
+	async def upsert_providers(self, rows: List[dict]) -> Dict[str, int]:
+		values = [
+			{
+				"id_yiqi_provider": item.get("id"),
+				"name": item["CLIE_NOMBRE"],
+				"currency": item.get("CLIE_MONEDA"),
+				"allow_multi_invoice": False,
+			}
+			for item in rows
+			if item.get("CLIE_NOMBRE") and item.get("CLIE_ACTIVO_P") == "S"
+		]
+		# allow_multi_invoice sólo se fija al crear: es configuración local
+		result = await bulk_upsert(
+			global_session,
+			Provider,
+			values,
+			index_elements=["id_yiqi_provider"],
+			update_columns=["name", "currency"],
+		)
+		return vars(result)
+
+	async def upsert_purchase_invoices(
+		self, id_schema: int, invoices: List[FacturaDeCompra]
+	) -> Dict[str, int]:
+		values = [
+			{
+				"id_schema": id_schema,
+				"id_yiqi_invoice": invoice.id,
+				"id_yiqi_provider": invoice.CLIE_ID_PROV,
+				"number": invoice.NUMERO,
+				"status": invoice.DESC_ESTADO,
+				"concept": invoice.CONCEPTO,
+				"awb": invoice.AWB,
+				"kg": invoice.KG,
+				"items": invoice.ITEMS,
+				"issue_date": invoice.FECHA_EMISION,
+				"receipt_date": invoice.FECHA_DE_RECEPCION,
+				"service_month": invoice.MES_DE_SERVICIO,
+				"net": invoice.NETO,
+				"balance": invoice.SALDO,
+				"id_yiqi_currency": invoice.MONE_ID_MONE,
+				"id_yiqi_service": invoice.SERV_ID_SERV,
+				"yiqi_created_at": invoice.AUDI_FECHA_ALTA,
+			}
+			for invoice in invoices
+			if invoice.id is not None
+		]
+		result = await bulk_upsert(
+			global_session,
+			YiqiPurchaseInvoice,
+			values,
+			index_elements=["id_schema", "id_yiqi_invoice"],
+		)
+		return vars(result)
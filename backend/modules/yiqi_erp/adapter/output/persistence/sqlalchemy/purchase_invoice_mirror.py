@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import List
+
+from sqlmodel import select
+
+from core.db import session as global_session
+from modules.yiqi_erp.domain.entity.purchase_invoice_mirror import (
+	YiqiPurchaseInvoice,
+)
+from modules.yiqi_erp.domain.repository.purchase_invoice_mirror import (
+	YiqiPurchaseInvoiceRepository,
+)
+
+
+@dataclass
+class YiqiPurchaseInvoiceSQLAlchemyRepository(YiqiPurchaseInvoiceRepository):
+	async def get_by_provider(
+		self,
+		id_schema: int,
+		id_provider: int,
+		status: str | None = None,
+		limit: int = 100,
+		offset: int = 0,
+	) -> List[YiqiPurchaseInvoice]:
+		# Usa ix_yiqipurchaseinvoice_provider_status (id_schema, proveedor, estado)
+		stmt = select(YiqiPurchaseInvoice).where(
+			YiqiPurchaseInvoice.id_schema == id_schema,
+			YiqiPurchaseInvoice.id_yiqi_provider == id_provider,
+		)
+		if status is not None:
+			stmt = stmt.where(YiqiPurchaseInvoice.status == status)
+		stmt = (
+			stmt.order_by(
+				YiqiPurchaseInvoice.issue_date.desc().nulls_last(),
+				YiqiPurchaseInvoice.id_yiqi_invoice.desc(),
+			)
+			.limit(limit)
+			.offset(offset)
+		)
+		result = await global_session.execute(stmt)
+		return list(result.scalars().all())
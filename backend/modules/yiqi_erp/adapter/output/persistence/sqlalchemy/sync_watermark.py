@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+from sqlmodel import select
+
+from core.db import session as global_session
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+from modules.yiqi_erp.domain.repository.sync_watermark import (
+	YiqiSyncWatermarkRepository,
+)
+
+
+@dataclass
+class YiqiSyncWatermarkSQLAlchemyRepository(YiqiSyncWatermarkRepository):
+	async def get_watermark(
+		self, id_schema: int, entity_name: str
+	) -> YiqiSyncWatermark | None:
+		return await global_session.get(YiqiSyncWatermark, (id_schema, entity_name))
+
+	async def get_watermarks(self, id_schema: int) -> list[YiqiSyncWatermark]:
+		stmt = select(YiqiSyncWatermark).where(
+			YiqiSyncWatermark.id_schema == id_schema
+		)
+		result = await global_session.execute(stmt)
+		return list(result.scalars().all())
+
+	async def save(self, watermark: YiqiSyncWatermark) -> YiqiSyncWatermark:
+		# Se escribe en la misma transacción que la copia local: la marca sólo
+		# avanza si el commit de los datos sincronizados tiene éxito
+		global_session.add(watermark)
+		await global_session.flush()
+		return watermark
@@ -11,3 +11,15 @@ class YiqiEntityNotFoundException(CustomException):
 	code = 404
 	error_code = "YIQI_ENTITY__NOT_FOUND_ERROR"
 	message = "Resource not found"
+
+
+class YiqiImportException(CustomException):
+	code = 502
+	error_code = "YIQI__IMPORT_ERROR"
+	message = "Yiqi reportó un error durante la importación"
+
+
+class YiqiImportTimeoutException(CustomException):
+	code = 504
+	error_code = "YIQI__IMPORT_TIMEOUT"
+	message = "La importación en Yiqi no terminó dentro del tiempo límite"
@@ -0,0 +1,171 @@
+"""
+Importaciones de guías aéreas en Yiqi seguidas en segundo plano.
+
+La API inicia la importación y responde enseguida con un `import_id`. La
+importación corre como tarea del event loop de la API. El estado
+(queued -> running -> done/error/cancelled/timeout) y el porcentaje se
+guardan en Redis, de modo que cualquier réplica puede responder el estado o
+transmitirlo por SSE.
+
+La cancelación se pide con una marca en Redis que el poller revisa en cada
+consulta; si la tarea corre en el mismo proceso además se cancela
+directamente. Yiqi no tiene una API para abortar la importación: cancelar
+deja de seguirla, no la revierte.
+
+Si el proceso de la API se reinicia, las tareas en curso se cancelan al
+apagar (ver `cancel_running`). Si muere sin apagarse, un estado sin cambios
+por más de `import_deadline` segundos se informa como timeout.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from typing import AsyncIterator, ClassVar, Dict
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from modules.yiqi_erp.application.exception import (
+	YiqiEntityNotFoundException,
+	YiqiImportTimeoutException,
+)
+from modules.yiqi_erp.application.usecase.yiqi import CreateMultipleAirWaybillsUseCase
+from modules.yiqi_erp.domain.command import UploadFileCommand
+from modules.yiqi_erp.domain.repository.import_status import (
+	YiqiImportStatusRepository,
+)
+from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+from modules.yiqi_erp.domain.vo.import_status import (
+	YiqiImportProgress,
+	YiqiImportStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ImportCancelled(Exception): ...
+
+
+@dataclass
+class YiqiAirWaybillImportService:
+	yiqi_repository: YiqiRepository
+	status_repository: YiqiImportStatusRepository
+	import_deadline: float = 600.0
+	stream_interval: float = 1.0
+
+	# Compartido entre instancias (el container crea una por request)
+	_tasks: ClassVar[Dict[str, asyncio.Task]] = {}
+
+	def __post_init__(self):
+		self.import_air_waybills = CreateMultipleAirWaybillsUseCase(
+			self.yiqi_repository, deadline=self.import_deadline
+		)
+
+	async def start_import(
+		self, file: UploadFileCommand, id_schema: int
+	) -> YiqiImportStatus:
+		# El UploadFile del request se cierra al responder: se copia antes
+		content = await file.read()
+		filename = file.filename
+		content_type = file.content_type
+
+		status = YiqiImportStatus(import_id=uuid.uuid4().hex, id_schema=id_schema)
+		await self.status_repository.save(status)
+
+		upload = UploadFile(
+			BytesIO(content),
+			size=len(content),
+			filename=filename,
+			headers=Headers(
+				{"content-type": content_type or "application/octet-stream"}
+			),
+		)
+		task = asyncio.create_task(self._run(status, upload))
+		self._tasks[status.import_id] = task
+		task.add_done_callback(lambda _: self._tasks.pop(status.import_id, None))
+		return status
+
+	async def get_status(self, import_id: str) -> YiqiImportStatus:
+		status = await self.status_repository.get(import_id)
+		if status is None:
+			raise YiqiEntityNotFoundException
+		stale_after = timedelta(seconds=self.import_deadline)
+		if (
+			not status.finished
+			and import_id not in self._tasks
+			and datetime.now(timezone.utc) - status.updated_at > stale_after
+		):
+			# Nadie sigue la importación (el proceso que la corría murió)
+			await self._update(
+				status,
+				status="timeout",
+				message="La importación dejó de reportar progreso",
+			)
+		return status
+
+	async def cancel(self, import_id: str) -> YiqiImportStatus:
+		status = await self.get_status(import_id)
+		if status.finished:
+			return status
+		await self.status_repository.request_cancel(import_id)
+		task = self._tasks.get(import_id)
+		if task is not None:
+			task.cancel()
+		return status
+
+	@classmethod
+	async def cancel_running(cls) -> None:
+		"""Cancela las importaciones de este proceso; se llama al apagar la API."""
+		tasks = list(cls._tasks.values())
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+
+	async def stream_status(self, import_id: str) -> AsyncIterator[YiqiImportStatus]:
+		"""Emite el estado cada vez que cambia, hasta que la importación termina."""
+		last = None
+		while True:
+			status = await self.get_status(import_id)
+			if last is None or status.updated_at != last.updated_at:
+				yield status
+				last = status
+			if status.finished:
+				return
+			await asyncio.sleep(self.stream_interval)
+
+	# ------------------------------------------------------------------
+
+	async def _update(self, current: YiqiImportStatus, **changes) -> None:
+		for key, value in changes.items():
+			setattr(current, key, value)
+		current.updated_at = datetime.now(timezone.utc)
+		await self.status_repository.save(current)
+
+	async def _run(self, status: YiqiImportStatus, file: UploadFile) -> None:
+		async def on_progress(progress: YiqiImportProgress) -> None:
+			if await self.status_repository.is_cancel_requested(status.import_id):
+				raise ImportCancelled
+			if progress.percent != status.percent:
+				await self._update(status, percent=progress.percent)
+
+		try:
+			await self._update(status, status="running")
+			await self.import_air_waybills(file, status.id_schema, on_progress)
+			await self._update(status, status="done", percent=100)
+		except asyncio.CancelledError:
+			await self._update(status, status="cancelled")
+			raise
+		except ImportCancelled:
+			await self._update(status, status="cancelled")
+		except YiqiImportTimeoutException as e:
+			await self._update(status, status="timeout", message=e.message)
+		except Exception as e:
+			logger.exception(f"Air waybills import {status.import_id} failed")
+			await self._update(
+				status, status="error", message=getattr(e, "message", str(e))
+			)
+		finally:
+			await file.close()
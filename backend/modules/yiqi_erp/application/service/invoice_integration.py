@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 from io import BytesIO
+from uuid import UUID
+
 from shared.interfaces.service_locator import ServiceLocator
 from shared.interfaces.service_protocols import (
 	YiqiServiceProtocol,
@@ -9,6 +11,28 @@ from shared.interfaces.service_protocols import (
 from modules.yiqi_erp.domain.command import CreateYiqiInvoiceCommand, UploadFileCommand
 
 
+async def upload_stored_attachment(
+	file_storage_service: FileStorageServiceProtocol,
+	yiqi_service: YiqiServiceProtocol,
+	file_id: UUID,
+	id_schema: int,
+) -> UploadFileCommand:
+	"""
+	Sube a Yiqi un archivo del storage por bloques, sin cargarlo en memoria.
+
+	Devuelve el UploadFileCommand para CreateYiqiInvoiceCommand, que sólo usa
+	el nombre del archivo.
+	"""
+	stored_file = await file_storage_service.stream_file(file_id)
+	metadata = stored_file.metadata
+	await yiqi_service.upload_file_stream(
+		metadata.download_filename, stored_file.stream, metadata.size, id_schema
+	)
+	return UploadFileCommand(
+		BytesIO(), size=metadata.size, filename=metadata.download_filename
+	)
+
+
 @dataclass
 class InvoiceIntegrationService:
 	yiqi_service: YiqiServiceProtocol
@@ -36,32 +60,20 @@ class InvoiceIntegrationService:
 		yiqi_detalle = None
 
 		if purchase_invoice.fk_receipt_file:
-			comprobante_metadata = await file_storage_service.get_metadata(
-				purchase_invoice.fk_receipt_file
+			yiqi_comprobante = await upload_stored_attachment(
+				file_storage_service,
+				self.yiqi_service,
+				purchase_invoice.fk_receipt_file,
+				company_id,
 			)
-			archivo_comprobante = await file_storage_service.download_file(
-				purchase_invoice.fk_receipt_file
-			)
-			yiqi_comprobante = UploadFileCommand(
-				BytesIO(archivo_comprobante.file),
-				size=comprobante_metadata.size,
-				filename=comprobante_metadata.download_filename,
-			)
-			await self.yiqi_service.upload_file(yiqi_comprobante, company_id)
 
 		if purchase_invoice.fk_detail_file:
-			detalle_metadata = await file_storage_service.get_metadata(
-				purchase_invoice.fk_detail_file
-			)
-			archivo_detalle = await file_storage_service.download_file(
-				purchase_invoice.fk_detail_file
-			)
-			yiqi_detalle = UploadFileCommand(
-				BytesIO(archivo_detalle.file),
-				size=detalle_metadata.size,
-				filename=detalle_metadata.download_filename,
+			yiqi_detalle = await upload_stored_attachment(
+				file_storage_service,
+				self.yiqi_service,
+				purchase_invoice.fk_detail_file,
+				company_id,
 			)
-			await self.yiqi_service.upload_file(yiqi_detalle, company_id)
 
 		yiqi_invoice_command = CreateYiqiInvoiceCommand(
 			Provider=purchase_invoice.fk_provider,
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from modules.yiqi_erp.application.usecase.purchase_invoice import (
+	YiqiPurchaseInvoiceUseCaseFactory,
+)
+from modules.yiqi_erp.domain.repository.purchase_invoice_mirror import (
+	YiqiPurchaseInvoiceRepository,
+)
+from modules.yiqi_erp.domain.repository.sync_watermark import (
+	YiqiSyncWatermarkRepository,
+)
+from modules.yiqi_erp.domain.vo.purchase_invoice_page import YiqiPurchaseInvoicePage
+
+
+@dataclass
+class YiqiPurchaseInvoiceService:
+	purchase_invoice_repository: YiqiPurchaseInvoiceRepository
+	watermark_repository: YiqiSyncWatermarkRepository
+	max_staleness_seconds: int = 1800
+
+	def __post_init__(self):
+		self.usecase = YiqiPurchaseInvoiceUseCaseFactory(
+			self.purchase_invoice_repository,
+			self.watermark_repository,
+			timedelta(seconds=self.max_staleness_seconds),
+		)
+
+	async def get_provider_invoices(
+		self,
+		id_provider: int,
+		id_schema: int,
+		status: str | None = None,
+		limit: int = 100,
+		offset: int = 0,
+	) -> YiqiPurchaseInvoicePage:
+		return await self.usecase.get_provider_invoices(
+			id_provider, id_schema, status, limit, offset
+		)
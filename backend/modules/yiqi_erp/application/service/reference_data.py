@@ -0,0 +1,99 @@
+"""
+Datos de referencia de Yiqi (monedas, países, servicios) con cache.
+
+Cambian pocas veces al año, pero se consultan en cada emisión de factura y
+en los selectores del portal. Se sirven desde StaleWhileRevalidateCache
+(memoria del proceso -> Redis -> Yiqi) y, para monedas, desde la tabla local
+`Currency` si Yiqi no responde y no hay copia cacheada.
+
+Las búsquedas por código/nombre se resuelven sobre la lista cacheada; sólo
+si el elemento no está (por ejemplo, una moneda recién creada) se consulta
+a Yiqi directamente.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List
+
+from core.helpers.cache import StaleWhileRevalidateCache
+from modules.yiqi_erp.application.usecase.yiqi import YiqiUseCaseFactory
+from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+from shared.interfaces.service_locator import service_locator
+from shared.interfaces.service_protocols import CurrencyServiceProtocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class YiqiReferenceDataService:
+	yiqi_repository: YiqiRepository
+	cache: StaleWhileRevalidateCache
+
+	def __post_init__(self):
+		self.usecase = YiqiUseCaseFactory(self.yiqi_repository)
+
+	async def get_currency_list(self, id_schema: int) -> List[dict]:
+		return await self.cache.get(
+			f"{id_schema}:currency_list",
+			lambda: self.usecase.get_currency_list(id_schema),
+			fallback=self._local_currency_list,
+		)
+
+	async def get_currency_by_code(self, code: str, id_schema: int) -> dict | None:
+		for currency in await self.get_currency_list(id_schema):
+			if currency.get("MONE_NOMBRE") == code:
+				return currency
+		return await self.usecase.get_currency_by_code(code, id_schema)
+
+	async def get_country_list(self, id_schema: int) -> List[dict]:
+		return await self.cache.get(
+			f"{id_schema}:country_list",
+			lambda: self.usecase.get_country_list(id_schema),
+		)
+
+	async def get_country_by_name(self, country_name: str, id_schema: int) -> dict | None:
+		for country in await self.get_country_list(id_schema):
+			if country.get("PAIS_PAIS") == country_name:
+				return country
+		return await self.usecase.get_country_by_name(country_name, id_schema)
+
+	async def get_services_list(self, id_schema: int) -> List[dict]:
+		return await self.cache.get(
+			f"{id_schema}:services_list",
+			lambda: self.usecase.get_services_list(id_schema),
+		)
+
+	async def warm_up(self, id_schema: int) -> None:
+		"""Carga las tres listas desde Yiqi. Los errores sólo se registran."""
+		loaders = {
+			"currency_list": self.usecase.get_currency_list,
+			"country_list": self.usecase.get_country_list,
+			"services_list": self.usecase.get_services_list,
+		}
+		results = await asyncio.gather(
+			*[
+				self.cache.refresh(f"{id_schema}:{name}", lambda load=load: load(id_schema))
+				for name, load in loaders.items()
+			],
+			return_exceptions=True,
+		)
+		for name, result in zip(loaders, results):
+			if isinstance(result, BaseException):
+				logger.warning(f"Could not warm up Yiqi {name}: {result!r}")
+
+	async def _local_currency_list(self) -> List[dict] | None:
+		"""Reconstruye la lista con la forma de Yiqi desde la tabla Currency."""
+		currency_service: CurrencyServiceProtocol = service_locator.get_service(
+			"currency_service"
+		)
+		currencies = [
+			{
+				"id": currency.id_yiqi_currency,
+				"MONE_NOMBRE": currency.code,
+				"PAIS_PAIS": currency.country,
+			}
+			for currency in await currency_service.get_currency_list()
+			if currency.id_yiqi_currency is not None
+		]
+		return currencies or None
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import List
+
+from modules.yiqi_erp.application.usecase.sync import (
+	YiqiSyncResult,
+	YiqiSyncUseCaseFactory,
+)
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+from modules.yiqi_erp.domain.repository.mirror import YiqiMirrorRepository
+from modules.yiqi_erp.domain.repository.sync_watermark import (
+	YiqiSyncWatermarkRepository,
+)
+from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class YiqiSyncService:
+	yiqi_repository: YiqiRepository
+	watermark_repository: YiqiSyncWatermarkRepository
+	mirror_repository: YiqiMirrorRepository
+	overlap_hours: int = 24
+
+	def __post_init__(self):
+		self.usecase = YiqiSyncUseCaseFactory(
+			self.yiqi_repository,
+			self.watermark_repository,
+			self.mirror_repository,
+			timedelta(hours=self.overlap_hours),
+		)
+
+	@property
+	def entities(self) -> List[str]:
+		return [*self.usecase.targets, *self.usecase.stream_targets]
+
+	async def sync_entity(
+		self, entity_name: str, id_schema: int, full: bool = False
+	) -> YiqiSyncResult:
+		watermark = None
+		if not full:
+			watermark = next(
+				(w for w in await self.get_watermarks(id_schema) if w.entity_name == entity_name),
+				None,
+			)
+		if entity_name in self.usecase.stream_targets:
+			return await self.usecase.sync_streamed(entity_name, id_schema, watermark)
+		delta = await self.usecase.fetch_updates(entity_name, id_schema, watermark)
+		return await self.usecase.apply_updates(delta)
+
+	async def sync_all(
+		self, id_schema: int, entities: List[str] | None = None, full: bool = False
+	) -> List[YiqiSyncResult]:
+		"""
+		Descarga todas las entidades en paralelo y luego escribe cada una en
+		su propia transacción: un fallo en una no revierte ni bloquea las
+		demás, y su marca queda donde estaba.
+
+		Las entidades que se sincronizan por stream van después, de a una,
+		para no sostener varias descargas grandes y transacciones a la vez.
+		"""
+		entities = self.entities if entities is None else entities
+		streamed = [name for name in entities if name in self.usecase.stream_targets]
+		entities = [name for name in entities if name not in self.usecase.stream_targets]
+		watermarks = {}
+		if not full:
+			watermarks = {
+				watermark.entity_name: watermark
+				for watermark in await self.get_watermarks(id_schema)
+			}
+
+		deltas = await asyncio.gather(
+			*[
+				self.usecase.fetch_updates(
+					entity_name, id_schema, watermarks.get(entity_name)
+				)
+				for entity_name in entities
+			],
+			return_exceptions=True,
+		)
+
+		results = []
+		for entity_name, delta in zip(entities, deltas):
+			try:
+				if isinstance(delta, BaseException):
+					raise delta
+				results.append(await self.usecase.apply_updates(delta))
+			except Exception as e:
+				logger.exception(f"Yiqi sync failed for {entity_name}")
+				results.append(
+					YiqiSyncResult(entity_name, since=None, fetched=0, error=str(e))
+				)
+
+		for entity_name in streamed:
+			try:
+				results.append(
+					await self.usecase.sync_streamed(
+						entity_name, id_schema, watermarks.get(entity_name)
+					)
+				)
+			except Exception as e:
+				logger.exception(f"Yiqi sync failed for {entity_name}")
+				results.append(
+					YiqiSyncResult(entity_name, since=None, fetched=0, error=str(e))
+				)
+		return results
+
+	async def get_watermarks(self, id_schema: int) -> List[YiqiSyncWatermark]:
+		return await self.usecase.get_watermarks(id_schema)
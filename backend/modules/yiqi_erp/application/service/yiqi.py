@@ -1,20 +1,29 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator
 
 from modules.yiqi_erp.domain.command import (
 	CreateYiqiAirWaybillCommand,
 	CreateYiqiInvoiceCommand,
 	UploadFileCommand,
 )
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
 from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
 from modules.yiqi_erp.application.usecase.yiqi import YiqiUseCaseFactory
+from modules.yiqi_erp.application.service.reference_data import (
+	YiqiReferenceDataService,
+)
 
 
 @dataclass
 class YiqiService:
 	yiqi_repository: YiqiRepository
+	# Monedas, países y servicios se sirven desde cache (ver reference_data)
+	reference_data: YiqiReferenceDataService | None = None
+	import_deadline: float = 600.0
 
 	def __post_init__(self):
-		self.usecase = YiqiUseCaseFactory(self.yiqi_repository)
+		self.usecase = YiqiUseCaseFactory(self.yiqi_repository, self.import_deadline)
 
 	async def create_invoice(
 		self, command: CreateYiqiInvoiceCommand, id_schema: int
@@ -40,23 +49,69 @@ class YiqiService:
 	async def get_provider_by_id(self, id_provider: int, id_schema: int):
 		return await self.usecase.get_provider_by_id(id_provider, id_schema)
 
-	async def get_providers_list(self, id_schema: int):
-		return await self.usecase.get_providers_list(id_schema)
+	async def get_providers_list(
+		self, id_schema: int, last_update: datetime | None = None
+	):
+		return await self.usecase.get_providers_list(id_schema, last_update)
 
-	async def get_services_list(self, id_schema: int):
-		return await self.usecase.get_services_list(id_schema)
+	async def get_services_list(
+		self, id_schema: int, last_update: datetime | None = None
+	):
+		if self.reference_data and last_update is None:
+			return await self.reference_data.get_services_list(id_schema)
+		return await self.usecase.get_services_list(id_schema, last_update)
 
-	async def get_currency_list(self, id_schema: int):
-		return await self.usecase.get_currency_list(id_schema)
+	async def get_currency_list(
+		self, id_schema: int, last_update: datetime | None = None
+	):
+		if self.reference_data and last_update is None:
+			return await self.reference_data.get_currency_list(id_schema)
+		return await self.usecase.get_currency_list(id_schema, last_update)
 
 	async def get_currency_by_code(self, code: str, id_schema: int):
+		if self.reference_data:
+			return await self.reference_data.get_currency_by_code(code, id_schema)
 		return await self.usecase.get_currency_by_code(code, id_schema)
 
-	async def get_country_list(self, id_schema: int):
-		return await self.usecase.get_country_list(id_schema)
+	async def get_country_list(
+		self, id_schema: int, last_update: datetime | None = None
+	):
+		if self.reference_data and last_update is None:
+			return await self.reference_data.get_country_list(id_schema)
+		return await self.usecase.get_country_list(id_schema, last_update)
 
 	async def get_country_by_name(self, country_name: str, id_schema: int):
+		if self.reference_data:
+			return await self.reference_data.get_country_by_name(country_name, id_schema)
 		return await self.usecase.get_country_by_name(country_name, id_schema)
 
+	async def warm_up_reference_data(self, id_schema: int) -> None:
+		if self.reference_data:
+			await self.reference_data.warm_up(id_schema)
+
 	async def upload_file(self, command: UploadFileCommand, id_schema: int):
 		return await self.usecase.upload_file(command, id_schema)
+
+	def iter_invoices_of_provider(
+		self,
+		id_provider: int,
+		id_schema: int,
+		last_update: datetime | None = None,
+		batch_size: int = 500,
+	) -> AsyncIterator[FacturaDeCompra]:
+		"""
+		Facturas de compra del proveedor validadas como FacturaDeCompra a
+		medida que llegan de Yiqi, de a `batch_size`.
+		"""
+		return self.usecase.iter_invoices_of_provider(
+			id_provider, id_schema, last_update, batch_size
+		)
+
+	async def upload_file_stream(
+		self,
+		filename: str,
+		stream: AsyncIterator[bytes],
+		size: int | None,
+		id_schema: int,
+	):
+		return await self.usecase.upload_file_stream(filename, stream, size, id_schema)
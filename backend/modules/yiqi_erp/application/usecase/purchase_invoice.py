@@ -0,0 +1,70 @@
+"""
+Consultas del portal de proveedores sobre la copia local de FACTURA_COMPRA.
+
+No llaman a Yiqi: leen la tabla que mantiene la sincronización incremental y
+acompañan el resultado con la fecha de la última sincronización confirmada,
+para que el portal pueda avisar cuando los datos quedaron viejos.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from modules.yiqi_erp.domain.repository.purchase_invoice_mirror import (
+	YiqiPurchaseInvoiceRepository,
+)
+from modules.yiqi_erp.domain.repository.sync_watermark import (
+	YiqiSyncWatermarkRepository,
+)
+from modules.yiqi_erp.domain.vo.purchase_invoice_page import YiqiPurchaseInvoicePage
+
+PURCHASE_INVOICE_ENTITY = "FACTURA_COMPRA"
+
+
+@dataclass
+class GetProviderPurchaseInvoicesUseCase:
+	purchase_invoice_repository: YiqiPurchaseInvoiceRepository
+	watermark_repository: YiqiSyncWatermarkRepository
+	max_staleness: timedelta = timedelta(minutes=30)
+
+	async def __call__(
+		self,
+		id_provider: int,
+		id_schema: int,
+		status: str | None = None,
+		limit: int = 100,
+		offset: int = 0,
+	) -> YiqiPurchaseInvoicePage:
+		watermark = await self.watermark_repository.get_watermark(
+			id_schema, PURCHASE_INVOICE_ENTITY
+		)
+		items = await self.purchase_invoice_repository.get_by_provider(
+			id_schema, id_provider, status, limit, offset
+		)
+
+		synced_at = watermark.last_update if watermark else None
+		return YiqiPurchaseInvoicePage(
+			items=items,
+			synced_at=synced_at,
+			stale=self._is_stale(synced_at),
+		)
+
+	def _is_stale(self, synced_at: datetime | None) -> bool:
+		if synced_at is None:
+			return True
+		if synced_at.tzinfo is None:
+			synced_at = synced_at.replace(tzinfo=timezone.utc)
+		return datetime.now(timezone.utc) - synced_at > self.max_staleness
+
+
+@dataclass
+class YiqiPurchaseInvoiceUseCaseFactory:
+	purchase_invoice_repository: YiqiPurchaseInvoiceRepository
+	watermark_repository: YiqiSyncWatermarkRepository
+	max_staleness: timedelta = timedelta(minutes=30)
+
+	def __post_init__(self):
+		self.get_provider_invoices = GetProviderPurchaseInvoicesUseCase(
+			self.purchase_invoice_repository,
+			self.watermark_repository,
+			self.max_staleness,
+		)
@@ -0,0 +1,247 @@
+"""
+Sincronización incremental de entidades de Yiqi hacia la copia local.
+
+Cada entidad tiene una marca de agua por schema (YiqiSyncWatermark). Una
+sincronización tiene dos fases:
+
+- fetch: pide a GetEntityUpdates2 sólo los cambios desde la marca (sólo HTTP,
+  por lo que varias entidades se descargan en paralelo).
+- apply: escribe las filas en las tablas locales y avanza la marca en la
+  misma transacción. Si el commit falla, la marca no se mueve y la siguiente
+  ejecución vuelve a pedir el mismo intervalo.
+
+Las entidades grandes (FACTURA_COMPRA) no se descargan enteras: se leen como
+stream y se escriben por lotes a medida que llegan, dentro de una única
+transacción que también avanza la marca (ver SyncStreamedEntityUseCase).
+
+`lastUpdate` de Yiqi tiene resolución de día y se evalúa en la hora local del
+ERP, por eso se pide desde `marca - overlap`. Reprocesar filas repetidas es
+inocuo porque la escritura es un upsert.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+import httpx
+
+from core.db import Transactional
+from modules.yiqi_erp.application.exception import YiqiServiceException
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+from modules.yiqi_erp.domain.repository.mirror import YiqiMirrorRepository
+from modules.yiqi_erp.domain.repository.sync_watermark import (
+	YiqiSyncWatermarkRepository,
+)
+from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+
+
+@dataclass
+class YiqiSyncResult:
+	entity_name: str
+	since: datetime | None
+	fetched: int
+	created: int = 0
+	updated: int = 0
+	unchanged: int = 0
+	error: str | None = None
+
+
+@dataclass
+class YiqiEntityDelta:
+	entity_name: str
+	id_schema: int
+	since: datetime | None
+	started_at: datetime
+	rows: List[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class SyncTarget:
+	fetch: Callable[..., Awaitable[httpx.Response]]
+	upsert: Callable[[List[dict]], Awaitable[Dict[str, int]]]
+
+
+def build_sync_targets(
+	yiqi_repository: YiqiRepository, mirror_repository: YiqiMirrorRepository
+) -> Dict[str, SyncTarget]:
+	return {
+		"MONEDA": SyncTarget(
+			yiqi_repository.get_currency_list, mirror_repository.upsert_currencies
+		),
+		"SERVICIOS": SyncTarget(
+			yiqi_repository.get_services_list, mirror_repository.upsert_services
+		),
+		"CLIENTE": SyncTarget(
+			yiqi_repository.get_providers_list, mirror_repository.upsert_providers
+		),
+	}
+
+
+@dataclass(frozen=True)
+class StreamSyncTarget:
+	iterate: Callable[..., AsyncIterator[Any]]
+	upsert: Callable[[int, List[Any]], Awaitable[Dict[str, int]]]
+
+
+def build_stream_sync_targets(
+	yiqi_repository: YiqiRepository, mirror_repository: YiqiMirrorRepository
+) -> Dict[str, StreamSyncTarget]:
+	return {
+		"FACTURA_COMPRA": StreamSyncTarget(
+			yiqi_repository.iter_purchase_invoices,
+			mirror_repository.upsert_purchase_invoices,
+		),
+	}
+
+
+async def _advance_watermark(
+	watermark_repository: YiqiSyncWatermarkRepository,
+	id_schema: int,
+	entity_name: str,
+	started_at: datetime,
+	fetched: int,
+) -> None:
+	watermark = await watermark_repository.get_watermark(id_schema, entity_name)
+	if watermark is None:
+		watermark = YiqiSyncWatermark(
+			id_schema=id_schema, entity_name=entity_name, last_update=started_at
+		)
+	watermark.last_update = started_at
+	watermark.last_fetched = fetched
+	await watermark_repository.save(watermark)
+
+
+def _since(watermark: YiqiSyncWatermark | None, overlap: timedelta) -> datetime | None:
+	return watermark.last_update - overlap if watermark else None
+
+
+@dataclass
+class FetchEntityUpdatesUseCase:
+	"""Descarga los cambios de una entidad desde su marca. No toca la base."""
+
+	targets: Dict[str, SyncTarget]
+	overlap: timedelta = timedelta(hours=24)
+
+	async def __call__(
+		self,
+		entity_name: str,
+		id_schema: int,
+		watermark: YiqiSyncWatermark | None = None,
+	) -> YiqiEntityDelta:
+		# La nueva marca es el inicio de la descarga: lo que cambie en Yiqi
+		# mientras tanto entra en la próxima sincronización
+		started_at = datetime.now(timezone.utc)
+		since = _since(watermark, self.overlap)
+
+		response: httpx.Response = await self.targets[entity_name].fetch(
+			id_schema, since
+		)
+		if not response.is_success:
+			raise YiqiServiceException
+		return YiqiEntityDelta(entity_name, id_schema, since, started_at, response.json())
+
+
+@dataclass
+class ApplyEntityUpdatesUseCase:
+	"""Escribe los cambios en la copia local y avanza la marca en la misma transacción."""
+
+	targets: Dict[str, SyncTarget]
+	watermark_repository: YiqiSyncWatermarkRepository
+
+	@Transactional()
+	async def __call__(self, delta: YiqiEntityDelta) -> YiqiSyncResult:
+		counts = await self.targets[delta.entity_name].upsert(delta.rows)
+		await _advance_watermark(
+			self.watermark_repository,
+			delta.id_schema,
+			delta.entity_name,
+			delta.started_at,
+			len(delta.rows),
+		)
+
+		return YiqiSyncResult(
+			entity_name=delta.entity_name,
+			since=delta.since,
+			fetched=len(delta.rows),
+			created=counts.get("created", 0),
+			updated=counts.get("updated", 0),
+			unchanged=counts.get("unchanged", 0),
+		)
+
+
+@dataclass
+class SyncStreamedEntityUseCase:
+	"""
+	Descarga y escribe una entidad grande en una sola pasada: las filas se
+	validan y escriben de a `batch_size` mientras llega el stream, sin tener
+	el listado completo en memoria. Los lotes y la marca se confirman juntos
+	al final; si el stream o una escritura fallan no se confirma nada.
+	"""
+
+	targets: Dict[str, StreamSyncTarget]
+	watermark_repository: YiqiSyncWatermarkRepository
+	overlap: timedelta = timedelta(hours=24)
+	batch_size: int = 500
+
+	@Transactional()
+	async def __call__(
+		self,
+		entity_name: str,
+		id_schema: int,
+		watermark: YiqiSyncWatermark | None = None,
+	) -> YiqiSyncResult:
+		started_at = datetime.now(timezone.utc)
+		since = _since(watermark, self.overlap)
+		target = self.targets[entity_name]
+		result = YiqiSyncResult(entity_name, since=since, fetched=0)
+
+		async def apply(batch: List[Any]) -> None:
+			counts = await target.upsert(id_schema, batch)
+			result.fetched += len(batch)
+			result.created += counts.get("created", 0)
+			result.updated += counts.get("updated", 0)
+			result.unchanged += counts.get("unchanged", 0)
+
+		batch: List[Any] = []
+		async for row in target.iterate(id_schema, since, self.batch_size):
+			batch.append(row)
+			if len(batch) >= self.batch_size:
+				await apply(batch)
+				batch = []
+		if batch:
+			await apply(batch)
+
+		await _advance_watermark(
+			self.watermark_repository, id_schema, entity_name, started_at, result.fetched
+		)
+		return result
+
+
+@dataclass
+class GetSyncWatermarksUseCase:
+	watermark_repository: YiqiSyncWatermarkRepository
+
+	async def __call__(self, id_schema: int) -> List[YiqiSyncWatermark]:
+		return await self.watermark_repository.get_watermarks(id_schema)
+
+
+@dataclass
+class YiqiSyncUseCaseFactory:
+	yiqi_repository: YiqiRepository
+	watermark_repository: YiqiSyncWatermarkRepository
+	mirror_repository: YiqiMirrorRepository
+	overlap: timedelta = timedelta(hours=24)
+
+	def __post_init__(self):
+		self.targets = build_sync_targets(self.yiqi_repository, self.mirror_repository)
+		self.stream_targets = build_stream_sync_targets(
+			self.yiqi_repository, self.mirror_repository
+		)
+		self.fetch_updates = FetchEntityUpdatesUseCase(self.targets, self.overlap)
+		self.apply_updates = ApplyEntityUpdatesUseCase(
+			self.targets, self.watermark_repository
+		)
+		self.sync_streamed = SyncStreamedEntityUseCase(
+			self.stream_targets, self.watermark_repository, self.overlap
+		)
+		self.get_watermarks = GetSyncWatermarksUseCase(self.watermark_repository)
@@ -1,8 +1,16 @@
+import asyncio
 from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict
+
 import httpx
 
+from core.helpers.polling import poll_with_backoff
+
 from modules.yiqi_erp.application.exception import (
 	YiqiEntityNotFoundException,
+	YiqiImportException,
+	YiqiImportTimeoutException,
 	YiqiServiceException,
 )
 from modules.yiqi_erp.domain.command import (
@@ -10,7 +18,9 @@ from modules.yiqi_erp.domain.command import (
 	CreateYiqiInvoiceCommand,
 	UploadFileCommand,
 )
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
 from modules.yiqi_erp.domain.repository.yiqi import YiqiRepository
+from modules.yiqi_erp.domain.vo.import_status import YiqiImportProgress
 
 
 @dataclass
@@ -33,12 +43,45 @@ class CreateAirWaybillUseCase:
 		return air_waybill
 
 
+# Yiqi informa el progreso de importación por schema (processKey EXCIMP), no
+# por importación: dos importaciones simultáneas del mismo schema mezclarían
+# su progreso, así que se serializan dentro del proceso
+_import_locks: Dict[int, asyncio.Lock] = {}
+
+
 @dataclass
 class CreateMultipleAirWaybillsUseCase:
 	yiqi_repository: YiqiRepository
+	deadline: float = 600.0
+	initial_delay: float = 0.5
+	max_delay: float = 5.0
 
-	async def __call__(self, file: UploadFileCommand, id_schema: int):
-		return await self.yiqi_repository.create_multiple_air_waybills(file, id_schema)
+	async def __call__(
+		self,
+		file: UploadFileCommand,
+		id_schema: int,
+		on_progress: Callable[[YiqiImportProgress], Awaitable[None]] | None = None,
+	):
+		lock = _import_locks.setdefault(id_schema, asyncio.Lock())
+		async with lock:
+			await self.yiqi_repository.start_air_waybills_import(file, id_schema)
+			try:
+				progress = await poll_with_backoff(
+					lambda: self.yiqi_repository.get_air_waybills_import_progress(
+						id_schema
+					),
+					lambda progress: progress.finished,
+					initial_delay=self.initial_delay,
+					max_delay=self.max_delay,
+					deadline=self.deadline,
+					on_result=on_progress,
+				)
+			except TimeoutError:
+				raise YiqiImportTimeoutException
+
+		if progress.failed:
+			raise YiqiImportException(progress.raw)
+		return {"status": "ok"}
 
 
 @dataclass
@@ -79,8 +122,8 @@ class GetProviderByIdUseCase:
 class GetProviderListUseCase:
 	yiqi_repository: YiqiRepository
 
-	async def __call__(self, id_schema: int):
-		provider = await self.yiqi_repository.get_providers_list(id_schema)
+	async def __call__(self, id_schema: int, last_update: datetime | None = None):
+		provider = await self.yiqi_repository.get_providers_list(id_schema, last_update)
 		if provider.is_success:
 			return provider.json()
 		if provider.is_client_error:
@@ -93,8 +136,8 @@ class GetProviderListUseCase:
 class GetServicesListUseCase:
 	yiqi_repository: YiqiRepository
 
-	async def __call__(self, id_schema: int):
-		response = await self.yiqi_repository.get_services_list(id_schema)
+	async def __call__(self, id_schema: int, last_update: datetime | None = None):
+		response = await self.yiqi_repository.get_services_list(id_schema, last_update)
 		if response.is_success:
 			return response.json()
 		raise YiqiServiceException
@@ -104,9 +147,9 @@ class GetServicesListUseCase:
 class GetCurrencyListUseCase:
 	yiqi_repository: YiqiRepository
 
-	async def __call__(self, id_schema: int):
+	async def __call__(self, id_schema: int, last_update: datetime | None = None):
 		response: httpx.Response = await self.yiqi_repository.get_currency_list(
-			id_schema
+			id_schema, last_update
 		)
 		if response.is_success:
 			return response.json()
@@ -133,9 +176,9 @@ class GetCurrencyByCodeUseCase:
 class GetCountryListUseCase:
 	yiqi_repository: YiqiRepository
 
-	async def __call__(self, id_schema: int):
+	async def __call__(self, id_schema: int, last_update: datetime | None = None):
 		response: httpx.Response = await self.yiqi_repository.get_country_list(
-			id_schema
+			id_schema, last_update
 		)
 		if response.is_success:
 			return response.json()
@@ -169,15 +212,51 @@ class UploadFileUseCase:
 		raise YiqiServiceException
 
 
+@dataclass
+class UploadFileStreamUseCase:
+	yiqi_repository: YiqiRepository
+
+	async def __call__(
+		self,
+		filename: str,
+		stream: AsyncIterator[bytes],
+		size: int | None,
+		id_schema: int,
+	):
+		response: httpx.Response = await self.yiqi_repository.upload_file_stream(
+			filename, stream, size, id_schema
+		)
+		if response.is_success:
+			return True
+		raise YiqiServiceException
+
+
+@dataclass
+class IterInvoicesOfProviderUseCase:
+	yiqi_repository: YiqiRepository
+
+	def __call__(
+		self,
+		id_provider: int,
+		id_schema: int,
+		last_update: datetime | None = None,
+		batch_size: int = 500,
+	) -> AsyncIterator[FacturaDeCompra]:
+		return self.yiqi_repository.iter_invoices_of_provider(
+			id_provider, id_schema, last_update, batch_size
+		)
+
+
 @dataclass
 class YiqiUseCaseFactory:
 	yiqi_repository: YiqiRepository
+	import_deadline: float = 600.0
 
 	def __post_init__(self):
 		self.create_invoice = CreateInvoiceUseCase(self.yiqi_repository)
 		self.create_air_waybill = CreateAirWaybillUseCase(self.yiqi_repository)
 		self.create_multiple_air_waybills = CreateMultipleAirWaybillsUseCase(
-			self.yiqi_repository
+			self.yiqi_repository, deadline=self.import_deadline
 		)
 		self.get_air_waybills_template_file = GetAirWaybillsTemplateFileUseCase(
 			self.yiqi_repository
@@ -193,3 +272,7 @@ class YiqiUseCaseFactory:
 		self.get_country_list = GetCountryListUseCase(self.yiqi_repository)
 		self.get_country_by_name = GetCountryByNameUseCase(self.yiqi_repository)
 		self.upload_file = UploadFileUseCase(self.yiqi_repository)
+		self.upload_file_stream = UploadFileStreamUseCase(self.yiqi_repository)
+		self.iter_invoices_of_provider = IterInvoicesOfProviderUseCase(
+			self.yiqi_repository
+		)
@@ -1,11 +1,35 @@
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
-from dependency_injector.providers import Singleton, Factory, Configuration
+from dependency_injector.providers import Singleton, Factory, Configuration, Object
 
 from modules.yiqi_erp.application.service.yiqi import YiqiService
+from modules.yiqi_erp.application.service.sync import YiqiSyncService
+from modules.yiqi_erp.application.service.purchase_invoice import (
+	YiqiPurchaseInvoiceService,
+)
+from modules.yiqi_erp.application.service.reference_data import (
+	YiqiReferenceDataService,
+)
+from modules.yiqi_erp.application.service.air_waybill_import import (
+	YiqiAirWaybillImportService,
+)
 
 from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
 from core.config.settings import env
+from core.db.redis_db import RedisClient
+from core.helpers.cache import StaleWhileRevalidateCache
 from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+from modules.yiqi_erp.adapter.output.persistence.sqlalchemy.mirror import (
+	YiqiMirrorSQLAlchemyRepository,
+)
+from modules.yiqi_erp.adapter.output.persistence.sqlalchemy.purchase_invoice_mirror import (
+	YiqiPurchaseInvoiceSQLAlchemyRepository,
+)
+from modules.yiqi_erp.adapter.output.persistence.sqlalchemy.sync_watermark import (
+	YiqiSyncWatermarkSQLAlchemyRepository,
+)
+from modules.yiqi_erp.adapter.output.persistence.redis.import_status import (
+	YiqiImportStatusRedisRepository,
+)
 
 
 class YiqiContainer(DeclarativeContainer):
@@ -17,7 +41,16 @@ class YiqiContainer(DeclarativeContainer):
 		YiqiHttpClient,
 		base_url=config.YIQI_BASE_URL,
 		api_key=config.YIQI_API_TOKEN,
-		api_timeout=200.0,
+		api_timeout=config.YIQI_HTTP_TIMEOUT_SECONDS,
+		connect_timeout=config.YIQI_HTTP_CONNECT_TIMEOUT_SECONDS,
+		max_connections=config.YIQI_HTTP_MAX_CONNECTIONS,
+		max_keepalive_connections=config.YIQI_HTTP_MAX_KEEPALIVE,
+		keepalive_expiry=config.YIQI_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+		http2=config.YIQI_HTTP2,
+		max_retries=config.YIQI_HTTP_MAX_RETRIES,
+		max_concurrency_per_schema=config.YIQI_MAX_CONCURRENCY_PER_SCHEMA,
+		failure_threshold=config.YIQI_CIRCUIT_FAILURE_THRESHOLD,
+		recovery_timeout=config.YIQI_CIRCUIT_RECOVERY_SECONDS,
 	)
 
 	repository = Factory(
@@ -25,7 +58,56 @@ class YiqiContainer(DeclarativeContainer):
 		client=client,
 	)
 
-	service = Factory(YiqiService, yiqi_repository=repository)
+	reference_cache = Singleton(
+		StaleWhileRevalidateCache,
+		namespace="yiqi:reference",
+		ttl=config.YIQI_REFERENCE_TTL_SECONDS,
+		stale_ttl=config.YIQI_REFERENCE_STALE_SECONDS,
+		max_age=config.YIQI_REFERENCE_MAX_AGE_SECONDS,
+		redis_client=Object(RedisClient.cache),
+	)
+
+	reference_data = Factory(
+		YiqiReferenceDataService,
+		yiqi_repository=repository,
+		cache=reference_cache,
+	)
+
+	service = Factory(
+		YiqiService,
+		yiqi_repository=repository,
+		reference_data=reference_data,
+		import_deadline=config.YIQI_IMPORT_DEADLINE_SECONDS,
+	)
+
+	import_status_repository = Factory(
+		YiqiImportStatusRedisRepository,
+		redis_client=Object(RedisClient.cache),
+	)
 
-	async def shutdown(self):
-		await self.client().close()
+	air_waybill_import_service = Factory(
+		YiqiAirWaybillImportService,
+		yiqi_repository=repository,
+		status_repository=import_status_repository,
+		import_deadline=config.YIQI_IMPORT_DEADLINE_SECONDS,
+	)
+
+	watermark_repository = Factory(YiqiSyncWatermarkSQLAlchemyRepository)
+	mirror_repository = Factory(YiqiMirrorSQLAlchemyRepository)
+
+	sync_service = Factory(
+		YiqiSyncService,
+		yiqi_repository=repository,
+		watermark_repository=watermark_repository,
+		mirror_repository=mirror_repository,
+		overlap_hours=config.YIQI_SYNC_OVERLAP_HOURS,
+	)
+
+	purchase_invoice_repository = Factory(YiqiPurchaseInvoiceSQLAlchemyRepository)
+
+	purchase_invoice_service = Factory(
+		YiqiPurchaseInvoiceService,
+		purchase_invoice_repository=purchase_invoice_repository,
+		watermark_repository=watermark_repository,
+		max_staleness_seconds=config.YIQI_PURCHASE_INVOICE_MAX_STALENESS_SECONDS,
+	)
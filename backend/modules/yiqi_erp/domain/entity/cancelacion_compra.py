@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -17,9 +17,9 @@ class CancelacionDeCompras(YiqiEntity):
 	COMENTARIOS: Optional[str] = None
 	ID_URUGUAY: Optional[int] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	ID_DE_FACTURA: Optional[str] = None
 	FORMULA_FACTURA: Optional[str] = None
 	ESTADO_DE_FACTURA: Optional[str] = None
@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -118,9 +118,9 @@ class Empresa(YiqiEntity):
 	CODIGO_DIARIO: Optional[str] = None
 	URUGUAY: Optional[bool] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	PAIS_FX: Optional[str] = None
 	SALDO_PROVEEDOR_USD: Optional[float] = None
 	SALDO_AJUSTADO_PROVE: Optional[float] = None
@@ -160,9 +160,9 @@ class PortalServicio(YiqiEntity):
 	DESCRIPCION_INGLES: Optional[str] = None
 	ADM__ID_ADM_: Optional[int] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	NOMBRE_DEL_SERVICIO: Optional[str] = None
 	ESTA_CODIGO: Optional[int] = None
 	DESC_ESTADO: Optional[str] = None
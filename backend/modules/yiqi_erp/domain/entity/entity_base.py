@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
 
 
 class YiqiEntity(BaseModel):
@@ -12,19 +12,41 @@ class YiqiEntity(BaseModel):
 
 	@classmethod
 	def alias_generator(cls, field_name: str) -> str:
-		if "_ID_" or "id" in field_name:
+		# Las columnas propias llevan el prefijo de la entidad (FACO_SALDO); las
+		# claves foráneas (CLIE_ID_PROV), la auditoría y el id van tal cual
+		if field_name == "id" or "_ID_" in field_name or field_name.startswith("AUDI_"):
 			return field_name
 		return f"{cls.__prefix__}_{field_name}"
 
-	model_config = ConfigDict(
-		alias_generator=lambda field_name: field_name,  # placeholder
-		populate_by_name=True,
-	)
-
-	def __init_subclass__(cls, **kwargs):
-		cls.model_config = ConfigDict(
-			alias_generator=cls.alias_generator, populate_by_name=True
+	@classmethod
+	def validation_alias_generator(cls, field_name: str) -> AliasChoices:
+		# Hay columnas propias con "_ID_" (FACO_ARHC_ID_2736): se aceptan ambas
+		choices = (
+			cls.alias_generator(field_name),
+			f"{cls.__prefix__}_{field_name}",
+			field_name,
 		)
+		return AliasChoices(*dict.fromkeys(choices))
+
+	model_config = ConfigDict(populate_by_name=True)
+
+	@classmethod
+	def __pydantic_init_subclass__(cls, **kwargs):
+		# La config de la subclase no llega a los campos ya creados: los alias se
+		# asignan acá y se reconstruye el validador
+		super().__pydantic_init_subclass__(**kwargs)
+		for name, field in cls.model_fields.items():
+			if field.alias is None:
+				field.alias = cls.alias_generator(name)
+				field.validation_alias = cls.validation_alias_generator(name)
+				field.serialization_alias = field.serialization_alias or field.alias
+		cls.model_rebuild(force=True)
+
+	@field_validator("*", mode="before")
+	@classmethod
+	def empty_as_none(cls, value: Any) -> Any:
+		# Yiqi devuelve "" en los campos vacíos
+		return None if value == "" else value
 
 	@classmethod
 	def get_attributes(cls):
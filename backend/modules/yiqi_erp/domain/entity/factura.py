@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date, time
+from datetime import date, datetime, time
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -79,9 +79,9 @@ class Factura(YiqiEntity):
 	MONE_ID_MONE: Optional[int]
 	PEDI_ID_PEDI: Optional[int]
 	AUDI_USUA_ALTA: Optional[str]
-	AUDI_FECHA_ALTA: Optional[date]
+	AUDI_FECHA_ALTA: Optional[datetime]
 	AUDI_USUA_MODIF: Optional[str]
-	AUDI_FECHA_MODIF: Optional[date]
+	AUDI_FECHA_MODIF: Optional[datetime]
 	CONTINENTE: Optional[str]
 	REGION: Optional[str]
 	BANK_INFORMATION: Optional[str]
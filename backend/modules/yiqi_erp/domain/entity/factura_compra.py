@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from pydantic import Field
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
@@ -171,9 +171,9 @@ class FacturaDeCompra(YiqiEntity):
 	ID_PREVISION: Optional[str] = Field(default=None, serialization_alias="7179")
 	ASIE_ID_ASIE: Optional[int] = Field(default=None, serialization_alias="3149")
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	ESTADO_DE_EMPRESA: Optional[str] = Field(default=None, serialization_alias="6755")
 	REGION: Optional[str] = Field(default=None, serialization_alias="6654")
 	PAIS: Optional[str] = Field(default=None, serialization_alias="7226")
@@ -231,4 +231,5 @@ class FacturaDeCompra(YiqiEntity):
 	FECHA_REAL_DE_PAGO: Optional[date] = Field(default=None, serialization_alias="6442")
 	KEY_FACO_CLIE: Optional[str] = Field(default=None, serialization_alias="7084")
 	ESTA_CODIGO: Optional[int] = None
-	DESC_ESTADO: Optional[str] = None
+	# Columna calculada de Yiqi, sin prefijo
+	DESC_ESTADO: Optional[str] = Field(default=None, alias="DESC_ESTADO")
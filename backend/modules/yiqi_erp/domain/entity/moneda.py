@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -16,8 +16,8 @@ class Moneda(YiqiEntity):
 	ID_URUGUAY: Optional[int]
 	ULTIMA_FECHA: Optional[date]
 	AUDI_USUA_ALTA: Optional[str]
-	AUDI_FECHA_ALTA: Optional[date]
+	AUDI_FECHA_ALTA: Optional[datetime]
 	AUDI_USUA_MODIF: Optional[str]
-	AUDI_FECHA_MODIF: Optional[date]
+	AUDI_FECHA_MODIF: Optional[datetime]
 	ESTA_CODIGO: Optional[int]
 	DESC_ESTADO: Optional[str]
@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -35,9 +35,9 @@ class NotaCreditoCompra(YiqiEntity):
 	PAIS_DEL_PROVEEDOR: Optional[str] = None
 	TIPO_CAMBIO: Optional[int] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	ESTADO_FACTURA: Optional[str] = None
 	NETO: Optional[int] = None
 	TOTAL: Optional[int] = None
@@ -95,9 +95,9 @@ class OrdenDePago(YiqiEntity):
 	CHEQ_ID_CHEQ: Optional[int] = None
 	TC_AL_DIA_DE_PAGO: Optional[int] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	EMPL_ID_EMPL: Optional[int] = None
 	MONTO: Optional[int] = None
 	PENDIENTE_CANCELACIO: Optional[int] = None
@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 from modules.yiqi_erp.domain.entity.entity_base import YiqiEntity
 
@@ -48,9 +48,9 @@ class NotaCreditoVenta(YiqiEntity):
 	MONE_ID_MONE: Optional[int] = None
 	IDENTIFICADOR_NC: Optional[int] = None
 	AUDI_USUA_ALTA: Optional[str] = None
-	AUDI_FECHA_ALTA: Optional[date] = None
+	AUDI_FECHA_ALTA: Optional[datetime] = None
 	AUDI_USUA_MODIF: Optional[str] = None
-	AUDI_FECHA_MODIF: Optional[date] = None
+	AUDI_FECHA_MODIF: Optional[datetime] = None
 	NETO: Optional[int] = None
 	IVA: Optional[int] = None
 	TOTAL: Optional[int] = None
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from shared.mixins import TimestampMixin
+
+
+class YiqiPurchaseInvoice(SQLModel, TimestampMixin, table=True):
+	"""
+	Copia local de FACTURA_COMPRA de Yiqi con los atributos que muestra el
+	portal de proveedores. La mantiene al día la sincronización incremental
+	(entidad FACTURA_COMPRA); `updated_at` indica cuándo se escribió por
+	última vez cada fila.
+	"""
+
+	__table_args__ = (
+		Index("ix_yiqipurchaseinvoice_provider_status", "id_schema", "id_yiqi_provider", "status"),
+		Index("ix_yiqipurchaseinvoice_status", "id_schema", "status"),
+	)
+
+	id_schema: int = Field(primary_key=True)
+	id_yiqi_invoice: int = Field(primary_key=True, description="id de la factura en Yiqi")
+	id_yiqi_provider: int | None = Field(default=None, description="CLIE_ID_PROV")
+	number: str | None = Field(default=None, description="FACO_NUMERO")
+	status: str | None = Field(default=None, description="DESC_ESTADO")
+	concept: str | None = Field(default=None, description="FACO_CONCEPTO")
+	awb: str | None = Field(default=None, description="FACO_AWB")
+	kg: float | None = Field(default=None, description="FACO_KG")
+	items: int | None = Field(default=None, description="FACO_ITEMS")
+	issue_date: date | None = Field(default=None, description="FACO_FECHA_EMISION")
+	receipt_date: date | None = Field(default=None, description="FACO_FECHA_DE_RECEPCION")
+	service_month: date | None = Field(default=None, description="FACO_MES_DE_SERVICIO")
+	net: float | None = Field(default=None, description="FACO_NETO")
+	balance: float | None = Field(default=None, description="FACO_SALDO")
+	id_yiqi_currency: int | None = Field(default=None, description="MONE_ID_MONE")
+	id_yiqi_service: int | None = Field(default=None, description="SERV_ID_SERV")
+	yiqi_created_at: datetime | None = Field(default=None, description="AUDI_FECHA_ALTA")
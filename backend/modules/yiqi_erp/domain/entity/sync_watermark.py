@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+from shared.mixins import TimestampMixin
+
+
+class YiqiSyncWatermark(SQLModel, TimestampMixin, table=True):
+	"""
+	Marca de agua de la sincronización incremental de una entidad de Yiqi.
+
+	`last_update` es el instante (UTC) en que empezó la última sincronización
+	confirmada; la siguiente pide a GetEntityUpdates2 sólo los cambios desde
+	ese momento.
+	"""
+
+	id_schema: int = Field(primary_key=True)
+	entity_name: str = Field(primary_key=True, description="Entidad de Yiqi (ej: MONEDA)")
+	last_update: datetime = Field(description="Inicio de la última sincronización confirmada")
+	last_fetched: int = Field(default=0, description="Registros recibidos en la última sincronización")
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from modules.yiqi_erp.domain.vo.import_status import YiqiImportStatus
+
+
+class YiqiImportStatusRepository(ABC):
+	@abstractmethod
+	async def save(self, status: YiqiImportStatus) -> YiqiImportStatus: ...
+
+	@abstractmethod
+	async def get(self, import_id: str) -> YiqiImportStatus | None: ...
+
+	@abstractmethod
+	async def request_cancel(self, import_id: str) -> None: ...
+
+	@abstractmethod
+	async def is_cancel_requested(self, import_id: str) -> bool: ...
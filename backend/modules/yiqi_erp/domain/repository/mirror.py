@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
+
+
+class YiqiMirrorRepository(ABC):
+	"""
+	Escritura de la copia local de las entidades de Yiqi (monedas, servicios,
+	proveedores, facturas de compra). Cada método recibe las filas tal como
+	las devuelve GetEntityUpdates2 y devuelve los contadores
+	{"created": n, "updated": n, "unchanged": n}.
+	"""
+
+	@abstractmethod
+	async def upsert_currencies(self, rows: List[dict]) -> Dict[str, int]: ...
+
+	@abstractmethod
+	async def upsert_services(self, rows: List[dict]) -> Dict[str, int]: ...
+
+	@abstractmethod
+	async def upsert_providers(self, rows: List[dict]) -> Dict[str, int]: ...
+
+	@abstractmethod
+	async def upsert_purchase_invoices(
+		self, id_schema: int, invoices: List[FacturaDeCompra]
+	) -> Dict[str, int]: ...
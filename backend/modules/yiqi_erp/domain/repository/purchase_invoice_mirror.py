@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from modules.yiqi_erp.domain.entity.purchase_invoice_mirror import (
+	YiqiPurchaseInvoice,
+)
+
+
+class YiqiPurchaseInvoiceRepository(ABC):
+	"""Lectura de la copia local de FACTURA_COMPRA."""
+
+	@abstractmethod
+	async def get_by_provider(
+		self,
+		id_schema: int,
+		id_provider: int,
+		status: str | None = None,
+		limit: int = 100,
+		offset: int = 0,
+	) -> List[YiqiPurchaseInvoice]: ...
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+
+
+class YiqiSyncWatermarkRepository(ABC):
+	@abstractmethod
+	async def get_watermark(
+		self, id_schema: int, entity_name: str
+	) -> YiqiSyncWatermark | None: ...
+
+	@abstractmethod
+	async def get_watermarks(self, id_schema: int) -> list[YiqiSyncWatermark]: ...
+
+	@abstractmethod
+	async def save(self, watermark: YiqiSyncWatermark) -> YiqiSyncWatermark: ...
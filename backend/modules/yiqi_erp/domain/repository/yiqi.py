@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator
 from fastapi import UploadFile
 
 from modules.yiqi_erp.domain.command import (
 	CreateYiqiAirWaybillCommand,
 	CreateYiqiInvoiceCommand,
 )
+from modules.yiqi_erp.domain.entity.factura_compra import FacturaDeCompra
+from modules.yiqi_erp.domain.vo.import_status import YiqiImportProgress
 
 
 class YiqiRepository(ABC):
@@ -12,13 +16,17 @@ class YiqiRepository(ABC):
 	async def get_provider_by_id(self, id_provider: int, id_schema: int): ...
 
 	@abstractmethod
-	async def get_providers_list(self, id_schema: int): ...
+	async def get_providers_list(
+		self, id_schema: int, last_update: datetime | None = None
+	): ...
 
 	@abstractmethod
 	async def get_contact_by_id(self, id_contact: int, id_schema: int): ...
 
 	@abstractmethod
-	async def get_services_list(self, id_schema: int): ...
+	async def get_services_list(
+		self, id_schema: int, last_update: datetime | None = None
+	): ...
 
 	@abstractmethod
 	async def get_services_list_by_provider_id(
@@ -26,13 +34,17 @@ class YiqiRepository(ABC):
 	): ...
 
 	@abstractmethod
-	async def get_currency_list(self, id_schema: int): ...
+	async def get_currency_list(
+		self, id_schema: int, last_update: datetime | None = None
+	): ...
 
 	@abstractmethod
 	async def get_currency_by_code(self, code: str, id_schema: int) -> list[dict]: ...
 
 	@abstractmethod
-	async def get_country_list(self, id_schema: int): ...
+	async def get_country_list(
+		self, id_schema: int, last_update: datetime | None = None
+	): ...
 
 	@abstractmethod
 	async def get_country_by_name(
@@ -40,7 +52,26 @@ class YiqiRepository(ABC):
 	) -> dict | None: ...
 
 	@abstractmethod
-	async def get_invoices_list_of_provider(self, id_provider: int, id_schema: int): ...
+	async def get_invoices_list_of_provider(
+		self, id_provider: int, id_schema: int, last_update: datetime | None = None
+	): ...
+
+	@abstractmethod
+	def iter_invoices_of_provider(
+		self,
+		id_provider: int,
+		id_schema: int,
+		last_update: datetime | None = None,
+		batch_size: int = 500,
+	) -> AsyncIterator[FacturaDeCompra]: ...
+
+	@abstractmethod
+	def iter_purchase_invoices(
+		self,
+		id_schema: int,
+		last_update: datetime | None = None,
+		batch_size: int = 500,
+	) -> AsyncIterator[FacturaDeCompra]: ...
 
 	@abstractmethod
 	async def create_invoice(
@@ -60,11 +91,16 @@ class YiqiRepository(ABC):
 	) -> dict: ...
 
 	@abstractmethod
-	async def create_multiple_air_waybills(
+	async def start_air_waybills_import(
 		self,
 		file: UploadFile,
 		id_schema: int,
-	) -> dict: ...
+	) -> None: ...
+
+	@abstractmethod
+	async def get_air_waybills_import_progress(
+		self, id_schema: int
+	) -> YiqiImportProgress: ...
 
 	@abstractmethod
 	async def get_air_waybills_template_file(self, id_schema: int) -> UploadFile: ...
@@ -76,3 +112,12 @@ class YiqiRepository(ABC):
 
 	@abstractmethod
 	async def upload_file(self, file: UploadFile, id_schema: int): ...
+
+	@abstractmethod
+	async def upload_file_stream(
+		self,
+		filename: str,
+		stream: AsyncIterator[bytes],
+		size: int | None,
+		id_schema: int,
+	): ...
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set
+
+
+@dataclass
+class AirWaybillReconciliation:
+	"""
+	Cruce entre las guías enviadas a Yiqi y las que Yiqi devuelve para la
+	factura, indexado por código de guía (GUAE_GUIA_AEREA).
+
+	Si Yiqi repite un código queda el último id, igual que antes.
+	"""
+
+	yiqi_ids_by_code: Dict[str, int]
+	sent_codes: Set[str]
+	linked_codes: Set[str] = field(default_factory=set)
+
+	@classmethod
+	def index(
+		cls, yiqi_awbs: Iterable[Dict[str, Any]], sent_codes: Iterable[str]
+	) -> "AirWaybillReconciliation":
+		yiqi_ids_by_code = {
+			awb["GUAE_GUIA_AEREA"]: int(awb["id"])
+			for awb in yiqi_awbs
+			if awb.get("GUAE_GUIA_AEREA") and awb.get("id") is not None
+		}
+		return cls(yiqi_ids_by_code=yiqi_ids_by_code, sent_codes=set(sent_codes))
+
+	@property
+	def matches(self) -> Dict[str, int]:
+		"""Códigos presentes en ambos lados con su id en Yiqi."""
+		return {
+			code: id_yiqi
+			for code, id_yiqi in self.yiqi_ids_by_code.items()
+			if code in self.sent_codes
+		}
+
+	@property
+	def missing_in_yiqi(self) -> List[str]:
+		"""Guías locales que no quedaron vinculadas a una guía de Yiqi."""
+		return sorted(self.sent_codes - self.linked_codes)
+
+	@property
+	def missing_locally(self) -> List[str]:
+		"""Guías que Yiqi tiene en la factura y no se vincularon localmente."""
+		return sorted(set(self.yiqi_ids_by_code) - self.linked_codes)
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Set, Tuple
+
+# Plantilla de importación de guías aéreas de Yiqi: fila de títulos y fila con
+# las claves técnicas de cada columna (ImportExcel las usa para mapear)
+AIR_WAYBILL_SHEET_TITLES: Tuple[str, ...] = (
+	"🔑 Proveedor (Nombre)",
+	"🔑 Factura (Id factura)",
+	"🔑 Guía aérea",
+	"CN38",
+	"Origen (País)",
+	"Destino (País)",
+	"Kg",
+	"Bags",
+)
+AIR_WAYBILL_SHEET_KEYS: Tuple[str, ...] = (
+	"CLIE_ID_CLIE",
+	"FACO_ID_FACO",
+	"GUAE_GUIA_AEREA",
+	"GUAE_CN38",
+	"PAIS_ID_PAI1",
+	"PAIS_ID_PAIS",
+	"GUAE_KG",
+	"GUAE_BAGS",
+)
+
+
+@dataclass
+class AirWaybillSheet:
+	"""
+	Filas de la planilla de guías aéreas de una factura de compra.
+
+	`rows` toma las guías a medida que llegan de la consulta, cuenta cuántas
+	se escribieron en `rows_written` y guarda sus códigos en `awb_codes` para
+	conciliar después contra lo que devuelve Yiqi.
+	"""
+
+	id_yiqi_provider: int
+	id_yiqi_invoice: int
+	rows_written: int = 0
+	awb_codes: Set[str] = field(default_factory=set)
+
+	def row(self, air_waybill: Any) -> Tuple[str, ...]:
+		return (
+			str(self.id_yiqi_provider),
+			str(self.id_yiqi_invoice),
+			air_waybill.awb_code,
+			"",
+			air_waybill.origin,
+			air_waybill.destination,
+			str(air_waybill.kg),
+			"",
+		)
+
+	async def rows(self, air_waybills: AsyncIterable[Any]) -> AsyncIterator[Tuple[str, ...]]:
+		yield AIR_WAYBILL_SHEET_TITLES
+		yield AIR_WAYBILL_SHEET_KEYS
+		async for air_waybill in air_waybills:
+			self.rows_written += 1
+			self.awb_codes.add(air_waybill.awb_code)
+			yield self.row(air_waybill)
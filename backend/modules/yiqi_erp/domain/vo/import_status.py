@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ImportState = Literal["queued", "running", "done", "error", "cancelled", "timeout"]
+FINISHED_STATES = ("done", "error", "cancelled", "timeout")
+
+
+class YiqiImportProgress(BaseModel):
+	"""Respuesta de /api/instancesApi/GetProgress (ej: "45|OK", "100|OK", "0|ERROR|...")."""
+
+	percent: int = 0
+	failed: bool = False
+	raw: str = ""
+
+	@property
+	def finished(self) -> bool:
+		return self.failed or self.percent >= 100
+
+	@classmethod
+	def parse(cls, text: str) -> "YiqiImportProgress":
+		raw = text.strip().strip('"')
+		head = raw.split("|", 1)[0]
+		return cls(
+			percent=int(head) if head.isdigit() else 0,
+			failed="|ERROR|" in raw,
+			raw=raw,
+		)
+
+
+def _now() -> datetime:
+	return datetime.now(timezone.utc)
+
+
+class YiqiImportStatus(BaseModel):
+	"""Estado de una importación de guías aéreas seguida por la API."""
+
+	import_id: str
+	id_schema: int
+	status: ImportState = "queued"
+	percent: int = 0
+	message: str | None = None
+	started_at: datetime = Field(default_factory=_now)
+	updated_at: datetime = Field(default_factory=_now)
+
+	@property
+	def finished(self) -> bool:
+		return self.status in FINISHED_STATES
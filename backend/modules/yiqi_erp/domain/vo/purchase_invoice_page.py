@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from modules.yiqi_erp.domain.entity.purchase_invoice_mirror import (
+	YiqiPurchaseInvoice,
+)
+
+
+class YiqiPurchaseInvoicePage(BaseModel):
+	"""
+	Facturas de compra servidas desde la copia local.
+
+	`synced_at` es el inicio de la última sincronización confirmada de
+	FACTURA_COMPRA (None si nunca se sincronizó) y `stale` indica que pasó más
+	tiempo del tolerado desde entonces: lo que muestra puede no reflejar los
+	últimos cambios hechos en Yiqi.
+	"""
+
+	items: List[YiqiPurchaseInvoice]
+	synced_at: datetime | None = None
+	stale: bool = True
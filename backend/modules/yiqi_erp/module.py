@@ -7,12 +7,22 @@ from typing import Dict
 
 from fastapi import APIRouter
 
+from core.celery.runtime import worker_runtime
+from core.config.settings import env
 from modules.yiqi_erp.adapter.input.tasks.yiqi_erp import (
 	create_invoice_from_purchase_invoice_tasks,
+	purchase_invoice_emission_key,
 )
 from modules.yiqi_erp.adapter.input.tasks.yiqi_erp_improved import (
 	create_invoice_from_purchase_invoice_improved_tasks,
 )
+from modules.yiqi_erp.adapter.input.tasks.yiqi_sync import (
+	sync_yiqi_entities_tasks,
+	yiqi_sync_key,
+)
+from modules.yiqi_erp.application.service.air_waybill_import import (
+	YiqiAirWaybillImportService,
+)
 from modules.yiqi_erp.container import YiqiContainer
 
 
@@ -29,8 +39,33 @@ def setup_routes() -> APIRouter:
 # Configuración del módulo
 name = "yiqi_erp"
 container = YiqiContainer()
+
+
+async def close_client():
+	"""Cierra el pool HTTP compartido hacia Yiqi al apagar el worker"""
+	# El Singleton se resuelve recién acá: importar el módulo no crea el cliente
+	await container.client().close()
+
+
+worker_runtime.add_shutdown_hook(close_client)
+
+
+async def warm_up_reference_data():
+	"""Precarga monedas, países y servicios de Yiqi al iniciar la API"""
+	await container.service().warm_up_reference_data(env.YIQI_SCHEMA)
+
+
+async def cancel_running_imports():
+	"""Deja las importaciones en curso como canceladas al apagar la API"""
+	await YiqiAirWaybillImportService.cancel_running()
+
+
 service: Dict[str, object] = {
 	"yiqi_service": container.service,
+	"yiqi_sync_service": container.sync_service,
+	"yiqi_purchase_invoice_service": container.purchase_invoice_service,
+	"yiqi_erp_warmup": warm_up_reference_data,
+	"yiqi_erp_shutdown": cancel_running_imports,
 	"yiqi_erp_tasks": {
 		"create_invoice_from_purchase_invoice_tasks": {
 			"task": create_invoice_from_purchase_invoice_tasks,
@@ -41,6 +76,9 @@ service: Dict[str, object] = {
 				"retry_backoff_max": 600,
 				"retry_jitter": True,
 			},
+			"idempotency_key": purchase_invoice_emission_key,
+			"idempotency_ttl": 3600,
+			"priority": 3,
 		},
 		"create_invoice_from_purchase_invoice_improved_tasks": {
 			"task": create_invoice_from_purchase_invoice_improved_tasks,
@@ -51,6 +89,18 @@ service: Dict[str, object] = {
 				"retry_backoff_max": 600,
 				"retry_jitter": True,
 			},
+			"idempotency_key": purchase_invoice_emission_key,
+			"idempotency_ttl": 3600,
+			"priority": 3,
+		},
+		"sync_yiqi_entities_tasks": {
+			"task": sync_yiqi_entities_tasks,
+			# Sin autoretry: la próxima ejecución de beat retoma desde la marca
+			"config": {},
+			"idempotency_key": yiqi_sync_key,
+			"idempotency_ttl": 60,
+			"priority": 1,
+			"schedule": env.YIQI_SYNC_INTERVAL_SECONDS,
 		},
 	},
 }
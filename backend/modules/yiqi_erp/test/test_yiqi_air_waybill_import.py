@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from unittest.mock import AsyncMock
+
+import pytest
+
+from modules.yiqi_erp.application.exception import (
+	YiqiImportException,
+	YiqiImportTimeoutException,
+)
+from modules.yiqi_erp.application.service.air_waybill_import import (
+	YiqiAirWaybillImportService,
+)
+from modules.yiqi_erp.application.usecase.yiqi import CreateMultipleAirWaybillsUseCase
+from modules.yiqi_erp.domain.command import UploadFileCommand
+from modules.yiqi_erp.domain.repository.import_status import (
+	YiqiImportStatusRepository,
+)
+from modules.yiqi_erp.domain.vo.import_status import (
+	YiqiImportProgress,
+	YiqiImportStatus,
+)
+
+
+class InMemoryImportStatusRepository(YiqiImportStatusRepository):
+	def __init__(self):
+		self.statuses = {}
+		self.cancelled = set()
+		self.history = []
+
+	async def save(self, status):
+		self.statuses[status.import_id] = status.model_copy()
+		self.history.append(status.status)
+		return status
+
+	async def get(self, import_id):
+		return self.statuses.get(import_id)
+
+	async def request_cancel(self, import_id):
+		self.cancelled.add(import_id)
+
+	async def is_cancel_requested(self, import_id):
+		return import_id in self.cancelled
+
+
+def progress_sequence(*texts):
+	repository = AsyncMock()
+	repository.get_air_waybills_import_progress.side_effect = [
+		YiqiImportProgress.parse(text) for text in texts
+	]
+	return repository
+
+
+def excel_file():
+	return UploadFileCommand(BytesIO(b"xlsx"), size=4, filename="air_waybills.xlsx")
+
+
+def test_progress_parsing():
+	assert YiqiImportProgress.parse('"45|OK"').percent == 45
+	assert YiqiImportProgress.parse("100|OK").finished
+	failed = YiqiImportProgress.parse("0|ERROR|Fila 3: guía duplicada")
+	assert failed.failed and failed.finished
+
+
+async def test_import_polls_until_finished():
+	repository = progress_sequence("0|OK", "50|OK", "100|OK")
+	seen = []
+
+	async def on_progress(progress):
+		seen.append(progress.percent)
+
+	usecase = CreateMultipleAirWaybillsUseCase(repository, initial_delay=0.001)
+	assert await usecase(excel_file(), 316, on_progress) == {"status": "ok"}
+
+	repository.start_air_waybills_import.assert_awaited_once()
+	assert seen == [0, 50, 100]
+
+
+async def test_import_error_reported_by_yiqi():
+	repository = progress_sequence("10|OK", "0|ERROR|Fila 3")
+	usecase = CreateMultipleAirWaybillsUseCase(repository, initial_delay=0.001)
+
+	with pytest.raises(YiqiImportException) as exc:
+		await usecase(excel_file(), 316)
+	assert "Fila 3" in exc.value.message
+
+
+async def test_import_deadline():
+	repository = AsyncMock()
+	repository.get_air_waybills_import_progress.return_value = YiqiImportProgress(
+		percent=10
+	)
+	usecase = CreateMultipleAirWaybillsUseCase(
+		repository, deadline=0.05, initial_delay=0.01, max_delay=0.01
+	)
+
+	with pytest.raises(YiqiImportTimeoutException):
+		await usecase(excel_file(), 316)
+
+
+async def test_background_import_records_status():
+	repository = progress_sequence("0|OK", "100|OK")
+	status_repository = InMemoryImportStatusRepository()
+	service = YiqiAirWaybillImportService(repository, status_repository)
+	service.import_air_waybills.initial_delay = 0.001
+
+	status = await service.start_import(excel_file(), 316)
+	assert status.status == "queued"
+	await service._tasks[status.import_id]
+
+	final = await service.get_status(status.import_id)
+	assert final.status == "done" and final.percent == 100
+	assert status_repository.history[:2] == ["queued", "running"]
+
+
+async def test_background_import_can_be_cancelled():
+	repository = AsyncMock()
+	repository.get_air_waybills_import_progress.return_value = YiqiImportProgress(
+		percent=10
+	)
+	status_repository = InMemoryImportStatusRepository()
+	service = YiqiAirWaybillImportService(repository, status_repository)
+	service.import_air_waybills.initial_delay = 0.01
+
+	status = await service.start_import(excel_file(), 316)
+	await asyncio.sleep(0.02)
+	await service.cancel(status.import_id)
+	await asyncio.gather(
+		service._tasks.get(status.import_id) or asyncio.sleep(0),
+		return_exceptions=True,
+	)
+
+	assert (await service.get_status(status.import_id)).status == "cancelled"
+
+
+async def test_shutdown_cancels_running_imports():
+	repository = AsyncMock()
+	repository.get_air_waybills_import_progress.return_value = YiqiImportProgress(
+		percent=10
+	)
+	status_repository = InMemoryImportStatusRepository()
+	service = YiqiAirWaybillImportService(repository, status_repository)
+	service.import_air_waybills.initial_delay = 0.01
+
+	status = await service.start_import(excel_file(), 316)
+	task = service._tasks[status.import_id]
+	await asyncio.sleep(0.02)
+	await YiqiAirWaybillImportService.cancel_running()
+
+	assert task.cancelled()
+	assert (await service.get_status(status.import_id)).status == "cancelled"
+
+
+async def test_orphaned_import_reported_as_timeout():
+	status_repository = InMemoryImportStatusRepository()
+	service = YiqiAirWaybillImportService(
+		AsyncMock(), status_repository, import_deadline=60
+	)
+	stale = datetime.now(timezone.utc) - timedelta(seconds=120)
+	await status_repository.save(
+		YiqiImportStatus(
+			import_id="orphan", id_schema=316, status="running", updated_at=stale
+		)
+	)
+
+	status = await service.get_status("orphan")
+	assert status.status == "timeout"
+	assert (await status_repository.get("orphan")).status == "timeout"
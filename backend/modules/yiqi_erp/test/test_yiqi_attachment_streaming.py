@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.yiqi_invoice_emission import StubServices
+from modules.yiqi_erp.adapter.input.tasks import yiqi_erp
+from modules.yiqi_erp.adapter.input.tasks.yiqi_erp import (
+	create_invoice_from_purchase_invoice_tasks,
+)
+
+
+@pytest.fixture
+def services():
+	stubs = StubServices(db=0, s3=0, yiqi=0)
+	stubs.uploaded = []
+	stubs.created = []
+
+	async def record_upload(filename, stream, size, schema_id):
+		stubs.uploaded.append((filename, b"".join([chunk async for chunk in stream]), size))
+
+	async def buffered_download(file_id):
+		raise AssertionError("la emisión no debe cargar el adjunto entero en memoria")
+
+	async def create_invoice(command, schema_id):
+		stubs.created.append(command)
+		return {"ok": False, "error": "cortado en el test"}
+
+	stubs.upload_file_stream = record_upload
+	stubs.download_file = buffered_download
+	stubs.create_invoice = create_invoice
+	with patch.object(yiqi_erp, "service_locator", stubs):
+		yield stubs
+
+
+async def test_live_emission_streams_attachments_to_yiqi(services):
+	with pytest.raises(Exception, match="cortado en el test"):
+		await create_invoice_from_purchase_invoice_tasks(1, 316)
+
+	assert services.uploaded == [("factura.pdf", b"%" * 1024, 1024)] * 2
+	command = services.created[0]
+	assert command.Comprobante.filename == "factura.pdf"
+	assert command.Detalle.filename == "factura.pdf"
+
+
+async def test_invoice_without_air_waybills_is_not_retried(services):
+	async def create_invoice(command, schema_id):
+		services.created.append(command)
+		return {"ok": True, "newId": 99}
+
+	async def no_air_waybills(purchase_invoice_id):
+		return
+		yield
+
+	async def create_multiple_air_waybills(file, schema_id):
+		raise AssertionError("sin guías no se importa la planilla")
+
+	services.create_invoice = create_invoice
+	services.iter_air_waybills_by_purchase_invoice_id = no_air_waybills
+	services.create_multiple_air_waybills = create_multiple_air_waybills
+
+	# Fallar después de crear la factura haría que el autoretry la duplicara
+	response = await create_invoice_from_purchase_invoice_tasks(1, 316)
+
+	assert response == {"ok": True, "newId": 99}
+	assert len(services.created) == 1
+	assert services.invoice.invoice_status == "SENT"
@@ -0,0 +1,40 @@
+from modules.yiqi_erp.domain.vo.air_waybill_reconciliation import (
+	AirWaybillReconciliation,
+)
+
+YIQI_AWBS = [
+	{"id": 10, "GUAE_GUIA_AEREA": "123-00000001"},
+	{"id": "11", "GUAE_GUIA_AEREA": "123-00000002"},
+	{"id": 12, "GUAE_GUIA_AEREA": "999-00000009"},
+	{"id": 13, "GUAE_GUIA_AEREA": None},
+]
+
+
+def test_matches_by_code_on_both_sides():
+	reconciliation = AirWaybillReconciliation.index(
+		YIQI_AWBS, {"123-00000001", "123-00000002", "123-00000003"}
+	)
+
+	assert reconciliation.matches == {"123-00000001": 10, "123-00000002": 11}
+
+
+def test_reports_unmatched_after_linking():
+	reconciliation = AirWaybillReconciliation.index(
+		YIQI_AWBS, {"123-00000001", "123-00000002", "123-00000003"}
+	)
+	reconciliation.linked_codes = {"123-00000001", "123-00000002"}
+
+	assert reconciliation.missing_in_yiqi == ["123-00000003"]
+	assert reconciliation.missing_locally == ["999-00000009"]
+
+
+def test_repeated_code_in_yiqi_keeps_last_id():
+	reconciliation = AirWaybillReconciliation.index(
+		[
+			{"id": 1, "GUAE_GUIA_AEREA": "123-00000001"},
+			{"id": 2, "GUAE_GUIA_AEREA": "123-00000001"},
+		],
+		{"123-00000001"},
+	)
+
+	assert reconciliation.matches == {"123-00000001": 2}
@@ -0,0 +1,52 @@
+import csv
+import io
+from types import SimpleNamespace
+
+from openpyxl import load_workbook
+
+from core.helpers.spreadsheet import write_csv, write_spreadsheet
+from modules.yiqi_erp.domain.vo.air_waybill_sheet import (
+	AIR_WAYBILL_SHEET_KEYS,
+	AIR_WAYBILL_SHEET_TITLES,
+	AirWaybillSheet,
+)
+
+
+async def air_waybills(count: int):
+	for i in range(count):
+		yield SimpleNamespace(
+			awb_code=f"123-{i:08d}", origin="Argentina", destination="Chile", kg=1.5 + i
+		)
+
+
+async def test_xlsx_has_yiqi_template_header_and_rows():
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+
+	content = await write_spreadsheet(sheet.rows(air_waybills(3)), "xlsx")
+
+	rows = list(load_workbook(io.BytesIO(content)).active.iter_rows(values_only=True))
+	assert rows[0] == AIR_WAYBILL_SHEET_TITLES
+	assert rows[1] == AIR_WAYBILL_SHEET_KEYS
+	assert rows[2] == ("15", "4321", "123-00000000", None, "Argentina", "Chile", "1.5", None)
+	assert len(rows) == 5
+	assert sheet.rows_written == 3
+
+
+async def test_csv_is_utf8_with_bom():
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+
+	content = await write_csv(sheet.rows(air_waybills(2)))
+
+	assert content.startswith(b"\xef\xbb\xbf")
+	rows = list(csv.reader(io.StringIO(content.decode("utf-8-sig"))))
+	assert tuple(rows[0]) == AIR_WAYBILL_SHEET_TITLES
+	assert rows[3] == ["15", "4321", "123-00000001", "", "Argentina", "Chile", "2.5", ""]
+
+
+async def test_empty_query_writes_only_template():
+	sheet = AirWaybillSheet(id_yiqi_provider=15, id_yiqi_invoice=4321)
+
+	content = await write_spreadsheet(sheet.rows(air_waybills(0)), "xlsx")
+
+	assert sheet.rows_written == 0
+	assert load_workbook(io.BytesIO(content)).active.max_row == 2
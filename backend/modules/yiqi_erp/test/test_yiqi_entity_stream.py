@@ -0,0 +1,126 @@
+import json
+
+import httpx
+import pytest
+
+from core.helpers.json_stream import JSONStreamError, iter_json_array
+from modules.yiqi_erp.adapter.output.api.decoding import (
+	entity_list_adapter,
+	iter_entities,
+)
+from modules.yiqi_erp.adapter.output.api.exception import RequestException
+from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+from modules.yiqi_erp.domain.entity import FacturaDeCompra
+
+ROWS = [
+	{
+		"id": i,
+		"CLIE_ID_PROV": 77,
+		"FACO_NUMERO": f"0001-{i:08d}",
+		"DESC_ESTADO": "Recepción",
+		"FACO_SALDO": 1500.5 + i,
+		"FACO_FECHA_EMISION": "2025-01-10T00:00:00",
+		"FACO_ARHC_ID_2736": "",
+		"AUDI_FECHA_ALTA": "2025-01-10T13:45:12",
+	}
+	for i in range(1, 8)
+]
+PAYLOAD = json.dumps(ROWS, ensure_ascii=False).encode()
+
+
+async def chunks(data: bytes, size: int):
+	for start in range(0, len(data), size):
+		yield data[start : start + size]
+
+
+async def collect(aiter):
+	return [item async for item in aiter]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(PAYLOAD)])
+async def test_json_array_is_decoded_across_any_chunk_boundary(size):
+	assert await collect(iter_json_array(chunks(PAYLOAD, size))) == ROWS
+
+
+async def test_numbers_split_between_chunks_are_not_truncated():
+	assert await collect(iter_json_array(chunks(b"[12345, 6.75e2]", 2))) == [
+		12345,
+		675.0,
+	]
+
+
+@pytest.mark.parametrize("payload", [b"", b"{}", b"[1, 2", b"[1 2]", b"[1] x"])
+async def test_invalid_payloads_raise(payload):
+	with pytest.raises((JSONStreamError, json.JSONDecodeError)):
+		await collect(iter_json_array(chunks(payload, 3)))
+
+
+@pytest.mark.parametrize("size", [1, 3, 64])
+async def test_trailing_comma_is_rejected(size):
+	with pytest.raises(JSONStreamError, match="Trailing comma"):
+		await collect(iter_json_array(chunks(b"[1, 2 , ]", size)))
+
+	assert await collect(iter_json_array(chunks(b"[ ]", size))) == []
+
+
+async def test_rows_are_validated_into_entities_with_yiqi_column_names():
+	invoices = await collect(iter_entities(chunks(PAYLOAD, 100), FacturaDeCompra, 3))
+
+	assert len(invoices) == len(ROWS)
+	first = invoices[0]
+	assert first.NUMERO == "0001-00000001"
+	assert first.SALDO == 1501.5
+	assert first.CLIE_ID_PROV == 77
+	assert first.DESC_ESTADO == "Recepción"
+	assert first.ARHC_ID_2736 is None
+	assert first.FECHA_EMISION.isoformat() == "2025-01-10"
+	assert first.AUDI_FECHA_ALTA.hour == 13
+
+
+async def test_invalid_rows_are_skipped_without_dropping_the_batch():
+	rows = [ROWS[0], {"id": 99, "FACO_SALDO": "no es un número"}, ROWS[1]]
+	payload = json.dumps(rows).encode()
+
+	invoices = await collect(iter_entities(chunks(payload, 10), FacturaDeCompra))
+
+	assert [invoice.id for invoice in invoices] == [1, 2]
+
+
+def test_type_adapter_is_built_once_per_model():
+	assert entity_list_adapter(FacturaDeCompra) is entity_list_adapter(FacturaDeCompra)
+
+
+def make_repository(handler):
+	client = YiqiHttpClient(
+		base_url="https://yiqi.test",
+		api_key="token",
+		retry_backoff=0,
+		transport=httpx.MockTransport(handler),
+	)
+	return YiqiApiRepository(client)
+
+
+async def test_repository_streams_invoices_of_provider():
+	requests = []
+
+	def handler(request):
+		requests.append(request)
+		if len(requests) == 1:
+			return httpx.Response(503)
+		return httpx.Response(200, content=chunks(PAYLOAD, 64))
+
+	repository = make_repository(handler)
+
+	invoices = await collect(repository.iter_invoices_of_provider(77, 316))
+
+	assert [invoice.id for invoice in invoices] == [row["id"] for row in ROWS]
+	assert len(requests) == 2
+	assert requests[-1].url.params["entityName"] == "FACTURA_COMPRA"
+
+
+async def test_repository_raises_on_error_response():
+	repository = make_repository(lambda request: httpx.Response(400, text="bad filter"))
+
+	with pytest.raises(RequestException):
+		await collect(repository.iter_invoices_of_provider(77, 316))
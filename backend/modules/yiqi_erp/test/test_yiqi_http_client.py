@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.helpers.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+from modules.yiqi_erp.adapter.output.api.exception import YiqiUnavailableException
+from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+
+
+def make_client(handler, **kwargs):
+	kwargs.setdefault("retry_backoff", 0)
+	return YiqiHttpClient(
+		base_url="https://yiqi.test",
+		api_key="token",
+		transport=httpx.MockTransport(handler),
+		**kwargs,
+	)
+
+
+def sequence(*statuses):
+	calls = []
+
+	def handler(request):
+		calls.append(request)
+		return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], text="x")
+
+	return handler, calls
+
+
+async def test_get_is_retried_on_gateway_errors():
+	handler, calls = sequence(503, 502, 200)
+	client = make_client(handler, max_retries=2)
+
+	response = await client.get("/api/public/CLIENTE", {"schemaId": 316})
+
+	assert response.status_code == 200
+	assert len(calls) == 3
+
+
+async def test_post_is_not_retried():
+	handler, calls = sequence(503, 200)
+	client = make_client(handler)
+
+	response = await client.post("/api/InstancesAPI/Save", json={"schemaId": 316})
+
+	assert response.status_code == 503
+	assert len(calls) == 1
+
+
+async def test_non_idempotent_get_is_not_retried():
+	def handler(request):
+		raise httpx.ConnectError("down", request=request)
+
+	client = make_client(handler)
+
+	with pytest.raises(httpx.ConnectError):
+		await client.get("/api/instancesApi/ImportExcel", idempotent=False)
+	assert client.breaker.failures == 1
+
+
+async def test_local_transport_errors_are_not_retried():
+	calls = []
+
+	def handler(request):
+		calls.append(request)
+		raise httpx.UnsupportedProtocol("sin esquema", request=request)
+
+	client = make_client(handler, max_retries=2, failure_threshold=1)
+
+	with pytest.raises(httpx.UnsupportedProtocol):
+		await client.get("/api/public/CLIENTE")
+	assert len(calls) == 1
+	assert client.breaker.state == CLOSED and client.breaker.failures == 0
+
+
+async def test_circuit_opens_and_fails_fast():
+	handler, calls = sequence(500)
+	client = make_client(handler, max_retries=0, failure_threshold=2)
+
+	await client.get("/api/public/CLIENTE")
+	await client.get("/api/public/CLIENTE")
+	assert client.breaker.state == OPEN
+
+	with pytest.raises(YiqiUnavailableException):
+		await client.get("/api/public/CLIENTE")
+	assert len(calls) == 2
+
+	# Pasado el recovery_timeout se deja pasar una llamada de prueba
+	client.breaker.opened_at -= client.recovery_timeout
+	handler_ok, _ = sequence(200)
+	client._client._transport = httpx.MockTransport(handler_ok)
+	response = await client.get("/api/public/CLIENTE")
+	assert response.status_code == 200
+	assert client.breaker.state == CLOSED
+
+
+def test_endpoint_timeouts():
+	client = make_client(lambda request: httpx.Response(200))
+
+	assert client._timeout_for("/api/instancesApi/GetProgress").read == 15.0
+	assert client._timeout_for("/api/InstancesAPI/GetEntityUpdates2").read == 30.0
+
+
+@pytest.mark.parametrize("error", [ValueError("tamaño distinto"), asyncio.CancelledError()])
+async def test_failed_probe_does_not_leave_the_circuit_half_open_forever(error):
+	handler, calls = sequence(500)
+	client = make_client(handler, max_retries=0, failure_threshold=2)
+	await client.get("/api/public/CLIENTE")
+	await client.get("/api/public/CLIENTE")
+	client.breaker.opened_at -= client.recovery_timeout
+
+	def broken(request):
+		raise error
+
+	client._client._transport = httpx.MockTransport(broken)
+	with pytest.raises(type(error)):
+		await client.get("/api/public/CLIENTE")
+	assert client.breaker.state == HALF_OPEN
+
+	handler_ok, _ = sequence(200)
+	client._client._transport = httpx.MockTransport(handler_ok)
+	response = await client.get("/api/public/CLIENTE")
+	assert response.status_code == 200
+	assert client.breaker.state == CLOSED
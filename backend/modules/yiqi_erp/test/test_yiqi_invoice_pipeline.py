@@ -0,0 +1,52 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.yiqi_invoice_emission import StubServices
+from modules.yiqi_erp.adapter.input.tasks import yiqi_erp_improved
+from modules.yiqi_erp.adapter.input.tasks.yiqi_erp_improved import (
+	InvoiceCreationError,
+	create_invoice_from_purchase_invoice_improved_tasks,
+)
+
+
+@pytest.fixture
+def services():
+	stubs = StubServices(db=0.001, s3=0.05, yiqi=0.05)
+	stubs.uploaded = []
+	upload_file_stream = stubs.upload_file_stream
+
+	async def record_upload(filename, stream, size, schema_id):
+		stubs.uploaded.append(filename)
+		return await upload_file_stream(filename, stream, size, schema_id)
+
+	stubs.upload_file_stream = record_upload
+	with patch.object(yiqi_erp_improved, "service_locator", stubs):
+		yield stubs
+
+
+async def test_independent_steps_overlap(services):
+	start = time.perf_counter()
+	response = await create_invoice_from_purchase_invoice_improved_tasks(1, 316)
+	elapsed = time.perf_counter() - start
+
+	assert response == {"newId": 99}
+	assert services.invoice.fk_yiqi_invoice == 99
+	assert services.uploaded == ["factura.pdf", "factura.pdf"]
+	# Secuencial: moneda + 2 x (S3 + upload) + create ~ 0.35 s
+	assert elapsed < 0.25
+
+
+async def test_attachments_are_not_uploaded_when_lookup_fails(services):
+	async def missing_provider(_):
+		await asyncio.sleep(0.001)
+		return SimpleNamespace(id=1, id_yiqi_provider=None, name="Proveedor")
+
+	services.get_provider_by_id = missing_provider
+
+	with pytest.raises(InvoiceCreationError, match="Provider missing Yiqi ID"):
+		await create_invoice_from_purchase_invoice_improved_tasks(1, 316)
+	assert services.uploaded == []
@@ -0,0 +1,168 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import shared.models  # noqa: F401 - configura todos los mappers de SQLModel
+from core.db.session import reset_session_context, set_session_context
+from modules.yiqi_erp.adapter.output.persistence.sqlalchemy.mirror import (
+	YiqiMirrorSQLAlchemyRepository,
+)
+from modules.yiqi_erp.adapter.output.persistence.sqlalchemy.purchase_invoice_mirror import (
+	YiqiPurchaseInvoiceSQLAlchemyRepository,
+)
+from modules.yiqi_erp.application.service.purchase_invoice import (
+	YiqiPurchaseInvoiceService,
+)
+from modules.yiqi_erp.application.service.sync import YiqiSyncService
+from modules.yiqi_erp.domain.entity import FacturaDeCompra
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+from modules.yiqi_erp.test.test_yiqi_sync import InMemoryWatermarkRepository
+
+INVOICES = [
+	FacturaDeCompra(
+		id=i, CLIE_ID_PROV=77, NUMERO=f"0001-{i:08d}", DESC_ESTADO="Recepción", SALDO=10.0 * i
+	)
+	for i in range(1, 6)
+]
+
+
+@pytest.fixture
+def session_context():
+	context = set_session_context(str(uuid.uuid4()))
+	yield
+	reset_session_context(context)
+
+
+@pytest.fixture
+def sync_service():
+	async def iter_purchase_invoices(id_schema, last_update, batch_size):
+		for invoice in INVOICES:
+			yield invoice
+
+	yiqi_repository = MagicMock()
+	yiqi_repository.iter_purchase_invoices = MagicMock(side_effect=iter_purchase_invoices)
+	mirror = AsyncMock()
+	mirror.upsert_purchase_invoices.side_effect = lambda id_schema, batch: {
+		"created": len(batch)
+	}
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		service = YiqiSyncService(
+			yiqi_repository=yiqi_repository,
+			watermark_repository=InMemoryWatermarkRepository(),
+			mirror_repository=mirror,
+		)
+		service.usecase.sync_streamed.batch_size = 2
+		yield service
+
+
+async def test_purchase_invoices_are_synced_in_batches_from_the_stream(
+	sync_service, session_context
+):
+	result = await sync_service.sync_entity("FACTURA_COMPRA", 316)
+
+	batches = sync_service.mirror_repository.upsert_purchase_invoices.await_args_list
+	assert [len(call.args[1]) for call in batches] == [2, 2, 1]
+	assert (result.fetched, result.created) == (5, 5)
+	watermark = await sync_service.watermark_repository.get_watermark(316, "FACTURA_COMPRA")
+	assert watermark.last_fetched == 5
+
+
+async def test_failed_stream_keeps_purchase_invoice_watermark(
+	sync_service, session_context
+):
+	last_update = datetime(2025, 4, 7, 12, 0, tzinfo=timezone.utc)
+	await sync_service.watermark_repository.save(
+		YiqiSyncWatermark(id_schema=316, entity_name="FACTURA_COMPRA", last_update=last_update)
+	)
+	sync_service.mirror_repository.upsert_purchase_invoices.side_effect = RuntimeError(
+		"db down"
+	)
+
+	results = await sync_service.sync_all(316, entities=["FACTURA_COMPRA"])
+
+	assert results[0].error == "db down"
+	watermark = await sync_service.watermark_repository.get_watermark(316, "FACTURA_COMPRA")
+	assert watermark.last_update == last_update
+
+
+async def test_upsert_maps_yiqi_columns_to_mirror_rows():
+	with patch(
+		"modules.yiqi_erp.adapter.output.persistence.sqlalchemy.mirror.bulk_upsert",
+		new=AsyncMock(return_value=MagicMock(created=1, updated=0, unchanged=0)),
+	) as bulk_upsert:
+		await YiqiMirrorSQLAlchemyRepository().upsert_purchase_invoices(
+			316, INVOICES[:1] + [FacturaDeCompra(NUMERO="sin id")]
+		)
+
+	rows = bulk_upsert.await_args.args[2]
+	assert rows == [
+		{
+			"id_schema": 316,
+			"id_yiqi_invoice": 1,
+			"id_yiqi_provider": 77,
+			"number": "0001-00000001",
+			"status": "Recepción",
+			"concept": None,
+			"awb": None,
+			"kg": None,
+			"items": None,
+			"issue_date": None,
+			"receipt_date": None,
+			"service_month": None,
+			"net": None,
+			"balance": 10.0,
+			"id_yiqi_currency": None,
+			"id_yiqi_service": None,
+			"yiqi_created_at": None,
+		}
+	]
+	assert bulk_upsert.await_args.kwargs["index_elements"] == ["id_schema", "id_yiqi_invoice"]
+
+
+async def test_provider_query_filters_by_schema_provider_and_status():
+	session = MagicMock()
+	session.execute = AsyncMock(return_value=MagicMock())
+	with patch(
+		"modules.yiqi_erp.adapter.output.persistence.sqlalchemy.purchase_invoice_mirror.global_session",
+		session,
+	):
+		await YiqiPurchaseInvoiceSQLAlchemyRepository().get_by_provider(
+			316, 77, status="Pagada", limit=20, offset=40
+		)
+
+	stmt = session.execute.await_args.args[0]
+	sql = str(stmt.compile(dialect=postgresql.dialect()))
+	assert "yiqipurchaseinvoice.id_schema = " in sql
+	assert "yiqipurchaseinvoice.id_yiqi_provider = " in sql
+	assert "yiqipurchaseinvoice.status = " in sql
+	assert "ORDER BY yiqipurchaseinvoice.issue_date DESC NULLS LAST" in sql
+
+
+@pytest.mark.parametrize(
+	"synced_ago, stale",
+	[(None, True), (timedelta(minutes=5), False), (timedelta(hours=2), True)],
+)
+async def test_provider_invoices_report_staleness(synced_ago, stale):
+	watermarks = InMemoryWatermarkRepository()
+	if synced_ago is not None:
+		await watermarks.save(
+			YiqiSyncWatermark(
+				id_schema=316,
+				entity_name="FACTURA_COMPRA",
+				last_update=datetime.now(timezone.utc) - synced_ago,
+			)
+		)
+	repository = AsyncMock()
+	repository.get_by_provider.return_value = []
+	service = YiqiPurchaseInvoiceService(repository, watermarks, max_staleness_seconds=1800)
+
+	page = await service.get_provider_invoices(77, 316, status="Recepción")
+
+	repository.get_by_provider.assert_awaited_once_with(316, 77, "Recepción", 100, 0)
+	assert page.stale is stale
+	assert (page.synced_at is None) is (synced_ago is None)
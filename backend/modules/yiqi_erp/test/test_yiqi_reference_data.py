@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from core.helpers.cache import StaleWhileRevalidateCache
+from modules.yiqi_erp.application.exception import YiqiServiceException
+from modules.yiqi_erp.application.service.reference_data import (
+	YiqiReferenceDataService,
+)
+
+CURRENCIES = [
+	{"id": 1, "MONE_NOMBRE": "USD", "PAIS_PAIS": "EEUU"},
+	{"id": 2, "MONE_NOMBRE": "ARS", "PAIS_PAIS": "Argentina"},
+]
+
+
+@pytest.fixture
+def yiqi_repository():
+	repository = AsyncMock()
+	repository.get_currency_list.return_value = httpx.Response(200, json=CURRENCIES)
+	return repository
+
+
+@pytest.fixture
+def clock():
+	with patch("core.helpers.cache.time") as time:
+		time.time.return_value = 1000.0
+		yield time.time
+
+
+@pytest.fixture
+def reference_data(yiqi_repository, clock):
+	cache = StaleWhileRevalidateCache("test", ttl=60, stale_ttl=600)
+	return YiqiReferenceDataService(yiqi_repository=yiqi_repository, cache=cache)
+
+
+async def test_currency_by_code_is_served_from_cached_list(reference_data, yiqi_repository):
+	assert (await reference_data.get_currency_by_code("ARS", 316))["id"] == 2
+	assert (await reference_data.get_currency_by_code("USD", 316))["id"] == 1
+
+	yiqi_repository.get_currency_list.assert_awaited_once()
+	yiqi_repository.get_currency_by_code.assert_not_awaited()
+
+
+async def test_concurrent_misses_share_one_request(reference_data, yiqi_repository):
+	await asyncio.gather(*[reference_data.get_currency_list(316) for _ in range(10)])
+
+	yiqi_repository.get_currency_list.assert_awaited_once()
+
+
+async def test_stale_value_is_served_while_revalidating(
+	reference_data, yiqi_repository, clock
+):
+	await reference_data.get_currency_list(316)
+	updated = CURRENCIES + [{"id": 3, "MONE_NOMBRE": "EUR", "PAIS_PAIS": "UE"}]
+	yiqi_repository.get_currency_list.return_value = httpx.Response(200, json=updated)
+	clock.return_value += 120
+
+	assert await reference_data.get_currency_list(316) == CURRENCIES
+	await asyncio.sleep(0)
+	await asyncio.sleep(0)
+	assert await reference_data.get_currency_list(316) == updated
+
+
+async def test_degraded_mode_serves_last_known_value(
+	reference_data, yiqi_repository, clock
+):
+	await reference_data.get_currency_list(316)
+	yiqi_repository.get_currency_list.return_value = httpx.Response(503)
+	clock.return_value += 3600
+
+	assert await reference_data.get_currency_list(316) == CURRENCIES
+
+
+async def test_cold_cache_falls_back_to_local_currencies(reference_data, yiqi_repository):
+	yiqi_repository.get_currency_list.return_value = httpx.Response(503)
+	local = [{"id": 1, "MONE_NOMBRE": "USD", "PAIS_PAIS": "EEUU"}]
+
+	with patch.object(
+		YiqiReferenceDataService, "_local_currency_list", AsyncMock(return_value=local)
+	):
+		assert await reference_data.get_currency_list(316) == local
+
+
+async def test_cold_cache_without_fallback_raises(reference_data, yiqi_repository):
+	yiqi_repository.get_services_list.return_value = httpx.Response(503)
+
+	with pytest.raises(YiqiServiceException):
+		await reference_data.get_services_list(316)
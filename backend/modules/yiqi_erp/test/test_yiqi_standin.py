@@ -0,0 +1,86 @@
+from io import BytesIO
+
+import pytest
+from starlette.datastructures import Headers
+
+from benchmarks.yiqi_emission_load import run_load
+from benchmarks.yiqi_standin import STANDIN_URL, YiqiStandIn
+from core.helpers.spreadsheet import write_csv
+from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+from modules.yiqi_erp.application.exception import YiqiServiceException
+from modules.yiqi_erp.application.service.yiqi import YiqiService
+from modules.yiqi_erp.domain.command import UploadFileCommand
+from modules.yiqi_erp.domain.vo.air_waybill_sheet import AirWaybillSheet
+
+
+@pytest.fixture
+def standin():
+	return YiqiStandIn()
+
+
+@pytest.fixture
+async def repository(standin):
+	client = YiqiHttpClient(
+		base_url=STANDIN_URL,
+		api_key="token",
+		retry_backoff=0,
+		transport=standin.transport(),
+	)
+	yield YiqiApiRepository(client)
+	await client.close()
+
+
+async def test_recorded_entities_are_replayed_with_filters(repository):
+	service = YiqiService(repository)
+
+	currency = await service.get_currency_by_code("USD", 316)
+	provider = await service.get_provider_by_id(10, 316)
+	invoices = [invoice async for invoice in repository.iter_invoices_of_provider(10, 316)]
+
+	assert currency["id"] == 2
+	assert provider["CLIE_NOMBRE"] == "Proveedor Aéreo SA"
+	assert [invoice.NUMERO for invoice in invoices] == ["0001-00000100", "0001-00000101"]
+
+
+async def test_air_waybill_import_round_trip(repository, standin):
+	class AirWaybill:
+		awb_code, origin, destination, kg = "12345678901", "Argentina", "Uruguay", 2.5
+
+	async def air_waybills():
+		yield AirWaybill()
+
+	sheet = AirWaybillSheet(id_yiqi_provider=10, id_yiqi_invoice=555)
+	content = await write_csv(sheet.rows(air_waybills()))
+	upload = UploadFileCommand(
+		BytesIO(content),
+		size=len(content),
+		filename="air_waybills.csv",
+		headers=Headers({"content-type": "text/csv"}),
+	)
+
+	await repository.start_air_waybills_import(upload, 316)
+	progress = [await repository.get_air_waybills_import_progress(316) for _ in range(3)]
+	awbs = await repository.get_air_waybills_by_invoice_id(555, 316)
+
+	assert [step.percent for step in progress] == [50, 100, 100]
+	assert [awb["GUAE_GUIA_AEREA"] for awb in awbs] == ["12345678901"]
+	assert standin.calls["uploadexcel"] == standin.calls["importexcel"] == 1
+
+
+async def test_injected_errors_are_retried_then_surface(repository, standin):
+	standin.error_rates["getentityupdates2"] = 1.0
+
+	with pytest.raises(YiqiServiceException):
+		await YiqiService(repository).get_currency_list(316)
+
+	assert standin.calls["getentityupdates2"] == 1 + repository.client.max_retries
+	assert standin.errors["getentityupdates2"] == standin.calls["getentityupdates2"]
+
+
+async def test_emission_task_runs_against_standin(standin):
+	result = await run_load("improved", standin, concurrency=2, invoices=4, db=0, s3=0)
+
+	assert not result.failures
+	assert result.calls["save"] == 4
+	assert result.calls["savefile"] == 8
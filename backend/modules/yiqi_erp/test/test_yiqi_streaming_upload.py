@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from modules.yiqi_erp.adapter.output.api.http_client import YiqiHttpClient
+from modules.yiqi_erp.adapter.output.api.multipart import StreamingMultipartBody
+from modules.yiqi_erp.adapter.output.api.yiqi_rest import YiqiApiRepository
+
+CONTENT = b"%PDF-1.7 " + bytes(range(256)) * 1000
+
+
+async def chunks(data: bytes, size: int = 4096):
+	for start in range(0, len(data), size):
+		yield data[start : start + size]
+
+
+async def collect(body: StreamingMultipartBody) -> bytes:
+	return b"".join([part async for part in body])
+
+
+async def test_body_matches_httpx_multipart_encoding():
+	body = StreamingMultipartBody(
+		fields={"SchemaId": "316"},
+		file_field="FileName",
+		filename="factura.pdf",
+		stream=chunks(CONTENT),
+		size=len(CONTENT),
+	)
+	expected = httpx.Request(
+		"POST",
+		"https://yiqi.test",
+		data={"SchemaId": "316"},
+		files={"FileName": ("factura.pdf", CONTENT, "application/octet-stream")},
+		headers={"Content-Type": body.headers["Content-Type"]},
+	)
+
+	encoded = await collect(body)
+
+	assert encoded == expected.read()
+	assert int(body.headers["Content-Length"]) == len(encoded)
+
+
+async def test_body_chunks_stay_bounded():
+	body = StreamingMultipartBody(
+		fields={}, file_field="f", filename="a.pdf", stream=chunks(CONTENT, 1024)
+	)
+
+	sizes = [len(part) async for part in body]
+
+	assert max(sizes) <= 1024
+	assert "Content-Length" not in body.headers
+
+
+async def test_size_mismatch_aborts_upload():
+	body = StreamingMultipartBody(
+		fields={}, file_field="f", filename="a.pdf", stream=chunks(CONTENT), size=10
+	)
+
+	with pytest.raises(ValueError):
+		await collect(body)
+
+
+async def test_repository_streams_to_save_file():
+	received = {}
+
+	async def handler(request: httpx.Request):
+		received["content_length"] = request.headers.get("Content-Length")
+		received["body"] = await request.aread()
+		return httpx.Response(200, json=True)
+
+	client = YiqiHttpClient(
+		base_url="https://yiqi.test",
+		api_key="token",
+		transport=httpx.MockTransport(handler),
+	)
+	repository = YiqiApiRepository(client)
+
+	response = await repository.upload_file_stream(
+		"factura.pdf", chunks(CONTENT), len(CONTENT), 316
+	)
+
+	assert response.is_success
+	assert int(received["content_length"]) == len(received["body"])
+	assert CONTENT in received["body"]
+	# Comparte el semáforo de su schema, no el de requests sin schemaId
+	assert set(client._semaphores) == {316}
@@ -0,0 +1,225 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+import shared.models  # noqa: F401 - configura todos los mappers de SQLModel
+from core.db.session import reset_session_context, set_session_context
+from modules.yiqi_erp.adapter.input.tasks.yiqi_sync import yiqi_sync_key
+from modules.yiqi_erp.adapter.output.api.yiqi_rest import (
+	FULL_HISTORY,
+	format_last_update,
+)
+from modules.yiqi_erp.application.service.sync import YiqiSyncService
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark
+
+
+class InMemoryWatermarkRepository:
+	def __init__(self):
+		self.watermarks = {}
+
+	async def get_watermark(self, id_schema, entity_name):
+		return self.watermarks.get((id_schema, entity_name))
+
+	async def get_watermarks(self, id_schema):
+		return [w for (schema, _), w in self.watermarks.items() if schema == id_schema]
+
+	async def save(self, watermark):
+		self.watermarks[(watermark.id_schema, watermark.entity_name)] = watermark
+		return watermark
+
+
+@pytest.fixture
+def session_context():
+	context = set_session_context(str(uuid.uuid4()))
+	yield
+	reset_session_context(context)
+
+
+@pytest.fixture
+def yiqi_repository():
+	repository = AsyncMock()
+	repository.get_currency_list.return_value = httpx.Response(
+		200, json=[{"id": 1, "MONE_NOMBRE": "USD", "PAIS_PAIS": "EEUU"}]
+	)
+	repository.purchase_invoices = []
+
+	async def iter_purchase_invoices(id_schema, last_update, batch_size):
+		for invoice in repository.purchase_invoices:
+			yield invoice
+
+	# Se lee con `async for`: un AsyncMock devolvería una corrutina
+	repository.iter_purchase_invoices = iter_purchase_invoices
+	return repository
+
+
+@pytest.fixture
+def sync_service(yiqi_repository):
+	mirror = AsyncMock()
+	mirror.upsert_currencies.return_value = {"created": 1, "updated": 0}
+	mirror.upsert_services.return_value = {"created": 0}
+	with patch("core.db.transactional.session") as session:
+		session.commit = AsyncMock()
+		session.rollback = AsyncMock()
+		yield YiqiSyncService(
+			yiqi_repository=yiqi_repository,
+			watermark_repository=InMemoryWatermarkRepository(),
+			mirror_repository=mirror,
+			overlap_hours=24,
+		)
+
+
+def test_format_last_update():
+	assert format_last_update(None) == FULL_HISTORY
+	assert format_last_update(datetime(2025, 4, 7, 15, 30)) == "07042025"
+
+
+async def test_first_sync_fetches_full_history(sync_service, yiqi_repository, session_context):
+	result = await sync_service.sync_entity("MONEDA", 316)
+
+	yiqi_repository.get_currency_list.assert_awaited_once_with(316, None)
+	assert result.since is None
+	assert result.fetched == 1
+	assert result.created == 1
+	watermark = await sync_service.watermark_repository.get_watermark(316, "MONEDA")
+	assert watermark.last_fetched == 1
+
+
+async def test_next_sync_fetches_delta_since_watermark(
+	sync_service, yiqi_repository, session_context
+):
+	last_update = datetime(2025, 4, 7, 12, 0, tzinfo=timezone.utc)
+	await sync_service.watermark_repository.save(
+		YiqiSyncWatermark(id_schema=316, entity_name="MONEDA", last_update=last_update)
+	)
+
+	result = await sync_service.sync_entity("MONEDA", 316)
+
+	assert result.since == last_update - timedelta(hours=24)
+	yiqi_repository.get_currency_list.assert_awaited_once_with(316, result.since)
+	watermark = await sync_service.watermark_repository.get_watermark(316, "MONEDA")
+	assert watermark.last_update > last_update
+
+
+async def test_failed_sync_keeps_watermark(sync_service, yiqi_repository, session_context):
+	last_update = datetime(2025, 4, 7, 12, 0, tzinfo=timezone.utc)
+	await sync_service.watermark_repository.save(
+		YiqiSyncWatermark(id_schema=316, entity_name="MONEDA", last_update=last_update)
+	)
+	sync_service.mirror_repository.upsert_currencies.side_effect = RuntimeError("db down")
+
+	results = await sync_service.sync_all(316, entities=["MONEDA"])
+
+	assert results[0].error == "db down"
+	watermark = await sync_service.watermark_repository.get_watermark(316, "MONEDA")
+	assert watermark.last_update == last_update
+
+
+async def test_sync_all_isolates_failures_per_entity(
+	sync_service, yiqi_repository, session_context
+):
+	yiqi_repository.get_services_list.return_value = httpx.Response(500)
+	yiqi_repository.get_providers_list.return_value = httpx.Response(200, json=[])
+	sync_service.mirror_repository.upsert_providers.return_value = {"created": 0}
+	yiqi_repository.purchase_invoices = [object(), object()]
+	sync_service.mirror_repository.upsert_purchase_invoices.return_value = {
+		"created": 2
+	}
+
+	results = {r.entity_name: r for r in await sync_service.sync_all(316)}
+
+	assert results["MONEDA"].error is None
+	assert results["SERVICIOS"].error is not None
+	assert results["CLIENTE"].error is None
+	assert results["FACTURA_COMPRA"].error is None
+	assert results["FACTURA_COMPRA"].created == 2
+	assert await sync_service.watermark_repository.get_watermark(316, "SERVICIOS") is None
+
+
+async def test_sync_all_with_no_entities_does_nothing(
+	sync_service, yiqi_repository, session_context
+):
+	assert await sync_service.sync_all(316, entities=[]) == []
+	assert not yiqi_repository.method_calls
+
+
+class FakeUpsertSession:
+	"""Simula el RETURNING (xmax = 0) de Postgres sobre un dict en memoria."""
+
+	def __init__(self, existing):
+		self.rows = dict(existing)
+		self.executions = []
+
+	async def execute(self, stmt, params):
+		self.executions.append(params)
+		returned = []
+		for row in params:
+			current = self.rows.get(row["code"])
+			if current is None:
+				returned.append(True)
+			elif current != row:
+				returned.append(False)
+			self.rows[row["code"]] = row
+		result = AsyncMock()
+		result.scalars = lambda: type("S", (), {"all": lambda self: returned})()
+		return result
+
+
+async def test_bulk_upsert_counts_and_chunks():
+	from core.db.bulk import bulk_upsert
+	from modules.finance.domain.entity.currency import Currency
+
+	session = FakeUpsertSession(
+		{
+			"USD": {"code": "USD", "name": "USD", "country": "EEUU"},
+			"ARS": {"code": "ARS", "name": "ARS", "country": "Argentina"},
+		}
+	)
+	rows = [
+		{"code": "USD", "name": "USD", "country": "EEUU"},
+		{"code": "ARS", "name": "ARS", "country": "ARG"},
+		{"code": "EUR", "name": "EUR", "country": None},
+		{"code": "EUR", "name": "EUR", "country": "UE"},
+	]
+
+	result = await bulk_upsert(session, Currency, rows, ["code"], chunk_size=2)
+
+	assert (result.created, result.updated, result.unchanged) == (1, 1, 1)
+	assert [len(chunk) for chunk in session.executions] == [2, 1]
+	assert session.rows["EUR"]["country"] == "UE"
+
+
+async def test_upsert_providers_keeps_local_multi_invoice_flag():
+	from core.db.bulk import UpsertResult
+	from modules.yiqi_erp.adapter.output.persistence.sqlalchemy import mirror
+
+	rows = [
+		{"id": 7, "CLIE_NOMBRE": "Proveedor", "CLIE_MONEDA": "USD", "CLIE_ACTIVO_P": "S"},
+		{"id": 8, "CLIE_NOMBRE": "Inactivo", "CLIE_ACTIVO_P": "N"},
+	]
+	with patch.object(
+		mirror, "bulk_upsert", AsyncMock(return_value=UpsertResult(created=1))
+	) as bulk_upsert:
+		await mirror.YiqiMirrorSQLAlchemyRepository().upsert_providers(rows)
+
+	_, _, values = bulk_upsert.await_args.args
+	assert values == [
+		{
+			"id_yiqi_provider": 7,
+			"name": "Proveedor",
+			"currency": "USD",
+			"allow_multi_invoice": False,
+		}
+	]
+	assert "allow_multi_invoice" not in bulk_upsert.await_args.kwargs["update_columns"]
+
+
+def test_sync_key_depends_on_entities_and_mode():
+	assert yiqi_sync_key(316) == yiqi_sync_key(316, None, False)
+	assert yiqi_sync_key(316, ["SERVICIOS", "MONEDA"]) == yiqi_sync_key(
+		316, ["MONEDA", "SERVICIOS"]
+	)
+	assert yiqi_sync_key(316) != yiqi_sync_key(316, full=True)
+	assert yiqi_sync_key(316, ["MONEDA"]) != yiqi_sync_key(316, ["CLIENTE"])
@@ -3,7 +3,7 @@ Contratos compartidos entre módulos usando Protocol (Structural Subtyping)
 Esto permite desacoplar módulos sin necesidad de imports directos
 """
 
-from typing import Protocol, Any, Optional, Sequence
+from typing import Protocol, Any, Dict, Iterable, Optional, Sequence
 from uuid import UUID
 
 
@@ -115,6 +115,10 @@ class FileStorageServiceProtocol(Protocol):
 		"""Obtiene metadata de un archivo"""
 		...
 
+	async def get_metadata_many(self, file_ids: Iterable[UUID | None]) -> Dict[UUID, Any]:
+		"""Obtiene metadata de varios archivos en una sola consulta"""
+		...
+
 	async def delete_file(self, file_id: UUID) -> bool:
 		"""Elimina un archivo"""
 		...
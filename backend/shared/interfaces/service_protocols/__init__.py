@@ -23,7 +23,9 @@ from .user import UserServiceProtocol
 from .yiqi_erp import (
 	InvoiceIntegrationServiceProtocol,
 	YiqiERPTasksProtocol,
+	YiqiPurchaseInvoiceServiceProtocol,
 	YiqiServiceProtocol,
+	YiqiSyncServiceProtocol,
 )
 
 
@@ -48,5 +50,7 @@ __all__ = [
 	"UserServiceProtocol",
 	"InvoiceIntegrationServiceProtocol",
 	"YiqiERPTasksProtocol",
+	"YiqiPurchaseInvoiceServiceProtocol",
 	"YiqiServiceProtocol",
+	"YiqiSyncServiceProtocol",
 ]
@@ -35,6 +35,10 @@ class AuthServiceProtocol(Protocol):
 		"""Trae la sesión de un usuario"""
 		...
 
+	async def get_user_permissions(self, user_uuid: str) -> list[str] | None:
+		"""Trae sólo los permisos de la sesión (None si no hay sesión)"""
+		...
+
 
 class JwtServiceProtocol(Protocol):
 	"""API pública del módulo Auth para gestión de JWT tokens"""
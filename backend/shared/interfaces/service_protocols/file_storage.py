@@ -5,7 +5,7 @@ Permite type checking y autocompletado sin crear dependencias directas
 entre otros módulos.
 """
 
-from typing import Any, Optional, Protocol, Self
+from typing import Any, Dict, Iterable, Optional, Protocol, Self
 from uuid import UUID
 
 
@@ -19,7 +19,8 @@ class FileStorageServiceProtocol(Protocol):
 	def __call__(self) -> Self: ...
 	async def save_file(self, command: Any) -> Optional[Any]:
 		"""
-		Guarda un archivo en el storage.
+		Guarda un archivo en el storage, direccionado por su SHA-256: si el
+		mismo contenido ya estaba guardado no se vuelve a subir.
 
 		Args:
 			command: SaveFileCommand con file, filename, size
@@ -42,6 +43,21 @@ class FileStorageServiceProtocol(Protocol):
 		"""
 		...
 
+	async def stream_file(self, file_metadata_uuid: UUID) -> Any:
+		"""
+		Abre un archivo del storage para leerlo por bloques.
+
+		No carga el archivo en memoria: el contenido se descarga a medida que
+		se itera `stream`.
+
+		Returns:
+			FileStreamDTO con (stream: AsyncIterator[bytes], metadata: FileMetadata,
+			read_range: (inicio, fin) -> AsyncIterator[bytes] para leer un tramo)
+
+		Used by: yiqi_erp (adjuntos de facturas)
+		"""
+		...
+
 	async def get_metadata(self, file_metadata_uuid: UUID) -> Any:
 		"""
 		Obtiene metadata de un archivo.
@@ -52,3 +68,52 @@ class FileStorageServiceProtocol(Protocol):
 		Used by: provider (draft invoices)
 		"""
 		...
+
+	async def get_metadata_many(
+		self, file_metadata_uuids: Iterable[UUID | None]
+	) -> Dict[UUID, Any]:
+		"""
+		Metadata de varios archivos con una sola consulta (IN).
+
+		Ignora ids vacíos y repetidos. Los que no existen no aparecen en el
+		resultado, no levanta excepción.
+
+		Returns:
+			Dict[UUID, FileMetadata]
+
+		Used by: provider (draft invoices)
+		"""
+		...
+
+	async def create_upload_url(self, command: Any) -> Any:
+		"""
+		Firma una subida directa al storage (sin pasar por la API).
+
+		Args:
+			command: CreateUploadUrlCommand con filename, size, content_type
+
+		Returns:
+			PresignedUploadDTO con (id, request, upload_token, expires_in)
+		"""
+		...
+
+	async def confirm_upload(self, command: Any) -> Optional[Any]:
+		"""
+		Verifica que la subida directa llegó al storage y registra su metadata.
+
+		Args:
+			command: ConfirmUploadCommand con el upload_token de create_upload_url
+
+		Returns:
+			FileMetadata del archivo subido
+		"""
+		...
+
+	async def get_download_url(self, file_metadata_uuid: UUID) -> Any:
+		"""
+		URL firmada para descargar el archivo directo del storage.
+
+		Returns:
+			PresignedDownloadDTO con (url, expires_in, metadata)
+		"""
+		...
@@ -5,7 +5,7 @@ Permite type checking y autocompletado sin crear dependencias directas
 entre otros módulos.
 """
 
-from typing import Any, Optional, Protocol, Self, List, Sequence
+from typing import Any, AsyncIterator, Mapping, Optional, Protocol, Self, List, Sequence
 
 
 class ProviderServiceProtocol(Protocol):
@@ -114,6 +114,12 @@ class AirWaybillServiceProtocol(Protocol):
 		"""Obtiene guías aéreas asociadas a una factura"""
 		...
 
+	def iter_air_waybills_by_purchase_invoice_id(
+		self, id_purchase_invoice: int, batch_size: int = 1000
+	) -> AsyncIterator[Any]:
+		"""Recorre las guías aéreas de una factura por lotes (cursor)"""
+		...
+
 	async def create_air_waybill(self, command: Any) -> Any:
 		"""Crea una nueva guía aérea"""
 		...
@@ -126,6 +132,12 @@ class AirWaybillServiceProtocol(Protocol):
 		"""Actualiza una guía aérea existente"""
 		...
 
+	async def link_yiqi_air_waybills(
+		self, id_purchase_invoice: int, yiqi_ids_by_code: Mapping[str, int]
+	) -> List[str]:
+		"""Vincula en bloque las guías de una factura con sus ids en Yiqi"""
+		...
+
 	async def delete_air_waybill(self, air_waybill: Any) -> Any:
 		"""Elimina una guía aérea"""
 		...
@@ -5,7 +5,8 @@ Permite type checking y autocompletado sin crear dependencias directas
 entre otros módulos.
 """
 
-from typing import Any, Protocol, Self, List
+from datetime import datetime
+from typing import Any, AsyncIterator, Protocol, Self, List
 
 
 class YiqiServiceProtocol(Protocol):
@@ -32,11 +33,15 @@ class YiqiServiceProtocol(Protocol):
 		"""Obtiene proveedor del ERP por ID"""
 		...
 
-	async def get_services_list(self, id_schema: int) -> List[dict]:
+	async def get_services_list(
+		self, id_schema: int, last_update: datetime | None = None
+	) -> List[dict]:
 		"""Obtiene lista de servicios del ERP"""
 		...
 
-	async def get_currency_list(self, id_schema: int) -> List[dict]:
+	async def get_currency_list(
+		self, id_schema: int, last_update: datetime | None = None
+	) -> List[dict]:
 		"""Obtiene lista de monedas del ERP"""
 		...
 
@@ -48,7 +53,9 @@ class YiqiServiceProtocol(Protocol):
 		"""
 		...
 
-	async def get_country_list(self, id_schema: int = 316) -> List[dict]:
+	async def get_country_list(
+		self, id_schema: int = 316, last_update: datetime | None = None
+	) -> List[dict]:
 		"""Obtiene lista de países del ERP"""
 		...
 
@@ -60,10 +67,34 @@ class YiqiServiceProtocol(Protocol):
 		"""
 		...
 
-	async def get_providers_list(self, id_schema: int) -> List[dict]:
+	async def get_providers_list(
+		self, id_schema: int, last_update: datetime | None = None
+	) -> List[dict]:
 		"""Obtiene lista de proveedores del ERP"""
 		...
 
+	async def create_multiple_air_waybills(self, command: Any, id_schema: int) -> dict:
+		"""
+		Importa guías aéreas en el ERP a partir de un archivo Excel.
+
+		Espera (sin bloquear el event loop) a que Yiqi termine la importación.
+		Lanza YiqiImportException si Yiqi informa error y
+		YiqiImportTimeoutException si no termina a tiempo.
+
+		Args:
+			command: UploadFileCommand
+			id_schema: ID del schema/empresa
+
+		Used by: yiqi_erp_tasks
+		"""
+		...
+
+	async def get_air_waybills_by_invoice_id(
+		self, id_invoice: int, id_schema: int
+	) -> List[dict] | None:
+		"""Obtiene las guías aéreas de una factura del ERP"""
+		...
+
 	async def upload_file(self, command: Any, id_schema: int = 316) -> dict:
 		"""
 		Sube un archivo al ERP.
@@ -76,6 +107,108 @@ class YiqiServiceProtocol(Protocol):
 		"""
 		...
 
+	def iter_invoices_of_provider(
+		self,
+		id_provider: int,
+		id_schema: int,
+		last_update: datetime | None = None,
+		batch_size: int = 500,
+	) -> AsyncIterator[Any]:
+		"""
+		Recorre las facturas de compra de un proveedor sin cargar el payload
+		completo: el JSON se decodifica a medida que llega y se valida por
+		lotes en modelos FacturaDeCompra.
+
+		Args:
+			id_provider: ID del proveedor en Yiqi (CLIE_ID_PROV)
+			id_schema: ID del schema/empresa
+			last_update: Sólo cambios desde esta fecha (None = historial completo)
+			batch_size: Filas validadas por lote
+
+		Used by:
+		"""
+		...
+
+	async def upload_file_stream(
+		self, filename: str, stream: Any, size: int | None, id_schema: int
+	) -> bool:
+		"""
+		Sube un archivo al ERP leyéndolo de un iterador asíncrono de bytes.
+
+		El archivo nunca se carga completo en memoria (S3 -> Yiqi por bloques).
+
+		Args:
+			filename: Nombre con el que se guarda en Yiqi
+			stream: AsyncIterator[bytes] con el contenido
+			size: Tamaño en bytes si se conoce (Content-Length), o None
+			id_schema: ID del schema/empresa
+
+		Used by: yiqi_erp_tasks (adjuntos de facturas)
+		"""
+		...
+
+
+class YiqiSyncServiceProtocol(Protocol):
+	"""
+	Sincronización incremental de la copia local de entidades de Yiqi.
+
+	Cada entidad (MONEDA, SERVICIOS, CLIENTE, FACTURA_COMPRA) avanza su marca de agua sólo
+	cuando el commit de los datos sincronizados tiene éxito.
+	"""
+
+	def __call__(self) -> Self: ...
+
+	@property
+	def entities(self) -> List[str]:
+		"""Entidades sincronizables"""
+		...
+
+	async def sync_entity(
+		self, entity_name: str, id_schema: int, full: bool = False
+	) -> Any:
+		"""Sincroniza una entidad desde su marca de agua (o completa con full)"""
+		...
+
+	async def sync_all(
+		self, id_schema: int, entities: List[str] | None = None, full: bool = False
+	) -> List[Any]:
+		"""
+		Sincroniza varias entidades, cada una en su propia transacción.
+
+		Used by: yiqi_erp.sync_yiqi_entities_tasks, hexa sync-with-yiqi-db
+		"""
+		...
+
+	async def get_watermarks(self, id_schema: int) -> List[Any]:
+		"""Marcas de agua actuales del schema"""
+		...
+
+
+class YiqiPurchaseInvoiceServiceProtocol(Protocol):
+	"""
+	Facturas de compra de Yiqi servidas desde la copia local (sin llamar a Yiqi).
+
+	La respuesta incluye `synced_at` y `stale` para indicar la antigüedad de
+	los datos.
+	"""
+
+	def __call__(self) -> Self: ...
+
+	async def get_provider_invoices(
+		self,
+		id_provider: int,
+		id_schema: int,
+		status: str | None = None,
+		limit: int = 100,
+		offset: int = 0,
+	) -> Any:
+		"""
+		Facturas de un proveedor, opcionalmente filtradas por estado (DESC_ESTADO).
+
+		Used by: GET /yiqi_erp/v1/yiqi_erp/provider/{id_provider}/purchase_invoices
+		"""
+		...
+
 
 class InvoiceIntegrationServiceProtocol(Protocol):
 	"""
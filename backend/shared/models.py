@@ -8,6 +8,8 @@ from modules.provider.domain.entity import *
 from modules.rbac.domain.entity import *
 from modules.user.domain.entity import *
 from modules.user_relationships.domain.entity import *
+from modules.yiqi_erp.domain.entity.purchase_invoice_mirror import YiqiPurchaseInvoice  # noqa: F401
+from modules.yiqi_erp.domain.entity.sync_watermark import YiqiSyncWatermark  # noqa: F401
 
 # Core models
 from core.audit.models import AuditLog